@@ -0,0 +1,4 @@
+"""Performance benchmarks for the scraper, data loading and Flask routes.
+
+Run ``python -m benchmarks`` from the repository root; see ``benchmarks/README.md``.
+"""
@@ -0,0 +1,96 @@
+"""Run the benchmark suite: ``python -m benchmarks [-k PATTERN] [--compare latest]``."""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import sys
+from pathlib import Path
+
+from . import harness
+
+MODULES = ['bench_scraper', 'bench_data', 'bench_api', 'bench_simulation']
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent.parent / '.benchmarks'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run sc2_gantt performance benchmarks")
+    parser.add_argument('-k', dest='patterns', action='append',
+                        help="Only run benchmarks matching this glob or substring (repeatable)")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    parser.add_argument('--rounds', type=int, default=5, help="Timed rounds per benchmark (default: 5)")
+    parser.add_argument('--round-time', type=float, default=0.05,
+                        help="Target seconds per round used to calibrate loop counts (default: 0.05)")
+    parser.add_argument('--corpus', help="Recorded corpus directory for corpus-backed benchmarks")
+    parser.add_argument('--results-dir', default=str(DEFAULT_RESULTS_DIR),
+                        help="Directory results are saved to (default: .benchmarks/)")
+    parser.add_argument('--no-save', action='store_true', help="Do not save results")
+    parser.add_argument('--compare', metavar='RESULTS',
+                        help="Compare against a results JSON file, or 'latest' for the newest saved run")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Relative median change reported as a regression (default: 0.10)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit with status 1 if any benchmark regressed beyond the threshold")
+    args = parser.parse_args()
+
+    harness.ensure_src_path()
+    for module in MODULES:
+        importlib.import_module(f'{__package__}.{module}')
+
+    selected = harness.select(args.patterns)
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return
+
+    results_dir = Path(args.results_dir)
+    baseline_path = None
+    if args.compare:
+        baseline_path = harness.latest_results(results_dir) if args.compare == 'latest' else Path(args.compare)
+        if baseline_path is None or not baseline_path.exists():
+            print(f"❌ No baseline results found for --compare {args.compare}")
+            sys.exit(2)
+
+    results = {}
+    for bench in selected:
+        ctx = harness.BenchContext(args.corpus)
+        try:
+            # The scraper prints progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = bench.setup(ctx)
+                if fn is None:
+                    stats = None
+                else:
+                    stats = harness.measure(fn, rounds=args.rounds, round_time=args.round_time)
+        finally:
+            ctx.close()
+        if stats is None:
+            print(f"  skipped {bench.name}")
+            continue
+        results[bench.name] = dict(stats, group=bench.group)
+        print(f"  {bench.name}: {stats['median'] * 1000:.3f} ms")
+
+    print()
+    print(harness.format_results(results))
+
+    document = harness.results_document(results, {'rounds': args.rounds, 'round_time': args.round_time,
+                                                  'corpus': args.corpus})
+    if not args.no_save:
+        path = harness.save_results(document, results_dir)
+        print(f"\n✅ Results saved to {path}")
+
+    if baseline_path is not None:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        rows = harness.compare(baseline, document, args.threshold)
+        print(f"\nCompared with {baseline_path.name} "
+              f"({(baseline['environment'].get('commit') or 'unknown')[:10]}):")
+        print(harness.format_comparison(rows))
+        regressions = [row for row in rows if row['status'] == 'regression']
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
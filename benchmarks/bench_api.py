@@ -0,0 +1,52 @@
+"""Flask ``test_client()`` throughput per route."""
+
+from sc2_gantt.backend.web_app import create_app
+
+from .harness import benchmark
+
+BUILD_ORDER = {
+    'metadata': {'exportDate': '2025-01-01T00:00:00.000Z', 'timeScale': 10, 'totalRows': 2},
+    'rows': [
+        {'rowIndex': 0, 'entities': [
+            {'name': 'SCV', 'type': 'unit', 'race': 'terran', 'startTime': i * 12, 'buildTime': 12,
+             'minerals': 50, 'gas': 0, 'chronoboosted': False, 'chronoboostCount': 0}
+            for i in range(20)
+        ]},
+        {'rowIndex': 1, 'entities': [
+            {'name': 'Marine', 'type': 'unit', 'race': 'terran', 'startTime': 60 + i * 18, 'buildTime': 18,
+             'minerals': 50, 'gas': 0, 'chronoboosted': False, 'chronoboostCount': 0}
+            for i in range(10)
+        ]}
+    ]
+}
+
+# (benchmark name, method, path, extra test-client kwargs)
+ROUTES = [
+    ('index', 'GET', '/', {}),
+    ('api_sc2_data', 'GET', '/api/sc2-data', {}),
+    ('api_sc2_data_gzip', 'GET', '/api/sc2-data', {'headers': {'Accept-Encoding': 'gzip'}}),
+    ('download_sc2_data', 'GET', '/download/sc2-data', {}),
+    ('download_race_data', 'GET', '/download/sc2-data/terran', {}),
+    ('bundle_js', 'GET', '/bundle/js/gantt.js', {}),
+    ('bundle_js_gzip', 'GET', '/bundle/js/gantt.js', {'headers': {'Accept-Encoding': 'gzip'}}),
+    ('asset_icon', 'GET', '/assets/icons/terran/units/marine.jpg', {}),
+    ('metrics', 'GET', '/metrics', {}),
+    ('export_build_order', 'POST', '/export/build-order', {'json': BUILD_ORDER}),
+]
+
+
+def _route_setup(method: str, path: str, kwargs: dict):
+    def setup(ctx):
+        client = create_app({'TESTING': True}).test_client()
+
+        def run():
+            response = client.open(path, method=method, **kwargs)
+            response.get_data()
+            response.close()
+            assert response.status_code == 200, f"{method} {path} -> {response.status_code}"
+        return run
+    return setup
+
+
+for _name, _method, _path, _kwargs in ROUTES:
+    benchmark('api', _name)(_route_setup(_method, _path, _kwargs))
@@ -0,0 +1,36 @@
+"""Benchmarks for loading and serializing sc2_comprehensive_data.json."""
+
+import json
+from pathlib import Path
+
+from .harness import benchmark
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'src' / 'sc2_gantt' / 'assets' / 'sc2_comprehensive_data.json'
+
+
+@benchmark('data')
+def json_load_file(ctx):
+    """Open and parse the data file, as the backend does on a cache miss."""
+    def run():
+        with open(DATA_PATH, 'r') as f:
+            return json.load(f)
+    return run
+
+
+@benchmark('data')
+def json_loads(ctx):
+    text = DATA_PATH.read_text()
+    return lambda: json.loads(text)
+
+
+@benchmark('data')
+def json_dumps_compact(ctx):
+    data = json.loads(DATA_PATH.read_text())
+    return lambda: json.dumps(data, separators=(',', ':'))
+
+
+@benchmark('data')
+def json_dumps_indented(ctx):
+    """Pretty-printed dump, as used by the per-race download route."""
+    data = json.loads(DATA_PATH.read_text())
+    return lambda: json.dumps(data, indent=2)
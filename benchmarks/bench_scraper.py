@@ -0,0 +1,120 @@
+"""Scraper benchmarks: entity page parsing, upgrade extraction, icon matching and conversion."""
+
+import io
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+from PIL import Image
+
+from sc2_gantt.backend.sc2_data.comprehensive_scraper import SC2ComprehensiveScraper
+
+from .harness import benchmark
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+ASSETS = Path(__file__).resolve().parent.parent / 'src' / 'sc2_gantt' / 'assets'
+
+ENTITY_PAGES = {
+    'engineering_bay': {'name': 'Engineering Bay', 'href': '/starcraft2/Engineering_Bay',
+                        'page_name': 'Engineering_Bay', 'type': 'building', 'race': 'terran'},
+    'marine': {'name': 'Marine', 'href': '/starcraft2/Marine',
+               'page_name': 'Marine', 'type': 'unit', 'race': 'terran'}
+}
+
+
+class CannedResponse:
+    """Stand-in for ``requests.Response`` serving fixed bytes."""
+
+    def __init__(self, content: bytes, content_type: str = 'text/html; charset=UTF-8'):
+        self.status_code = 200
+        self.content = content
+        self.text = content.decode('utf-8', errors='replace')
+        self.headers = {'Content-Type': content_type}
+
+    def raise_for_status(self):
+        pass
+
+
+def _scraper(ctx) -> SC2ComprehensiveScraper:
+    scraper = SC2ComprehensiveScraper(output_dir=str(ctx.tmp_path))
+    # Keep per-call telemetry from growing without bound across timing loops
+    scraper.telemetry.record = lambda *args, **kwargs: None
+    return scraper
+
+
+def _entity_page_setup(page: str):
+    def setup(ctx):
+        scraper = _scraper(ctx)
+        entity = ENTITY_PAGES[page]
+        response = CannedResponse((FIXTURES / f"{page}.html").read_bytes())
+        ctx.enter(patch('requests.get', return_value=response))
+        return lambda: scraper.extract_entity_data(entity)
+    return setup
+
+
+for _page in ENTITY_PAGES:
+    benchmark('scraper', f"extract_entity_data[{_page}]")(_entity_page_setup(_page))
+
+
+@benchmark('scraper', 'extract_entity_data[corpus]')
+def extract_entity_data_corpus(ctx):
+    """Parse every recorded entity page of a corpus (only with --corpus)."""
+    if ctx.corpus_dir is None:
+        return None
+    from sc2_gantt.backend.sc2_data.corpus import Corpus
+
+    corpus = Corpus(str(ctx.corpus_dir))
+    pages = []
+    for key, entry in corpus.entries.items():
+        if not entry['content_type'].startswith('text/html') or 'Statistics' in key:
+            continue
+        page_name = key.rsplit('/', 1)[-1]
+        entity = {'name': page_name.replace('_', ' '), 'href': key, 'page_name': page_name,
+                  'type': 'unit', 'race': 'terran'}
+        html = (corpus.files_dir / entry['file']).read_text(encoding='utf-8', errors='replace')
+        pages.append((html, entity))
+
+    scraper = _scraper(ctx)
+
+    def run():
+        for html, entity in pages:
+            scraper._parse_entity_page(html, entity, entity['href'])
+    return run if pages else None
+
+
+@benchmark('scraper')
+def extract_upgrades_from_entity_page(ctx):
+    scraper = _scraper(ctx)
+    soup = BeautifulSoup((FIXTURES / 'engineering_bay.html').read_text(), 'html.parser')
+    entity = ENTITY_PAGES['engineering_bay']
+    return lambda: scraper.extract_upgrades_from_entity_page(soup, entity)
+
+
+@benchmark('scraper')
+def find_matching_icon(ctx):
+    """Match every known upgrade name against the full set of upgrade icon filenames."""
+    scraper = _scraper(ctx)
+    icons = [(f"{path.stem}.png", f"https://liquipedia.net/commons/images/{path.stem}.png")
+             for path in sorted(ASSETS.glob('icons/*/upgrades/*.jpg'))]
+    with open(ASSETS / 'sc2_comprehensive_data.json') as f:
+        data = json.load(f)
+    names = [upgrade['name'] for race in data['races'].values()
+             for upgrade in race.get('upgrades', {}).values()]
+
+    def run():
+        for name in names:
+            scraper._find_matching_icon(name, icons)
+    return run
+
+
+@benchmark('scraper')
+def download_icon(ctx):
+    """Fetch (canned), decode an RGBA PNG and re-encode it as JPG."""
+    scraper = _scraper(ctx)
+    source = Image.open(ASSETS / 'icons' / 'terran' / 'units' / 'marine.jpg').convert('RGBA')
+    buffer = io.BytesIO()
+    source.resize((300, 300)).save(buffer, 'PNG')
+    ctx.enter(patch('requests.get', return_value=CannedResponse(buffer.getvalue(), 'image/png')))
+    url = 'https://liquipedia.net/commons/images/thumb/a/a8/Marine.png/300px-Marine.png'
+    return lambda: scraper.download_icon(url, 'Marine', 'terran', 'unit')
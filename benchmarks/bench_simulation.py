@@ -0,0 +1,48 @@
+"""Benchmarks for the economy simulation: full runs versus incremental edits."""
+
+import copy
+import json
+
+from .bench_data import DATA_PATH
+from .harness import benchmark
+
+
+def _setup(steps=40):
+    from sc2_gantt.backend.build_order import GameDataIndex
+
+    index = GameDataIndex(json.loads(DATA_PATH.read_text()))
+    workers = [{'name': 'Probe', 'race': 'protoss', 'startTime': 12 * i, 'buildTime': 12} for i in range(steps // 2)]
+    structures = [{'name': name, 'race': 'protoss', 'startTime': start} for name, start in
+                  [('Pylon', 18), ('Gateway', 45), ('Assimilator', 60), ('Cybernetics Core', 110), ('Nexus', 150)]]
+    army = [{'name': 'Stalker', 'race': 'protoss', 'startTime': 160 + 27 * i}
+            for i in range(steps - len(workers) - len(structures))]
+    build = {'rows': [{'entities': workers}, {'entities': structures}, {'entities': army}]}
+    return index, build
+
+
+@benchmark('simulation')
+def full_40_steps(ctx):
+    """Simulate a 40-step build from scratch."""
+    from sc2_gantt.backend.simulation import simulate_build_order
+
+    index, build = _setup()
+    return lambda: simulate_build_order(build, index)
+
+
+@benchmark('simulation')
+def incremental_edit_step_35(ctx):
+    """Re-simulate after moving a step near the end of a 40-step build."""
+    from sc2_gantt.backend.simulation import IncrementalSimulation
+
+    index, build = _setup()
+    simulation = IncrementalSimulation(index)
+    simulation.update(build)
+    edited = copy.deepcopy(build)
+    last = edited['rows'][2]['entities'][-5]
+    toggle = [0]
+
+    def run():
+        toggle[0] ^= 1
+        last['startTime'] = build['rows'][2]['entities'][-5]['startTime'] + toggle[0]
+        return simulation.update(edited)
+    return run
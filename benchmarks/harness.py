@@ -0,0 +1,202 @@
+"""Minimal benchmark registry, timer and JSON result store."""
+
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+RESULTS_FORMAT = 1
+
+
+class Benchmark(NamedTuple):
+    name: str
+    group: str
+    setup: Callable[['BenchContext'], Optional[Callable[[], Any]]]
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(group: str, name: Optional[str] = None):
+    """Register a setup function that returns the callable to time (or None to skip)."""
+    def decorator(setup):
+        REGISTRY.append(Benchmark(f"{group}.{name or setup.__name__}", group, setup))
+        return setup
+    return decorator
+
+
+def select(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """Return registered benchmarks whose name matches any of the glob patterns."""
+    if not patterns:
+        return list(REGISTRY)
+    return [b for b in REGISTRY if any(fnmatch.fnmatch(b.name, p) or p in b.name for p in patterns)]
+
+
+class BenchContext:
+    """Per-benchmark scratch directory and cleanup stack."""
+
+    def __init__(self, corpus_dir: Optional[str] = None):
+        self.stack = ExitStack()
+        self.tmp_path = Path(self.stack.enter_context(tempfile.TemporaryDirectory()))
+        self.corpus_dir = Path(corpus_dir) if corpus_dir else None
+
+    def enter(self, context_manager):
+        return self.stack.enter_context(context_manager)
+
+    def close(self):
+        self.stack.close()
+
+
+def measure(fn: Callable[[], Any], rounds: int = 5, round_time: float = 0.05,
+            warmup: int = 1) -> Dict[str, float]:
+    """Time ``fn``, calibrating loops per round so each round lasts ``round_time`` seconds."""
+    for _ in range(warmup):
+        fn()
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(round_time / elapsed) + 1))
+
+    samples = [elapsed / loops]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    median = statistics.median(samples)
+    return {
+        'loops': loops,
+        'rounds': rounds,
+        'min': min(samples),
+        'median': median,
+        'mean': statistics.mean(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'ops': 1 / median if median else 0.0
+    }
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', *args], capture_output=True, text=True, timeout=10,
+                                cwd=Path(__file__).parent)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the commit and machine the results were taken on."""
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def results_document(results: Dict[str, Dict[str, Any]], options: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'format': RESULTS_FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment(),
+        'options': options,
+        'benchmarks': results
+    }
+
+
+def save_results(document: Dict[str, Any], results_dir: Path) -> Path:
+    """Write results as ``<timestamp>_<commit>.json`` and return the path."""
+    results_dir.mkdir(parents=True, exist_ok=True)
+    commit = (document['environment'].get('commit') or 'nocommit')[:10]
+    if document['environment'].get('dirty'):
+        commit += '-dirty'
+    path = results_dir / f"{time.strftime('%Y%m%d-%H%M%S')}_{commit}.json"
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def latest_results(results_dir: Path) -> Optional[Path]:
+    if not results_dir.exists():
+        return None
+    candidates = sorted(results_dir.glob('*.json'))
+    return candidates[-1] if candidates else None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Compare median times; a change beyond ``threshold`` is a regression or improvement."""
+    rows = []
+    base_results = baseline.get('benchmarks', {})
+    for name, stats in current['benchmarks'].items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({'name': name, 'baseline': None, 'current': stats['median'],
+                         'change': None, 'status': 'new'})
+            continue
+        change = stats['median'] / base['median'] - 1 if base['median'] else 0.0
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': base['median'], 'current': stats['median'],
+                     'change': change, 'status': status})
+    return rows
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_results(results: Dict[str, Dict[str, Any]]) -> str:
+    width = max([len(name) for name in results] + [9])
+    header = f"{'benchmark':<{width}}{'median':>12}{'min':>12}{'stddev':>12}{'ops/s':>12}"
+    lines = [header, '-' * len(header)]
+    for name, stats in results.items():
+        lines.append(f"{name:<{width}}{_format_time(stats['median']):>12}{_format_time(stats['min']):>12}"
+                     f"{_format_time(stats['stddev']):>12}{stats['ops']:>12.1f}")
+    return '\n'.join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    width = max([len(row['name']) for row in rows] + [9])
+    header = f"{'benchmark':<{width}}{'baseline':>12}{'current':>12}{'change':>10}  status"
+    lines = [header, '-' * (len(header) + 6)]
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row['change'] is not None else '-'
+        lines.append(f"{row['name']:<{width}}{_format_time(row['baseline']):>12}"
+                     f"{_format_time(row['current']):>12}{change:>10}  {row['status']}")
+    return '\n'.join(lines)
+
+
+def ensure_src_path():
+    """Make the in-tree package importable when run from a checkout."""
+    src = str(Path(__file__).resolve().parent.parent / 'src')
+    if src not in sys.path:
+        sys.path.insert(0, src)
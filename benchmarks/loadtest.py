@@ -0,0 +1,402 @@
+"""Asyncio load generator replaying scenario files against a local ``create_app()`` server.
+
+    python -m benchmarks.loadtest benchmarks/scenarios/session.json --users 20 --duration 30
+    python -m benchmarks.loadtest benchmarks/scenarios/api_burst.json --mode dev --users 50
+
+The server is started in a separate process (so the client does not compete
+with it for the GIL) unless ``--url`` points at one that is already running.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import harness
+
+SCENARIOS_DIR = Path(__file__).parent / 'scenarios'
+
+
+class HTTPError(Exception):
+    """Raised for malformed responses or dropped connections."""
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client connection on asyncio streams."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                      body: bytes = b'') -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request, retrying once if a reused connection was closed by the server."""
+        reused = self._writer is not None
+        try:
+            return await self._request(method, path, headers or {}, body)
+        except (ConnectionError, asyncio.IncompleteReadError, HTTPError):
+            self.close()
+            if not reused:
+                raise
+            return await self._request(method, path, headers or {}, body)
+
+    async def _request(self, method: str, path: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        if self._writer is None:
+            await self._connect()
+        assert self._reader is not None and self._writer is not None
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body)}")
+        self._writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise HTTPError('connection closed before response')
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise HTTPError(f"bad status line {status_line!r}")
+        version, status = parts[0], int(parts[1])
+
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            content = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            content = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            content = await self._reader.readexactly(int(response_headers['content-length']))
+        else:
+            content = await self._reader.read()
+            self.close()
+            return status, response_headers, content
+
+        connection = response_headers.get('connection', '').lower()
+        if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+            self.close()
+        return status, response_headers, content
+
+
+class Recorder:
+    """Collects per-step latency, size and errors."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.bytes: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[int, int] = {}
+        self.sessions = 0
+
+    def add(self, step: str, latency: float, status: Optional[int], size: int):
+        self.samples.setdefault(step, []).append(latency)
+        self.bytes[step] = self.bytes.get(step, 0) + size
+        if status is None or status >= 400:
+            self.errors[step] = self.errors.get(step, 0) + 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        from sc2_gantt.backend.sc2_data.telemetry import percentile
+
+        def stats(latencies: List[float], errors: int, size: int) -> Dict[str, Any]:
+            return {
+                'requests': len(latencies),
+                'errors': errors,
+                'rps': len(latencies) / elapsed if elapsed else 0.0,
+                'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p99': percentile(latencies, 99),
+                'max': max(latencies) if latencies else 0.0,
+                'bytes': size
+            }
+
+        all_latencies = [latency for values in self.samples.values() for latency in values]
+        return {
+            'elapsed': elapsed,
+            'sessions': self.sessions,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'total': stats(all_latencies, sum(self.errors.values()), sum(self.bytes.values())),
+            'steps': {step: stats(values, self.errors.get(step, 0), self.bytes.get(step, 0))
+                      for step, values in self.samples.items()}
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    rows = list(report['steps'].items()) + [('TOTAL', report['total'])]
+    width = max(len(name) for name, _ in rows)
+    header = (f"{'step':<{width}}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>9}"
+              f"{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'MiB':>8}")
+    lines = [header, '-' * len(header)]
+    for name, stats in rows:
+        lines.append(f"{name:<{width}}{stats['requests']:>8}{stats['errors']:>8}{stats['rps']:>9.1f}"
+                     f"{stats['p50'] * 1000:>9.1f}{stats['p90'] * 1000:>9.1f}{stats['p99'] * 1000:>9.1f}"
+                     f"{stats['max'] * 1000:>9.1f}{stats['bytes'] / 2 ** 20:>8.1f}")
+    lines.append(f"\n{report['sessions']} sessions in {report['elapsed']:.1f}s, "
+                 f"statuses: {report['statuses']}")
+    return '\n'.join(lines)
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Load a scenario by path or by name from ``benchmarks/scenarios``."""
+    candidate = Path(path)
+    if not candidate.exists():
+        candidate = SCENARIOS_DIR / (path if path.endswith('.json') else f"{path}.json")
+    with open(candidate) as f:
+        scenario = json.load(f)
+    if not scenario.get('steps'):
+        raise ValueError(f"Scenario {candidate} has no steps")
+    return scenario
+
+
+class VirtualUser:
+    """Runs scenario sessions back to back over a small per-user connection pool."""
+
+    def __init__(self, scenario: Dict[str, Any], host: str, port: int, recorder: Recorder,
+                 rng: random.Random):
+        self.scenario = scenario
+        self.host = host
+        self.port = port
+        self.recorder = recorder
+        self.rng = rng
+        self.pool: List[HTTPConnection] = [HTTPConnection(host, port)]
+
+    def _connections(self, count: int) -> List[HTTPConnection]:
+        while len(self.pool) < count:
+            self.pool.append(HTTPConnection(self.host, self.port))
+        return self.pool[:count]
+
+    async def _timed(self, connection: HTTPConnection, step: str, method: str, path: str,
+                     headers: Dict[str, str], body: bytes = b'') -> Optional[bytes]:
+        start = time.perf_counter()
+        try:
+            status, response_headers, content = await connection.request(method, path, headers, body)
+        except (OSError, asyncio.IncompleteReadError, HTTPError, ValueError):
+            connection.close()
+            self.recorder.add(step, time.perf_counter() - start, None, 0)
+            return None
+        # Sizes are recorded as transferred; callers get the decoded body
+        self.recorder.add(step, time.perf_counter() - start, status, len(content))
+        if status >= 400:
+            return None
+        if response_headers.get('content-encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return content
+
+    async def _think(self):
+        low, high = self.scenario.get('think_time', [0, 0])
+        if high > 0:
+            await asyncio.sleep(self.rng.uniform(low, high))
+
+    async def run_session(self):
+        variables = {'race': self.rng.choice(self.scenario.get('races', ['protoss', 'terran', 'zerg']))}
+        saved: Dict[str, Any] = {}
+        default_headers = self.scenario.get('headers', {})
+
+        for step in self.scenario['steps']:
+            name = step.get('name') or step.get('path', 'step')
+            headers = dict(default_headers, **step.get('headers', {}))
+
+            if 'icons' in step:
+                await self._fetch_icons(name, step['icons'], saved, variables, headers)
+            else:
+                body = b''
+                if 'json' in step:
+                    body = json.dumps(step['json']).encode()
+                    headers.setdefault('Content-Type', 'application/json')
+                path = step['path'].format(**variables)
+                content = await self._timed(self.pool[0], name, step.get('method', 'GET'), path, headers, body)
+                if step.get('save') and content is not None:
+                    saved[step['save']] = json.loads(content)
+            await self._think()
+
+        self.recorder.sessions += 1
+
+    async def _fetch_icons(self, name: str, spec: Dict[str, Any], saved: Dict[str, Any],
+                           variables: Dict[str, str], headers: Dict[str, str]):
+        """Fetch the icon hrefs of one race from saved data, like the palette does."""
+        data = saved.get(spec.get('from', 'sc2_data'))
+        if not data:
+            return
+        race_data = data['races'].get(spec.get('race', '{race}').format(**variables), {})
+        types = set(spec.get('types', ['unit', 'building', 'upgrade']))
+        entries = list(race_data.get('detailed_data', {}).values())
+        if 'upgrade' in types:
+            entries += list(race_data.get('upgrades', {}).values())
+        hrefs = [e['href'] for e in entries if e.get('href') and e.get('type', 'upgrade') in types]
+        hrefs = hrefs[:spec.get('limit', len(hrefs))]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for href in hrefs:
+            queue.put_nowait(href)
+
+        async def worker(connection: HTTPConnection):
+            while not queue.empty():
+                await self._timed(connection, name, 'GET', queue.get_nowait(), headers)
+
+        await asyncio.gather(*(worker(c) for c in self._connections(spec.get('parallel', 6))))
+
+    def close(self):
+        for connection in self.pool:
+            connection.close()
+
+
+async def run_load(scenario: Dict[str, Any], host: str, port: int, users: int,
+                   duration: Optional[float] = None, sessions: Optional[int] = None,
+                   ramp_up: float = 0.0, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Run ``users`` concurrent virtual users until ``duration`` elapses or ``sessions`` complete."""
+    recorder = Recorder()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+    remaining = [sessions] if sessions else None
+
+    async def user_loop(index: int):
+        if ramp_up and users > 1:
+            await asyncio.sleep(ramp_up * index / (users - 1))
+        user = VirtualUser(scenario, host, port, recorder, random.Random(rng.random()))
+        try:
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if remaining is not None:
+                    if remaining[0] <= 0:
+                        break
+                    remaining[0] -= 1
+                await user.run_session()
+        finally:
+            user.close()
+
+    await asyncio.gather(*(user_loop(i) for i in range(users)))
+    return recorder.report(time.perf_counter() - start)
+
+
+def _serve(mode: str, threads: int, ready):
+    """Server process entry point: build the app and report the bound port."""
+    harness.ensure_src_path()
+    from sc2_gantt.backend.web_app import create_app
+
+    if mode == 'dev':
+        # Mirrors run_app(): debug mode on the threaded Werkzeug development server
+        app = create_app({'DEBUG': True})
+    else:
+        app = create_app()
+
+    waitress = None
+    if mode == 'production':
+        try:
+            import waitress  # type: ignore[import-not-found, no-redef]
+        except ImportError:
+            pass
+
+    if waitress is not None:
+        server = waitress.create_server(app, host='127.0.0.1', port=0, threads=threads)
+        ready.put((server.effective_port, 'waitress'))
+        server.run()
+    else:
+        from werkzeug.serving import make_server
+        # Per-request access logging would dominate the timings
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        ready.put((server.server_port, 'werkzeug'))
+        server.serve_forever()
+
+
+def start_server(mode: str, threads: int = 8) -> Tuple[multiprocessing.Process, int, str]:
+    """Start ``create_app()`` in a child process and return it with its port and server name."""
+    context = multiprocessing.get_context('spawn')
+    ready = context.Queue()
+    process = context.Process(target=_serve, args=(mode, threads, ready), daemon=True)
+    process.start()
+    port, server_name = ready.get(timeout=60)
+    return process, port, server_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the sc2_gantt web API with scenario files")
+    parser.add_argument('scenario', nargs='?', default='session',
+                        help="Scenario file, or a name from benchmarks/scenarios (default: session)")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users (default: 10)")
+    parser.add_argument('--duration', type=float, help="Run for this many seconds (default: 20)")
+    parser.add_argument('--sessions', type=int, help="Stop after this many sessions instead of a duration")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds over which users are started")
+    parser.add_argument('--mode', choices=['dev', 'production'], default='production',
+                        help="Server configuration to start (default: production)")
+    parser.add_argument('--threads', type=int, default=8, help="Worker threads for waitress in production mode")
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--seed', type=int, help="Random seed for race choice and think times")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    duration = args.duration if args.duration or args.sessions else 20.0
+
+    process = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port, server_name = target.hostname or '127.0.0.1', target.port or 80, 'external'
+    else:
+        process, port, server_name = start_server(args.mode, args.threads)
+        host = '127.0.0.1'
+        if server_name == 'werkzeug' and args.mode == 'production':
+            print("⚠️  waitress is not installed; using the threaded Werkzeug server")
+
+    print(f"Running scenario '{scenario.get('name', args.scenario)}' with {args.users} users "
+          f"against {server_name} at http://{host}:{port}")
+    try:
+        report = asyncio.run(run_load(scenario, host, port, args.users, duration, args.sessions,
+                                      args.ramp_up, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+    report.update({'scenario': scenario.get('name', args.scenario), 'users': args.users,
+                   'mode': args.mode if process is not None else None, 'server': server_name,
+                   'environment': harness.environment()})
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+    if report['total']['requests'] == 0:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,8 @@ sys.path.insert(0, str(src_dir))
 try:
     from flask import Flask
     from sc2_gantt.backend.web_app import create_app
+    from sc2_gantt.backend.asset_pipeline import AssetPipeline, render_index_html
+    from sc2_gantt.backend.offline import write_service_worker
 except ImportError as e:
     print(f"Import error: {e}")
     print(f"Current directory: {current_dir}")
@@ -40,21 +42,10 @@ def build_static_site():
     # Create the Flask app
     app = create_app()
     
-    # Copy static HTML template
-    print("Copying static HTML template...")
-    static_template_path = Path('src/sc2_gantt/frontend/templates/static_index.html')
-    if static_template_path.exists():
-        shutil.copy2(static_template_path, dist_dir / 'index.html')
-    else:
-        # Fallback to dynamic template if static doesn't exist
-        with app.test_client() as client:
-            response = client.get('/')
-            content = response.get_data(as_text=True)
-            # Replace Flask url_for calls with static paths
-            content = content.replace("{{ url_for('static', filename='css/gantt.css') }}", "./css/gantt.css")
-            content = content.replace("{{ url_for('static', filename='js/gantt.js') }}", "./js/gantt.js")
-            with open(dist_dir / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(content)
+    # Render HTML template with relative paths to the bundles
+    print("Rendering static HTML template...")
+    with open(dist_dir / 'index.html', 'w', encoding='utf-8') as f:
+        f.write(render_index_html('.'))
         
     # Generate API data as static JSON
     print("Generating sc2-data.json...")
@@ -77,23 +68,31 @@ def build_static_site():
             print(f"Error: Failed to get API data. Status code: {response.status_code}")
             print(f"Response: {response.get_data(as_text=True)}")
     
+    # Tiny icon previews the palette shows while icons load
+    with app.test_client() as client:
+        response = client.get('/api/icon-placeholders')
+        if response.status_code == 200:
+            api_dir = dist_dir / 'api'
+            api_dir.mkdir(exist_ok=True)
+            with open(api_dir / 'icon-placeholders.json', 'w', encoding='utf-8') as f:
+                f.write(response.get_data(as_text=True))
+            print(f"Generated icon placeholders: {len(response.get_json())} icons")
+        else:
+            print(f"Error: Failed to get icon placeholders. Status code: {response.status_code}")
+            print(f"Response: {response.get_data(as_text=True)}")
+    
     # Copy static files
     print("Copying static files...")
     
-    # Copy frontend files (CSS, JS)
-    frontend_dir = Path('src/sc2_gantt/frontend')
-    
-    # Copy CSS
-    css_src = frontend_dir / 'css'
-    css_dst = dist_dir / 'css'
-    if css_src.exists():
-        shutil.copytree(css_src, css_dst)
-    
-    # Copy JS
-    js_src = frontend_dir / 'js'
-    js_dst = dist_dir / 'js'
-    if js_src.exists():
-        shutil.copytree(js_src, js_dst)
+    # Build minified CSS/JS bundles, injecting static hosting configuration
+    # instead of patching the JavaScript source
+    pipeline = AssetPipeline(config={
+        'APP_BASE_PATH': '.',
+        'APP_API_URL': './api/sc2-data.json',
+        'APP_STATIC_MODE': True
+    })
+    for path in pipeline.write(dist_dir):
+        print(f"Built {path.relative_to(dist_dir)}")
     
     # Copy assets
     assets_src = Path('src/sc2_gantt/assets')
@@ -104,111 +103,9 @@ def build_static_site():
     else:
         print(f"Warning: Assets directory not found at {assets_src}")
     
-    # Update API endpoints in JavaScript for static hosting
-    print("Updating API endpoints for static hosting...")
-    gantt_js_path = dist_dir / 'js' / 'gantt.js'
-    if gantt_js_path.exists():
-        with open(gantt_js_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Replace API endpoints with static file paths
-        # Use relative paths that work both locally and on GitHub Pages
-        content = content.replace("'/api/sc2-data'", "'api/sc2-data.json'")
-        content = content.replace('"/api/sc2-data"', '"api/sc2-data.json"')
-        content = content.replace("fetch('/api/sc2-data')", "fetch('api/sc2-data.json')")
-        content = content.replace('fetch("/api/sc2-data")', 'fetch("api/sc2-data.json")')
-        
-        # Update asset paths to be relative
-        content = content.replace('/assets/', 'assets/')
-        
-        # Add better error handling for debugging
-        old_load_function = '''async loadSC2Data() {
-        try {
-            const response = await fetch('api/sc2-data.json');
-            this.sc2Data = await response.json();
-            console.log('SC2 data loaded:', this.sc2Data);
-        } catch (error) {
-            console.error('Failed to load SC2 data:', error);
-        }
-    }'''
-        
-        new_load_function = '''async loadSC2Data() {
-        try {
-            console.log('Attempting to load SC2 data from api/sc2-data.json');
-            console.log('Current location:', window.location.href);
-            console.log('Base URL would be:', new URL('api/sc2-data.json', window.location.href).href);
-            
-            const response = await fetch('api/sc2-data.json');
-            console.log('Fetch response status:', response.status);
-            
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            
-            const data = await response.json();
-            this.sc2Data = data;
-            console.log('SC2 data loaded successfully:', Object.keys(data));
-            
-            if (data.races) {
-                console.log('Available races:', Object.keys(data.races));
-            }
-        } catch (error) {
-            console.error('Failed to load SC2 data:', error);
-            console.error('Error details:', {
-                message: error.message,
-                stack: error.stack,
-                currentURL: window.location.href
-            });
-            
-            // Try alternative paths
-            console.log('Trying alternative paths...');
-            try {
-                const altResponse = await fetch('./api/sc2-data.json');
-                if (altResponse.ok) {
-                    this.sc2Data = await altResponse.json();
-                    console.log('SC2 data loaded from alternative path');
-                    return;
-                }
-            } catch (altError) {
-                console.error('Alternative path also failed:', altError);
-            }
-            
-            // Show user-friendly error
-            alert('Failed to load game data. Please check the browser console for details.');
-        }
-    }'''
-        
-        content = content.replace(old_load_function, new_load_function)
-        
-        # Update export functionality for static hosting
-        export_replacement = '''
-        // Static hosting - export as client-side download
-        const blob = new Blob([JSON.stringify(buildOrder, null, 2)], { type: 'application/json' });
-        const url = window.URL.createObjectURL(blob);
-        const link = document.createElement('a');
-        link.href = url;
-        link.download = 'build_order.json';
-        link.style.display = 'none';
-        document.body.appendChild(link);
-        link.click();
-        document.body.removeChild(link);
-        window.URL.revokeObjectURL(url);
-        
-        console.log('Build order exported successfully');'''
-        
-        # Replace the server-side export with client-side export
-        if '/export/build-order' in content:
-            # Find and replace the fetch call for export
-            import re
-            content = re.sub(
-                r"const response = await fetch\('/export/build-order'.*?\n.*?console\.log\('Build order exported successfully'\);",
-                export_replacement.strip(),
-                content,
-                flags=re.DOTALL
-            )
-        
-        with open(gantt_js_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    # Service worker precaching the site for offline use
+    print("Creating service worker...")
+    write_service_worker(dist_dir)
     
     # Create a simple 404.html for GitHub Pages
     print("Creating 404.html...")
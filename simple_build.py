@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
 Simplified build script for GitHub Pages that only sets configuration parameters.
-Does not modify any JavaScript or CSS code - uses parameterization instead.
+Does not modify any JavaScript or CSS code - the asset pipeline minifies the
+frontend and injects configuration as a prelude instead.
 """
 
 import os
+import sys
 import json
 import shutil
 from pathlib import Path
 
+# Add the src directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from sc2_gantt.backend.asset_pipeline import AssetPipeline, render_index_html
+from sc2_gantt.backend.offline import write_service_worker
+from sc2_gantt.backend.render import icon_placeholders
+
 def build_static_site():
     """Build static site by copying files and setting configuration parameters."""
     
@@ -25,22 +34,14 @@ def build_static_site():
     print(f"Building static site for repository: {repo_name}")
     print(f"Base path: {base_path}")
     
-    # Copy static files without modification
-    frontend_dir = Path('src/sc2_gantt/frontend')
-    
-    # Copy CSS
-    css_src = frontend_dir / 'css'
-    css_dst = dist_dir / 'css'
-    if css_src.exists():
-        shutil.copytree(css_src, css_dst)
-        print("✓ Copied CSS files")
-    
-    # Copy JavaScript
-    js_src = frontend_dir / 'js'
-    js_dst = dist_dir / 'js'
-    if js_src.exists():
-        shutil.copytree(js_src, js_dst)
-        print("✓ Copied JavaScript files")
+    # Build minified CSS/JS bundles with configuration injected
+    pipeline = AssetPipeline(config={
+        'APP_BASE_PATH': base_path,
+        'APP_API_URL': f'{base_path}/api/sc2-data.json',
+        'APP_STATIC_MODE': True
+    })
+    pipeline.write(dist_dir)
+    print("✓ Built CSS and JavaScript bundles")
     
     # Copy assets
     assets_src = Path('src/sc2_gantt/assets')
@@ -57,46 +58,31 @@ def build_static_site():
     if data_file.exists():
         shutil.copy2(data_file, api_dir / 'sc2-data.json')
         print("✓ Created API endpoint")
+        with open(data_file, 'r', encoding='utf-8') as f:
+            placeholders = icon_placeholders(json.load(f))
+        with open(api_dir / 'icon-placeholders.json', 'w', encoding='utf-8') as f:
+            json.dump(placeholders, f, separators=(',', ':'))
+        print(f"✓ Created icon placeholders ({len(placeholders)} icons)")
     
-    # Copy HTML template and only update Flask syntax
-    flask_template = Path('src/sc2_gantt/frontend/templates/index.html')
-    if flask_template.exists():
-        with open(flask_template, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Only replace Flask url_for calls - no other modifications
-        html_content = html_content.replace(
-            "{{ url_for('static', filename='css/gantt.css') }}", 
-            f"{base_path}/css/gantt.css"
-        )
-        html_content = html_content.replace(
-            "{{ url_for('static', filename='js/gantt.js') }}", 
-            f"{base_path}/js/gantt.js"
-        )
-        
-        # Add configuration parameters before closing </head>
-        config_script = f'''
-    <script>
-        // Configuration for GitHub Pages
-        window.APP_BASE_PATH = '{base_path}';
-        window.APP_API_URL = '{base_path}/api/sc2-data.json';
-        window.APP_STATIC_MODE = true;
-    </script>'''
-        
-        html_content = html_content.replace('</head>', config_script + '\n</head>')
-        
-        with open(dist_dir / 'index.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print("✓ Created index.html with configuration")
+    # Render HTML template pointing at the bundles
+    with open(dist_dir / 'index.html', 'w', encoding='utf-8') as f:
+        f.write(render_index_html(base_path))
+    print("✓ Created index.html")
     
     # Create simple 404 redirect
     with open(dist_dir / '404.html', 'w', encoding='utf-8') as f:
         f.write(f'<meta http-equiv="refresh" content="0; url={base_path}/">')
     
+    # Service worker precaching the site for instant repeat loads and offline use
+    manifest = write_service_worker(dist_dir)
+    print(f"✓ Created service worker ({len(manifest['shell']) + len(manifest['data']) + len(manifest['icons'])} "
+          f"files precached, data version {manifest['data_version']})")
+    
     print(f"\n✓ Static site built successfully in {dist_dir.absolute()}")
     
     # Verify key files
-    key_files = ['index.html', 'css/gantt.css', 'js/gantt.js', 'api/sc2-data.json']
+    key_files = ['index.html', 'css/gantt.css', 'js/gantt.js', 'js/gantt.js.map', 'js/simulation-worker.js',
+                 'api/sc2-data.json', 'api/icon-placeholders.json', 'assets/earliest_timings.json', 'sw.js', 'precache-manifest.json']
     for file in key_files:
         path = dist_dir / file
         if path.exists():
@@ -1,9 +1,214 @@
+import argparse
 import sys
+from pathlib import Path
+
+
+def render_command(args):
+    """Render build-order files to chart images."""
+    from .backend.render import DATA_PATH, render_batch
+
+    formats = tuple(dict.fromkeys(args.format or ['png']))
+    result = render_batch(
+        args.sources,
+        Path(args.output),
+        formats=formats,
+        workers=args.workers,
+        data_path=Path(args.data) if args.data else DATA_PATH,
+        scale=args.scale,
+        force=args.force
+    )
+
+    for source, error in result['failed']:
+        print(f"❌ {source}: {error}")
+    print(f"✅ Rendered {result['rendered']} files ({result['images']} images, "
+          f"{result['bytes'] / 1024:.0f} KiB) in {result['seconds']:.2f}s "
+          f"with {result['workers']} workers: {result['files_per_second']:.1f} files/s")
+    if result['skipped']:
+        print(f"   Skipped {result['skipped']} up-to-date files (use --force to re-render)")
+    return 1 if result['failed'] else 0
+
+
+def earliest_command(args):
+    """Precompute the earliest-timing lookup table."""
+    import json
+    import time
+
+    from .backend.earliest import TABLE_PATH, build_table, data_fingerprint, write_table
+    from .backend.render import DATA_PATH
+
+    with open(args.data or DATA_PATH, encoding='utf-8') as f:
+        sc2_data = json.load(f)
+    output = Path(args.output) if args.output else TABLE_PATH
+
+    if args.check:
+        try:
+            with open(output, encoding='utf-8') as f:
+                current = json.load(f) == build_table(sc2_data)
+        except (OSError, ValueError):
+            current = False
+        print(f"{'✅' if current else '❌'} {output} is {'up to date' if current else 'stale'} "
+              f"(data {data_fingerprint(sc2_data)})")
+        return 0 if current else 1
+
+    started = time.perf_counter()
+    table = write_table(sc2_data, output)
+    count = sum(len(entries) for entries in table['races'].values())
+    print(f"✅ Wrote {count} timings for {len(table['races'])} races to {output} "
+          f"({output.stat().st_size / 1024:.0f} KiB) in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def validate_command(args):
+    """Check the prerequisites of build-order files."""
+    import json
+    import time
+
+    from .backend.prerequisites import PrerequisiteValidator
+    from .backend.render import DATA_PATH, collect_build_files
+
+    with open(args.data or DATA_PATH, encoding='utf-8') as f:
+        validator = PrerequisiteValidator(json.load(f))
+
+    builds, sources, failed = [], [], []
+    for source, _ in collect_build_files(args.sources):
+        try:
+            with open(source, encoding='utf-8') as f:
+                build_order = json.load(f)
+        except (OSError, ValueError) as e:
+            failed.append((source, str(e)))
+            continue
+        if isinstance(build_order, dict) and isinstance(build_order.get('document'), dict):
+            # A stored build as returned by GET /api/builds/<id>
+            build_order = build_order['document']
+        builds.append(build_order)
+        sources.append(source)
+
+    started = time.perf_counter()
+    results = validator.validate_many(builds)
+    seconds = time.perf_counter() - started
+
+    invalid = 0
+    for source, result in zip(sources, results):
+        if not result['ok']:
+            invalid += 1
+            for error in result['errors']:
+                print(f"❌ {source}: {error['message']}")
+    for source, error in failed:
+        print(f"❌ {source}: {error}")
+    print(f"{'✅' if not invalid and not failed else '❌'} {len(results) - invalid} of {len(results)} builds valid, "
+          f"checked in {seconds * 1000:.1f} ms")
+    return 1 if invalid or failed else 0
+
+
+def patch_command(args):
+    """Record the game data as a patch, or list the recorded patches."""
+    import json
+
+    from .backend.patches import PATCHES_DIR, PatchError, PatchStore
+    from .backend.render import DATA_PATH
+
+    store = PatchStore(Path(args.dir) if args.dir else PATCHES_DIR)
+    try:
+        if args.patch is None:
+            for entry in store.patches():
+                print(f"{entry['patch']}: {entry['changed']} changed, {entry['removed']} removed"
+                      + (f" since {entry['base']}" if entry['base'] else " (snapshot)"))
+            return 0
+        with open(args.data or DATA_PATH, encoding='utf-8') as f:
+            entry = store.add(args.patch, json.load(f))
+    except PatchError as e:
+        print(f"❌ {e}")
+        return 1
+
+    size = (store.directory / f"{entry['patch']}.json").stat().st_size
+    since = f"since {entry['base']}" if entry['base'] else "as a snapshot"
+    print(f"✅ Recorded patch {entry['patch']} {since}: {entry['changed']} records changed, "
+          f"{entry['removed']} removed ({size / 1024:.0f} KiB)")
+    return 0
+
+
+def replays_command(args):
+    """Extract build orders from replays."""
+    from .backend.render import DATA_PATH
+    from .backend.replays import ReplayError, ingest_replays
+
+    try:
+        result = ingest_replays(
+            args.sources,
+            Path(args.output),
+            workers=args.workers,
+            data_path=Path(args.data) if args.data else DATA_PATH,
+            player=args.player
+        )
+    except ReplayError as e:
+        print(f"❌ {e}")
+        return 1
+
+    for source, error in result['failed']:
+        print(f"❌ {source}: {error}")
+    print(f"✅ Extracted {result['builds']} build orders from {result['replays']} replays "
+          f"in {result['seconds']:.2f}s with {result['workers']} workers: "
+          f"{result['replays_per_second']:.1f} replays/s")
+    return 1 if result['failed'] else 0
+
 
 def main():
     """Console script for sc2_gantt."""
-    print("Edit src/sc2_gantt/__main__.py to extend CLI.")
-    return 0
+    parser = argparse.ArgumentParser(prog='sc2_gantt', description="StarCraft II build-order Gantt charts")
+    subparsers = parser.add_subparsers(dest='command')
+
+    render = subparsers.add_parser('render', help="Render build-order JSON files to SVG/PNG charts")
+    render.add_argument('sources', nargs='+',
+                        help="Build-order JSON files, directories (searched recursively) or glob patterns")
+    render.add_argument('-o', '--output', default='charts',
+                        help="Output directory; paths below input directories are mirrored (default: charts)")
+    render.add_argument('-f', '--format', action='append', choices=['png', 'svg'],
+                        help="Image format, repeatable (default: png)")
+    render.add_argument('-j', '--workers', type=int,
+                        help="Worker processes (default: number of CPUs)")
+    render.add_argument('--scale', type=float, default=3.0,
+                        help="Pixels per second of game time (default: 3.0)")
+    render.add_argument('--data', help="SC2 data JSON file (default: the bundled data)")
+    render.add_argument('--force', action='store_true',
+                        help="Re-render files whose images are newer than the build order")
+    render.set_defaults(handler=render_command)
+
+    earliest = subparsers.add_parser('earliest', help="Precompute the earliest-timing lookup table")
+    earliest.add_argument('-o', '--output', help="Table file (default: the bundled assets/earliest_timings.json)")
+    earliest.add_argument('--data', help="SC2 data JSON file (default: the bundled data)")
+    earliest.add_argument('--check', action='store_true',
+                          help="Only check that the table matches the data; exit 1 if it is stale")
+    earliest.set_defaults(handler=earliest_command)
+
+    validate = subparsers.add_parser('validate', help="Check that every step's prerequisites are built in time")
+    validate.add_argument('sources', nargs='+',
+                          help="Build-order JSON files, directories (searched recursively) or glob patterns")
+    validate.add_argument('--data', help="SC2 data JSON file (default: the bundled data)")
+    validate.set_defaults(handler=validate_command)
+
+    patch = subparsers.add_parser('patch', help="Record the game data as a patch, or list the recorded patches")
+    patch.add_argument('patch', nargs='?', help="Patch name, e.g. 5.0.14 (omit to list the patches)")
+    patch.add_argument('--data', help="SC2 data JSON file (default: the bundled data)")
+    patch.add_argument('--dir', help="Patch store directory (default: the bundled assets/patches)")
+    patch.set_defaults(handler=patch_command)
+
+    replays = subparsers.add_parser('replays', help="Extract build orders from .SC2Replay files")
+    replays.add_argument('sources', nargs='+',
+                         help="Replay files, directories (searched recursively) or glob patterns")
+    replays.add_argument('-o', '--output', default='builds',
+                         help="Output directory; paths below input directories are mirrored (default: builds)")
+    replays.add_argument('-j', '--workers', type=int,
+                         help="Worker processes (default: number of CPUs)")
+    replays.add_argument('--player', help="Only extract this player's build")
+    replays.add_argument('--data', help="SC2 data JSON file (default: the bundled data)")
+    replays.set_defaults(handler=replays_command)
+
+    args = parser.parse_args()
+    if not hasattr(args, 'handler'):
+        parser.print_help()
+        return 0
+    return args.handler(args)
+
 
 if __name__ == "__main__":
-    sys.exit(main)
+    sys.exit(main())
@@ -0,0 +1,517 @@
+"""Frontend asset pipeline: JS/CSS minification, config injection and source maps."""
+
+import bisect
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+FRONTEND_DIR = Path(__file__).parent.parent / 'frontend'
+
+# Configuration keys the frontend reads from ``window`` (see gantt.js)
+CONFIG_KEYS = ('APP_BASE_PATH', 'APP_API_URL', 'APP_STATIC_MODE')
+
+
+class BuiltAsset(NamedTuple):
+    """A single pipeline output file held in memory."""
+    content: str
+    mimetype: str
+    etag: str
+
+
+# ---------------------------------------------------------------------------
+# Source maps
+# ---------------------------------------------------------------------------
+
+_BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+
+def _vlq_encode(value: int) -> str:
+    """Encode a signed integer as a base64 VLQ string."""
+    vlq = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ''
+    while True:
+        digit = vlq & 31
+        vlq >>= 5
+        if vlq:
+            digit |= 32
+        encoded += _BASE64[digit]
+        if not vlq:
+            return encoded
+
+
+class _OutputWriter:
+    """Accumulate generated code while recording source map segments."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.line = 0
+        self.column = 0
+        self.segments: List[Tuple[int, int, int, int]] = []
+
+    def write(self, text: str, source_pos: Optional[Tuple[int, int]] = None):
+        if source_pos is not None:
+            self.segments.append((self.line, self.column, source_pos[0], source_pos[1]))
+        self.parts.append(text)
+        newlines = text.count('\n')
+        if newlines:
+            self.line += newlines
+            self.column = len(text) - text.rfind('\n') - 1
+        else:
+            self.column += len(text)
+
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+    def source_map(self, output_name: str, source_name: str, source_content: str) -> Dict[str, Any]:
+        """Build a version 3 source map for a single source file."""
+        lines: List[List[Tuple[int, int, int]]] = [[] for _ in range(self.line + 1)]
+        for gen_line, gen_col, src_line, src_col in self.segments:
+            lines[gen_line].append((gen_col, src_line, src_col))
+
+        encoded_lines = []
+        prev_src_line = prev_src_col = 0
+        for segments in lines:
+            prev_gen_col = 0
+            encoded = []
+            for gen_col, src_line, src_col in segments:
+                encoded.append(
+                    _vlq_encode(gen_col - prev_gen_col) + _vlq_encode(0) +
+                    _vlq_encode(src_line - prev_src_line) + _vlq_encode(src_col - prev_src_col)
+                )
+                prev_gen_col, prev_src_line, prev_src_col = gen_col, src_line, src_col
+            encoded_lines.append(','.join(encoded))
+
+        return {
+            'version': 3,
+            'file': output_name,
+            'sources': [source_name],
+            'sourcesContent': [source_content],
+            'names': [],
+            'mappings': ';'.join(encoded_lines)
+        }
+
+
+class _Token(NamedTuple):
+    kind: str
+    text: str
+    offset: int
+    newline_before: bool
+
+
+def _position_lookup(source: str):
+    """Return a function mapping a character offset to a (line, column) pair."""
+    line_starts = [0] + [m.end() for m in re.finditer('\n', source)]
+
+    def lookup(offset: int) -> Tuple[int, int]:
+        line = bisect.bisect_right(line_starts, offset) - 1
+        return line, offset - line_starts[line]
+
+    return lookup
+
+
+# ---------------------------------------------------------------------------
+# JavaScript
+# ---------------------------------------------------------------------------
+
+_JS_PUNCTUATORS = sorted([
+    '>>>=', '...', '===', '!==', '**=', '<<=', '>>=', '>>>', '&&=', '||=', '??=',
+    '=>', '==', '!=', '<=', '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=',
+    '*=', '/=', '%=', '&=', '|=', '^=', '<<', '>>', '**',
+    '{', '}', '(', ')', '[', ']', ';', ',', '<', '>', '+', '-', '*', '/', '%',
+    '&', '|', '^', '!', '~', '?', ':', '=', '.', '@', '#'
+], key=len, reverse=True)
+
+# After these keywords a '/' starts a regular expression, not a division
+_JS_REGEX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await'
+}
+
+# A line break after these keywords is significant (restricted productions)
+_JS_RESTRICTED = {'return', 'break', 'continue', 'throw', 'yield', '++', '--'}
+
+# A line break can be dropped after/before these punctuators without changing ASI
+_JS_JOIN_AFTER = {
+    '{', '(', '[', ',', ';', ':', '?', '=', '=>', '==', '===', '!=', '!==', '<', '>',
+    '<=', '>=', '*', '%', '&&', '||', '??', '&', '|', '^', '!', '~', '+=', '-=',
+    '*=', '/=', '%=', '&=', '|=', '^=', '.', '?.', '...'
+}
+_JS_JOIN_BEFORE = {
+    '}', ')', ']', ',', ';', '.', '?.', ':', '?', '=', '==', '===', '!=', '!==',
+    '&&', '||', '??', '=>', '+=', '-=', '*=', '/=', '%=', '&=', '|=', '^=', '*', '%'
+}
+
+_IDENT_RE = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]+')
+_NUMBER_RE = re.compile(r'(?:0[xXoObB][0-9a-fA-F_]+n?|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)')
+
+
+def _is_ident_char(char: str) -> bool:
+    return char.isalnum() or char in '_$' or ord(char) > 127
+
+
+def _scan_string(source: str, pos: int) -> int:
+    """Return the offset just past the quoted string starting at ``pos``."""
+    quote = source[pos]
+    pos += 1
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        pos += 1
+        if char == quote:
+            return pos
+    raise ValueError('Unterminated string literal')
+
+
+def _scan_template(source: str, pos: int) -> int:
+    """Return the offset just past the template literal starting at ``pos``."""
+    pos += 1
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+        elif char == '`':
+            return pos + 1
+        elif source.startswith('${', pos):
+            pos = _scan_template_expression(source, pos + 2)
+        else:
+            pos += 1
+    raise ValueError('Unterminated template literal')
+
+
+def _scan_template_expression(source: str, pos: int) -> int:
+    """Return the offset just past the ``}`` closing a template substitution."""
+    depth = 1
+    while pos < len(source):
+        char = source[pos]
+        if char in '\'"':
+            pos = _scan_string(source, pos)
+        elif char == '`':
+            pos = _scan_template(source, pos)
+        elif char == '{':
+            depth += 1
+            pos += 1
+        elif char == '}':
+            depth -= 1
+            pos += 1
+            if depth == 0:
+                return pos
+        else:
+            pos += 1
+    raise ValueError('Unterminated template substitution')
+
+
+def _scan_regex(source: str, pos: int) -> int:
+    """Return the offset just past the regular expression literal at ``pos``."""
+    pos += 1
+    in_class = False
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        if char == '\n':
+            raise ValueError('Unterminated regular expression literal')
+        pos += 1
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            break
+    while pos < len(source) and _is_ident_char(source[pos]):
+        pos += 1
+    return pos
+
+
+def _regex_allowed(prev: Optional[_Token]) -> bool:
+    if prev is None:
+        return True
+    if prev.kind == 'punct':
+        return prev.text not in (')', ']', '++', '--')
+    if prev.kind == 'word':
+        return prev.text in _JS_REGEX_KEYWORDS
+    return False
+
+
+def tokenize_js(source: str) -> List[_Token]:
+    """Split JavaScript source into tokens, dropping comments and whitespace."""
+    tokens: List[_Token] = []
+    pos = 0
+    newline = False
+    length = len(source)
+
+    while pos < length:
+        char = source[pos]
+
+        if char in ' \t\r\n\f\v\ufeff\xa0':
+            newline = newline or char == '\n'
+            pos += 1
+            continue
+
+        if source.startswith('//', pos):
+            end = source.find('\n', pos)
+            pos = length if end == -1 else end
+            continue
+
+        if source.startswith('/*', pos):
+            end = source.find('*/', pos + 2)
+            if end == -1:
+                raise ValueError('Unterminated block comment')
+            newline = newline or '\n' in source[pos:end]
+            pos = end + 2
+            continue
+
+        start = pos
+        prev = tokens[-1] if tokens else None
+
+        if char in '\'"':
+            pos = _scan_string(source, pos)
+            kind = 'string'
+        elif char == '`':
+            pos = _scan_template(source, pos)
+            kind = 'string'
+        elif char == '/' and _regex_allowed(prev):
+            pos = _scan_regex(source, pos)
+            kind = 'regex'
+        elif char.isdigit() or (char == '.' and source[pos + 1:pos + 2].isdigit()):
+            match = _NUMBER_RE.match(source, pos)
+            pos = match.end() if match else pos + 1
+            kind = 'word'
+        elif _is_ident_char(char):
+            match = _IDENT_RE.match(source, pos)
+            pos = match.end()  # type: ignore[union-attr]
+            kind = 'word'
+        else:
+            punct = next((p for p in _JS_PUNCTUATORS if source.startswith(p, pos)), char)
+            pos += len(punct)
+            kind = 'punct'
+
+        tokens.append(_Token(kind, source[start:pos], start, newline))
+        newline = False
+
+    return tokens
+
+
+def _js_separator(prev: _Token, token: _Token) -> str:
+    """Choose the minimal separator that keeps two adjacent tokens equivalent."""
+    if token.newline_before:
+        restricted = prev.text in _JS_RESTRICTED
+        joinable = (
+            (prev.kind == 'punct' and prev.text in _JS_JOIN_AFTER) or
+            (token.kind == 'punct' and token.text in _JS_JOIN_BEFORE)
+        )
+        if restricted or not joinable:
+            return '\n'
+
+    last, first = prev.text[-1], token.text[0]
+    if _is_ident_char(last) and _is_ident_char(first):
+        return ' '
+    if (last, first) in (('+', '+'), ('-', '-'), ('/', '/'), ('/', '*')):
+        return ' '
+    if prev.kind == 'word' and prev.text[0].isdigit() and first == '.' and '.' not in prev.text:
+        return ' '
+    return ''
+
+
+def minify_js(source: str, output_name: str, source_name: str,
+              prelude: str = '') -> Tuple[str, Dict[str, Any]]:
+    """Minify JavaScript and return the code together with its source map."""
+    lookup = _position_lookup(source)
+    writer = _OutputWriter()
+    if prelude:
+        writer.write(prelude)
+
+    prev = None
+    for token in tokenize_js(source):
+        if prev is not None:
+            writer.write(_js_separator(prev, token))
+        writer.write(token.text, lookup(token.offset))
+        prev = token
+
+    return writer.text(), writer.source_map(output_name, source_name, source)
+
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+_CSS_TIGHT = set('{};,>~')
+
+
+def tokenize_css(source: str) -> List[_Token]:
+    """Split CSS source into tokens, dropping comments and whitespace."""
+    tokens: List[_Token] = []
+    pos = 0
+    space = False
+    length = len(source)
+
+    while pos < length:
+        char = source[pos]
+        if char.isspace():
+            space = True
+            pos += 1
+            continue
+        if source.startswith('/*', pos):
+            end = source.find('*/', pos + 2)
+            if end == -1:
+                raise ValueError('Unterminated CSS comment')
+            space = True
+            pos = end + 2
+            continue
+
+        start = pos
+        if char in '\'"':
+            pos = _scan_string(source, pos)
+            kind = 'string'
+        elif char in _CSS_TIGHT or char == ':':
+            pos += 1
+            kind = 'punct'
+        else:
+            while (pos < length and not source[pos].isspace() and source[pos] not in _CSS_TIGHT
+                   and source[pos] not in ':\'"' and not source.startswith('/*', pos)):
+                pos += 1
+            kind = 'word'
+
+        tokens.append(_Token(kind, source[start:pos], start, space))
+        space = False
+
+    return tokens
+
+
+def minify_css(source: str, output_name: str, source_name: str) -> Tuple[str, Dict[str, Any]]:
+    """Minify CSS and return the stylesheet together with its source map."""
+    lookup = _position_lookup(source)
+    writer = _OutputWriter()
+    tokens = tokenize_css(source)
+
+    prev = None
+    for index, token in enumerate(tokens):
+        # Drop the redundant semicolon closing the last declaration of a block
+        if token.text == ';' and index + 1 < len(tokens) and tokens[index + 1].text == '}':
+            continue
+        if prev is not None and token.newline_before:
+            # Whitespace before ':' is a descendant combinator in selectors, keep it
+            if prev.text not in _CSS_TIGHT and prev.text != ':' and token.text not in _CSS_TIGHT:
+                writer.write(' ')
+        writer.write(token.text, lookup(token.offset))
+        prev = token
+
+    return writer.text(), writer.source_map(output_name, source_name, source)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def config_prelude(config: Dict[str, Any]) -> str:
+    """Render frontend configuration as a script prelude setting ``window`` globals."""
+    lines = []
+    for key in CONFIG_KEYS:
+        if key in config and config[key] is not None:
+            lines.append(f"window.{key}={json.dumps(config[key])};\n")
+    return ''.join(lines)
+
+
+class AssetPipeline:
+    """Build minified, source-mapped frontend bundles from ``frontend/``."""
+
+    # Output path -> source path (relative to the frontend directory)
+    ASSETS = {
+        'js/gantt.js': 'js/gantt.js',
+        'js/simulation-worker.js': 'js/simulation-worker.js',
+        'css/gantt.css': 'css/gantt.css'
+    }
+
+    # Web Worker scripts have no ``window``, so they get no config prelude
+    WORKERS = {'js/simulation-worker.js'}
+
+    MIMETYPES = {
+        '.js': 'application/javascript',
+        '.css': 'text/css',
+        '.map': 'application/json'
+    }
+
+    def __init__(self, frontend_dir: Optional[Path] = None,
+                 config: Optional[Dict[str, Any]] = None, minify: bool = True):
+        self.frontend_dir = Path(frontend_dir) if frontend_dir else FRONTEND_DIR
+        self.config = dict(config or {})
+        self.minify = minify
+        self._built: Dict[str, BuiltAsset] = {}
+        self._source_mtimes: Dict[str, float] = {}
+
+    def _sources_changed(self) -> bool:
+        for source in self.ASSETS.values():
+            path = self.frontend_dir / source
+            if self._source_mtimes.get(source) != path.stat().st_mtime:
+                return True
+        return False
+
+    def _build_one(self, output_name: str, source: str) -> Dict[str, BuiltAsset]:
+        path = self.frontend_dir / source
+        text = path.read_text(encoding='utf-8')
+        self._source_mtimes[source] = path.stat().st_mtime
+
+        basename = Path(output_name).name
+        source_name = f"{Path(source).stem}.src{Path(source).suffix}"
+        is_js = output_name.endswith('.js')
+
+        if is_js:
+            prelude = '' if output_name in self.WORKERS else config_prelude(self.config)
+            if self.minify:
+                code, source_map = minify_js(text, basename, source_name, prelude)
+            else:
+                code, source_map = prelude + text, None
+            code += f"\n//# sourceMappingURL={basename}.map\n" if source_map else ''
+        else:
+            if self.minify:
+                code, source_map = minify_css(text, basename, source_name)
+                code += f"\n/*# sourceMappingURL={basename}.map */\n"
+            else:
+                code, source_map = text, None
+
+        outputs = {output_name: self._make_asset(output_name, code)}
+        if source_map:
+            map_name = f"{output_name}.map"
+            outputs[map_name] = self._make_asset(map_name, json.dumps(source_map, separators=(',', ':')))
+        return outputs
+
+    def _make_asset(self, name: str, content: str) -> BuiltAsset:
+        etag = hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+        return BuiltAsset(content, self.MIMETYPES[Path(name).suffix], etag)
+
+    def build(self) -> Dict[str, BuiltAsset]:
+        """Build every asset and return them keyed by output path."""
+        built: Dict[str, BuiltAsset] = {}
+        for output_name, source in self.ASSETS.items():
+            built.update(self._build_one(output_name, source))
+        self._built = built
+        return built
+
+    def get(self, filename: str) -> Optional[BuiltAsset]:
+        """Return a built asset, rebuilding first if any source file changed."""
+        if not self._built or self._sources_changed():
+            self.build()
+        return self._built.get(filename)
+
+    def write(self, output_dir: Path) -> List[Path]:
+        """Build every asset and write it below ``output_dir``."""
+        written = []
+        for name, asset in self.build().items():
+            path = Path(output_dir) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(asset.content, encoding='utf-8')
+            written.append(path)
+        return written
+
+
+def render_index_html(base_path: str = '') -> str:
+    """Render the index template for static hosting, pointing at bundled assets."""
+    from jinja2 import Environment, FileSystemLoader
+
+    env = Environment(loader=FileSystemLoader(str(FRONTEND_DIR / 'templates')))
+    return env.get_template('index.html').render(asset_url=lambda filename: f"{base_path}/{filename}")
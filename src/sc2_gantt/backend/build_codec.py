@@ -0,0 +1,294 @@
+"""Compact binary encoding of build orders for share links and storage.
+
+Entities are replaced by small per-race IDs (their position in the sorted
+``detailed_data``/``upgrades`` keys), start times become the gap after the
+previous entity in the row in tenths of a second, and build times, costs and
+chronoboost counts are only written where they differ from the game data.
+Everything is varint-packed and base64url-encoded without padding, so a
+40-step build fits comfortably in a URL. ``gantt.js`` carries a matching
+decoder (``BuildOrderCodec``) for ``#build=<code>`` share links.
+
+Layout (all integers are unsigned LEB128 varints unless noted)::
+
+    version:u8 fingerprint flags race [name_len name] row_count
+    row:    entity_count entity*
+    entity: (id << 1 | has_extras) start [extras [chronoboost_count]
+            [build_time] [minerals gas] [race]]
+
+``start`` is a zigzag gap in ticks, or an absolute big-endian float64 when
+any time in the build is off the 0.1s grid (``FLAG_FLOAT_TIMES``); build
+times follow the same rule. The fingerprint is derived from the entity
+tables, so codes made against different game data are rejected instead of
+silently decoding to the wrong entities.
+"""
+
+import base64
+import binascii
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .build_order import (
+    BuildOrderError, GameDataIndex, entity_duration, entity_key, summarize_build_order
+)
+
+
+FORMAT_VERSION = 1
+TICKS_PER_SECOND = 10
+CHRONOBOOST_SECONDS = 10
+
+# Header flags
+FLAG_FLOAT_TIMES = 1
+FLAG_NAME = 2
+
+# Per-entity extras
+EXTRA_CHRONOBOOSTED = 1
+EXTRA_CHRONOBOOST_COUNT = 2
+EXTRA_BUILD_TIME = 4
+EXTRA_COST = 8
+EXTRA_RACE = 16
+
+_FLOAT64 = struct.Struct('>d')
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def float64(self) -> float:
+        value = _FLOAT64.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def raw(self, length: int) -> bytes:
+        if self.pos + length > len(self.data):
+            raise IndexError(length)
+        value = self.data[self.pos:self.pos + length]
+        self.pos += length
+        return value
+
+
+def _to_ticks(seconds: float) -> Optional[int]:
+    """Return ``seconds`` in ticks if that converts back to exactly the same value."""
+    ticks = round(seconds * TICKS_PER_SECOND)
+    return ticks if ticks / TICKS_PER_SECOND == seconds else None
+
+
+def _from_ticks(ticks: int):
+    return ticks // TICKS_PER_SECOND if ticks % TICKS_PER_SECOND == 0 else ticks / TICKS_PER_SECOND
+
+
+def _as_int(value: Any, what: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+        raise BuildOrderError(f'{what} must be a whole number')
+    return int(value)
+
+
+class BuildCodec:
+    """Encode build orders to short base64url codes and back, against one game data set."""
+
+    def __init__(self, sc2_data: Dict[str, Any]):
+        self.index = GameDataIndex(sc2_data)
+        self.races: List[str] = sorted(sc2_data.get('races', {}))
+        self.keys: Dict[str, List[str]] = {race: [] for race in self.races}
+        for race, key in sorted(self.index.entities):
+            self.keys[race].append(key)
+        self.ids = {(race, key): i for race, keys in self.keys.items() for i, key in enumerate(keys)}
+        table = '\n'.join(f"{race}:{','.join(self.keys[race])}" for race in self.races)
+        self.fingerprint = zlib.crc32(table.encode('utf-8')) & 0xffff
+
+    def _canonical_entity(self, entity: Dict[str, Any], race: str) -> Dict[str, Any]:
+        entity_race = (entity.get('race') or race).lower()
+        data = self.index.lookup(entity_race, entity['name'])
+        if data is None:
+            raise BuildOrderError(f'Unknown {entity_race} entity "{entity["name"]}"')
+        count = _as_int(entity.get('chronoboostCount', 0), 'chronoboostCount')
+        return {
+            'name': data['name'],
+            'type': data.get('type'),
+            'race': entity_race,
+            'startTime': entity['startTime'],
+            'buildTime': entity.get('buildTime', self._default_build_time(data, count)),
+            'minerals': _as_int(entity.get('minerals', data.get('minerals', 0)), 'minerals'),
+            'gas': _as_int(entity.get('gas', data.get('gas', 0)), 'gas'),
+            'chronoboosted': bool(entity.get('chronoboosted', False)),
+            'chronoboostCount': count
+        }
+
+    @staticmethod
+    def _default_build_time(data: Dict[str, Any], chronoboost_count: int):
+        return (entity_duration(data) or 0) - CHRONOBOOST_SECONDS * chronoboost_count
+
+    def encode(self, build_order: Any) -> str:
+        """Return the share code for a build order in the frontend export format."""
+        race = summarize_build_order(build_order)['race']
+        if race not in self.keys:
+            raise BuildOrderError(f'Unknown race "{race}"')
+        name = (build_order.get('metadata') or {}).get('name')
+        rows = [sorted((self._canonical_entity(e, race) for e in row.get('entities', [])),
+                       key=lambda e: e['startTime'])
+                for row in build_order['rows']]
+
+        times = [e[field] for row in rows for e in row for field in ('startTime', 'buildTime')]
+        float_times = any(not isinstance(t, (int, float)) or _to_ticks(t) is None for t in times)
+        flags = (FLAG_FLOAT_TIMES if float_times else 0) | (FLAG_NAME if isinstance(name, str) else 0)
+
+        out = bytearray([FORMAT_VERSION])
+        _write_varint(out, self.fingerprint)
+        _write_varint(out, flags)
+        _write_varint(out, self.races.index(race))
+        if flags & FLAG_NAME:
+            encoded_name = name.encode('utf-8')
+            _write_varint(out, len(encoded_name))
+            out += encoded_name
+        _write_varint(out, len(rows))
+
+        for row in rows:
+            _write_varint(out, len(row))
+            previous_end = 0
+            for entity in row:
+                data = self.index.lookup(entity['race'], entity['name'])
+                extras = 0
+                if entity['chronoboosted']:
+                    extras |= EXTRA_CHRONOBOOSTED
+                if entity['chronoboostCount']:
+                    extras |= EXTRA_CHRONOBOOST_COUNT
+                if entity['buildTime'] != self._default_build_time(data, entity['chronoboostCount']):
+                    extras |= EXTRA_BUILD_TIME
+                if entity['minerals'] != data.get('minerals', 0) or entity['gas'] != data.get('gas', 0):
+                    extras |= EXTRA_COST
+                if entity['race'] != race:
+                    extras |= EXTRA_RACE
+
+                _write_varint(out, self.ids[(entity['race'], entity_key(data['name']))] << 1 | bool(extras))
+                if float_times:
+                    out += _FLOAT64.pack(entity['startTime'])
+                else:
+                    start = _to_ticks(entity['startTime'])
+                    _write_varint(out, _zigzag(start - previous_end))
+                    previous_end = start + _to_ticks(entity['buildTime'])
+                if not extras:
+                    continue
+
+                _write_varint(out, extras)
+                if extras & EXTRA_CHRONOBOOST_COUNT:
+                    _write_varint(out, _zigzag(entity['chronoboostCount']))
+                if extras & EXTRA_BUILD_TIME:
+                    if float_times:
+                        out += _FLOAT64.pack(entity['buildTime'])
+                    else:
+                        _write_varint(out, _zigzag(_to_ticks(entity['buildTime'])))
+                if extras & EXTRA_COST:
+                    _write_varint(out, _zigzag(entity['minerals']))
+                    _write_varint(out, _zigzag(entity['gas']))
+                if extras & EXTRA_RACE:
+                    _write_varint(out, self.races.index(entity['race']))
+
+        return base64.urlsafe_b64encode(bytes(out)).decode('ascii').rstrip('=')
+
+    def decode(self, code: str) -> Dict[str, Any]:
+        """Return the canonical build order for a share code."""
+        try:
+            raw = base64.urlsafe_b64decode(code + '=' * (-len(code) % 4))
+        except (binascii.Error, ValueError):
+            raise BuildOrderError('Build code is not valid base64url')
+        reader = _Reader(raw)
+        try:
+            build_order = self._decode(reader)
+        except (IndexError, struct.error):
+            raise BuildOrderError('Build code is truncated')
+        if reader.pos != len(raw):
+            raise BuildOrderError('Build code has trailing data')
+        return build_order
+
+    def _race(self, index: int) -> str:
+        if index >= len(self.races):
+            raise BuildOrderError(f'Unknown race id {index}')
+        return self.races[index]
+
+    def _decode(self, reader: _Reader) -> Dict[str, Any]:
+        version = reader.raw(1)[0]
+        if version != FORMAT_VERSION:
+            raise BuildOrderError(f'Unsupported build code version {version}')
+        if reader.varint() != self.fingerprint:
+            raise BuildOrderError('Build code was made with different game data')
+        flags = reader.varint()
+        race = self._race(reader.varint())
+        metadata: Dict[str, Any] = {'race': race}
+        if flags & FLAG_NAME:
+            metadata['name'] = reader.raw(reader.varint()).decode('utf-8', errors='replace')
+        float_times = flags & FLAG_FLOAT_TIMES
+
+        rows = []
+        for row_index in range(reader.varint()):
+            entities = []
+            previous_end = 0
+            for _ in range(reader.varint()):
+                header = reader.varint()
+                entity_id, has_extras = header >> 1, header & 1
+                start = reader.float64() if float_times else previous_end + _unzigzag(reader.varint())
+                extras = reader.varint() if has_extras else 0
+                count = _unzigzag(reader.varint()) if extras & EXTRA_CHRONOBOOST_COUNT else 0
+                build_time = None
+                if extras & EXTRA_BUILD_TIME:
+                    build_time = reader.float64() if float_times else _unzigzag(reader.varint())
+                cost: Optional[Tuple[int, int]] = None
+                if extras & EXTRA_COST:
+                    cost = (_unzigzag(reader.varint()), _unzigzag(reader.varint()))
+                entity_race = self._race(reader.varint()) if extras & EXTRA_RACE else race
+
+                keys = self.keys[entity_race]
+                if entity_id >= len(keys):
+                    raise BuildOrderError(f'Unknown {entity_race} entity id {entity_id}')
+                data = self.index.entities[(entity_race, keys[entity_id])]
+                if build_time is None:
+                    build_time = self._default_build_time(data, count)
+                    if not float_times:
+                        build_time = _to_ticks(build_time)
+                if not float_times:
+                    previous_end = start + build_time
+                    start, build_time = _from_ticks(start), _from_ticks(build_time)
+
+                entities.append({
+                    'name': data['name'],
+                    'type': data.get('type'),
+                    'race': entity_race,
+                    'startTime': start,
+                    'buildTime': build_time,
+                    'minerals': cost[0] if cost else data.get('minerals', 0),
+                    'gas': cost[1] if cost else data.get('gas', 0),
+                    'chronoboosted': bool(extras & EXTRA_CHRONOBOOSTED),
+                    'chronoboostCount': count
+                })
+            rows.append({'rowIndex': row_index, 'entities': entities})
+        return {'metadata': metadata, 'rows': rows}
+
+    def canonicalize(self, build_order: Any) -> Dict[str, Any]:
+        """Return what ``decode(encode(build_order))`` yields."""
+        return self.decode(self.encode(build_order))
@@ -0,0 +1,250 @@
+"""Build-order validation, summaries and evaluation against the game data.
+
+Build orders use the export format produced by the frontend: ``metadata`` plus
+``rows`` of timed ``entities`` (``name``, ``type``, ``race``, ``startTime``,
+``buildTime``, ``minerals``, ``gas``, ``chronoboosted``, ``chronoboostCount``).
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+
+# Structures each race starts the game with; requirements on them are always met
+STARTING_ENTITIES = {
+    'protoss': {'nexus', 'probe'},
+    'terran': {'command_center', 'scv'},
+    'zerg': {'hatchery', 'drone', 'larva', 'overlord'}
+}
+
+# Game times are plain seconds ("270", "95.5") or minutes and seconds ("4:30")
+_GAME_TIME_RE = re.compile(r'^(?:\d+(?:\.\d+)?|(\d+):([0-5]\d(?:\.\d+)?))$')
+
+# Longest accepted NDJSON line; longer lines are rejected without being buffered
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class BuildOrderError(ValueError):
+    """Raised when a build order is malformed."""
+
+
+def entity_key(name: str) -> str:
+    """Normalize an entity name the way ``detailed_data`` keys are ("Siege Tank" -> "siege_tank")."""
+    return '_'.join(name.lower().split())
+
+
+def format_game_time(seconds: float) -> str:
+    return f"{int(seconds) // 60}:{int(seconds) % 60:02d}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def parse_game_time(value: Any) -> float:
+    """Seconds from a non-negative number or a ``"4:30"``/``"270"`` string."""
+    if _is_number(value) and value >= 0:
+        return float(value)
+    if isinstance(value, str):
+        match = _GAME_TIME_RE.match(value.strip())
+        if match:
+            if match.group(1) is None:
+                return float(match.group(0))
+            return int(match.group(1)) * 60 + float(match.group(2))
+    raise BuildOrderError(f'Invalid game time {value!r}; use seconds or "m:ss"')
+
+
+def check_metadata(build_order: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the build's ``metadata`` ({} if missing), which must be an object with a string ``race``."""
+    metadata = build_order.get('metadata') or {}
+    if not isinstance(metadata, dict):
+        raise BuildOrderError('"metadata" must be an object')
+    if metadata.get('race') is not None and not isinstance(metadata['race'], str):
+        raise BuildOrderError('"metadata.race" must be a string')
+    return metadata
+
+
+def check_entity(entity: Any) -> None:
+    """Raise BuildOrderError unless ``entity`` has a name, numeric times and well-typed optional fields."""
+    name = entity.get('name') if isinstance(entity, dict) else None
+    if not isinstance(name, str) or not name.strip():
+        raise BuildOrderError('Each entity needs a "name"')
+    start, duration = entity.get('startTime'), entity.get('buildTime', 0)
+    if not _is_number(start) or not _is_number(duration) or start < 0:
+        raise BuildOrderError(f'Entity "{name}" needs a numeric "startTime" and "buildTime"')
+    if entity.get('race') is not None and not isinstance(entity['race'], str):
+        raise BuildOrderError(f'Entity "{name}" has a non-string "race"')
+    for field in ('minerals', 'gas', 'chronoboostCount'):
+        if entity.get(field) is not None and not _is_number(entity[field]):
+            raise BuildOrderError(f'Entity "{name}" has a non-numeric "{field}"')
+
+
+def summarize_build_order(build_order: Any) -> Dict[str, Any]:
+    """Validate a build order and compute its summary and per-entity first start/completion."""
+    if not isinstance(build_order, dict) or not isinstance(build_order.get('rows'), list):
+        raise BuildOrderError('Build order must be an object with a "rows" list')
+    metadata = check_metadata(build_order)
+
+    races: Counter = Counter()
+    targets: Dict[str, Tuple[float, float]] = {}
+    total_minerals = total_gas = count = 0
+    completion_time = 0.0
+
+    for row in build_order['rows']:
+        if not isinstance(row, dict) or not isinstance(row.get('entities', []), list):
+            raise BuildOrderError('Each row must be an object with an "entities" list')
+        for entity in row.get('entities', []):
+            check_entity(entity)
+            name, start, duration = entity['name'], entity['startTime'], entity.get('buildTime', 0)
+
+            complete = start + duration
+            key = entity_key(name)
+            first = targets.get(key)
+            targets[key] = (min(first[0], start), min(first[1], complete)) if first else (start, complete)
+            if entity.get('race'):
+                races[entity['race'].lower()] += 1
+            total_minerals += int(entity.get('minerals') or 0)
+            total_gas += int(entity.get('gas') or 0)
+            completion_time = max(completion_time, complete)
+            count += 1
+
+    race = (metadata.get('race') or (races.most_common(1)[0][0] if races else 'unknown')).lower()
+    return {
+        'name': metadata.get('name'),
+        'race': race,
+        'total_minerals': total_minerals,
+        'total_gas': total_gas,
+        'total_cost': total_minerals + total_gas,
+        'completion_time': completion_time,
+        'entity_count': count,
+        'targets': targets
+    }
+
+
+class GameDataIndex:
+    """Lookup of units, buildings and upgrades by race and normalized name."""
+
+    def __init__(self, sc2_data: Dict[str, Any]):
+        self.entities: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for race, race_data in sc2_data.get('races', {}).items():
+            for entity in race_data.get('detailed_data', {}).values():
+                self.entities[(race, entity_key(entity['name']))] = entity
+            for upgrade in race_data.get('upgrades', {}).values():
+                self.entities.setdefault((race, entity_key(upgrade['name'])), upgrade)
+        # Leveled upgrades ("Air Armor Level 2") by race, base name and level
+        self.levels: Dict[Tuple[str, str, int], str] = {}
+        for (race, key), data in self.entities.items():
+            if isinstance(data.get('level'), int) and data.get('base_name'):
+                self.levels[(race, entity_key(data['base_name']), data['level'])] = key
+
+    def lookup(self, race: str, name: str) -> Optional[Dict[str, Any]]:
+        return self.entities.get((race, entity_key(name)))
+
+    def previous_level(self, race: str, key: str) -> Optional[str]:
+        """Key of the level below a leveled upgrade, which has to be researched first."""
+        data = self.entities.get((race, key), {})
+        if not isinstance(data.get('level'), int) or not data.get('base_name'):
+            return None
+        return self.levels.get((race, entity_key(data['base_name']), data['level'] - 1))
+
+
+def entity_duration(data: Dict[str, Any]) -> Optional[float]:
+    """Build or research time of a game data entry."""
+    return data.get('build_time') or data.get('research_time')
+
+
+def evaluate_build_order(build_order: Any, index: GameDataIndex) -> Dict[str, Any]:
+    """Check a build order against the game data.
+
+    Errors (malformed input, unknown entities) make the build invalid; warnings
+    flag costs or times that differ from the data, entities started before their
+    requirements complete, and overlapping entities within a row.
+    """
+    try:
+        summary = summarize_build_order(build_order)
+    except BuildOrderError as e:
+        return {'ok': False, 'errors': [str(e)], 'warnings': []}
+
+    race = summary['race']
+    completed = {key: complete for key, (_, complete) in summary['targets'].items()}
+    starting = STARTING_ENTITIES.get(race, set())
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    for row_index, row in enumerate(build_order['rows']):
+        previous_end = None
+        for entity in sorted(row.get('entities', []), key=lambda e: e['startTime']):
+            name, start = entity['name'], entity['startTime']
+            end = start + entity.get('buildTime', 0)
+            if previous_end is not None and start < previous_end - 1e-6:
+                warnings.append(f'{name} at {format_game_time(start)} overlaps the previous entity in row {row_index}')
+            previous_end = end
+
+            entity_race = (entity.get('race') or race).lower()
+            data = index.lookup(entity_race, name)
+            if data is None:
+                errors.append(f'Unknown {entity_race} entity "{name}"')
+                continue
+
+            expected = entity_duration(data)
+            if (expected and 'buildTime' in entity and not entity.get('chronoboosted')
+                    and abs(entity['buildTime'] - expected) > 0.5):
+                warnings.append(f'{name} build time {entity["buildTime"]}s differs from {expected}s')
+            for resource in ('minerals', 'gas'):
+                if resource in entity and data.get(resource) is not None and entity[resource] != data[resource]:
+                    warnings.append(f'{name} {resource} {entity[resource]} differs from {data[resource]}')
+
+            for requirement in data.get('requirements') or []:
+                key = entity_key(requirement)
+                if key in starting or index.lookup(race, requirement) is None:
+                    continue
+                if completed.get(key, float('inf')) > start + 1e-6:
+                    warnings.append(f'{name} starts at {format_game_time(start)} before {requirement} completes')
+
+    result_summary = {k: v for k, v in summary.items() if k != 'targets'}
+    return {'ok': not errors, 'errors': errors, 'warnings': warnings, 'summary': result_summary}
+
+
+def normalize_build_order(build_order: Dict[str, Any], index: GameDataIndex) -> Dict[str, Any]:
+    """Return a canonical copy with missing costs and times filled in from the game data."""
+    race = summarize_build_order(build_order)['race']
+    rows = []
+    for row_index, row in enumerate(build_order['rows']):
+        entities = []
+        for entity in sorted(row.get('entities', []), key=lambda e: e['startTime']):
+            data = index.lookup((entity.get('race') or race).lower(), entity['name']) or {}
+            entities.append({
+                'name': data.get('name', entity['name']),
+                'type': entity.get('type') or data.get('type'),
+                'race': (entity.get('race') or race).lower(),
+                'startTime': entity['startTime'],
+                'buildTime': entity.get('buildTime', entity_duration(data) or 0),
+                'minerals': entity.get('minerals', data.get('minerals', 0)),
+                'gas': entity.get('gas', data.get('gas', 0)),
+                'chronoboosted': bool(entity.get('chronoboosted', False)),
+                'chronoboostCount': int(entity.get('chronoboostCount', 0))
+            })
+        rows.append({'rowIndex': row.get('rowIndex', row_index), 'entities': entities})
+    return {'metadata': dict(build_order.get('metadata') or {}, race=race), 'rows': rows}
+
+
+def iter_ndjson(stream: IO[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> Iterator[Tuple[Any, Optional[str]]]:
+    """Yield ``(document, error)`` per non-blank line, reading one bounded line at a time."""
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # Discard the rest of an oversized line without buffering it
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes)
+            yield None, f'Line exceeds {max_line_bytes} bytes'
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError as e:
+            yield None, f'Invalid JSON: {e}'
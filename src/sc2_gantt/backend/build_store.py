@@ -0,0 +1,301 @@
+"""SQLite-backed build-order storage with indexed queries and REST endpoints.
+
+Each saved build is summarised on write into indexed columns (race, total
+cost, completion time) and one ``build_targets`` row per distinct entity
+holding the time it is first started and completed, indexed with and without
+the race, so queries like "Terran builds reaching Stimpack before 4:30" or
+"builds reaching Stimpack before 4:30" are answered from an index instead of
+by scanning documents.
+"""
+
+import base64
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, jsonify, request
+
+from .build_order import BuildOrderError, entity_key, parse_game_time, summarize_build_order
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    race TEXT NOT NULL,
+    total_minerals INTEGER NOT NULL,
+    total_gas INTEGER NOT NULL,
+    total_cost INTEGER NOT NULL,
+    completion_time REAL NOT NULL,
+    entity_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_builds_race_completion ON builds (race, completion_time, id);
+CREATE INDEX IF NOT EXISTS idx_builds_race_cost ON builds (race, total_cost, id);
+CREATE INDEX IF NOT EXISTS idx_builds_completion ON builds (completion_time, id);
+CREATE INDEX IF NOT EXISTS idx_builds_cost ON builds (total_cost, id);
+
+CREATE TABLE IF NOT EXISTS build_targets (
+    race TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    first_complete REAL NOT NULL,
+    first_start REAL NOT NULL,
+    build_id INTEGER NOT NULL REFERENCES builds (id) ON DELETE CASCADE,
+    PRIMARY KEY (race, entity, first_complete, build_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_build_targets_entity ON build_targets (entity, first_complete);
+CREATE INDEX IF NOT EXISTS idx_build_targets_build ON build_targets (build_id);
+"""
+
+# Columns a listing can be ordered by (keyset pagination on (column, id))
+SORT_COLUMNS = ('id', 'completion_time', 'total_cost')
+
+SUMMARY_COLUMNS = 'id, name, race, total_minerals, total_gas, total_cost, completion_time, entity_count, created_at'
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: Any, build_id: int) -> str:
+    raw = json.dumps([sort_value, build_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, build_id = json.loads(raw)
+        return sort_value, int(build_id)
+    except (ValueError, TypeError):
+        raise BuildOrderError('Invalid cursor')
+
+
+class BuildStore:
+    """Build-order database with one SQLite connection per thread."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the database on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self.path != ':memory:':
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA foreign_keys = ON')
+            if self.path != ':memory:':
+                conn.execute('PRAGMA journal_mode = WAL')
+                conn.execute('PRAGMA synchronous = NORMAL')
+            with self._schema_lock:
+                if not self._schema_ready or self.path == ':memory:':
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _insert(self, conn: sqlite3.Connection, build_order: Dict[str, Any], name: Optional[str]) -> int:
+        summary = summarize_build_order(build_order)
+        cursor = conn.execute(
+            'INSERT INTO builds (name, race, total_minerals, total_gas, total_cost, completion_time, '
+            'entity_count, created_at, document) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (name or summary['name'], summary['race'], summary['total_minerals'], summary['total_gas'],
+             summary['total_cost'], summary['completion_time'], summary['entity_count'], time.time(),
+             json.dumps(build_order, separators=(',', ':')))
+        )
+        build_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT INTO build_targets (race, entity, first_start, first_complete, build_id) VALUES (?, ?, ?, ?, ?)',
+            [(summary['race'], key, start, complete, build_id)
+             for key, (start, complete) in summary['targets'].items()]
+        )
+        return build_id
+
+    def save(self, build_order: Dict[str, Any], name: Optional[str] = None) -> int:
+        """Store one build order and return its id."""
+        conn = self._connection()
+        with conn:
+            return self._insert(conn, build_order, name)
+
+    def bulk_import(self, build_orders: List[Dict[str, Any]]) -> List[int]:
+        """Store many build orders in one transaction; nothing is stored if any is invalid."""
+        conn = self._connection()
+        ids = []
+        with conn:
+            for index, build_order in enumerate(build_orders):
+                try:
+                    ids.append(self._insert(conn, build_order, None))
+                except BuildOrderError as e:
+                    raise BuildOrderError(f'Build {index}: {e}')
+        return ids
+
+    def get(self, build_id: int) -> Optional[Dict[str, Any]]:
+        """Return a stored build's summary with its ``document``, or None."""
+        row = self._connection().execute(
+            f'SELECT {SUMMARY_COLUMNS}, document FROM builds WHERE id = ?', (build_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        build = dict(row)
+        build['document'] = json.loads(build['document'])
+        return build
+
+    def _list_query(self, race: Optional[str] = None, entity: Optional[str] = None,
+                    before: Optional[float] = None, max_completion: Optional[float] = None,
+                    max_cost: Optional[int] = None, sort: str = 'id', cursor: Optional[str] = None,
+                    limit: int = 50) -> Tuple[str, List[Any]]:
+        if sort not in SORT_COLUMNS:
+            raise BuildOrderError(f'Invalid sort "{sort}", expected one of {", ".join(SORT_COLUMNS)}')
+
+        if before is not None and not entity:
+            raise BuildOrderError('"before" needs an "entity" to check the time of')
+
+        joins: List[str] = []
+        where: List[str] = []
+        params: List[Any] = []
+        if entity:
+            # The (race, entity, first_complete) primary key answers target queries,
+            # idx_build_targets_entity those without a race
+            joins.append('JOIN build_targets t ON t.build_id = b.id')
+            where.append('t.entity = ?')
+            params.append(entity_key(entity))
+            if race:
+                where.append('t.race = ?')
+                params.append(race.lower())
+            if before is not None:
+                where.append('t.first_complete <= ?')
+                params.append(before)
+        elif race:
+            where.append('b.race = ?')
+            params.append(race.lower())
+        if max_completion is not None:
+            where.append('b.completion_time <= ?')
+            params.append(max_completion)
+        if max_cost is not None:
+            where.append('b.total_cost <= ?')
+            params.append(max_cost)
+
+        # Newest first by id; ascending for time/cost so "fastest"/"cheapest" come first
+        if sort == 'id':
+            order = 'b.id DESC'
+            if cursor:
+                where.append('b.id < ?')
+                params.append(decode_cursor(cursor)[1])
+        else:
+            order = f'b.{sort} ASC, b.id ASC'
+            if cursor:
+                value, last_id = decode_cursor(cursor)
+                where.append(f'(b.{sort} > ? OR (b.{sort} = ? AND b.id > ?))')
+                params.extend([value, value, last_id])
+
+        sql = f'SELECT {", ".join("b." + c.strip() for c in SUMMARY_COLUMNS.split(","))} FROM builds b'
+        if joins:
+            sql += ' ' + ' '.join(joins)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order} LIMIT ?'
+        params.append(limit + 1)
+        return sql, params
+
+    def list(self, limit: int = 50, sort: str = 'id', **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of build summaries and the cursor for the next page (or None)."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        sql, params = self._list_query(sort=sort, limit=limit, **filters)
+        rows = [dict(row) for row in self._connection().execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last[sort], last['id'])
+        return rows, next_cursor
+
+    def explain(self, **filters: Any) -> List[str]:
+        """Return SQLite's query plan for a listing (used to check index use)."""
+        sql, params = self._list_query(**filters)
+        return [row['detail'] for row in self._connection().execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def get_build_store(app: Flask) -> Optional[BuildStore]:
+    return app.extensions.get('sc2_gantt_build_store')
+
+
+def init_build_store(app: Flask) -> Optional[BuildStore]:
+    """Open the build store and register the ``/api/builds`` endpoints if enabled in config."""
+    # Imported here because web_app imports this module
+    from .web_app import error_response
+
+    if not app.config.get('BUILD_STORE_ENABLED', True):
+        return None
+
+    store = BuildStore(app.config.get('BUILD_STORE_PATH') or Path(app.instance_path) / 'builds.sqlite3')
+    app.extensions['sc2_gantt_build_store'] = store
+
+    @app.route('/api/builds', methods=['POST'])
+    def save_build():
+        """Save a build order and return its summary."""
+        build_order = request.get_json(silent=True)
+        if not build_order:
+            return error_response('No build order data provided', 400)
+        try:
+            build_id = store.save(build_order, name=request.args.get('name'))
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        build = store.get(build_id)
+        build.pop('document')
+        return jsonify(build), 201
+
+    @app.route('/api/builds/import', methods=['POST'])
+    def import_builds():
+        """Bulk-import a JSON list of build orders in a single transaction."""
+        payload = request.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload = payload.get('builds')
+        if not isinstance(payload, list) or not payload:
+            return error_response('Expected a non-empty list of build orders', 400)
+        try:
+            ids = store.bulk_import(payload)
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        return jsonify({'imported': len(ids), 'ids': ids}), 201
+
+    @app.route('/api/builds/<int:build_id>')
+    def fetch_build(build_id):
+        """Return a stored build order with its summary."""
+        build = store.get(build_id)
+        if build is None:
+            return error_response(f'Build {build_id} not found', 404)
+        return jsonify(build)
+
+    @app.route('/api/builds')
+    def list_builds():
+        """List build summaries matching the filters, one cursor-paginated page at a time."""
+        args = request.args
+        try:
+            builds, next_cursor = store.list(
+                race=args.get('race'),
+                entity=args.get('entity'),
+                before=parse_game_time(args['before']) if 'before' in args else None,
+                max_completion=parse_game_time(args['max_completion']) if 'max_completion' in args else None,
+                max_cost=args.get('max_cost', type=int),
+                sort=args.get('sort', 'id'),
+                cursor=args.get('cursor'),
+                limit=args.get('limit', 50, type=int)
+            )
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        return jsonify({'builds': builds, 'next_cursor': next_cursor})
+
+    return store
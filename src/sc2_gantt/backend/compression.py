@@ -0,0 +1,72 @@
+"""Gzip compression of text responses.
+
+Responses with a strong ETag (the bundles, icon placeholders and chart
+images) are versioned by it, so their compressed bodies are kept in a small
+LRU cache keyed by path, ETag and encoding instead of being gzipped again on
+every request.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import Flask, request
+
+from .metrics import get_metrics
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+    'text/css',
+    'text/html',
+    'text/plain'
+}
+
+
+def init_compression(app: Flask, min_size: int = 500, level: int = 6, cache_size: int = 64):
+    """Gzip eligible responses when the client accepts it and ``COMPRESS_RESPONSES`` is set."""
+    cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+    lock = threading.Lock()
+
+    @app.after_request
+    def compress_response(response):
+        if (not app.config['COMPRESS_RESPONSES'] or
+                response.direct_passthrough or response.is_streamed or
+                not 200 <= response.status_code < 300 or
+                'Content-Encoding' in response.headers or
+                response.mimetype not in COMPRESSIBLE_MIMETYPES or
+                'gzip' not in request.accept_encodings):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        key = (request.path, etag, 'gzip') if etag and not weak else None
+        with lock:
+            compressed = cache.get(key) if key else None
+            if compressed is not None:
+                cache.move_to_end(key)
+        if compressed is None:
+            compressed = gzip.compress(data, compresslevel=level)
+            if key:
+                with lock:
+                    cache[key] = compressed
+                    while len(cache) > cache_size:
+                        cache.popitem(last=False)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        if etag:
+            # A different encoding of the same resource only matches weakly
+            response.set_etag(etag, weak=True)
+
+        metrics = get_metrics(app)
+        if metrics is not None:
+            rule = request.url_rule
+            labels = (('route', rule.rule if rule is not None else 'unmatched'),)
+            metrics.observe('sc2_gantt_response_compression_ratio', len(compressed) / len(data), labels)
+        return response
@@ -0,0 +1,286 @@
+"""Earliest possible timing of every entity, precomputed into a lookup table.
+
+For each unit, building and upgrade the shortest prerequisite path is built
+from the game data: its ``requirements``, the structure that produces it
+(trying each alternative, e.g. Gateway or Warp Gate) and, for upgrades, the
+``research_building`` and the level below (same ``base_name``). The path is
+simulated on top of a standard opening: constant worker production up to
+``OPENING_WORKERS`` on one base, supply providers just in time and one gas
+(two when the path needs more than ``SECOND_GAS_ABOVE`` gas).
+
+The simulation itself only knows the ``requirements`` field, so each step's
+requested start is raised to the completion of its prerequisites from the
+previous run and the build is re-simulated until the times settle. Workers
+keep their place in the queue, which is what a standard opening does.
+
+The table is written by ``python -m sc2_gantt earliest`` to
+``assets/earliest_timings.json`` together with a fingerprint of the game
+data; a table made from different data is recomputed on load instead of
+served stale.
+"""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .build_order import (
+    STARTING_ENTITIES, BuildOrderError, GameDataIndex, entity_duration, entity_key, format_game_time
+)
+from .simulation import (
+    GEYSERS, STARTING_SUPPLY_CAP, STARTING_WORKERS, SUPPLY_COST, SUPPLY_PROVIDED, TOWN_HALLS, WORKERS,
+    IncrementalSimulation
+)
+
+
+TABLE_PATH = Path(__file__).parent.parent / 'assets' / 'earliest_timings.json'
+TABLE_VERSION = 2
+
+OPENING_WORKERS = 20
+SECOND_GAS_ABOVE = 300
+OPENING_GAS_TIMES = (30, 45)
+MAX_REFINEMENTS = 12
+# Producer combinations tried per entity
+MAX_ALTERNATIVES = 16
+
+# Requirements named in the data that stand for an entity
+REQUIREMENT_ALIASES = {'pylon_power': 'pylon'}
+
+
+def data_fingerprint(sc2_data: Dict[str, Any]) -> str:
+    """Hash of the race data, so a table is only used with the data it was made from."""
+    encoded = json.dumps(sc2_data.get('races', {}), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class EarliestTimings:
+    """Compute the earliest start and completion of entities under the standard opening."""
+
+    def __init__(self, index: GameDataIndex):
+        self.index = index
+        self.producers: Dict[Tuple[str, str], List[str]] = {}
+        for (race, key), data in sorted(index.entities.items()):
+            for produced in data.get('produces') or []:
+                self.producers.setdefault((race, entity_key(produced)), []).append(key)
+
+        self.worker: Dict[str, str] = {}
+        self.provider: Dict[str, str] = {}
+        self.geyser: Dict[str, str] = {}
+        for race in STARTING_ENTITIES:
+            present = {key for r, key in index.entities if r == race}
+            self.worker[race] = next(iter(sorted(present & WORKERS)), None)
+            self.geyser[race] = next(iter(sorted(present & GEYSERS)), None)
+            providers = sorted(key for key in present if key in SUPPLY_PROVIDED and key not in TOWN_HALLS)
+            self.provider[race] = providers[0] if providers else None
+
+    def _fixed_prerequisites(self, race: str, key: str) -> set:
+        data = self.index.entities[(race, key)]
+        names = list(data.get('requirements') or [])
+        if data.get('research_building'):
+            names.append(data['research_building'])
+        prerequisites = set()
+        for name in names:
+            required = REQUIREMENT_ALIASES.get(entity_key(name), entity_key(name))
+            if (race, required) in self.index.entities and required != key:
+                prerequisites.add(required)
+        previous = self.index.previous_level(race, key)
+        if previous:
+            prerequisites.add(previous)
+        return prerequisites
+
+    def _graphs(self, race: str, target: str) -> List[Dict[str, FrozenSet[str]]]:
+        """Every prerequisite graph for ``target``, one per choice of producers."""
+        starting = STARTING_ENTITIES.get(race, set())
+        graphs: List[Dict[str, FrozenSet[str]]] = []
+
+        def expand(graph: Dict[str, FrozenSet[str]], pending: List[str]):
+            while pending and (pending[-1] in graph or pending[-1] in starting):
+                pending = pending[:-1]
+            if not pending:
+                graphs.append(graph)
+                return
+            key = pending[-1]
+            fixed = self._fixed_prerequisites(race, key)
+            producers = [p for p in self.producers.get((race, key), []) if p != key]
+            options = [None] if not producers or starting & set(producers) else producers
+            for producer in options:
+                if len(graphs) >= MAX_ALTERNATIVES:
+                    return
+                deps = fixed | {producer} if producer else fixed
+                deps = frozenset(d for d in deps if d not in starting)
+                expand(dict(graph, **{key: deps}), pending[:-1] + sorted(deps))
+
+        expand({}, [target])
+        return graphs
+
+    @staticmethod
+    def _ordered(graph: Dict[str, FrozenSet[str]]) -> Optional[List[str]]:
+        """Prerequisites first; None if the graph has a cycle."""
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(key: str) -> bool:
+            if state.get(key) == 2:
+                return True
+            if state.get(key) == 1:
+                return False
+            state[key] = 1
+            if not all(visit(dep) for dep in sorted(graph.get(key, ()))):
+                return False
+            state[key] = 2
+            order.append(key)
+            return True
+
+        return order if all(visit(key) for key in sorted(graph)) else None
+
+    def _entity(self, race: str, key: str, start: float) -> Dict[str, Any]:
+        data = self.index.entities[(race, key)]
+        return {'name': data['name'], 'race': race, 'startTime': start,
+                'buildTime': entity_duration(data) or 0,
+                'minerals': data.get('minerals', 0), 'gas': data.get('gas', 0)}
+
+    def _simulate(self, race: str, graph: Dict[str, FrozenSet[str]], order: List[str], target: str):
+        """Simulate the opening plus ``order``; returns the step timings of the path."""
+        worker_time = entity_duration(self.index.entities.get((race, self.worker[race]), {})) or 12
+        rows: List[List[Dict[str, Any]]] = [[
+            self._entity(race, self.worker[race], worker_time * i)
+            for i in range(OPENING_WORKERS - STARTING_WORKERS)
+        ]] if self.worker[race] else [[]]
+
+        # Supply providers, each requested two supply before it is needed
+        supply = OPENING_WORKERS + sum(SUPPLY_COST.get(key, 0) for key in order)
+        cap = STARTING_SUPPLY_CAP.get(race, 15)
+        provider = self.provider[race]
+        openers: Dict[str, List[int]] = {}
+        if provider:
+            provided = SUPPLY_PROVIDED[provider]
+            for k in range(math.ceil(max(0, supply - cap + 1) / provided)):
+                worker_index = max(0, cap + provided * k - 2 - STARTING_WORKERS)
+                rows.append([self._entity(race, provider, worker_time * worker_index)])
+                openers.setdefault(provider, []).append(len(rows) - 1)
+        gas = sum(self.index.entities[(race, key)].get('gas', 0) for key in order)
+        if gas and self.geyser[race]:
+            for requested in OPENING_GAS_TIMES[:2 if gas > SECOND_GAS_ABOVE else 1]:
+                rows.append([self._entity(race, self.geyser[race], requested)])
+                openers.setdefault(self.geyser[race], []).append(len(rows) - 1)
+
+        path = [key for key in order if key not in openers or key == target]
+        path_rows = {}
+        for key in path:
+            rows.append([self._entity(race, key, 0)])
+            path_rows[key] = len(rows) - 1
+
+        simulation = IncrementalSimulation(self.index)
+        build = {'metadata': {'race': race}, 'rows': [{'entities': row} for row in rows]}
+        for _ in range(MAX_REFINEMENTS):
+            simulation.update(build)
+            ends: Dict[str, float] = {}
+            timings: Dict[int, Tuple[float, float]] = {}
+            for event in simulation.events:
+                timings[event.row] = (event.start, event.end)
+            for key, row_indexes in openers.items():
+                ends[key] = min(timings[row][1] for row in row_indexes)
+            for key in path:
+                ends[key] = timings[path_rows[key]][1]
+
+            settled = True
+            for key in path:
+                requested = max((ends[dep] for dep in graph.get(key, ()) if dep in ends), default=0)
+                entity = rows[path_rows[key]][0]
+                if abs(entity['startTime'] - requested) > 1e-6:
+                    rows[path_rows[key]][0] = dict(entity, startTime=requested)
+                    settled = False
+            if settled:
+                break
+            build = {'metadata': {'race': race}, 'rows': [{'entities': row} for row in rows]}
+
+        return [(self.index.entities[(race, key)]['name'], *timings[path_rows[key]]) for key in path]
+
+    def compute(self, race: str, key: str) -> Optional[Dict[str, Any]]:
+        """Fastest timing of one entity over its producer alternatives, or None if it cannot be built."""
+        best = None
+        for graph in self._graphs(race, key):
+            order = self._ordered(graph)
+            if order is None:
+                continue
+            if key not in order:
+                order.append(key)
+            try:
+                steps = self._simulate(race, graph, order, key)
+            except (BuildOrderError, KeyError):
+                continue
+            start, end = next((s, e) for name, s, e in steps if entity_key(name) == key)
+            start, end = round(start, 1), round(end, 1)
+            if best is None or (start, len(steps)) < (best['start'], len(best['path']) + 1):
+                best = {'start': start, 'completion': end,
+                        'path': [[name, round(s, 1), round(e, 1)]
+                                 for name, s, e in sorted(steps, key=lambda step: step[1])
+                                 if entity_key(name) != key]}
+        return best
+
+    def table(self, races: Optional[List[str]] = None) -> Dict[str, Dict[str, list]]:
+        """``{race: {key: [start, completion, path]}}`` for every entity of ``races``."""
+        races = races or sorted({race for race, _ in self.index.entities})
+        result: Dict[str, Dict[str, list]] = {}
+        for race in races:
+            entries = result.setdefault(race, {})
+            for entity_race, key in sorted(self.index.entities):
+                if entity_race != race:
+                    continue
+                timing = self.compute(race, key)
+                if timing is not None:
+                    entries[key] = [timing['start'], timing['completion'], timing['path']]
+        return result
+
+
+def build_table(sc2_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The full lookup table document for ``sc2_data``."""
+    return {
+        'version': TABLE_VERSION,
+        'fingerprint': data_fingerprint(sc2_data),
+        'opening': {'workers': OPENING_WORKERS, 'second_gas_above': SECOND_GAS_ABOVE},
+        'races': EarliestTimings(GameDataIndex(sc2_data)).table()
+    }
+
+
+def write_table(sc2_data: Dict[str, Any], path: Path = TABLE_PATH) -> Dict[str, Any]:
+    table = build_table(sc2_data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, separators=(',', ':'), sort_keys=True)
+        f.write('\n')
+    return table
+
+
+class EarliestTable:
+    """Answers earliest-timing questions from the precomputed table."""
+
+    def __init__(self, sc2_data: Dict[str, Any], path: Path = TABLE_PATH):
+        self.index = GameDataIndex(sc2_data)
+        table = None
+        try:
+            with open(path, encoding='utf-8') as f:
+                table = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if (not isinstance(table, dict) or table.get('version') != TABLE_VERSION or
+                table.get('fingerprint') != data_fingerprint(sc2_data)):
+            table = build_table(sc2_data)
+        self.races: Dict[str, Dict[str, list]] = table['races']
+
+    def lookup(self, race: str, name: str) -> Optional[Dict[str, Any]]:
+        race = race.lower()
+        entry = self.races.get(race, {}).get(entity_key(name))
+        if entry is None:
+            return None
+        start, completion, path = entry
+        return {
+            'race': race,
+            'name': self.index.entities[(race, entity_key(name))]['name'],
+            'start': start,
+            'start_time': format_game_time(start),
+            'completion': completion,
+            'completion_time': format_game_time(completion),
+            'path': [{'name': step, 'start': step_start, 'completion': step_end}
+                     for step, step_start, step_end in path]
+        }
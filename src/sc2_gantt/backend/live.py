@@ -0,0 +1,339 @@
+"""Live recalculation sessions: edit operations in, simulation updates out over SSE.
+
+A client opens a session, listens on its event stream (``text/event-stream``)
+and posts edit operations. Operations are applied to the session's build as
+they arrive, which is cheap; the simulation runs only when the stream wakes
+up. However many operations were posted in the meantime, the stream runs one
+``IncrementalSimulation.update`` and sends one ``update`` event, so a burst
+of drag edits costs as many simulations as the server has time for, not one
+per mouse move.
+
+Operations (``row`` and ``index`` address an entity by position)::
+
+    {"op": "set", "build": {...}}                       replace the whole build
+    {"op": "row", "row": 1, "entities": [...]}          replace one row
+    {"op": "insert", "row": 0, "index": 3, "entity": {...}}
+    {"op": "update", "row": 0, "index": 3, "fields": {"startTime": 41.5}}
+    {"op": "delete", "row": 0, "index": 3}
+
+A batch is applied atomically: if any operation is invalid, none are.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from flask import Flask, Response, jsonify, request, stream_with_context, url_for
+
+from .build_order import BuildOrderError, GameDataIndex, check_entity, check_metadata
+from .metrics import get_metrics
+from .simulation import IncrementalSimulation
+
+
+UPDATABLE_FIELDS = {'startTime', 'buildTime', 'minerals', 'gas', 'chronoboosted', 'chronoboostCount'}
+MAX_ROWS = 64
+
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append('data: ' + json.dumps(data, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+class LiveSession:
+    """One client's build state, its incremental simulation and the stream that reports on it."""
+
+    def __init__(self, session_id: str, index_factory: Callable[[], GameDataIndex]):
+        self.id = session_id
+        self.index_factory = index_factory
+        self.metadata: Dict[str, Any] = {}
+        self.rows: List[List[Dict[str, Any]]] = [[]]
+        # seq counts applied batches; the stream reports the seq each update reflects
+        self.seq = 0
+        self.updates = 0
+        self.last_seen = time.monotonic()
+        self.closed = False
+        self.condition = threading.Condition()
+        self.stream_generation = 0
+        self.simulation: Optional[IncrementalSimulation] = None
+        self.simulation_lock = threading.Lock()
+
+    def build_order(self) -> Dict[str, Any]:
+        return {
+            'metadata': dict(self.metadata),
+            'rows': [{'rowIndex': i, 'entities': list(row)} for i, row in enumerate(self.rows)]
+        }
+
+    @staticmethod
+    def _check_entity(entity: Any, index: GameDataIndex, race: str) -> Dict[str, Any]:
+        # Every updatable field is checked here, so a stored build always simulates
+        check_entity(entity)
+        name = entity['name']
+        for field in ('buildTime', 'minerals', 'gas', 'chronoboostCount'):
+            if (entity.get(field) or 0) < 0:
+                raise BuildOrderError(f'Entity "{name}" needs a non-negative "{field}"')
+        race = (entity.get('race') or race or '').lower()
+        if race and index.lookup(race, name) is None:
+            raise BuildOrderError(f'Unknown {race} entity "{name}"')
+        return entity
+
+    @classmethod
+    def _check_rows(cls, rows: Any, index: GameDataIndex, race: str) -> List[List[Dict[str, Any]]]:
+        if not isinstance(rows, list) or len(rows) > MAX_ROWS:
+            raise BuildOrderError(f'Build order must have a "rows" list of at most {MAX_ROWS} rows')
+        checked = []
+        for row in rows:
+            entities = row.get('entities', []) if isinstance(row, dict) else None
+            if not isinstance(entities, list):
+                raise BuildOrderError('Each row must be an object with an "entities" list')
+            checked.append([cls._check_entity(entity, index, race) for entity in entities])
+        return checked or [[]]
+
+    @staticmethod
+    def _position(rows: List[List[Dict[str, Any]]], op: Dict[str, Any], insert: bool = False):
+        row, position = op.get('row'), op.get('index')
+        if isinstance(row, bool) or not isinstance(row, int) or not 0 <= row < len(rows):
+            raise BuildOrderError(f'No row {row!r}')
+        limit = len(rows[row]) + (1 if insert else 0)
+        if position is None and insert:
+            position = len(rows[row])
+        if isinstance(position, bool) or not isinstance(position, int) or not 0 <= position < limit:
+            raise BuildOrderError(f'No entity {position!r} in row {row}')
+        return row, position
+
+    def apply(self, ops: Any) -> int:
+        """Apply a batch of edit operations and wake the stream; returns the new seq."""
+        if not isinstance(ops, list) or not ops:
+            raise BuildOrderError('Expected a non-empty list of operations')
+        index = self.index_factory()
+        metadata, rows = self.metadata, list(self.rows)
+
+        for number, op in enumerate(ops):
+            kind = op.get('op') if isinstance(op, dict) else None
+            race = metadata.get('race')
+            try:
+                if kind == 'set':
+                    build = op.get('build')
+                    if not isinstance(build, dict):
+                        raise BuildOrderError('"set" needs a "build" object')
+                    metadata = {key: value for key, value in check_metadata(build).items()
+                                if key in ('race', 'name')}
+                    rows = self._check_rows(build.get('rows'), index, metadata.get('race'))
+                elif kind == 'row':
+                    row = op.get('row')
+                    if isinstance(row, bool) or not isinstance(row, int) or not 0 <= row < MAX_ROWS:
+                        raise BuildOrderError(f'No row {row!r}')
+                    rows.extend([] for _ in range(len(rows), row + 1))
+                    rows[row] = self._check_rows([{'entities': op.get('entities')}], index, race)[0]
+                elif kind == 'insert':
+                    row, position = self._position(rows, op, insert=True)
+                    entity = self._check_entity(op.get('entity'), index, race)
+                    rows[row] = rows[row][:position] + [entity] + rows[row][position:]
+                elif kind == 'update':
+                    row, position = self._position(rows, op)
+                    fields = op.get('fields')
+                    if not isinstance(fields, dict) or not set(fields) <= UPDATABLE_FIELDS:
+                        raise BuildOrderError(f'"update" fields must be among {", ".join(sorted(UPDATABLE_FIELDS))}')
+                    rows[row] = list(rows[row])
+                    rows[row][position] = self._check_entity(dict(rows[row][position], **fields), index, race)
+                elif kind == 'delete':
+                    row, position = self._position(rows, op)
+                    rows[row] = rows[row][:position] + rows[row][position + 1:]
+                else:
+                    raise BuildOrderError(f'Unknown operation {kind!r}')
+            except BuildOrderError as e:
+                raise BuildOrderError(f'Operation {number}: {e}')
+
+        with self.condition:
+            self.metadata, self.rows = metadata, rows
+            self.seq += 1
+            self.last_seen = time.monotonic()
+            self.condition.notify_all()
+            return self.seq
+
+    def recalculate(self, build_order: Dict[str, Any], full: bool) -> Dict[str, Any]:
+        """Re-simulate from the first changed step; ``full`` reports every event, not just the diff."""
+        index = self.index_factory()
+        with self.simulation_lock:
+            if self.simulation is None or self.simulation.index is not index:
+                self.simulation = IncrementalSimulation(index)
+                full = True
+            started = time.perf_counter()
+            result = self.simulation.update(build_order)
+            if full:
+                result['changed'] = [event.to_dict() for event in self.simulation.events]
+                result['removed'] = []
+            result['full'] = full
+            result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            self.updates += 1
+        return result
+
+    def stream(self, heartbeat: float) -> Iterator[str]:
+        """Yield SSE messages: a full update first, then one diff per wake-up with pending edits.
+
+        Opening a new stream ends the previous one, since both would share one
+        simulation and its diffs.
+        """
+        with self.condition:
+            self.stream_generation += 1
+            generation = self.stream_generation
+            self.condition.notify_all()
+
+        reported = None
+        while True:
+            with self.condition:
+                if self.seq == reported and not self.closed and generation == self.stream_generation:
+                    self.condition.wait(heartbeat)
+                if self.closed or generation != self.stream_generation:
+                    return
+                self.last_seen = time.monotonic()
+                seq, build_order = self.seq, self.build_order()
+
+            if seq == reported:
+                yield ': keep-alive\n\n'
+                continue
+            try:
+                result = self.recalculate(build_order, full=reported is None)
+            except Exception as e:
+                # Reported on the stream, which stays open for the next edit
+                yield _sse('error', {'seq': seq, 'error': str(e)}, seq)
+            else:
+                yield _sse('update', dict(result, seq=seq), seq)
+            reported = seq
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class LiveSessions:
+    """Live sessions by id, dropping the least recently used beyond ``max_sessions`` or idle past ``ttl``."""
+
+    def __init__(self, index_factory: Callable[[], GameDataIndex], max_sessions: int = 100, ttl: float = 600):
+        self.index_factory = index_factory
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.sessions: 'OrderedDict[str, LiveSession]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _expire(self):
+        deadline = time.monotonic() - self.ttl
+        for session_id, session in list(self.sessions.items()):
+            if session.last_seen < deadline or len(self.sessions) > self.max_sessions:
+                del self.sessions[session_id]
+                session.close()
+
+    def create(self) -> LiveSession:
+        session = LiveSession(secrets.token_urlsafe(12), self.index_factory)
+        with self.lock:
+            self.sessions[session.id] = session
+            self._expire()
+        return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        with self.lock:
+            self._expire()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                session.last_seen = time.monotonic()
+            return session
+
+    def remove(self, session_id: str) -> bool:
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+
+
+def get_live_sessions(app: Flask) -> Optional[LiveSessions]:
+    """Return the app's live sessions, or None when the live channel is disabled."""
+    return app.extensions.get('sc2_gantt_live')
+
+
+def init_live(app: Flask, index_factory: Callable[[], GameDataIndex]) -> Optional[LiveSessions]:
+    """Register the ``/api/live`` session endpoints if ``LIVE_ENABLED`` is set."""
+    # Imported here because web_app imports this module
+    from .web_app import error_response
+
+    if not app.config.get('LIVE_ENABLED', True):
+        return None
+
+    sessions = LiveSessions(index_factory,
+                            max_sessions=app.config.get('LIVE_MAX_SESSIONS', 100),
+                            ttl=app.config.get('LIVE_SESSION_TTL', 600))
+    app.extensions['sc2_gantt_live'] = sessions
+
+    def count(name: str, amount: int = 1):
+        metrics = get_metrics(app)
+        if metrics is not None:
+            metrics.inc(name, (), amount)
+
+    @app.route('/api/live/sessions', methods=['POST'])
+    def open_live_session():
+        """Open a session, optionally seeded with a build order."""
+        build_order = request.get_json(silent=True)
+        session = sessions.create()
+        if build_order:
+            try:
+                session.apply([{'op': 'set', 'build': build_order}])
+            except BuildOrderError as e:
+                sessions.remove(session.id)
+                return error_response(str(e), 400)
+        return jsonify({
+            'id': session.id,
+            'seq': session.seq,
+            'events': url_for('live_events', session_id=session.id),
+            'ops': url_for('live_ops', session_id=session.id)
+        }), 201
+
+    @app.route('/api/live/sessions/<session_id>/ops', methods=['POST'])
+    def live_ops(session_id):
+        """Apply a batch of edit operations; the result arrives on the event stream."""
+        session = sessions.get(session_id)
+        if session is None:
+            return error_response(f'Unknown session "{session_id}"', 404)
+        payload = request.get_json(silent=True)
+        ops = payload.get('ops') if isinstance(payload, dict) else payload
+        try:
+            seq = session.apply(ops)
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        count('sc2_gantt_live_ops_total', len(ops))
+        return jsonify({'seq': seq}), 202
+
+    @app.route('/api/live/sessions/<session_id>/events')
+    def live_events(session_id):
+        """Stream simulation updates for a session as Server-Sent Events."""
+        session = sessions.get(session_id)
+        if session is None:
+            return error_response(f'Unknown session "{session_id}"', 404)
+
+        def generate():
+            for message in session.stream(app.config.get('LIVE_HEARTBEAT', 15)):
+                if message.startswith('event: update'):
+                    count('sc2_gantt_live_updates_total')
+                yield message
+
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    @app.route('/api/live/sessions/<session_id>', methods=['DELETE'])
+    def close_live_session(session_id):
+        """Close a session and end its stream."""
+        if not sessions.remove(session_id):
+            return error_response(f'Unknown session "{session_id}"', 404)
+        return '', 204
+
+    return sessions
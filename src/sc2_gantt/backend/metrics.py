@@ -0,0 +1,178 @@
+"""In-process request metrics exposed in Prometheus text format."""
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, request
+
+
+# Prometheus-style default latency buckets (seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets (bytes)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Compressed/original size ratio buckets
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+
+    def counter(self, name: str, help_text: str):
+        """Declare a counter metric."""
+        self._help[name] = ('counter', help_text)
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float]):
+        """Declare a histogram metric."""
+        self._help[name] = ('histogram', help_text)
+        self._histograms.setdefault(name, {})
+        self._buckets[name] = buckets
+
+    def inc(self, name: str, labels: LabelSet = (), amount: float = 1):
+        with self._lock:
+            series = self._counters[name]
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name: str, value: float, labels: LabelSet = ()):
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(self._buckets[name])
+            histogram.observe(value)
+
+    def get_counter(self, name: str, labels: LabelSet = ()) -> float:
+        with self._lock:
+            return self._counters[name].get(labels, 0)
+
+    def get_histogram(self, name: str, labels: LabelSet = ()) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms[name].get(labels)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, (metric_type, help_text) in self._help.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                if metric_type == 'counter':
+                    for labels, value in sorted(self._counters[name].items()):
+                        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                    continue
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = ('le', _format_value(bound))
+                        lines.append(f'{name}_bucket{_format_labels(labels, le)} {cumulative}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _default_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.histogram('sc2_gantt_request_duration_seconds',
+                       'Request latency in seconds by route.', LATENCY_BUCKETS)
+    registry.histogram('sc2_gantt_response_size_bytes',
+                       'Response body size in bytes by route.', SIZE_BUCKETS)
+    registry.counter('sc2_gantt_requests_total',
+                     'Requests served by route, method and status code.')
+    registry.counter('sc2_gantt_data_cache_requests_total',
+                     'SC2 data cache lookups by result (hit or miss).')
+    registry.counter('sc2_gantt_render_cache_requests_total',
+                     'Rendered chart cache lookups by format and result (hit or miss).')
+    registry.counter('sc2_gantt_live_ops_total',
+                     'Edit operations received on live recalculation sessions.')
+    registry.counter('sc2_gantt_live_updates_total',
+                     'Simulation updates pushed to live sessions (edits coalesced per update).')
+    registry.histogram('sc2_gantt_response_compression_ratio',
+                       'Compressed to original response size ratio.', RATIO_BUCKETS)
+    return registry
+
+
+def get_metrics(app: Flask) -> Optional[MetricsRegistry]:
+    """Return the app's metrics registry, or None when metrics are disabled."""
+    return app.extensions.get('sc2_gantt_metrics')
+
+
+def init_metrics(app: Flask) -> MetricsRegistry:
+    """Instrument ``app`` with per-route request metrics and a ``/metrics`` endpoint."""
+    registry = _default_registry()
+    app.extensions['sc2_gantt_metrics'] = registry
+    perf_counter = time.perf_counter
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        rule = request.url_rule
+        route = rule.rule if rule is not None else 'unmatched'
+        labels = (('route', route), ('method', request.method))
+        registry.observe('sc2_gantt_request_duration_seconds', perf_counter() - start, labels)
+        registry.inc('sc2_gantt_requests_total', labels + (('status', str(response.status_code)),))
+        if not response.is_streamed and not response.direct_passthrough:
+            registry.observe('sc2_gantt_response_size_bytes', response.calculate_content_length() or 0, labels)
+        elif response.content_length is not None:
+            registry.observe('sc2_gantt_response_size_bytes', response.content_length, labels)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """Expose collected metrics in Prometheus text format."""
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    return registry
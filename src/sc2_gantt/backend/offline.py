@@ -0,0 +1,80 @@
+"""Service worker and precache manifest for the static site.
+
+The manifest is generated from the build output, so it lists exactly what was
+deployed. Files fall into three groups: the app shell (index.html and the
+bundles), the game data and the icons. Every entry carries a revision, a hash
+of its content. Data and icons share one cache versioned by the hash of the
+data files; the shell has its own, so a frontend change does not refetch six
+megabytes of icons. See ``frontend/js/service-worker.js`` for the caching.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .asset_pipeline import FRONTEND_DIR, minify_js
+
+
+SERVICE_WORKER = 'sw.js'
+PRECACHE_MANIFEST = 'precache-manifest.json'
+SERVICE_WORKER_SOURCE = 'js/service-worker.js'
+
+SHELL_FILES = ('index.html', 'js/gantt.js', 'js/simulation-worker.js', 'css/gantt.css')
+DATA_FILES = ('api/sc2-data.json', 'api/icon-placeholders.json', 'assets/earliest_timings.json')
+ICONS_DIR = 'assets/icons'
+
+
+def _revision(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def _group_version(entries: List[Dict[str, str]]) -> str:
+    combined = ''.join(f"{entry['url']}:{entry['revision']}\n" for entry in entries)
+    return hashlib.sha256(combined.encode('utf-8')).hexdigest()[:16]
+
+
+def build_precache_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Describe the files of the static site in ``output_dir`` to precache.
+
+    URLs are relative to the site root, which is the service worker's scope.
+    Files of the shell and data groups that were not built are left out.
+    """
+    output_dir = Path(output_dir)
+
+    def entries(names) -> List[Dict[str, str]]:
+        return [{'url': name, 'revision': _revision(output_dir / name)}
+                for name in names if (output_dir / name).is_file()]
+
+    icons_dir = output_dir / ICONS_DIR
+    icons = sorted(path.relative_to(output_dir).as_posix() for path in icons_dir.rglob('*')
+                   if path.is_file()) if icons_dir.is_dir() else []
+
+    shell, data = entries(SHELL_FILES), entries(DATA_FILES)
+    return {
+        'shell_version': _group_version(shell),
+        'data_version': _group_version(data),
+        'shell': shell,
+        'data': data,
+        'icons': entries(icons)
+    }
+
+
+def write_service_worker(output_dir: Path, frontend_dir: Path = FRONTEND_DIR) -> Dict[str, Any]:
+    """Write the precache manifest and ``sw.js`` to the root of ``output_dir``.
+
+    The worker is stamped with a hash of the manifest: browsers look for a new
+    service worker by comparing its bytes, so any change to the site has to
+    change ``sw.js``.
+    """
+    output_dir = Path(output_dir)
+    manifest = build_precache_manifest(output_dir)
+    encoded = json.dumps(manifest, separators=(',', ':'), sort_keys=True)
+    (output_dir / PRECACHE_MANIFEST).write_text(encoded + '\n', encoding='utf-8')
+
+    version = hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+    source = (Path(frontend_dir) / SERVICE_WORKER_SOURCE).read_text(encoding='utf-8')
+    code, _ = minify_js(source, SERVICE_WORKER, Path(SERVICE_WORKER_SOURCE).name,
+                        prelude=f"const PRECACHE_VERSION={json.dumps(version)};\n")
+    (output_dir / SERVICE_WORKER).write_text(code + '\n', encoding='utf-8')
+    return manifest
@@ -0,0 +1,239 @@
+"""Game data of every scraped patch, stored as deltas.
+
+The store is a directory (``assets/patches`` by default) holding
+``index.json``, the patches in order, and one file per patch. The first
+patch is a full snapshot; every later one is a delta against its
+predecessor. Each race's sections (``entities``, ``detailed_data``,
+``upgrades``) are treated as records keyed by name or id, and a delta only
+lists the records that were added or changed, the keys removed and, when
+needed, the new order. Anything else is replaced whole.
+
+In memory, a patch is built from its predecessor and shares every record
+object the delta does not change. A section or race with no changes is
+shared whole, so each further patch costs a few lists of references plus
+its changed records. The returned data is shared between patches and
+requests and must be treated as read-only.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .render import write_atomic
+
+
+PATCHES_DIR = Path(__file__).parent.parent / 'assets' / 'patches'
+INDEX_FILE = 'index.json'
+STORE_VERSION = 1
+
+_PATCH_NAME_RE = re.compile(r'^[0-9A-Za-z][0-9A-Za-z._-]{0,63}$')
+
+
+class PatchError(ValueError):
+    """Raised for unknown patches and invalid patch stores."""
+
+
+def _records(section: Any) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+    """Keys in order and records by key of a keyed section, or None if it is not one."""
+    if isinstance(section, dict) and all(isinstance(record, dict) for record in section.values()):
+        return list(section), section
+    if isinstance(section, list) and all(isinstance(record, dict) and isinstance(record.get('name'), str)
+                                         for record in section):
+        records = {record['name']: record for record in section}
+        if len(records) == len(section):
+            return [record['name'] for record in section], records
+    return None
+
+
+def _section_delta(base: Any, section: Any) -> Optional[Dict[str, Any]]:
+    """Delta turning ``base`` into ``section``; None if they are equal."""
+    if base == section:
+        return None
+    base_keyed, keyed = _records(base), _records(section)
+    if base_keyed is None or keyed is None or isinstance(base, list) != isinstance(section, list):
+        return {'value': section}
+    (base_order, base_records), (order, records) = base_keyed, keyed
+    delta: Dict[str, Any] = {
+        'set': {key: records[key] for key in order if base_records.get(key) != records[key]},
+        'removed': [key for key in base_order if key not in records]
+    }
+    removed = set(delta['removed'])
+    derived = [key for key in base_order if key not in removed] + [key for key in order if key not in base_records]
+    if derived != order:
+        delta['order'] = order
+    return delta
+
+
+def diff_game_data(base: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta of ``data`` against ``base``: changed sections per race, None for removed ones."""
+    races: Dict[str, Any] = {}
+    base_races, new_races = base.get('races', {}), data.get('races', {})
+    for race in base_races:
+        if race not in new_races:
+            races[race] = None
+    for race, race_data in new_races.items():
+        base_race = base_races.get(race, {})
+        sections: Dict[str, Any] = {section: None for section in base_race if section not in race_data}
+        for section, value in race_data.items():
+            delta = _section_delta(base_race.get(section), value)
+            if delta is not None:
+                sections[section] = delta
+        if sections:
+            races[race] = sections
+    return {'metadata': data.get('metadata', {}), 'races': races}
+
+
+def _apply_section(base: Any, delta: Dict[str, Any]) -> Any:
+    if 'value' in delta:
+        return delta['value']
+    keyed = _records(base)
+    if keyed is None:
+        raise PatchError('Patch delta lists records of a section that has none')
+    base_order, base_records = keyed
+    changed, removed = delta.get('set', {}), set(delta.get('removed', []))
+    order = delta.get('order') or (
+        [key for key in base_order if key not in removed] + [key for key in changed if key not in base_records])
+    records = {}
+    for key in order:
+        record = changed.get(key)
+        # A record equal to its predecessor (rewritten by hand, say) is shared all the same
+        if record is None or record == base_records.get(key):
+            record = base_records[key]
+        records[key] = record
+    return records if isinstance(base, dict) else [records[key] for key in order]
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Game data of ``base`` with ``delta`` applied, sharing every unchanged record, section and race."""
+    races = dict(base.get('races', {}))
+    for race, sections in delta.get('races', {}).items():
+        if sections is None:
+            races.pop(race, None)
+            continue
+        race_data = dict(races.get(race, {}))
+        for section, section_delta in sections.items():
+            if section_delta is None:
+                race_data.pop(section, None)
+            else:
+                race_data[section] = _apply_section(race_data.get(section), section_delta)
+        races[race] = race_data
+    return {'metadata': delta.get('metadata', {}), 'races': races}
+
+
+def _count_records(sc2_data: Dict[str, Any]) -> int:
+    count = 0
+    for race_data in sc2_data.get('races', {}).values():
+        for section in race_data.values():
+            keyed = _records(section)
+            count += len(keyed[1]) if keyed else 1
+    return count
+
+
+def _count_changes(delta: Dict[str, Any]) -> Tuple[int, int]:
+    changed = removed = 0
+    for sections in delta.get('races', {}).values():
+        for section_delta in (sections or {}).values():
+            if section_delta is not None:
+                changed += len(section_delta.get('set', {})) + ('value' in section_delta)
+                removed += len(section_delta.get('removed', []))
+    return changed, removed
+
+
+class PatchStore:
+    """Patches of the game data in a directory, built in memory on first use."""
+
+    def __init__(self, directory: Path = PATCHES_DIR):
+        self.directory = Path(directory)
+        self._index_mtime: Optional[float] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._data: Dict[str, Dict[str, Any]] = {}
+
+    def _refresh(self):
+        """Reread the index, and drop the built patches, when it changes on disk."""
+        path = self.directory / INDEX_FILE
+        mtime = path.stat().st_mtime if path.is_file() else None
+        if mtime == self._index_mtime:
+            return
+        entries = []
+        if mtime is not None:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    index = json.load(f)
+                entries = index['patches']
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                raise PatchError(f'Invalid patch index {path}: {e}') from e
+        self._index_mtime, self._entries, self._data = mtime, entries, {}
+
+    def patches(self) -> List[Dict[str, Any]]:
+        """Index entries, oldest first: ``{patch, base, scrape_timestamp, changed, removed}``."""
+        self._refresh()
+        return list(self._entries)
+
+    def latest(self) -> Optional[str]:
+        self._refresh()
+        return self._entries[-1]['patch'] if self._entries else None
+
+    def __contains__(self, patch: str) -> bool:
+        self._refresh()
+        return any(entry['patch'] == patch for entry in self._entries)
+
+    def get(self, patch: str) -> Dict[str, Any]:
+        """Game data of ``patch``, built from the nearest already-built predecessor."""
+        self._refresh()
+        names = [entry['patch'] for entry in self._entries]
+        if patch not in names:
+            raise PatchError(f'Unknown patch "{patch}"')
+        position = names.index(patch)
+        start = position
+        while start >= 0 and names[start] not in self._data:
+            start -= 1
+        data = self._data[names[start]] if start >= 0 else None
+        for name in names[start + 1:position + 1]:
+            document = self._read(name)
+            if document.get('base') is None:
+                data = document['data']
+            elif data is None:
+                raise PatchError(f'Patch "{name}" has no snapshot to apply its delta to')
+            else:
+                data = apply_delta(data, document['delta'])
+            self._data[name] = data
+        return data
+
+    def _read(self, patch: str) -> Dict[str, Any]:
+        path = self.directory / f'{patch}.json'
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise PatchError(f'Cannot read patch "{patch}" from {path}: {e}') from e
+
+    def add(self, patch: str, sc2_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record ``sc2_data`` as ``patch``, after the latest patch; returns its index entry."""
+        if not isinstance(patch, str) or not _PATCH_NAME_RE.match(patch):
+            raise PatchError(f'Invalid patch name "{patch}"; use letters, digits, ".", "_" and "-"')
+        if patch in self:
+            raise PatchError(f'Patch "{patch}" already exists')
+        sc2_data = dict(sc2_data, metadata=dict(sc2_data.get('metadata', {}), patch=patch))
+
+        base = self.latest()
+        if base is None:
+            document = {'patch': patch, 'base': None, 'data': sc2_data}
+            changed, removed = _count_records(sc2_data), 0
+        else:
+            delta = diff_game_data(self.get(base), sc2_data)
+            document = {'patch': patch, 'base': base, 'delta': delta}
+            changed, removed = _count_changes(delta)
+        entry = {'patch': patch, 'base': base,
+                 'scrape_timestamp': sc2_data['metadata'].get('scrape_timestamp'),
+                 'changed': changed, 'removed': removed}
+
+        # The patch file is written before the index that refers to it
+        write_atomic(self.directory / f'{patch}.json',
+                     json.dumps(document, separators=(',', ':')).encode('utf-8'))
+        index = {'version': STORE_VERSION, 'patches': self._entries + [entry]}
+        write_atomic(self.directory / INDEX_FILE, (json.dumps(index, indent=2) + '\n').encode('utf-8'))
+        # The patches built so far stay valid
+        self._entries = index['patches']
+        self._index_mtime = (self.directory / INDEX_FILE).stat().st_mtime
+        return entry
@@ -0,0 +1,137 @@
+"""Prerequisite validation of build orders with bitmasks.
+
+Each race's entities get consecutive integer ids once per game data set, and
+every entity's ``requirements`` and research building are compiled into one
+integer bitmask. Checking a build is then a walk over its steps in start
+order: completions up to a step's start are OR-ed into the mask of finished
+entities, and the step is legal when ``need & ~finished`` is zero. The bits
+left over name exactly what is missing.
+
+Only structures count as research buildings: some upgrades name the unit they
+affect there. A leveled upgrade also needs the level below it. Requirement
+names the data does not know (such as "No Mothership") are ignored, as in
+``evaluate_build_order``.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .build_order import (
+    STARTING_ENTITIES, BuildOrderError, GameDataIndex, check_entity, check_metadata, entity_duration, entity_key,
+    format_game_time
+)
+from .earliest import REQUIREMENT_ALIASES
+from .simulation import build_race
+
+
+EPSILON = 1e-6
+
+
+class PrerequisiteValidator:
+    """Requirements of one game data set compiled to bitmasks."""
+
+    def __init__(self, sc2_data: Dict[str, Any]):
+        self.index = GameDataIndex(sc2_data)
+        self.ids: Dict[str, Dict[str, int]] = {}
+        self.names: Dict[str, List[str]] = {}
+        for race, key in sorted(self.index.entities):
+            self.ids.setdefault(race, {})[key] = len(self.names.setdefault(race, []))
+            self.names[race].append(self.index.entities[(race, key)]['name'])
+
+        self.needs: Dict[str, List[int]] = {}
+        self.starting: Dict[str, int] = {}
+        for race, ids in self.ids.items():
+            needs = [0] * len(ids)
+            for key, entity_id in ids.items():
+                data = self.index.entities[(race, key)]
+                required = [REQUIREMENT_ALIASES.get(entity_key(name), entity_key(name))
+                            for name in data.get('requirements') or []]
+                building = entity_key(data.get('research_building') or '')
+                if self.index.entities.get((race, building), {}).get('type') == 'building':
+                    required.append(building)
+                previous = self.index.previous_level(race, key)
+                if previous:
+                    required.append(previous)
+                for requirement in required:
+                    if requirement in ids and requirement != key:
+                        needs[entity_id] |= 1 << ids[requirement]
+            self.needs[race] = needs
+            self.starting[race] = sum(1 << ids[key] for key in STARTING_ENTITIES.get(race, ()) if key in ids)
+        self._resolved: Dict[Tuple[str, str], Optional[int]] = {}
+
+    def _entity_id(self, race: str, name: str) -> Optional[int]:
+        resolved = self._resolved.get((race, name), -1)
+        if resolved == -1:
+            resolved = self._resolved[(race, name)] = self.ids.get(race, {}).get(entity_key(name))
+        return resolved
+
+    def missing_names(self, race: str, mask: int) -> List[str]:
+        """Names of the entities whose bits are set in ``mask``."""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.names[race][low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def validate(self, build_order: Any) -> Dict[str, Any]:
+        """Check every step's prerequisites; errors give the step's row and position in that row."""
+        if not isinstance(build_order, dict) or not isinstance(build_order.get('rows'), list):
+            raise BuildOrderError('Build order must be an object with a "rows" list')
+        check_metadata(build_order)
+        for row in build_order['rows']:
+            entities = row.get('entities', []) if isinstance(row, dict) else None
+            if not isinstance(entities, list):
+                raise BuildOrderError('Each row must be an object with an "entities" list')
+            for entity in entities:
+                check_entity(entity)
+        race = build_race(build_order)
+
+        errors: List[Dict[str, Any]] = []
+        steps: List[Tuple[float, float, int, int, int, str]] = []
+        for row_index, row in enumerate(build_order['rows']):
+            for position, entity in enumerate(row.get('entities', [])):
+                name, start = entity['name'], entity['startTime']
+                entity_race = (entity.get('race') or race).lower()
+                entity_id = self._entity_id(entity_race, name)
+                if entity_id is None:
+                    errors.append({'row': row_index, 'position': position, 'name': name, 'start': start,
+                                   'missing': [], 'message': f'Unknown {entity_race} entity "{name}"'})
+                    continue
+                duration = entity.get('buildTime')
+                if duration is None:
+                    duration = entity_duration(self.index.entities[(entity_race, entity_key(name))]) or 0
+                steps.append((start, start + duration, entity_id, row_index, position, entity_race))
+
+        # Only the build's own race has prerequisites to check against
+        finished = self.starting.get(race, 0)
+        needs = self.needs.get(race, [])
+        completions = sorted((end, entity_id) for _, end, entity_id, _, _, step_race in steps if step_race == race)
+        done = 0
+        for start, _, entity_id, row_index, position, step_race in sorted(steps, key=lambda s: (s[0], s[3], s[4])):
+            while done < len(completions) and completions[done][0] <= start + EPSILON:
+                finished |= 1 << completions[done][1]
+                done += 1
+            if step_race != race:
+                continue
+            missing = needs[entity_id] & ~finished
+            if missing:
+                names = self.missing_names(race, missing)
+                name = self.names[race][entity_id]
+                errors.append({'row': row_index, 'position': position, 'name': name, 'start': start,
+                               'missing': names,
+                               'message': f'{name} at {format_game_time(start)} (row {row_index}, position {position}) '
+                                          f'needs {", ".join(names)}'})
+        errors.sort(key=lambda error: (error['start'], error['row'], error['position']))
+        return {'ok': not errors, 'race': race, 'errors': errors}
+
+    def validate_many(self, build_orders: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Validate a batch; a malformed build gives a single error instead of raising."""
+        results = []
+        for build_order in build_orders:
+            try:
+                results.append(self.validate(build_order))
+            except Exception as e:
+                # One bad build must not abort the batch
+                message = str(e) if isinstance(e, BuildOrderError) else f'Invalid build order: {e}'
+                results.append({'ok': False, 'race': None, 'errors': [{'message': message}]})
+        return results
@@ -0,0 +1,224 @@
+"""Opt-in per-request profiling.
+
+When ``PROFILING_ENABLED`` is set, requests carrying an ``X-Profile`` header or a
+``profile`` query parameter are run under a deterministic profiler and the result
+is stored under ``PROFILING_DIR`` as a cProfile ``.pstats`` file or a speedscope
+JSON document. Streamed responses (SSE, NDJSON) are profiled only up to their
+first chunk. When profiling is disabled nothing is installed.
+"""
+
+import cProfile
+import itertools
+import json
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from flask import Flask, jsonify, send_from_directory
+from werkzeug.wsgi import ClosingIterator
+
+
+PROFILE_FORMATS = {
+    'pstats': '.pstats',
+    'speedscope': '.speedscope.json'
+}
+
+_TRUTHY = {'1', 'true', 'yes', 'on'}
+
+
+class SpeedscopeProfiler:
+    """Record call/return events into a speedscope evented profile."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.frames: List[Dict[str, Any]] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._stack: List[int] = []
+        self._start = 0.0
+        self._end = 0.0
+
+    def _frame(self, name: str, filename: str, line: int) -> int:
+        key = (name, filename, line)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({'name': name, 'file': filename, 'line': line})
+        return index
+
+    def _trace(self, frame, event, arg):
+        now = time.perf_counter() - self._start
+        if event == 'call':
+            code = frame.f_code
+            index = self._frame(code.co_qualname if hasattr(code, 'co_qualname') else code.co_name,
+                                code.co_filename, code.co_firstlineno)
+        elif event == 'c_call':
+            module = getattr(arg, '__module__', None) or 'builtins'
+            index = self._frame(f"{module}.{getattr(arg, '__qualname__', repr(arg))}", '<built-in>', 0)
+        else:
+            # 'return', 'c_return' and 'c_exception' close the innermost open frame;
+            # returns from frames entered before profiling started are ignored
+            if self._stack:
+                self.events.append({'type': 'C', 'frame': self._stack.pop(), 'at': now})
+            return
+        self._stack.append(index)
+        self.events.append({'type': 'O', 'frame': index, 'at': now})
+
+    def start(self):
+        self._start = time.perf_counter()
+        sys.setprofile(self._trace)
+
+    def stop(self):
+        sys.setprofile(None)
+        self._end = time.perf_counter() - self._start
+        while self._stack:
+            self.events.append({'type': 'C', 'frame': self._stack.pop(), 'at': self._end})
+
+    def dump(self, path: Path):
+        document = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': self.frames},
+            'profiles': [{
+                'type': 'evented',
+                'name': self.name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': self._end,
+                'events': self.events
+            }],
+            'name': self.name,
+            'exporter': 'sc2_gantt'
+        }
+        with open(path, 'w') as f:
+            json.dump(document, f)
+
+
+class _PstatsProfiler:
+    """Adapter giving cProfile the same start/stop/dump interface."""
+
+    def __init__(self, name: str):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def dump(self, path: Path):
+        self._profile.dump_stats(str(path))
+
+
+class ProfilingMiddleware:
+    """WSGI middleware that profiles requests which ask for it."""
+
+    def __init__(self, wsgi_app, profile_dir: Path, max_profiles: int = 50,
+                 default_format: str = 'pstats'):
+        self.wsgi_app = wsgi_app
+        self.profile_dir = Path(profile_dir)
+        self.max_profiles = max_profiles
+        self.default_format = default_format
+
+    def requested_format(self, environ) -> Optional[str]:
+        """Return the profile format requested by header or query flag, if any."""
+        value = environ.get('HTTP_X_PROFILE')
+        query = environ.get('QUERY_STRING', '')
+        if value is None and 'profile=' in query:
+            value = parse_qs(query).get('profile', [None])[0]
+        if value is None:
+            return None
+        value = value.lower()
+        if value in PROFILE_FORMATS:
+            return value
+        return self.default_format if value in _TRUTHY else None
+
+    def __call__(self, environ, start_response):
+        profile_format = self.requested_format(environ)
+        if profile_format is None:
+            return self.wsgi_app(environ, start_response)
+
+        path = environ.get('PATH_INFO', '/')
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', path).strip('-') or 'index'
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}{PROFILE_FORMATS[profile_format]}"
+
+        streamed = []
+
+        def profiled_start_response(status, headers, exc_info=None):
+            headers.append(('X-Profile-Id', filename))
+            fields = {name.lower(): value for name, value in headers}
+            # SSE and NDJSON responses carry no Content-Length and may never end
+            streamed.append('content-length' not in fields
+                            or fields.get('content-type', '').startswith('text/event-stream'))
+            return start_response(status, headers, exc_info)
+
+        profiler = (SpeedscopeProfiler if profile_format == 'speedscope' else _PstatsProfiler)(
+            f"{environ.get('REQUEST_METHOD', 'GET')} {path}"
+        )
+        profiler.start()
+        try:
+            result = self.wsgi_app(environ, profiled_start_response)
+            try:
+                if streamed and streamed[-1]:
+                    # Profile streams only until their first chunk, then pass the rest through
+                    chunks = iter(result)
+                    first = list(itertools.islice(chunks, 1))
+                    body = ClosingIterator(itertools.chain(first, chunks), getattr(result, 'close', None))
+                    result = None
+                else:
+                    body = list(result)
+            finally:
+                if result is not None and hasattr(result, 'close'):
+                    result.close()
+        finally:
+            profiler.stop()
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump(self.profile_dir / filename)
+            self.prune()
+        return body
+
+    def list_profiles(self) -> List[Path]:
+        """Return stored profiles, newest first."""
+        if not self.profile_dir.exists():
+            return []
+        profiles = [p for p in self.profile_dir.iterdir()
+                    if p.is_file() and p.name.endswith(tuple(PROFILE_FORMATS.values()))]
+        return sorted(profiles, key=lambda p: p.stat().st_mtime, reverse=True)
+
+    def prune(self):
+        """Delete the oldest profiles beyond the retention limit."""
+        for stale in self.list_profiles()[self.max_profiles:]:
+            stale.unlink(missing_ok=True)
+
+
+def init_profiling(app: Flask) -> Optional[ProfilingMiddleware]:
+    """Install the profiling middleware and download routes if enabled in config."""
+    if not app.config.get('PROFILING_ENABLED'):
+        return None
+
+    profile_dir = Path(app.config.get('PROFILING_DIR') or Path(app.instance_path) / 'profiles')
+    middleware = ProfilingMiddleware(
+        app.wsgi_app,
+        profile_dir,
+        max_profiles=app.config.get('PROFILING_MAX_FILES', 50),
+        default_format=app.config.get('PROFILING_FORMAT', 'pstats')
+    )
+    app.wsgi_app = middleware  # type: ignore[method-assign]
+
+    @app.route('/profiles')
+    def list_profiles():
+        """List stored request profiles, newest first."""
+        return jsonify([
+            {'id': p.name, 'size': p.stat().st_size, 'created': p.stat().st_mtime}
+            for p in middleware.list_profiles()
+        ])
+
+    @app.route('/profiles/<path:profile_id>')
+    def download_profile(profile_id):
+        """Download a stored request profile."""
+        return send_from_directory(str(middleware.profile_dir), profile_id, as_attachment=True)
+
+    return middleware
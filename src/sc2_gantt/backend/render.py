@@ -0,0 +1,513 @@
+"""Server-side Gantt chart rendering of build orders to SVG and PNG.
+
+The chart mirrors the frontend: one lane per row, bars coloured by race and
+sized by build time, entity icons from ``assets/icons`` and a time axis. A
+single layout pass produces positioned shapes that both the SVG writer and
+the Pillow (PNG) painter draw, so the two formats always agree.
+``render_batch`` renders whole directories of build-order files across a
+process pool for the ``sc2_gantt render`` command, and ``icon_placeholders``
+gives the palette tiny previews to show while the full icons load.
+"""
+
+import base64
+import glob
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw, ImageFont
+
+from .build_order import BuildOrderError, GameDataIndex, entity_duration, format_game_time, summarize_build_order
+
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / 'assets'
+
+# Pixels per second, the frontend's default zoom
+DEFAULT_SCALE = 3.0
+
+PADDING = 10
+HEADER_HEIGHT = 28
+LABEL_WIDTH = 56
+ROW_HEIGHT = 60
+BAR_HEIGHT = 50
+AXIS_HEIGHT = 22
+ICON_SIZE = 36
+# Icons are decoded once and kept at this size (cropped square, like object-fit: cover)
+ICON_SOURCE_SIZE = 64
+# Side of the blurred icon previews shown before an icon has loaded
+PLACEHOLDER_SIZE = 8
+MIN_DURATION = 60
+# Charts are drawn from unauthenticated share codes, so their size is bounded
+MAX_DURATION = 3600
+MAX_ROWS = 64
+MAX_PIXELS = 16_000_000
+TICK_STEPS = (10, 15, 30, 60, 120, 300, 600)
+MIN_TICK_SPACING = 50
+CHAR_WIDTH = 6
+
+# Catppuccin Frappé, as in gantt.css: (fill, border)
+RACE_COLORS = {
+    'protoss': ('#e5c890', '#f1d5a7'),
+    'terran': ('#8caaee', '#a6c3f0'),
+    'zerg': ('#ca9ee6', '#d7b1ea')
+}
+DEFAULT_COLORS = ('#a6d189', '#81c995')
+BACKGROUND = '#303446'
+LANE = '#414559'
+GRID = '#626880'
+TEXT = '#c6d0f5'
+TEXT_DARK = '#232634'
+CHRONOBOOST = '#f2d5cf'
+
+
+class Bar(NamedTuple):
+    x: float
+    y: float
+    width: float
+    height: float
+    fill: str
+    border: str
+    dashed: bool
+    name: str
+    label: Optional[str]
+    icon: Optional[Path]
+    icon_size: int
+    chronoboosted: bool
+    start: float
+    end: float
+
+
+class ChartLayout(NamedTuple):
+    width: int
+    height: int
+    title: str
+    summary: str
+    lanes: List[Tuple[float, str]]
+    ticks: List[Tuple[float, str]]
+    bars: List[Bar]
+
+
+def render_key(code: str) -> str:
+    """Content hash for a canonical build (its share code), used in ``/render`` URLs."""
+    return hashlib.sha256(code.encode('ascii')).hexdigest()[:20]
+
+
+class IconCache:
+    """Decoded, cropped entity icons, kept as Pillow images and JPEG data URIs."""
+
+    def __init__(self, assets_dir: Path = ASSETS_DIR, max_entries: int = 512):
+        self.assets_dir = Path(assets_dir)
+        self.max_entries = max_entries
+        self._images: 'OrderedDict[Path, Optional[Image.Image]]' = OrderedDict()
+        self._uris: Dict[Path, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, data: Dict[str, Any]) -> Optional[Path]:
+        """Resolve an entity's ``href`` (``/assets/icons/...``) below the assets directory."""
+        href = data.get('href') or ''
+        if not href.startswith('/assets/'):
+            return None
+        path = self.assets_dir / href[len('/assets/'):]
+        return path if path.is_file() else None
+
+    def image(self, path: Path) -> Optional[Image.Image]:
+        """Return the icon as an RGB square of ``ICON_SOURCE_SIZE``, or None if it cannot be read."""
+        with self._lock:
+            if path in self._images:
+                self._images.move_to_end(path)
+                return self._images[path]
+        try:
+            with Image.open(path) as source:
+                source = source.convert('RGB')
+                side = min(source.size)
+                left, top = (source.width - side) // 2, (source.height - side) // 2
+                icon = source.crop((left, top, left + side, top + side)).resize(
+                    (ICON_SOURCE_SIZE, ICON_SOURCE_SIZE), Image.LANCZOS)
+        except OSError:
+            icon = None
+        with self._lock:
+            self._images[path] = icon
+            while len(self._images) > self.max_entries:
+                evicted, _ = self._images.popitem(last=False)
+                self._uris.pop(evicted, None)
+        return icon
+
+    def data_uri(self, path: Path) -> Optional[str]:
+        """Return the icon as a small embedded JPEG for SVG output."""
+        if path in self._uris:
+            return self._uris[path]
+        icon = self.image(path)
+        uri = None
+        if icon is not None:
+            buffer = io.BytesIO()
+            icon.save(buffer, 'JPEG', quality=85)
+            uri = 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+        with self._lock:
+            if path in self._images:
+                self._uris[path] = uri
+        return uri
+
+    def placeholder(self, path: Path) -> Optional[str]:
+        """Return the icon shrunk to ``PLACEHOLDER_SIZE`` pixels as a PNG data URI."""
+        icon = self.image(path)
+        if icon is None:
+            return None
+        buffer = io.BytesIO()
+        icon.resize((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX).save(buffer, 'PNG', optimize=True)
+        return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def icon_placeholders(sc2_data: Dict[str, Any], icons: Optional[IconCache] = None) -> Dict[str, str]:
+    """``{href: data URI}`` of a tiny preview for every entity icon in ``sc2_data``."""
+    icons = icons or IconCache()
+    placeholders = {}
+    for data in GameDataIndex(sc2_data).entities.values():
+        path = icons.path_for(data)
+        if path is not None and data['href'] not in placeholders:
+            uri = icons.placeholder(path)
+            if uri is not None:
+                placeholders[data['href']] = uri
+    return placeholders
+
+
+def _tick_step(scale: float) -> int:
+    for step in TICK_STEPS:
+        if step * scale >= MIN_TICK_SPACING:
+            return step
+    return TICK_STEPS[-1]
+
+
+def chart_size(build_order: Dict[str, Any], scale: float = DEFAULT_SCALE,
+               summary: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+    """Width and height in pixels of a build's chart; BuildOrderError if it is too large to draw."""
+    summary = summary or summarize_build_order(build_order)
+    if summary['completion_time'] > MAX_DURATION:
+        raise BuildOrderError(f'Charts are limited to {format_game_time(MAX_DURATION)} of game time')
+    if len(build_order['rows']) > MAX_ROWS:
+        raise BuildOrderError(f'Charts are limited to {MAX_ROWS} rows')
+    duration = max(summary['completion_time'], MIN_DURATION)
+    width = int(PADDING + LABEL_WIDTH + duration * scale + PADDING)
+    height = int(PADDING + HEADER_HEIGHT + max(len(build_order['rows']), 1) * ROW_HEIGHT + AXIS_HEIGHT + PADDING)
+    if width * height > MAX_PIXELS:
+        raise BuildOrderError(f'Chart of {width}x{height} pixels exceeds the limit of {MAX_PIXELS} pixels')
+    return width, height
+
+
+def layout_chart(build_order: Dict[str, Any], index: GameDataIndex, icons: IconCache,
+                 scale: float = DEFAULT_SCALE) -> ChartLayout:
+    """Position lanes, bars and axis ticks for a build order."""
+    summary = summarize_build_order(build_order)
+    chart_width, chart_height = chart_size(build_order, scale, summary)
+    race = summary['race']
+    duration = max(summary['completion_time'], MIN_DURATION)
+    origin_x = PADDING + LABEL_WIDTH
+    origin_y = PADDING + HEADER_HEIGHT
+    rows = build_order['rows']
+
+    lanes = []
+    bars = []
+    for row_index, row in enumerate(rows):
+        lane_y = origin_y + row_index * ROW_HEIGHT
+        lanes.append((lane_y, f'Row {row_index + 1}'))
+        for entity in sorted(row.get('entities', []), key=lambda e: e['startTime']):
+            entity_race = (entity.get('race') or race).lower()
+            data = index.lookup(entity_race, entity['name']) or {}
+            start = entity['startTime']
+            build_time = entity.get('buildTime', entity_duration(data) or 0)
+            width = max(build_time * scale, 2)
+            fill, border = RACE_COLORS.get(entity_race, DEFAULT_COLORS)
+            count = int(entity.get('chronoboostCount') or 0)
+
+            label = f'{build_time:g}s' + (f' CB{count}' if count else '')
+            if len(label) * CHAR_WIDTH + 4 > width:
+                label = None
+            icon_size = int(min(ICON_SIZE, width - 4, BAR_HEIGHT - 16))
+            icon = icons.path_for(data) if icon_size >= 12 else None
+            bars.append(Bar(
+                x=origin_x + start * scale, y=lane_y + (ROW_HEIGHT - BAR_HEIGHT) / 2, width=width,
+                height=BAR_HEIGHT, fill=fill, border=border,
+                dashed=(entity.get('type') or data.get('type') or '').startswith('upgrade'),
+                name=data.get('name', entity['name']), label=label, icon=icon, icon_size=icon_size,
+                chronoboosted=bool(entity.get('chronoboosted')), start=start, end=start + build_time
+            ))
+
+    step = _tick_step(scale)
+    ticks = [(origin_x + t * scale, format_game_time(t)) for t in range(0, int(duration) + 1, step)]
+    title = (build_order.get('metadata') or {}).get('name') or f'{race.capitalize()} build order'
+    summary_text = (f"{summary['total_minerals']}/{summary['total_gas']}  "
+                    f"done {format_game_time(summary['completion_time'])}")
+    return ChartLayout(
+        width=chart_width, height=chart_height, title=title, summary=summary_text, lanes=lanes, ticks=ticks, bars=bars
+    )
+
+
+def render_svg(layout: ChartLayout, icons: IconCache) -> str:
+    """Draw a layout as a standalone SVG document with embedded icons."""
+    axis_y = layout.height - PADDING - AXIS_HEIGHT
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{layout.width}" height="{layout.height}" viewBox="0 0 {layout.width} {layout.height}" '
+        f'font-family="Arial, sans-serif" font-size="10">',
+        f'<rect width="100%" height="100%" fill="{BACKGROUND}"/>',
+        f'<text x="{PADDING}" y="{PADDING + 14}" fill="{TEXT}" font-size="14" font-weight="bold">'
+        f'{escape(layout.title)}</text>',
+        f'<text x="{layout.width - PADDING}" y="{PADDING + 14}" fill="{TEXT}" text-anchor="end">'
+        f'{escape(layout.summary)}</text>'
+    ]
+
+    symbols: Dict[Path, str] = {}
+    defs = []
+    for bar in layout.bars:
+        if bar.icon is not None and bar.icon not in symbols:
+            uri = icons.data_uri(bar.icon)
+            if uri is not None:
+                symbols[bar.icon] = f'i{len(symbols)}'
+                defs.append(f'<symbol id="{symbols[bar.icon]}" viewBox="0 0 {ICON_SOURCE_SIZE} {ICON_SOURCE_SIZE}">'
+                            f'<image width="{ICON_SOURCE_SIZE}" height="{ICON_SOURCE_SIZE}" '
+                            f'xlink:href="{uri}"/></symbol>')
+    if defs:
+        parts.append('<defs>' + ''.join(defs) + '</defs>')
+
+    for lane_y, label in layout.lanes:
+        parts.append(f'<rect x="{PADDING + LABEL_WIDTH}" y="{lane_y}" width="{layout.width - 2 * PADDING - LABEL_WIDTH}" '
+                     f'height="{ROW_HEIGHT - 4}" fill="{LANE}"/>')
+        parts.append(f'<text x="{PADDING}" y="{lane_y + ROW_HEIGHT / 2 + 4}" fill="{TEXT}">{escape(label)}</text>')
+    for x, label in layout.ticks:
+        parts.append(f'<line x1="{x:g}" y1="{PADDING + HEADER_HEIGHT}" x2="{x:g}" y2="{axis_y + 4}" '
+                     f'stroke="{GRID}" stroke-width="1"/>')
+        parts.append(f'<text x="{x:g}" y="{axis_y + 16}" fill="{TEXT}" text-anchor="middle">{label}</text>')
+
+    for bar in layout.bars:
+        dash = ' stroke-dasharray="4 2"' if bar.dashed else ''
+        stroke = CHRONOBOOST if bar.chronoboosted else bar.border
+        parts.append(f'<g><title>{escape(bar.name)} {format_game_time(bar.start)}-{format_game_time(bar.end)}</title>'
+                     f'<rect x="{bar.x:g}" y="{bar.y:g}" width="{bar.width:g}" height="{bar.height:g}" rx="3" '
+                     f'fill="{bar.fill}" stroke="{stroke}" stroke-width="2"{dash}/>')
+        if bar.icon in symbols:
+            parts.append(f'<use xlink:href="#{symbols[bar.icon]}" x="{bar.x + (bar.width - bar.icon_size) / 2:g}" '
+                         f'y="{bar.y + 3:g}" width="{bar.icon_size}" height="{bar.icon_size}"/>')
+        if bar.label:
+            parts.append(f'<text x="{bar.x + bar.width / 2:g}" y="{bar.y + bar.height - 3:g}" fill="{TEXT_DARK}" '
+                         f'text-anchor="middle" font-weight="bold">{escape(bar.label)}</text>')
+        parts.append('</g>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def render_png(layout: ChartLayout, icons: IconCache) -> bytes:
+    """Paint a layout with Pillow and return PNG bytes."""
+    image = Image.new('RGB', (layout.width, layout.height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    axis_y = layout.height - PADDING - AXIS_HEIGHT
+
+    draw.text((PADDING, PADDING + 2), layout.title, fill=TEXT, font=font)
+    summary_width = draw.textlength(layout.summary, font=font)
+    draw.text((layout.width - PADDING - summary_width, PADDING + 2), layout.summary, fill=TEXT, font=font)
+
+    for lane_y, label in layout.lanes:
+        draw.rectangle([PADDING + LABEL_WIDTH, lane_y, layout.width - PADDING - 1, lane_y + ROW_HEIGHT - 5], fill=LANE)
+        draw.text((PADDING, lane_y + ROW_HEIGHT / 2 - 5), label, fill=TEXT, font=font)
+    for x, label in layout.ticks:
+        draw.line([(x, PADDING + HEADER_HEIGHT), (x, axis_y + 4)], fill=GRID)
+        draw.text((x - draw.textlength(label, font=font) / 2, axis_y + 8), label, fill=TEXT, font=font)
+
+    for bar in layout.bars:
+        outline = CHRONOBOOST if bar.chronoboosted else bar.border
+        draw.rectangle([bar.x, bar.y, bar.x + bar.width - 1, bar.y + bar.height - 1], fill=bar.fill,
+                       outline=outline, width=1 if bar.dashed else 2)
+        if bar.icon is not None:
+            icon = icons.image(bar.icon)
+            if icon is not None:
+                image.paste(icon.resize((bar.icon_size, bar.icon_size), Image.BILINEAR),
+                            (int(bar.x + (bar.width - bar.icon_size) / 2), int(bar.y + 3)))
+        if bar.label:
+            label_width = draw.textlength(bar.label, font=font)
+            draw.text((bar.x + (bar.width - label_width) / 2, bar.y + bar.height - 13), bar.label,
+                      fill=TEXT_DARK, font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Render build orders against one game data set, reusing decoded icons across charts."""
+
+    FORMATS = ('svg', 'png')
+
+    def __init__(self, sc2_data: Dict[str, Any], assets_dir: Path = ASSETS_DIR,
+                 scale: float = DEFAULT_SCALE, icons: Optional[IconCache] = None):
+        self.index = GameDataIndex(sc2_data)
+        self.icons = icons or IconCache(assets_dir)
+        self.scale = scale
+
+    def render(self, build_order: Dict[str, Any], fmt: str) -> bytes:
+        """Return the chart as ``svg`` or ``png`` bytes."""
+        if fmt not in self.FORMATS:
+            raise ValueError(f'Unsupported format "{fmt}"')
+        layout = layout_chart(build_order, self.index, self.icons, self.scale)
+        if fmt == 'svg':
+            return render_svg(layout, self.icons).encode('utf-8')
+        return render_png(layout, self.icons)
+
+
+class RenderCache:
+    """LRU of canonical builds and their rendered images, keyed by ``render_key``."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put_build(self, key: str, build_order: Dict[str, Any]):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = {'build': build_order}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_build(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry['build']
+
+    def get_image(self, key: str, fmt: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.get(fmt) if entry else None
+
+    def put_image(self, key: str, fmt: str, content: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[fmt] = content
+
+
+# ---------------------------------------------------------------------------
+# Batch rendering
+# ---------------------------------------------------------------------------
+
+DATA_PATH = ASSETS_DIR / 'sc2_comprehensive_data.json'
+
+# Per-process renderer, created once by the pool initializer so icons are decoded once per worker
+_worker_renderer: Optional[ChartRenderer] = None
+
+
+def collect_build_files(sources: List[str], pattern: str = '*.json') -> List[Tuple[Path, Path]]:
+    """Expand directories (searched for ``pattern``) and globs into ``(file, path relative to its source)`` pairs."""
+    found: Dict[Path, Path] = {}
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = [(p, p.relative_to(path)) for p in sorted(path.rglob(pattern))]
+        elif path.is_file():
+            matches = [(path, Path(path.name))]
+        else:
+            matches = [(Path(p), Path(Path(p).name)) for p in sorted(glob.glob(source, recursive=True))]
+        for file_path, relative in matches:
+            if file_path.is_file():
+                found.setdefault(file_path.resolve(), relative)
+    return list(found.items())
+
+
+def write_atomic(path: Path, content: bytes):
+    """Write via a temporary file in the same directory so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _init_worker(data_path: str, scale: float):
+    global _worker_renderer
+    with open(data_path) as f:
+        _worker_renderer = ChartRenderer(json.load(f), scale=scale)
+
+
+def _render_file(task: Tuple[str, List[Tuple[str, str]]]) -> Tuple[str, int, Optional[str]]:
+    """Render one build file to each ``(format, output path)``; returns ``(file, bytes, error)``."""
+    source, outputs = task
+    try:
+        with open(source) as f:
+            build_order = json.load(f)
+        if isinstance(build_order, dict) and isinstance(build_order.get('document'), dict):
+            # A stored build as returned by GET /api/builds/<id>
+            build_order = build_order['document']
+        written = 0
+        for fmt, output in outputs:
+            content = _worker_renderer.render(build_order, fmt)
+            write_atomic(Path(output), content)
+            written += len(content)
+        return source, written, None
+    except Exception as e:
+        # Reported as this file's failure; an exception escaping pool.map would abort the batch
+        return source, 0, str(e) or type(e).__name__
+
+
+def render_batch(sources: List[str], output_dir: Path, formats: Tuple[str, ...] = ('png',),
+                 workers: Optional[int] = None, data_path: Path = DATA_PATH,
+                 scale: float = DEFAULT_SCALE, force: bool = False) -> Dict[str, Any]:
+    """Render every build-order file in ``sources`` across a process pool.
+
+    Outputs mirror each file's path below its source directory. Files whose
+    outputs are newer than the input are skipped unless ``force`` is set.
+    """
+    for fmt in formats:
+        if fmt not in ChartRenderer.FORMATS:
+            raise ValueError(f'Unsupported format "{fmt}"')
+    tasks = []
+    skipped = 0
+    for source, relative in collect_build_files(sources):
+        outputs = [(fmt, str(Path(output_dir) / relative.with_suffix(f'.{fmt}'))) for fmt in formats]
+        mtime = source.stat().st_mtime
+        if not force and all(os.path.exists(o) and os.path.getmtime(o) >= mtime for _, o in outputs):
+            skipped += 1
+            continue
+        tasks.append((str(source), outputs))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(str(data_path), scale)
+        results = [_render_file(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(data_path), scale)) as pool:
+            results = list(pool.map(_render_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    seconds = time.perf_counter() - start
+
+    failed = [(source, error) for source, _, error in results if error is not None]
+    rendered = len(results) - len(failed)
+    return {
+        'rendered': rendered,
+        'skipped': skipped,
+        'failed': failed,
+        'images': rendered * len(formats),
+        'bytes': sum(size for _, size, _ in results),
+        'workers': workers,
+        'seconds': seconds,
+        'files_per_second': rendered / seconds if seconds > 0 else 0.0
+    }
@@ -0,0 +1,396 @@
+"""Build orders extracted from StarCraft II replays.
+
+A ``.SC2Replay`` file is an MPQ archive. ``mpyq`` reads it and Blizzard's
+``s2protocol`` decodes it for the replay's game version. Both are optional
+(``pip install sc2_gantt[replays]``) and are only imported when a replay is
+read. The build comes from the tracker events:
+
+- trained units are born when they finish, so they start one build time earlier
+- buildings and warped-in units start at their init event and count once done;
+  cancelled or destroyed ones never complete and are dropped
+- morphs (Lair, Orbital Command, Baneling...) count when the unit changes type
+- upgrades count when research completes
+
+Units that are not build-order steps (larvae, MULEs, creep tumors...) and
+everything present at the start of the game are left out. Each player's steps
+are packed into as few non-overlapping rows as possible, in the export format
+``/export/build-order`` accepts.
+
+``ingest_replays`` runs over whole directories of replays across a process
+pool for the ``sc2_gantt replays`` command. At most a few replays per worker
+are in flight at once, and each build is written as soon as it is extracted.
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .build_order import GameDataIndex, entity_duration, entity_key, normalize_build_order
+from .render import DATA_PATH, collect_build_files, write_atomic
+
+
+# Game loops per second of game time at "faster" speed, the unit of the game data
+GAME_LOOPS_PER_SECOND = 22.4
+
+# Replays queued per worker process; bounds memory however many replays there are
+TASKS_PER_WORKER = 4
+
+# Tracker unit type names that differ from the data's names
+UNIT_ALIASES = {
+    'VikingFighter': 'Viking',
+    'HellionTank': 'Hellbat',
+    'ThorAP': 'Thor',
+    'BarracksReactor': 'Reactor',
+    'FactoryReactor': 'Reactor',
+    'StarportReactor': 'Reactor',
+    'BarracksTechLab': 'Tech Lab',
+    'FactoryTechLab': 'Tech Lab',
+    'StarportTechLab': 'Tech Lab',
+    'RefineryRich': 'Refinery',
+    'AssimilatorRich': 'Assimilator',
+    'ExtractorRich': 'Extractor',
+    'LurkerMP': 'Lurker',
+    'LurkerDenMP': 'Lurker Den',
+    'OverlordTransport': 'Ventral Sacs Overlord'
+}
+
+# Tracker upgrade names that differ from the data's names; leveled upgrades are mapped by LEVELED_UPGRADES
+UPGRADE_ALIASES = {
+    'ShieldWall': 'Combat Shield',
+    'PunisherGrenades': 'Concussive Shells',
+    'BansheeCloak': 'Cloaking Field',
+    'BansheeSpeed': 'Hyperflight Rotors',
+    'HighCapacityBarrels': 'Igniter',
+    'DrillClaws': 'Drilling Claws',
+    'HiSecAutoTracking': 'Sec Auto Tracking',
+    'TerranBuildingArmor': 'Neosteel Armor',
+    'MedivacCaduceusReactor': 'Caduceus Reactor',
+    'MedivacIncreaseSpeedBoost': 'Rapid Reignition System',
+    'LiberatorAGRangeUpgrade': 'Advanced Ballistics',
+    'BattlecruiserEnableSpecializations': 'Weapon Refit',
+    'WarpGateResearch': 'Warp Gate',
+    'BlinkTech': 'Blink',
+    'AdeptPiercingAttack': 'Resonating Glaives',
+    'PsiStormTech': 'Psionic Storm',
+    'DarkTemplarBlinkUpgrade': 'Shadow Stride',
+    'ObserverGraviticBooster': 'Gravitic Boosters',
+    'PhoenixRangeUpgrade': 'Crystals',
+    'VoidRaySpeedUpgrade': 'Flux Vanes',
+    'TempestGroundAttackUpgrade': 'Tectonic Destabilizers',
+    'zerglingmovementspeed': 'Metabolic Boost',
+    'zerglingattackspeed': 'Adrenal Glands',
+    'overlordspeed': 'Pneumatized Carapace',
+    'CentrificalHooks': 'Centrifugal Hooks',
+    'EvolveGroovedSpines': 'Grooved Spines',
+    'EvolveMuscularAugments': 'Muscular Augments',
+    'InfestorEnergyUpgrade': 'Pathogen Glands',
+    'DiggingClaws': 'Adaptive Talons',
+    'LurkerRange': 'Seismic Spines'
+}
+
+# (race, tracker category) -> data name of "<Race><Category>Level<N>" upgrades
+LEVELED_UPGRADES = {
+    ('terran', 'InfantryWeapons'): 'Infantry Weapons',
+    ('terran', 'InfantryArmors'): 'Infantry Armor',
+    ('terran', 'VehicleWeapons'): 'Vehicle Weapons',
+    ('terran', 'ShipWeapons'): 'Ship Weapons',
+    ('terran', 'VehicleAndShipArmors'): 'Vehicle and Ship Plating',
+    ('protoss', 'GroundWeapons'): 'Ground Weapons',
+    ('protoss', 'GroundArmors'): 'Ground Armor',
+    ('protoss', 'AirWeapons'): 'Air Weapons',
+    ('protoss', 'AirArmors'): 'Air Armor',
+    ('protoss', 'Shields'): 'Shields',
+    ('zerg', 'MeleeWeapons'): 'Melee Attacks',
+    ('zerg', 'MissileWeapons'): 'Missile Attacks',
+    ('zerg', 'GroundArmors'): 'Ground Carapace',
+    ('zerg', 'FlyerWeapons'): 'Flyer Attacks',
+    ('zerg', 'FlyerArmors'): 'Flyer Carapace'
+}
+_LEVELED_RE = re.compile(r'^(Terran|Protoss|Zerg)(\w+?)Level(\d)$')
+
+# Units that appear in the data but are not steps of a build order
+IGNORED_UNITS = {
+    'larva', 'broodling', 'changeling', 'interceptor', 'auto-turret', 'mule', 'creep_tumor',
+    'flying_locust', 'landed_locust', 'stasis_ward', 'warp_gate'
+}
+
+# Entities made by a unit changing type; other type changes (sieging, burrowing, lifting off) are ignored
+MORPHS = {
+    'lair', 'hive', 'greater_spire', 'orbital_command', 'planetary_fortress', 'baneling', 'ravager',
+    'lurker', 'brood_lord', 'overseer', 'ventral_sacs_overlord'
+}
+
+_CLAN_TAG_RE = re.compile(r'^&lt;.*?&gt;<sp/>')
+
+
+class ReplayError(ValueError):
+    """Raised when a replay cannot be read."""
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def _text(value: Any) -> str:
+    return value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+
+
+def _protocol():
+    """Import ``mpyq`` and ``s2protocol``, which are only needed to read replays."""
+    try:
+        import mpyq
+        from s2protocol import versions
+    except ImportError as e:
+        raise ReplayError(f'Reading replays needs the optional "{e.name}" package: '
+                          'pip install "sc2_gantt[replays]" (or: pip install mpyq s2protocol)') from e
+    return mpyq, versions
+
+
+def read_replay(path: Path) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """Return a replay's ``{map, players, base_build}`` and an iterator over its tracker events.
+
+    Players are ``{id, name, race}`` with the ids used by the tracker events.
+    The events are decoded lazily, one at a time.
+    """
+    mpyq, versions = _protocol()
+    try:
+        archive = mpyq.MPQArchive(str(path))
+        header = versions.latest().decode_replay_header(archive.header['user_data_header']['content'])
+        base_build = header['m_version']['m_baseBuild']
+        try:
+            protocol = versions.build(base_build)
+        except ImportError:
+            raise ReplayError(f'Unsupported game version (base build {base_build}); update s2protocol')
+        details = protocol.decode_replay_details(archive.read_file('replay.details'))
+        tracker = archive.read_file('replay.tracker.events')
+    except ReplayError:
+        raise
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ReplayError(f'Not a readable replay: {e}') from e
+    if not tracker:
+        raise ReplayError('Replay has no tracker events (recorded before patch 2.0.8)')
+
+    players = [{'id': slot + 1, 'name': _CLAN_TAG_RE.sub('', _text(player['m_name'])),
+                'race': _text(player['m_race'])}
+               for slot, player in enumerate(details['m_playerList'])]
+    metadata = {'map': _text(details['m_title']), 'players': players, 'base_build': base_build}
+    return metadata, protocol.decode_replay_tracker_events(tracker)
+
+
+class ReplayExtractor:
+    """Turn decoded tracker events into build orders against one game data set."""
+
+    def __init__(self, sc2_data: Dict[str, Any]):
+        self.index = GameDataIndex(sc2_data)
+        self.units: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self.upgrades: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for race, race_data in sc2_data.get('races', {}).items():
+            for entity in race_data.get('detailed_data', {}).values():
+                if entity_key(entity['name']) not in IGNORED_UNITS:
+                    self.units.setdefault(_normalize(entity['name']), (race, entity))
+            for upgrade in race_data.get('upgrades', {}).values():
+                self.upgrades.setdefault((race, _normalize(upgrade['name'])), upgrade)
+
+    def unit(self, type_name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """``(race, data)`` of a tracker unit type, or None if it is not a build-order step."""
+        return self.units.get(_normalize(UNIT_ALIASES.get(type_name, type_name)))
+
+    def upgrade(self, type_name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """``(race, data)`` of a tracker upgrade, or None if the data does not have it."""
+        leveled = _LEVELED_RE.match(type_name)
+        if leveled:
+            race = leveled.group(1).lower()
+            name = LEVELED_UPGRADES.get((race, leveled.group(2)))
+            data = self.upgrades.get((race, _normalize(f'{name} Level {leveled.group(3)}'))) if name else None
+            return (race, data) if data else None
+        name = _normalize(UPGRADE_ALIASES.get(type_name, type_name))
+        return next(((race, data) for (race, key), data in self.upgrades.items() if key == name), None)
+
+    def extract(self, metadata: Dict[str, Any], events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One build order per player who built anything, in player order."""
+        steps: Dict[int, List[Tuple[float, str, Dict[str, Any]]]] = {}
+        owners: Dict[Tuple[int, int], int] = {}
+        pending: Dict[Tuple[int, int], Tuple[int, float, str, Dict[str, Any]]] = {}
+        morphed = set()
+
+        def add(player: int, start: float, race: str, data: Dict[str, Any]):
+            steps.setdefault(player, []).append((round(max(0.0, start), 1), race, data))
+
+        for event in events:
+            kind = event.get('_event', '').rsplit('.', 1)[-1]
+            seconds = event.get('_gameloop', 0) / GAME_LOOPS_PER_SECOND
+            tag = (event.get('m_unitTagIndex'), event.get('m_unitTagRecycle'))
+
+            if kind == 'SUnitBornEvent':
+                owners[tag] = event['m_controlPlayerId']
+                resolved = self.unit(_text(event['m_unitTypeName']))
+                if resolved and event.get('_gameloop', 0) > 0:
+                    add(owners[tag], seconds - (entity_duration(resolved[1]) or 0), *resolved)
+            elif kind == 'SUnitInitEvent':
+                owners[tag] = event['m_controlPlayerId']
+                resolved = self.unit(_text(event['m_unitTypeName']))
+                if resolved:
+                    pending[tag] = (owners[tag], seconds, *resolved)
+            elif kind == 'SUnitDoneEvent':
+                if tag in pending:
+                    add(*pending.pop(tag))
+            elif kind == 'SUnitDiedEvent':
+                pending.pop(tag, None)
+                owners.pop(tag, None)
+            elif kind == 'SUnitTypeChangeEvent':
+                resolved = self.unit(_text(event['m_unitTypeName']))
+                if (resolved and tag in owners and entity_key(resolved[1]['name']) in MORPHS
+                        and (tag, resolved[1]['name']) not in morphed):
+                    morphed.add((tag, resolved[1]['name']))
+                    add(owners[tag], seconds - (entity_duration(resolved[1]) or 0), *resolved)
+            elif kind == 'SUpgradeEvent':
+                resolved = self.upgrade(_text(event['m_upgradeTypeName']))
+                if resolved and event.get('_gameloop', 0) > 0 and event.get('m_count', 1) > 0:
+                    add(event['m_playerId'], seconds - (entity_duration(resolved[1]) or 0), *resolved)
+
+        builds = []
+        for player in metadata.get('players', []):
+            if steps.get(player['id']):
+                builds.append(self._build_order(metadata, player, steps[player['id']]))
+        return builds
+
+    def _build_order(self, metadata: Dict[str, Any], player: Dict[str, Any],
+                     steps: List[Tuple[float, str, Dict[str, Any]]]) -> Dict[str, Any]:
+        races = [race for _, race, _ in steps]
+        # The details' race name is localized, so go by what the player built
+        race = max(set(races), key=races.count)
+        rows: List[List[Dict[str, Any]]] = []
+        ends: List[float] = []
+        for start, entity_race, data in sorted(steps, key=lambda step: (step[0], step[2]['name'])):
+            duration = entity_duration(data) or 0
+            entity = {'name': data['name'], 'type': data.get('type'), 'race': entity_race, 'startTime': start,
+                      'buildTime': duration, 'minerals': data.get('minerals', 0), 'gas': data.get('gas', 0)}
+            row = next((i for i, end in enumerate(ends) if end <= start + 1e-6), None)
+            if row is None:
+                rows.append([])
+                ends.append(0.0)
+                row = len(rows) - 1
+            rows[row].append(entity)
+            ends[row] = start + duration
+
+        build_order = {
+            'metadata': {'name': f"{player['name']} on {metadata.get('map', 'unknown map')}",
+                         'race': race, 'player': player['name'], 'map': metadata.get('map'),
+                         'replay': metadata.get('replay')},
+            'rows': [{'rowIndex': i, 'entities': entities} for i, entities in enumerate(rows)]
+        }
+        return normalize_build_order(build_order, self.index)
+
+
+# ---------------------------------------------------------------------------
+# Batch ingestion
+# ---------------------------------------------------------------------------
+
+# Per-process extractor, created once by the pool initializer
+_worker_extractor: Optional[ReplayExtractor] = None
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^\w-]+', '_', name).strip('_') or 'player'
+
+
+def _init_worker(data_path: str):
+    global _worker_extractor
+    with open(data_path) as f:
+        _worker_extractor = ReplayExtractor(json.load(f))
+
+
+def _ingest_file(task: Tuple[str, str, Optional[str]]) -> Tuple[str, int, Optional[str]]:
+    """Extract one replay and write a build file per player; returns ``(replay, builds, error)``."""
+    source, output, player_name = task
+    try:
+        metadata, events = read_replay(Path(source))
+        metadata['replay'] = Path(source).name
+        builds = _worker_extractor.extract(metadata, events)
+        if player_name:
+            builds = [b for b in builds if b['metadata']['player'].lower() == player_name.lower()]
+        for slot, build in enumerate(builds, 1):
+            path = Path(f"{output}.{slot}-{_slug(build['metadata']['player'])}.json")
+            write_atomic(path, json.dumps(build, indent=2).encode('utf-8'))
+        return source, len(builds), None
+    except Exception as e:
+        # Tracker events decode lazily, so a truncated replay fails inside extract()
+        # with s2protocol's own errors; one bad file must not abort the batch
+        return source, 0, str(e) or type(e).__name__
+
+
+def _start_pool(workers: int, data_path: Path) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(data_path),))
+
+
+def _future_result(future: Future, source: str) -> Tuple[str, int, Optional[str]]:
+    try:
+        return future.result()
+    except Exception as e:
+        # A crashed worker process fails the replays it had in hand
+        return source, 0, str(e) or type(e).__name__
+
+
+def ingest_replays(sources: List[str], output_dir: Path, workers: Optional[int] = None,
+                   data_path: Path = DATA_PATH, player: Optional[str] = None) -> Dict[str, Any]:
+    """Extract build orders from every replay in ``sources`` across a process pool.
+
+    Each replay gives ``<name>.<slot>-<player>.json`` files (only ``player``'s
+    if given), mirroring the replay's path below its source directory.
+    """
+    _protocol()
+    tasks = [(str(source), str(Path(output_dir) / relative.with_suffix('')), player)
+             for source, relative in collect_build_files(sources, '*.SC2Replay')]
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    start = time.perf_counter()
+    results = []
+    if workers == 1:
+        _init_worker(str(data_path))
+        results = [_ingest_file(task) for task in tasks]
+    else:
+        pending = deque(tasks)
+        running: Dict[Future, str] = {}
+        pool = _start_pool(workers, data_path)
+        try:
+            while pending or running:
+                broken = False
+                while pending and len(running) < workers * TASKS_PER_WORKER:
+                    try:
+                        running[pool.submit(_ingest_file, pending[0])] = pending[0][0]
+                    except BrokenProcessPool:
+                        broken = True
+                        break
+                    pending.popleft()
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    if broken or any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                        # A worker process died: the replays in flight fail with it
+                        # and the rest go to a fresh pool
+                        done, _ = wait(running)
+                        broken = True
+                    for future in done:
+                        results.append(_future_result(future, running.pop(future)))
+                if broken and pending:
+                    pool.shutdown()
+                    pool = _start_pool(workers, data_path)
+        finally:
+            pool.shutdown()
+    seconds = time.perf_counter() - start
+
+    failed = [(source, error) for source, _, error in results if error is not None]
+    ingested = len(results) - len(failed)
+    return {
+        'replays': ingested,
+        'failed': failed,
+        'builds': sum(count for _, count, _ in results),
+        'workers': workers,
+        'seconds': seconds,
+        'replays_per_second': ingested / seconds if seconds > 0 else 0.0
+    }
@@ -34,6 +34,31 @@ def main():
         help="Delay between requests in seconds (default: 1.0)"
     )
     
+    parser.add_argument(
+        "--telemetry-log",
+        type=str,
+        help="Write per-phase timing and progress events to this JSONL file"
+    )
+    
+    parser.add_argument(
+        "--base-page-url",
+        type=str,
+        help="Wiki page base URL, e.g. a local corpus server (default: Liquipedia)"
+    )
+    
+    parser.add_argument(
+        "--base-image-url",
+        type=str,
+        help="Image host base URL, e.g. a local corpus server (default: Liquipedia)"
+    )
+    
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=2,
+        help="Retries for throttled (429) or failed (5xx) requests (default: 2)"
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -41,7 +66,11 @@ def main():
         scraper = SC2ComprehensiveScraper(
             output_dir=args.output,
             max_workers=args.max_workers,
-            delay=args.delay
+            delay=args.delay,
+            telemetry_log=args.telemetry_log,
+            base_page_url=args.base_page_url,
+            base_image_url=args.base_image_url,
+            max_retries=args.max_retries
         )
         
         data = scraper.run()
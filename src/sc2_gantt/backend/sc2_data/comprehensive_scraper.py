@@ -11,6 +11,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
 import io
 
+from .telemetry import ScrapeTelemetry
+
 
 class SC2ComprehensiveScraper:
     """Comprehensive scraper for all SC2 entities (units, buildings, upgrades) across all races."""
@@ -29,7 +31,13 @@ class SC2ComprehensiveScraper:
     
     # Upgrades are extracted from individual unit/building pages, not separate pages
     
-    def __init__(self, output_dir: str = None, max_workers: int = 5, delay: float = 1.0):
+    # Throttling and transient server errors are retried with backoff
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    
+    def __init__(self, output_dir: str = None, max_workers: int = 5, delay: float = 1.0,
+                 telemetry_log: Optional[str] = None, base_page_url: Optional[str] = None,
+                 base_image_url: Optional[str] = None, max_retries: int = 2,
+                 retry_backoff: float = 1.0, max_backoff: float = 60.0, timeout: float = 30.0):
         if output_dir is None:
             package_dir = Path(__file__).parent.parent.parent
             self.output_dir = package_dir / "assets"
@@ -41,6 +49,46 @@ class SC2ComprehensiveScraper:
         
         self.max_workers = max_workers
         self.delay = delay  # Delay between requests to be respectful
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff  # Upper bound on any retry wait, including Retry-After
+        self.timeout = timeout  # Seconds to wait for a connection or response before retrying
+        
+        # Point at a different host, e.g. a local recorded-corpus server
+        if base_page_url:
+            self.BASE_PAGE_URL = base_page_url
+        if base_image_url:
+            self.BASE_IMAGE_URL = base_image_url
+        
+        # Per-phase timings (fetch, parse, icon conversion, queue wait, sleep)
+        self.telemetry = ScrapeTelemetry(telemetry_log)
+        
+    def _fetch(self, url: str, phase: str = 'fetch_page') -> requests.Response:
+        """GET a URL with the scraper headers, retrying throttled or failed requests."""
+        attempt = 0
+        while True:
+            with self.telemetry.span(phase, url=url, attempt=attempt) as event:
+                try:
+                    response = requests.get(url, headers=self.HEADERS, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    event['error'] = str(e)
+                    response = None
+                else:
+                    event['status'] = response.status_code
+                    event['bytes'] = len(response.content)
+                    if attempt >= self.max_retries or response.status_code not in self.RETRY_STATUSES:
+                        response.raise_for_status()
+                        return response
+            
+            retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+            wait = float(retry_after) if retry_after.isdigit() else self.retry_backoff * 2 ** attempt
+            wait = min(wait, self.max_backoff)
+            status = response.status_code if response is not None else None
+            with self.telemetry.span('retry_backoff', url=url, status=status):
+                time.sleep(wait)
+            attempt += 1
         
     def extract_entities_from_statistics(self, page_name: str, entity_type: str) -> Dict[str, List[Dict[str, str]]]:
         """Extract all entities from a statistics page."""
@@ -48,13 +96,17 @@ class SC2ComprehensiveScraper:
         print(f"Extracting {entity_type} from: {url}")
         
         try:
-            response = requests.get(url, headers=self.HEADERS)
-            response.raise_for_status()
+            response = self._fetch(url)
         except requests.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return {}
-            
-        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        with self.telemetry.span('parse', url=url):
+            return self._parse_statistics_page(response.text, entity_type)
+    
+    def _parse_statistics_page(self, html: str, entity_type: str) -> Dict[str, List[Dict[str, str]]]:
+        """Parse the per-race entity tables of a statistics page."""
+        soup = BeautifulSoup(html, 'html.parser')
         tables = soup.find_all("table", class_="wikitable")
         
         races = ["Protoss", "Terran", "Zerg"]
@@ -327,13 +379,17 @@ class SC2ComprehensiveScraper:
         url = urljoin(self.BASE_PAGE_URL, page_name)
         
         try:
-            response = requests.get(url, headers=self.HEADERS)
-            response.raise_for_status()
+            response = self._fetch(url)
         except requests.RequestException as e:
             print(f"Error fetching {url}: {e}")
             return None, []
-            
-        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        with self.telemetry.span('parse', url=url):
+            return self._parse_entity_page(response.text, entity, url)
+    
+    def _parse_entity_page(self, html: str, entity: Dict[str, str], url: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Parse an entity page into its detailed data and upgrades."""
+        soup = BeautifulSoup(html, 'html.parser')
         
         # Extract upgrades from this page
         upgrades = self.extract_upgrades_from_entity_page(soup, entity)
@@ -540,14 +596,12 @@ class SC2ComprehensiveScraper:
         """Extract what the entity unlocks."""
         return self._extract_field_from_infobox(infobox, ["unlocked tech", "unlocks", "allows", "enables"])
     
-    def download_icon(self, icon_url: str, name: str, race: str, entity_type: str) -> bool:
-        """Download icon, convert to JPG, and save to race-specific and type-specific subfolder."""
-        try:
-            response = requests.get(icon_url, headers=self.HEADERS)
-            response.raise_for_status()
-            
+    def _save_icon_as_jpg(self, content: bytes, save_path: Path, icon_url: str):
+        """Decode downloaded image bytes and save them as a JPG, timing each step."""
+        with self.telemetry.span('icon_decode', url=icon_url):
             # Convert image to JPG using PIL
-            image = Image.open(io.BytesIO(response.content))
+            image = Image.open(io.BytesIO(content))
+            image.load()
             
             # Convert to RGB if necessary (for transparency handling)
             if image.mode in ('RGBA', 'LA', 'P'):
@@ -559,6 +613,16 @@ class SC2ComprehensiveScraper:
                 image = background
             elif image.mode != 'RGB':
                 image = image.convert('RGB')
+        
+        with self.telemetry.span('icon_encode', url=icon_url) as event:
+            # Save as JPG with high quality
+            image.save(save_path, 'JPEG', quality=95)
+            event['bytes'] = save_path.stat().st_size
+    
+    def download_icon(self, icon_url: str, name: str, race: str, entity_type: str) -> bool:
+        """Download icon, convert to JPG, and save to race-specific and type-specific subfolder."""
+        try:
+            response = self._fetch(icon_url, phase='fetch_icon')
             
             race_dir = self.icons_dir / race.lower()
             type_dir = race_dir / f"{entity_type}s"  # 'units' or 'buildings'
@@ -566,9 +630,7 @@ class SC2ComprehensiveScraper:
             
             # Always save as .jpg
             save_path = type_dir / f"{name.lower().replace(' ', '_')}.jpg"
-            
-            # Save as JPG with high quality
-            image.save(save_path, 'JPEG', quality=95)
+            self._save_icon_as_jpg(response.content, save_path, icon_url)
                 
             return True
             
@@ -579,22 +641,7 @@ class SC2ComprehensiveScraper:
     def download_upgrade_icon(self, icon_url: str, upgrade_name: str, race: str) -> bool:
         """Download upgrade icon, convert to JPG, and save to race-specific upgrades subfolder."""
         try:
-            response = requests.get(icon_url, headers=self.HEADERS)
-            response.raise_for_status()
-            
-            # Convert image to JPG using PIL
-            image = Image.open(io.BytesIO(response.content))
-            
-            # Convert to RGB if necessary (for transparency handling)
-            if image.mode in ('RGBA', 'LA', 'P'):
-                # Create white background for transparency
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                if image.mode == 'P':
-                    image = image.convert('RGBA')
-                background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-                image = background
-            elif image.mode != 'RGB':
-                image = image.convert('RGB')
+            response = self._fetch(icon_url, phase='fetch_icon')
             
             race_dir = self.icons_dir / race.lower()
             upgrades_dir = race_dir / "upgrades"
@@ -603,9 +650,7 @@ class SC2ComprehensiveScraper:
             # Create filename - handle level-specific names properly and normalize whitespace
             filename = self._normalize_filename(upgrade_name).replace('level_', 'level')
             save_path = upgrades_dir / f"{filename}.jpg"
-            
-            # Save as JPG with high quality
-            image.save(save_path, 'JPEG', quality=95)
+            self._save_icon_as_jpg(response.content, save_path, icon_url)
                 
             return True
             
@@ -613,6 +658,11 @@ class SC2ComprehensiveScraper:
             print(f"Error downloading upgrade icon {icon_url}: {e}")
             return False
     
+    def _extract_entity_data_queued(self, entity: Dict[str, str], submitted: float) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run extract_entity_data in a worker, recording how long the task waited in the queue."""
+        self.telemetry.record('queue_wait', time.perf_counter() - submitted, entity=entity['name'])
+        return self.extract_entity_data(entity)
+    
     def scrape_all_entities(self) -> Dict[str, Any]:
         """Scrape all entities (units, buildings, upgrades) for all races."""
         print("Starting comprehensive SC2 data scraping...")
@@ -665,7 +715,7 @@ class SC2ComprehensiveScraper:
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 # Submit all scraping tasks
                 future_to_entity = {
-                    executor.submit(self.extract_entity_data, entity): entity
+                    executor.submit(self._extract_entity_data_queued, entity, time.perf_counter()): entity
                     for entity in race_data['entities']
                 }
                 
@@ -697,12 +747,22 @@ class SC2ComprehensiveScraper:
                         if entity_upgrades:
                             all_upgrades_by_race[race].extend(entity_upgrades)
                             print(f"   Found {len(entity_upgrades)} upgrades")
+                        
+                        self.telemetry.progress(
+                            entity=entity['name'], race=race, processed=processed, total=total_entities,
+                            ok=bool(entity_data), upgrades=len(entity_upgrades)
+                        )
                             
                     except Exception as e:
                         print(f"❌ ({processed}/{total_entities}) {entity['name']} - Error: {e}")
+                        self.telemetry.progress(
+                            entity=entity['name'], race=race, processed=processed, total=total_entities,
+                            ok=False, error=str(e)
+                        )
                     
                     # Respectful delay
-                    time.sleep(self.delay)
+                    with self.telemetry.span('rate_limit_sleep'):
+                        time.sleep(self.delay)
         
         # Aggregate upgrades by race
         print(f"\n=== Aggregating Upgrades ===")
@@ -760,4 +820,12 @@ class SC2ComprehensiveScraper:
             upgrade_count = len(race_data.get('upgrades', {}))
             print(f"✅ {race.capitalize()}: {detailed_count}/{total_count} entities, {upgrade_count} upgrades")
         
+        print(f"\n{'='*50}")
+        print("PHASE TIMINGS")
+        print(f"{'='*50}")
+        print(self.telemetry.format_summary())
+        if self.telemetry.log_path:
+            print(f"✅ Telemetry log: {self.telemetry.log_path}")
+        self.telemetry.close()
+        
         return data
\ No newline at end of file
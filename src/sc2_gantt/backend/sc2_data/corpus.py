@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Recorded Liquipedia corpus and a local stand-in server for offline scrape benchmarks.
+
+Record the pages and icons fetched by a real scrape::
+
+    python -m sc2_gantt.backend.sc2_data.corpus record corpora --version 2025-09
+
+Replay them with simulated network conditions and point the scraper at it::
+
+    python -m sc2_gantt.backend.sc2_data.corpus serve corpora/2025-09 --latency 80 --jitter 40 --throttle-rate 0.05
+    sc2_data --base-page-url http://127.0.0.1:8765/starcraft2/ --base-image-url http://127.0.0.1:8765
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+from .comprehensive_scraper import SC2ComprehensiveScraper
+
+
+def corpus_key(url: str) -> str:
+    """Normalize a URL (or request path) to the key it is stored under."""
+    parts = urlsplit(url)
+    key = unquote(parts.path)
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+class Corpus:
+    """A versioned, content-addressed store of recorded HTTP responses."""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str, version: Optional[str] = None):
+        self.path = Path(path)
+        self.files_dir = self.path / 'files'
+        self._lock = threading.Lock()
+        manifest_path = self.path / 'manifest.json'
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+            if self.manifest.get('format') != self.FORMAT_VERSION:
+                raise ValueError(f"Unsupported corpus format {self.manifest.get('format')} in {self.path}")
+        else:
+            self.manifest = {
+                'format': self.FORMAT_VERSION,
+                'version': version or self.path.name,
+                'recorded_at': time.time(),
+                'entries': {}
+            }
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest['entries']
+
+    def add(self, url: str, content: bytes, content_type: Optional[str] = None):
+        """Store a response body under the URL's path."""
+        digest = hashlib.sha256(content).hexdigest()
+        if not content_type:
+            content_type = mimetypes.guess_type(urlsplit(url).path)[0] or 'application/octet-stream'
+        extension = mimetypes.guess_extension(content_type.split(';')[0].strip()) or ''
+        filename = f"{digest[:16]}{extension}"
+
+        with self._lock:
+            self.files_dir.mkdir(parents=True, exist_ok=True)
+            file_path = self.files_dir / filename
+            if not file_path.exists():
+                file_path.write_bytes(content)
+            self.entries[corpus_key(url)] = {
+                'file': filename,
+                'content_type': content_type,
+                'bytes': len(content),
+                'sha256': digest
+            }
+
+    def lookup(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """Return the recorded body and content type for a request path."""
+        entry = self.entries.get(corpus_key(path))
+        if entry is None:
+            return None
+        return (self.files_dir / entry['file']).read_bytes(), entry['content_type']
+
+    def save(self) -> Path:
+        """Write the manifest and return its path."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.path / 'manifest.json'
+        with self._lock, open(manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        return manifest_path
+
+
+class RecordingScraper(SC2ComprehensiveScraper):
+    """Scraper that stores every successful page and icon response in a corpus."""
+
+    def __init__(self, corpus: Corpus, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.corpus = corpus
+
+    def _fetch(self, url: str, phase: str = 'fetch_page') -> requests.Response:
+        response = super()._fetch(url, phase)
+        self.corpus.add(url, response.content, response.headers.get('Content-Type'))
+        return response
+
+
+class CorpusServer:
+    """Local HTTP server replaying a corpus with configurable latency and failures."""
+
+    def __init__(self, corpus: Corpus, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1, seed: Optional[int] = None):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.stats = {'requests': 0, 'served': 0, 'errors': 0, 'throttled': 0, 'not_found': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def page_url(self) -> str:
+        """Value for the scraper's ``base_page_url``."""
+        return f"{self.base_url}/starcraft2/"
+
+    def _decide(self) -> Tuple[float, str]:
+        """Pick the simulated delay and outcome for one request."""
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return delay, 'throttled'
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 'errors'
+        return delay, 'served'
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                delay, outcome = server._decide()
+                if delay:
+                    time.sleep(delay)
+
+                if outcome == 'throttled':
+                    server._count(outcome)
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(server.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if outcome == 'errors':
+                    server._count(outcome)
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                recorded = server.corpus.lookup(self.path)
+                if recorded is None:
+                    server._count('not_found')
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                body, content_type = recorded
+                server._count('served')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'CorpusServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'CorpusServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def record_corpus(root: str, version: str, max_workers: int = 5, delay: float = 1.0) -> Corpus:
+    """Run a full scrape against Liquipedia and record every response."""
+    corpus = Corpus(str(Path(root) / version), version=version)
+    with tempfile.TemporaryDirectory() as scratch:
+        scraper = RecordingScraper(corpus, output_dir=scratch, max_workers=max_workers, delay=delay)
+        scraper.scrape_all_entities()
+    corpus.save()
+    return corpus
+
+
+def main():
+    """Entry point for the corpus record/serve CLI."""
+    parser = argparse.ArgumentParser(description="Record and replay a Liquipedia corpus for offline scraping")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record = subparsers.add_parser('record', help="Record pages and icons from Liquipedia")
+    record.add_argument('root', help="Corpus root directory")
+    record.add_argument('--version', default=time.strftime('%Y-%m-%d'),
+                        help="Corpus version name (default: today's date)")
+    record.add_argument('--max-workers', type=int, default=5)
+    record.add_argument('--delay', type=float, default=1.0)
+
+    serve = subparsers.add_parser('serve', help="Serve a recorded corpus locally")
+    serve.add_argument('corpus', help="Corpus directory (containing manifest.json)")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0, help="Base latency in ms")
+    serve.add_argument('--jitter', type=float, default=0.0, help="Uniform latency jitter in ms")
+    serve.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    serve.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    serve.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with 429s")
+    serve.add_argument('--seed', type=int, help="Random seed for reproducible runs")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        corpus = record_corpus(args.root, args.version, args.max_workers, args.delay)
+        print(f"✅ Recorded {len(corpus.entries)} responses to {corpus.path}")
+        return
+
+    corpus = Corpus(args.corpus)
+    server = CorpusServer(
+        corpus, host=args.host, port=args.port,
+        latency=args.latency / 1000, jitter=args.jitter / 1000,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"Serving corpus {corpus.manifest['version']} ({len(corpus.entries)} responses) at {server.base_url}")
+    print(f"  --base-page-url {server.page_url} --base-image-url {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStats: {server.stats}")
+        sys.exit(0)
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Per-phase timing and structured progress events for the scraper."""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Phases recorded by SC2ComprehensiveScraper, in pipeline order
+PHASES = ['queue_wait', 'fetch_page', 'parse', 'fetch_icon', 'icon_decode', 'icon_encode',
+          'retry_backoff', 'rate_limit_sleep']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ScrapeTelemetry:
+    """Thread-safe recorder of timed scraper events with an optional JSONL log."""
+
+    def __init__(self, log_path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.log_path = Path(log_path) if log_path else None
+        self._log = None
+        if self.log_path:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.log_path, 'w')
+
+    def record(self, phase: str, duration: float, **fields: Any):
+        """Record a completed phase with its duration in seconds."""
+        event = {'ts': round(time.time() - self._started, 6), 'event': 'phase', 'phase': phase,
+                 'duration': round(duration, 6), 'thread': threading.current_thread().name}
+        event.update(fields)
+        with self._lock:
+            self.events.append(event)
+            if self._log:
+                self._log.write(json.dumps(event) + '\n')
+
+    def progress(self, **fields: Any):
+        """Write a progress event to the log (not included in the phase summary)."""
+        event = {'ts': round(time.time() - self._started, 6), 'event': 'progress'}
+        event.update(fields)
+        with self._lock:
+            if self._log:
+                self._log.write(json.dumps(event) + '\n')
+                self._log.flush()
+
+    @contextmanager
+    def span(self, phase: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; extra fields may be added to the yielded dict."""
+        start = time.perf_counter()
+        extra: Dict[str, Any] = dict(fields)
+        try:
+            yield extra
+        except Exception as e:
+            extra['error'] = str(e)
+            raise
+        finally:
+            self.record(phase, time.perf_counter() - start, **extra)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate recorded events into count/total/p50/p95/max/bytes per phase."""
+        with self._lock:
+            events = list(self.events)
+
+        by_phase: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            by_phase.setdefault(event['phase'], []).append(event)
+
+        ordered = [p for p in PHASES if p in by_phase] + sorted(set(by_phase) - set(PHASES))
+        summary = {}
+        for phase in ordered:
+            durations = [e['duration'] for e in by_phase[phase]]
+            summary[phase] = {
+                'count': len(durations),
+                'total': sum(durations),
+                'p50': percentile(durations, 50),
+                'p95': percentile(durations, 95),
+                'max': max(durations),
+                'bytes': sum(e.get('bytes', 0) for e in by_phase[phase]),
+                'errors': sum(1 for e in by_phase[phase] if 'error' in e)
+            }
+        return summary
+
+    def format_summary(self) -> str:
+        """Render the per-phase summary as a plain-text table."""
+        header = f"{'phase':<18}{'count':>7}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'KiB':>10}{'errors':>8}"
+        lines = [header, '-' * len(header)]
+        for phase, stats in self.summary().items():
+            lines.append(
+                f"{phase:<18}{stats['count']:>7}{stats['total']:>10.2f}"
+                f"{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}{stats['max'] * 1000:>10.1f}"
+                f"{stats['bytes'] / 1024:>10.1f}{stats['errors']:>8}"
+            )
+        return '\n'.join(lines)
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
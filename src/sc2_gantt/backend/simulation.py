@@ -0,0 +1,362 @@
+"""Economy and supply simulation of build orders, with incremental re-simulation.
+
+Build steps are taken in order of requested start time. Each step starts at
+the earliest moment at or after its requested time when it is affordable,
+has supply, its required structures are finished, the previous step has
+started and its row (production queue) is free. The simulation advances
+mineral and gas income between completions and records when each step
+actually starts and ends.
+
+The economy model is a deliberate approximation:
+- about 0.94 minerals/s per worker, for up to 16 workers per base, then
+  0.33/s for the next 8
+- 0.9 gas/s for each of up to three workers per finished refinery
+- fixed supply values per unit and supply provider
+- larva and add-ons are not modelled
+
+The state after every step is checkpointed. ``IncrementalSimulation.update``
+restores the checkpoint just before the first step that differs from the
+previous build and re-simulates from there, so an edit late in the build
+costs only the steps after it. It returns the changed events as a diff.
+"""
+
+import heapq
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .build_order import (
+    BuildOrderError, GameDataIndex, STARTING_ENTITIES, check_entity, check_metadata, entity_duration, entity_key,
+    format_game_time
+)
+
+
+MINERAL_RATE = 0.94
+OVERSATURATED_MINERAL_RATE = 0.33
+WORKERS_PER_BASE = 16
+OVERSATURATION_PER_BASE = 8
+GAS_RATE = 0.9
+WORKERS_PER_GEYSER = 3
+STARTING_WORKERS = 12
+STARTING_MINERALS = 50
+EPSILON = 1e-6
+# Entity -> step memo entries kept by an incremental simulation
+STEP_CACHE_SIZE = 4096
+
+TOWN_HALLS = {'nexus', 'command_center', 'hatchery'}
+WORKERS = {'probe', 'scv', 'drone'}
+GEYSERS = {'assimilator', 'refinery', 'extractor'}
+# Zerg structures morphed from an existing structure rather than a drone
+ZERG_MORPHS = {'lair', 'hive', 'greater_spire'}
+
+SUPPLY_PROVIDED = {
+    'nexus': 15, 'command_center': 15, 'hatchery': 6,
+    'pylon': 8, 'supply_depot': 8, 'overlord': 8
+}
+
+# Supply cost per unit; morphs count only the difference from the unit they morph from
+SUPPLY_COST = {
+    'probe': 1, 'zealot': 2, 'adept': 2, 'stalker': 2, 'sentry': 2, 'high_templar': 2,
+    'dark_templar': 2, 'immortal': 4, 'colossus': 6, 'disruptor': 4, 'observer': 1,
+    'warp_prism': 2, 'phoenix': 2, 'oracle': 3, 'void_ray': 4, 'tempest': 5, 'carrier': 6,
+    'mothership': 8,
+    'scv': 1, 'marine': 1, 'marauder': 2, 'reaper': 1, 'ghost': 2, 'hellion': 2, 'hellbat': 2,
+    'widow_mine': 2, 'cyclone': 3, 'siege_tank': 3, 'thor': 6, 'viking': 2, 'medivac': 2,
+    'liberator': 3, 'raven': 2, 'banshee': 3, 'battlecruiser': 6,
+    'drone': 1, 'zergling': 1, 'queen': 2, 'roach': 2, 'ravager': 1, 'hydralisk': 2, 'lurker': 1,
+    'mutalisk': 2, 'corruptor': 2, 'brood_lord': 2, 'infestor': 2, 'swarm_host': 3,
+    'ultralisk': 6, 'viper': 3
+}
+
+STARTING_SUPPLY_CAP = {'protoss': 15, 'terran': 15, 'zerg': 14}
+
+
+class BuildStep(NamedTuple):
+    key: str
+    name: str
+    race: str
+    row: int
+    requested: float
+    build_time: float
+    minerals: int
+    gas: int
+    requirements: Tuple[str, ...]
+    consumes_worker: bool
+
+
+class EconomyState:
+    """Everything the simulation carries from one step to the next."""
+
+    __slots__ = ('time', 'minerals', 'gas', 'workers', 'bases', 'gas_slots', 'supply_used',
+                 'supply_cap', 'completed', 'pending', 'row_free', 'last_start')
+
+    def __init__(self, race: str):
+        self.time = 0.0
+        self.minerals = float(STARTING_MINERALS)
+        self.gas = 0.0
+        self.workers = STARTING_WORKERS
+        self.bases = 1
+        self.gas_slots = 0
+        self.supply_used = STARTING_WORKERS
+        self.supply_cap = STARTING_SUPPLY_CAP.get(race, 15)
+        self.completed: Dict[str, int] = dict.fromkeys(STARTING_ENTITIES.get(race, ()), 1)
+        # Heap of (end time, step index, key) for started but unfinished steps
+        self.pending: List[Tuple[float, int, str]] = []
+        self.row_free: Dict[int, float] = {}
+        self.last_start = 0.0
+
+    def copy(self) -> 'EconomyState':
+        clone = EconomyState.__new__(EconomyState)
+        for slot in self.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        clone.completed = dict(self.completed)
+        clone.pending = list(self.pending)
+        clone.row_free = dict(self.row_free)
+        return clone
+
+    def income(self) -> Tuple[float, float]:
+        """Current (minerals/s, gas/s)."""
+        gas_workers = min(self.gas_slots, self.workers)
+        mineral_workers = self.workers - gas_workers
+        saturated = min(mineral_workers, WORKERS_PER_BASE * self.bases)
+        extra = min(mineral_workers - saturated, OVERSATURATION_PER_BASE * self.bases)
+        return saturated * MINERAL_RATE + extra * OVERSATURATED_MINERAL_RATE, gas_workers * GAS_RATE
+
+    def _accrue(self, until: float):
+        if until > self.time:
+            mineral_rate, gas_rate = self.income()
+            self.minerals += mineral_rate * (until - self.time)
+            self.gas += gas_rate * (until - self.time)
+            self.time = until
+
+    def advance(self, until: float):
+        """Move time forward, applying every completion on the way."""
+        while self.pending and self.pending[0][0] <= until + EPSILON:
+            end, _, key = heapq.heappop(self.pending)
+            self._accrue(max(end, self.time))
+            self.completed[key] = self.completed.get(key, 0) + 1
+            self.supply_cap += SUPPLY_PROVIDED.get(key, 0)
+            if key in WORKERS:
+                self.workers += 1
+            elif key in TOWN_HALLS:
+                self.bases += 1
+            elif key in GEYSERS:
+                self.gas_slots += WORKERS_PER_GEYSER
+        self._accrue(until)
+
+
+class SimulationEvent(NamedTuple):
+    step: int
+    name: str
+    row: int
+    requested: float
+    start: float
+    end: float
+    minerals: int
+    gas: int
+    supply: str
+    warnings: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        event = self._asdict()
+        event['delay'] = round(self.start - self.requested, 3)
+        event['warnings'] = list(self.warnings)
+        return event
+
+
+def build_race(build_order: Dict[str, Any]) -> str:
+    """The race named in the metadata, else the most common entity race (as ``summarize_build_order``)."""
+    metadata = check_metadata(build_order)
+    if metadata.get('race'):
+        return metadata['race'].lower()
+    races = Counter(entity['race'].lower() for row in build_order['rows']
+                    for entity in row.get('entities', []) if entity.get('race'))
+    return races.most_common(1)[0][0] if races else 'unknown'
+
+
+def _make_step(entity: Dict[str, Any], row_index: int, race: str, index: GameDataIndex) -> BuildStep:
+    name, start = entity['name'], entity['startTime']
+    entity_race = (entity.get('race') or race).lower()
+    data = index.lookup(entity_race, name) or {}
+    key = entity_key(name)
+    return BuildStep(
+        key=key, name=data.get('name', name), race=entity_race, row=row_index, requested=float(start),
+        build_time=float(entity.get('buildTime', entity_duration(data) or 0)),
+        minerals=int(entity.get('minerals', data.get('minerals', 0)) or 0),
+        gas=int(entity.get('gas', data.get('gas', 0)) or 0),
+        requirements=tuple(entity_key(r) for r in data.get('requirements') or []
+                           if index.lookup(entity_race, r) is not None),
+        # Drones become the structures they build
+        consumes_worker=entity_race == 'zerg' and data.get('type') == 'building' and key not in ZERG_MORPHS
+    )
+
+
+def build_steps(build_order: Any, index: GameDataIndex,
+                cache: Optional[Dict[tuple, BuildStep]] = None) -> Tuple[str, List[BuildStep]]:
+    """Return the build's race and its steps in simulation order.
+
+    ``cache`` maps an entity's fields to its step so unchanged entities are
+    not looked up again on every edit.
+    """
+    if not isinstance(build_order, dict) or not isinstance(build_order.get('rows'), list):
+        raise BuildOrderError('Build order must be an object with a "rows" list')
+    for row in build_order['rows']:
+        if not isinstance(row, dict) or not isinstance(row.get('entities', []), list):
+            raise BuildOrderError('Each row must be an object with an "entities" list')
+        for entity in row.get('entities', []):
+            check_entity(entity)
+
+    race = build_race(build_order)
+    ordered = []
+    for row_index, row in enumerate(build_order['rows']):
+        for position, entity in enumerate(row.get('entities', [])):
+            fields = (row_index, race, entity.get('race'), entity.get('name'), entity.get('startTime'),
+                      entity.get('buildTime'), entity.get('minerals'), entity.get('gas'))
+            step = cache.get(fields) if cache is not None else None
+            if step is None:
+                step = _make_step(entity, row_index, race, index)
+                if cache is not None:
+                    if len(cache) >= STEP_CACHE_SIZE:
+                        cache.clear()
+                    cache[fields] = step
+            ordered.append(((step.requested, row_index, position), step))
+    ordered.sort(key=lambda item: item[0])
+    return race, [step for _, step in ordered]
+
+
+def _has_pending(state: EconomyState, key: str) -> bool:
+    return any(pending_key == key for _, _, pending_key in state.pending)
+
+
+def simulate_step(state: EconomyState, step_index: int, step: BuildStep) -> SimulationEvent:
+    """Start one step as early as allowed, mutating ``state``, and return its event."""
+    warnings = []
+    state.advance(max(step.requested, state.last_start, state.row_free.get(step.row, 0.0)))
+
+    missing = [r for r in step.requirements if not state.completed.get(r) and not _has_pending(state, r)]
+    for requirement in missing:
+        warnings.append(f'{step.name} requires {requirement.replace("_", " ")}, which is never built')
+    supply = SUPPLY_COST.get(step.key, 0)
+
+    while True:
+        waiting_for_requirement = any(
+            not state.completed.get(r) for r in step.requirements if r not in missing
+        )
+        supply_blocked = supply and state.supply_used + supply > state.supply_cap
+        if supply_blocked and not state.pending:
+            warnings.append(f'{step.name} is supply blocked at {state.supply_used}/{state.supply_cap}')
+            supply_blocked = False
+        mineral_rate, gas_rate = state.income()
+        short_minerals = step.minerals - state.minerals
+        short_gas = step.gas - state.gas
+        affordable = short_minerals <= EPSILON and short_gas <= EPSILON
+        if affordable and not waiting_for_requirement and not supply_blocked:
+            break
+
+        next_event = state.pending[0][0] if state.pending else float('inf')
+        target = next_event
+        if not waiting_for_requirement and not supply_blocked:
+            # Only resources are missing: jump to when the income covers them
+            need = 0.0
+            for short, rate in ((short_minerals, mineral_rate), (short_gas, gas_rate)):
+                if short > EPSILON:
+                    need = max(need, short / rate if rate > 0 else float('inf'))
+            target = min(next_event, state.time + need)
+        if target == float('inf'):
+            warnings.append(f'{step.name} can never be afforded')
+            break
+        state.advance(target)
+
+    start = state.time
+    state.minerals -= step.minerals
+    state.gas -= step.gas
+    state.supply_used += supply
+    if step.consumes_worker:
+        state.workers -= 1
+        state.supply_used -= 1
+    heapq.heappush(state.pending, (start + step.build_time, step_index, step.key))
+    state.row_free[step.row] = start + step.build_time
+    state.last_start = start
+
+    return SimulationEvent(
+        step=step_index, name=step.name, row=step.row, requested=step.requested,
+        start=round(start, 3), end=round(start + step.build_time, 3),
+        minerals=int(state.minerals), gas=int(state.gas),
+        supply=f'{state.supply_used}/{state.supply_cap}', warnings=tuple(warnings)
+    )
+
+
+class IncrementalSimulation:
+    """Simulate a build and re-simulate edits from the first changed step.
+
+    ``checkpoints[i]`` is the state after step ``i``; an update restores the
+    checkpoint before the first differing step instead of starting over.
+    """
+
+    def __init__(self, index: GameDataIndex):
+        self.index = index
+        self.race: Optional[str] = None
+        self.steps: List[BuildStep] = []
+        self.events: List[SimulationEvent] = []
+        self.checkpoints: List[EconomyState] = []
+        self.initial: Optional[EconomyState] = None
+        self.step_cache: Dict[tuple, BuildStep] = {}
+
+    def update(self, build_order: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulate ``build_order`` against the previous one and return the diff."""
+        race, steps = build_steps(build_order, self.index, self.step_cache)
+        first = 0
+        if race == self.race:
+            limit = min(len(steps), len(self.steps))
+            while first < limit and steps[first] == self.steps[first]:
+                first += 1
+        else:
+            self.race = race
+            self.initial = EconomyState(race)
+            self.steps, self.events, self.checkpoints = [], [], []
+
+        state = (self.checkpoints[first - 1] if first else self.initial).copy()
+        old_events = self.events
+        del self.checkpoints[first:]
+        events = old_events[:first]
+        for i in range(first, len(steps)):
+            events.append(simulate_step(state, i, steps[i]))
+            self.checkpoints.append(state.copy())
+
+        self.steps = steps
+        self.events = events
+        changed = [event.to_dict() for i, event in enumerate(events[first:], first)
+                   if i >= len(old_events) or old_events[i] != event]
+        return {
+            'race': race,
+            'from_step': first,
+            'recomputed': len(steps) - first,
+            'changed': changed,
+            'removed': list(range(len(steps), len(old_events))),
+            'total_steps': len(steps),
+            'summary': self.summary()
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.events:
+            return {'completion_time': 0, 'completion': format_game_time(0), 'supply': None,
+                    'workers': STARTING_WORKERS, 'warnings': 0}
+        final = self.checkpoints[-1]
+        completion = max(event.end for event in self.events)
+        return {
+            'completion_time': completion,
+            'completion': format_game_time(completion),
+            'supply': self.events[-1].supply,
+            'workers': final.workers + sum(1 for _, _, key in final.pending if key in WORKERS),
+            'warnings': sum(len(event.warnings) for event in self.events)
+        }
+
+
+def simulate_build_order(build_order: Dict[str, Any], index: GameDataIndex) -> Dict[str, Any]:
+    """Simulate a whole build once and return every event and the summary."""
+    simulation = IncrementalSimulation(index)
+    simulation.update(build_order)
+    return {
+        'race': simulation.race,
+        'events': [event.to_dict() for event in simulation.events],
+        'summary': simulation.summary()
+    }
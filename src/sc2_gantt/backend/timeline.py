@@ -0,0 +1,236 @@
+"""Point, range and aggregate queries over a simulated build.
+
+A build is simulated once (see ``simulation.py``) and indexed:
+
+- an interval tree of the steps' ``[start, end)`` intervals answers "what is
+  in production at 3:15" and "what overlaps 4:00-5:00"
+- every production structure (the producer named by the data's ``produces``
+  and upgrades' ``research_building``, plus the starting town hall) is one
+  instance; each step is assigned to the instance of its producer that is
+  free first, and a second interval tree of these busy intervals answers
+  "which production structures sit idle between 4:00 and 5:00"
+- prefix sums of minerals and gas spent and supply used, by start time, and
+  of supply provided, by completion, answer "how much was spent by 5:00"
+- completion times per entity answer "when does the second Medivac pop"
+
+Point and aggregate queries take O(log n) and range queries O(log n + k) for
+k results. Add-ons and larva are not modelled, as in the simulation.
+"""
+
+import bisect
+from itertools import accumulate
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .build_order import (
+    STARTING_ENTITIES, BuildOrderError, GameDataIndex, entity_key, format_game_time, parse_game_time
+)
+from .simulation import (
+    STARTING_SUPPLY_CAP, STARTING_WORKERS, SUPPLY_COST, SUPPLY_PROVIDED, TOWN_HALLS, IncrementalSimulation
+)
+
+
+EPSILON = 1e-6
+
+T = TypeVar('T')
+
+
+class IntervalTree(Generic[T]):
+    """Static interval tree over half-open ``[start, end)`` intervals.
+
+    The intervals are sorted by start and stored as an implicit balanced
+    binary search tree (the middle of each slice is its root), each node
+    keeping the largest end in its subtree so whole subtrees that end before
+    the query are skipped.
+    """
+
+    def __init__(self, intervals: List[Tuple[float, float, T]]):
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts = [start for start, _, _ in ordered]
+        self.ends = [end for _, end, _ in ordered]
+        self.items = [item for _, _, item in ordered]
+        self.max_end = list(self.ends)
+        self._augment(0, len(ordered))
+
+    def _augment(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float('-inf')
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._augment(lo, mid), self._augment(mid + 1, hi))
+        return self.max_end[mid]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def overlapping(self, start: float, end: float) -> List[T]:
+        """Items whose interval overlaps ``[start, end)``, in start order; ``start == end`` is a point query."""
+        found: List[int] = []
+        stack = [(0, len(self.items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] <= start + EPSILON:
+                continue
+            stack.append((lo, mid))
+            if self.starts[mid] < max(end, start + EPSILON):
+                if self.ends[mid] > start + EPSILON:
+                    found.append(mid)
+                stack.append((mid + 1, hi))
+        return [self.items[i] for i in sorted(found)]
+
+    def at(self, time: float) -> List[T]:
+        """Items whose interval contains ``time``."""
+        return self.overlapping(time, time)
+
+
+class BuildTimeline:
+    """A simulated build indexed for timeline queries."""
+
+    def __init__(self, build_order: Dict[str, Any], index: GameDataIndex):
+        self.index = index
+        simulation = IncrementalSimulation(index)
+        simulation.update(build_order)
+        self.race = simulation.race
+        self.summary = simulation.summary()
+        self.steps = simulation.steps
+        self.events = simulation.events
+        self.tree = IntervalTree([(event.start, event.end, i) for i, event in enumerate(self.events)])
+
+        # Aggregates change when a step starts (spending, supply) or ends (supply provided)
+        by_start = sorted(range(len(self.events)), key=lambda i: self.events[i].start)
+        self.start_times = [self.events[i].start for i in by_start]
+        self.minerals_spent = list(accumulate(self.steps[i].minerals for i in by_start))
+        self.gas_spent = list(accumulate(self.steps[i].gas for i in by_start))
+        self.supply_used = list(accumulate(
+            (SUPPLY_COST.get(self.steps[i].key, 0) - (1 if self.steps[i].consumes_worker else 0) for i in by_start),
+            initial=STARTING_WORKERS))[1:]
+        providers = sorted((event.end, SUPPLY_PROVIDED.get(self.steps[i].key, 0))
+                           for i, event in enumerate(self.events) if SUPPLY_PROVIDED.get(self.steps[i].key))
+        self.cap_times = [end for end, _ in providers]
+        self.supply_cap = list(accumulate((provided for _, provided in providers),
+                                          initial=STARTING_SUPPLY_CAP.get(self.race, 15)))[1:]
+
+        self.completions: Dict[str, List[float]] = {}
+        for i, event in sorted(enumerate(self.events), key=lambda item: item[1].end):
+            self.completions.setdefault(self.steps[i].key, []).append(event.end)
+
+        self.producers: List[Dict[str, Any]] = []
+        self.busy = IntervalTree(self._assign_producers())
+
+    def _producer_keys(self) -> Dict[str, List[str]]:
+        """Structure keys able to produce each entity key of the build's race."""
+        producers: Dict[str, List[str]] = {}
+        for (race, key), data in sorted(self.index.entities.items()):
+            if race != self.race:
+                continue
+            if data.get('type') == 'building':
+                for produced in data.get('produces') or []:
+                    producers.setdefault(entity_key(produced), []).append(key)
+            # Some upgrades name the unit they affect as their research building
+            building = entity_key(data.get('research_building') or '')
+            if self.index.entities.get((race, building), {}).get('type') == 'building':
+                producers.setdefault(key, []).append(building)
+        return producers
+
+    def _assign_producers(self) -> List[Tuple[float, float, Tuple[float, float, int]]]:
+        producer_keys = self._producer_keys()
+        structures = {key for keys in producer_keys.values() for key in keys}
+        instances: Dict[str, List[Dict[str, Any]]] = {}
+
+        def add_instance(key: str, ready: float):
+            data = self.index.entities.get((self.race, key), {})
+            instance = {'id': len(self.producers), 'key': key, 'name': data.get('name', key),
+                        'number': len(instances.get(key, [])) + 1, 'ready': ready, 'free': ready}
+            self.producers.append(instance)
+            instances.setdefault(key, []).append(instance)
+
+        for key in sorted(STARTING_ENTITIES.get(self.race, set()) & TOWN_HALLS & structures):
+            add_instance(key, 0.0)
+        for i in sorted(range(len(self.events)), key=lambda i: self.events[i].end):
+            if self.steps[i].key in structures:
+                add_instance(self.steps[i].key, self.events[i].end)
+
+        busy = []
+        for i in sorted(range(len(self.events)), key=lambda i: self.events[i].start):
+            event = self.events[i]
+            candidates = [instance for key in producer_keys.get(self.steps[i].key, [])
+                          for instance in instances.get(key, []) if instance['ready'] <= event.start + EPSILON]
+            if not candidates:
+                continue
+            instance = min(candidates, key=lambda c: (max(c['free'], event.start), c['id']))
+            instance['free'] = max(instance['free'], event.end)
+            busy.append((event.start, event.end, (event.start, event.end, instance['id'])))
+        return busy
+
+    def _event(self, i: int) -> Dict[str, Any]:
+        event = self.events[i]
+        return {'step': event.step, 'name': event.name, 'row': event.row,
+                'start': event.start, 'end': event.end}
+
+    def active(self, time: float) -> List[Dict[str, Any]]:
+        """Steps in production at ``time``."""
+        return [self._event(i) for i in self.tree.at(time)]
+
+    def overlapping(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Steps in production at any moment of ``[start, end)``."""
+        return [self._event(i) for i in self.tree.overlapping(start, end)]
+
+    def idle_producers(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Production structures standing during ``[start, end)`` with nothing queued for part of it."""
+        busy: Dict[int, float] = {}
+        for busy_start, busy_end, producer in self.busy.overlapping(start, end):
+            busy[producer] = busy.get(producer, 0.0) + min(busy_end, end) - max(busy_start, start)
+        idle = []
+        for producer in self.producers:
+            standing = end - max(start, producer['ready'])
+            idle_seconds = round(standing - busy.get(producer['id'], 0.0), 3)
+            if standing > EPSILON and idle_seconds > EPSILON:
+                idle.append({'name': producer['name'], 'number': producer['number'], 'ready': producer['ready'],
+                             'idle_seconds': idle_seconds, 'fully_idle': producer['id'] not in busy})
+        return idle
+
+    def completion(self, name: str, number: int = 1) -> Optional[float]:
+        """When the ``number``-th ``name`` finishes, or None if the build has fewer."""
+        ends = self.completions.get(entity_key(name), [])
+        return ends[number - 1] if 0 < number <= len(ends) else None
+
+    def resources(self, time: float) -> Dict[str, Any]:
+        """Minerals and gas spent on steps started by ``time``, and supply used and provided at ``time``."""
+        started = bisect.bisect_right(self.start_times, time + EPSILON)
+        finished = bisect.bisect_right(self.cap_times, time + EPSILON)
+        return {
+            'minerals_spent': self.minerals_spent[started - 1] if started else 0,
+            'gas_spent': self.gas_spent[started - 1] if started else 0,
+            'supply_used': self.supply_used[started - 1] if started else STARTING_WORKERS,
+            'supply_cap': self.supply_cap[finished - 1] if finished else STARTING_SUPPLY_CAP.get(self.race, 15)
+        }
+
+    def spent_between(self, start: float, end: float) -> Dict[str, int]:
+        """Minerals and gas spent on steps started in ``(start, end]``."""
+        before, after = self.resources(start), self.resources(end)
+        return {'minerals': after['minerals_spent'] - before['minerals_spent'],
+                'gas': after['gas_spent'] - before['gas_spent']}
+
+    def query(self, query: Dict[str, Any]) -> Any:
+        """Answer one query document of ``POST /api/timeline/query``."""
+        if not isinstance(query, dict):
+            raise BuildOrderError('Each query must be an object with a "type"')
+        kind = query.get('type')
+        if kind in ('active', 'resources'):
+            time = parse_game_time(query.get('at'))
+            return self.active(time) if kind == 'active' else self.resources(time)
+        if kind in ('overlapping', 'idle', 'spent'):
+            start, end = parse_game_time(query.get('from')), parse_game_time(query.get('to'))
+            if end < start:
+                raise BuildOrderError(f'Query range ends before it starts ({query.get("from")} - {query.get("to")})')
+            if kind == 'overlapping':
+                return self.overlapping(start, end)
+            return self.idle_producers(start, end) if kind == 'idle' else self.spent_between(start, end)
+        if kind == 'completion':
+            name, number = query.get('entity'), query.get('n', 1)
+            if not isinstance(name, str) or not isinstance(number, int) or number < 1:
+                raise BuildOrderError('A completion query needs an "entity" name and a positive "n"')
+            end = self.completion(name, number)
+            return {'time': end, 'game_time': format_game_time(end) if end is not None else None}
+        raise BuildOrderError(f'Unknown query type "{kind}"')
@@ -1,35 +1,119 @@
-from flask import Flask, render_template, send_from_directory, jsonify, send_file, Response
+from flask import Flask, render_template, send_from_directory, jsonify, send_file, Response, request, stream_with_context, url_for, has_request_context
 import os
 import json
 from pathlib import Path
 
+from .asset_pipeline import AssetPipeline
+from .build_codec import BuildCodec
+from .build_order import BuildOrderError, GameDataIndex, evaluate_build_order, iter_ndjson, normalize_build_order
+from .build_store import init_build_store
+from .compression import init_compression
+from .earliest import EarliestTable
+from .live import init_live
+from .metrics import get_metrics, init_metrics
+from .patches import PATCHES_DIR, PatchError, PatchStore
+from .prerequisites import PrerequisiteValidator
+from .profiling import init_profiling
+from .render import ChartRenderer, RenderCache, chart_size, icon_placeholders, render_key
+from .simulation import simulate_build_order
+from .timeline import BuildTimeline
+
 def error_response(message, status_code=500):
     """Helper to create consistent error responses."""
     return jsonify({'error': message}), status_code
 
-def create_app():
+def create_app(config=None):
     # Calculate paths relative to new directory structure
     backend_dir = Path(__file__).parent
     project_root = backend_dir.parent
     template_folder = str(project_root / 'frontend' / 'templates')
     static_folder = str(project_root / 'frontend')
+    data_path = project_root / 'assets' / 'sc2_comprehensive_data.json'
     
     app = Flask(__name__, 
                 template_folder=template_folder,
                 static_folder=static_folder)
+    app.config.update(config or {})
+    
+    # ASSET_PIPELINE serves minified, source-mapped bundles (disable to debug raw sources)
+    app.config.setdefault('ASSET_PIPELINE', True)
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('COMPRESS_RESPONSES', True)
+    app.config.setdefault('RENDER_CACHE_SIZE', 256)
+    app.config.setdefault('PATCHES_DIR', PATCHES_DIR)
+    asset_pipeline = AssetPipeline(Path(static_folder))
+    
+    # Metrics hooks are registered first so they observe the final (compressed) response
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+    init_compression(app)
+    init_profiling(app)
+    init_build_store(app)
+    
+    data_cache = {}
+    patch_store = PatchStore(app.config['PATCHES_DIR'])
+    
+    def requested_patch():
+        """The ``?patch=`` of the current request, or None for the current data file."""
+        return (request.args.get('patch') or None) if has_request_context() else None
+    
+    @app.before_request
+    def check_patch():
+        patch = requested_patch()
+        if patch is not None:
+            try:
+                patch_store.get(patch)
+            except PatchError as e:
+                return error_response(str(e), 404)
+    
+    def load_sc2_data():
+        """Load SC2 data, reusing the parsed copy until the file changes on disk.
+        
+        A request with ``?patch=`` gets that patch's data from the patch store instead.
+        """
+        patch = requested_patch()
+        if patch is not None:
+            return patch_store.get(patch)
+        mtime = data_path.stat().st_mtime
+        cached = data_cache.get('entry')
+        hit = cached is not None and cached[0] == mtime
+        
+        metrics = get_metrics(app)
+        if metrics is not None:
+            metrics.inc('sc2_gantt_data_cache_requests_total', (('result', 'hit' if hit else 'miss'),))
+        if hit:
+            return cached[1]
+        
+        with open(data_path, 'r') as f:
+            data = json.load(f)
+        data_cache['entry'] = (mtime, data)
+        return data
+    
+    @app.context_processor
+    def inject_asset_url():
+        def asset_url(filename):
+            if app.config['ASSET_PIPELINE']:
+                return url_for('serve_bundle', filename=filename)
+            return url_for('static', filename=filename)
+        return {'asset_url': asset_url}
     
     @app.route('/')
     def index():
         return render_template('index.html')
     
+    @app.route('/api/patches')
+    def get_patches():
+        """List the stored game data patches, oldest first."""
+        try:
+            return jsonify({'patches': patch_store.patches(), 'latest': patch_store.latest()})
+        except PatchError as e:
+            return error_response(str(e))
+    
     @app.route('/api/sc2-data')
     def get_sc2_data():
         """Serve SC2 comprehensive data as JSON API endpoint."""
         try:
-            data_path = project_root / 'assets' / 'sc2_comprehensive_data.json'
-            with open(data_path, 'r') as f:
-                data = json.load(f)
-            return jsonify(data)
+            return jsonify(load_sc2_data())
         except Exception as e:
             return error_response(str(e))
     
@@ -37,6 +121,16 @@ def create_app():
     def serve_static(filename):
         return send_from_directory(app.static_folder, filename)
     
+    @app.route('/bundle/<path:filename>')
+    def serve_bundle(filename):
+        """Serve minified frontend bundles and their source maps."""
+        asset = asset_pipeline.get(filename)
+        if asset is None:
+            return error_response(f'Bundle "{filename}" not found', 404)
+        response = Response(asset.content, mimetype=asset.mimetype)
+        response.set_etag(asset.etag)
+        return response.make_conditional(request)
+    
     @app.route('/assets/<path:filename>')
     def serve_assets(filename):
         """Serve assets like icons and data files."""
@@ -47,7 +141,11 @@ def create_app():
     def download_sc2_data():
         """Download SC2 comprehensive data as JSON file."""
         try:
-            data_path = project_root / 'assets' / 'sc2_comprehensive_data.json'
+            patch = requested_patch()
+            if patch is not None:
+                response = Response(json.dumps(load_sc2_data(), indent=2), mimetype='application/json')
+                response.headers['Content-Disposition'] = f'attachment; filename=sc2_data_{patch}.json'
+                return response
             return send_file(
                 data_path,
                 as_attachment=True,
@@ -61,9 +159,7 @@ def create_app():
     def download_race_data(race):
         """Download data for a specific race as JSON file."""
         try:
-            data_path = project_root / 'assets' / 'sc2_comprehensive_data.json'
-            with open(data_path, 'r') as f:
-                data = json.load(f)
+            data = load_sc2_data()
             
             if race not in data.get('races', {}):
                 return error_response(f'Race "{race}" not found', 404)
@@ -86,7 +182,6 @@ def create_app():
     @app.route('/export/build-order', methods=['POST'])
     def export_build_order():
         """Export build order data as JSON file."""
-        from flask import request
         try:
             build_order = request.get_json()
             if not build_order:
@@ -102,6 +197,195 @@ def create_app():
         except Exception as e:
             return error_response(str(e))
     
+    derived_cache = {}
+    
+    def from_game_data(factory):
+        """Return ``factory(data)`` for the current (cached) SC2 data, rebuilt when the data changes."""
+        data = load_sc2_data()
+        key = (factory, requested_patch())
+        cached = derived_cache.get(key)
+        if cached is None or cached[0] is not data:
+            cached = derived_cache[key] = (data, factory(data))
+        return cached[1]
+    
+    init_live(app, lambda: from_game_data(GameDataIndex))
+    
+    @app.route('/api/builds/evaluate', methods=['POST'])
+    def evaluate_build_orders():
+        """Validate (mode=evaluate) or normalize (mode=export) NDJSON build orders as a stream."""
+        mode = request.args.get('mode', 'evaluate')
+        if mode not in ('evaluate', 'export'):
+            return error_response(f'Invalid mode "{mode}"', 400)
+        index = from_game_data(GameDataIndex)
+        stream = request.stream
+        
+        def generate():
+            # One input line is parsed, checked and written out before the next is read
+            for position, (build_order, error) in enumerate(iter_ndjson(stream)):
+                if error is None:
+                    try:
+                        result = evaluate_build_order(build_order, index)
+                        if mode == 'export' and result['ok']:
+                            result = {'ok': True, 'build': normalize_build_order(build_order, index)}
+                    except Exception as e:
+                        # One bad line must not truncate the results of every line after it
+                        app.logger.exception('Failed to evaluate build order %d', position)
+                        error = f'Invalid build order: {e}'
+                if error is not None:
+                    result = {'ok': False, 'errors': [error], 'warnings': []}
+                yield json.dumps(dict(result, index=position), separators=(',', ':')) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    @app.route('/api/builds/validate', methods=['POST'])
+    def validate_build_orders():
+        """Check the prerequisites of every step of NDJSON build orders as a stream."""
+        validator = from_game_data(PrerequisiteValidator)
+        stream = request.stream
+        
+        def generate():
+            for position, (build_order, error) in enumerate(iter_ndjson(stream)):
+                if error is None:
+                    result = validator.validate_many([build_order])[0]
+                else:
+                    result = {'ok': False, 'race': None, 'errors': [{'message': error}]}
+                yield json.dumps(dict(result, index=position), separators=(',', ':')) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    @app.route('/api/simulate', methods=['POST'])
+    def simulate_build():
+        """Simulate a build order's economy and return when each step can really start."""
+        build_order = request.get_json(silent=True)
+        if not build_order:
+            return error_response('No build order data provided', 400)
+        try:
+            return jsonify(simulate_build_order(build_order, from_game_data(GameDataIndex)))
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+    
+    @app.route('/api/timeline/query', methods=['POST'])
+    def query_timeline():
+        """Answer point, range and aggregate queries about a build once it is simulated."""
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict) or not body.get('build'):
+            return error_response('No build order data provided', 400)
+        queries = body.get('queries')
+        if not isinstance(queries, list):
+            return error_response('"queries" must be a list', 400)
+        try:
+            timeline = BuildTimeline(body['build'], from_game_data(GameDataIndex))
+            return jsonify({'race': timeline.race, 'summary': timeline.summary,
+                            'results': [timeline.query(query) for query in queries]})
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+    
+    @app.route('/api/earliest/<race>/<entity>')
+    def earliest_timing(race, entity):
+        """Fastest start and completion of an entity under a standard opening, from the precomputed table."""
+        timing = from_game_data(EarliestTable).lookup(race, entity)
+        if timing is None:
+            return error_response(f'Unknown {race} entity "{entity}"', 404)
+        return jsonify(timing)
+    
+    @app.route('/api/icon-placeholders')
+    def get_icon_placeholders():
+        """Tiny previews of the entity icons, keyed by ``href``, shown while the palette's icons load."""
+        response = jsonify(from_game_data(icon_placeholders))
+        response.add_etag()
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response.make_conditional(request)
+    
+    @app.route('/api/builds/encode', methods=['POST'])
+    def encode_build_order():
+        """Pack a build order into a compact share code."""
+        build_order = request.get_json(silent=True)
+        if not build_order:
+            return error_response('No build order data provided', 400)
+        try:
+            code = from_game_data(BuildCodec).encode(build_order)
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        return jsonify({
+            'code': code,
+            'length': len(code),
+            'url': f"{url_for('index', _external=True)}#build={code}"
+        })
+    
+    @app.route('/api/builds/decode/<code>')
+    def decode_build_order(code):
+        """Unpack a share code into its canonical build order."""
+        try:
+            return jsonify(from_game_data(BuildCodec).decode(code))
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+    
+    render_cache = RenderCache(app.config['RENDER_CACHE_SIZE'])
+    
+    def render_cache_key(key):
+        # Codes and images depend on the game data, so each patch has its own entries
+        patch = requested_patch()
+        return key if patch is None else f'{key}@{patch}'
+    
+    @app.route('/render', methods=['POST'])
+    def register_chart():
+        """Register a build order for rendering and return its chart URLs."""
+        build_order = request.get_json(silent=True)
+        if not build_order:
+            return error_response('No build order data provided', 400)
+        codec = from_game_data(BuildCodec)
+        try:
+            code = codec.encode(build_order)
+            canonical = codec.decode(code)
+            chart_size(canonical, from_game_data(ChartRenderer).scale)
+        except BuildOrderError as e:
+            return error_response(str(e), 400)
+        key = render_key(code)
+        render_cache.put_build(render_cache_key(key), canonical)
+        patch = requested_patch()
+        # Share-code URLs keep working after the cache entry is evicted or the server restarts
+        return jsonify({
+            'hash': key,
+            'code': code,
+            'svg': url_for('render_chart', key=code, fmt='svg', patch=patch, _external=True),
+            'png': url_for('render_chart', key=code, fmt='png', patch=patch, _external=True)
+        }), 201
+    
+    @app.route('/render/<key>.<fmt>')
+    def render_chart(key, fmt):
+        """Serve the chart for a registered hash, or for a share code (which needs no registration)."""
+        if fmt not in ChartRenderer.FORMATS:
+            return error_response(f'Unsupported format "{fmt}"', 404)
+        build_order = render_cache.get_build(render_cache_key(key))
+        if build_order is None:
+            codec = from_game_data(BuildCodec)
+            try:
+                build_order = codec.decode(key)
+            except BuildOrderError:
+                return error_response(f'Unknown chart "{key}"', 404)
+            key = render_key(codec.encode(build_order))
+            render_cache.put_build(render_cache_key(key), build_order)
+        key = render_cache_key(key)
+        
+        content = render_cache.get_image(key, fmt)
+        metrics = get_metrics(app)
+        if metrics is not None:
+            metrics.inc('sc2_gantt_render_cache_requests_total',
+                        (('format', fmt), ('result', 'miss' if content is None else 'hit')))
+        if content is None:
+            try:
+                content = from_game_data(ChartRenderer).render(build_order, fmt)
+            except BuildOrderError as e:
+                return error_response(str(e), 400)
+            render_cache.put_image(key, fmt, content)
+        
+        response = Response(content, mimetype='image/svg+xml' if fmt == 'svg' else 'image/png')
+        response.set_etag(f'{key}-{fmt}')
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response.make_conditional(request)
+    
     return app
 
 def run_app():
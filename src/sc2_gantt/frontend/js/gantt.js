@@ -1,15 +1,721 @@
+/**
+ * Compact build-order codec for share links (mirrors sc2_gantt.backend.build_codec).
+ * Entities become per-race IDs, times become varint gaps in tenths of a second and
+ * only values that differ from the game data are written; the bytes are base64url.
+ */
+class BuildOrderCodec {
+    static VERSION = 1;
+    static TICKS_PER_SECOND = 10;
+    static CHRONOBOOST_SECONDS = 10;
+    static FLAG_FLOAT_TIMES = 1;
+    static FLAG_NAME = 2;
+    static EXTRA_CHRONOBOOSTED = 1;
+    static EXTRA_CHRONOBOOST_COUNT = 2;
+    static EXTRA_BUILD_TIME = 4;
+    static EXTRA_COST = 8;
+    static EXTRA_RACE = 16;
+
+    constructor(sc2Data) {
+        const races = (sc2Data && sc2Data.races) || {};
+        this.races = Object.keys(races).sort();
+        this.entities = new Map(); // "race:key" -> entity data
+        this.keys = {};
+        this.races.forEach(race => {
+            const raceData = races[race];
+            Object.values(raceData.detailed_data || {}).forEach(entity => {
+                this.entities.set(`${race}:${BuildOrderCodec.entityKey(entity.name)}`, entity);
+            });
+            Object.values(raceData.upgrades || {}).forEach(upgrade => {
+                const id = `${race}:${BuildOrderCodec.entityKey(upgrade.name)}`;
+                if (!this.entities.has(id)) this.entities.set(id, upgrade);
+            });
+            // Sort like Python's sorted() on str (code point order)
+            this.keys[race] = [...this.entities.keys()]
+                .filter(id => id.startsWith(`${race}:`))
+                .map(id => id.slice(race.length + 1))
+                .sort((a, b) => (a < b ? -1 : a > b ? 1 : 0));
+        });
+        this.ids = new Map();
+        this.races.forEach(race => this.keys[race].forEach((key, i) => this.ids.set(`${race}:${key}`, i)));
+        const table = this.races.map(race => `${race}:${this.keys[race].join(',')}`).join('\n');
+        this.fingerprint = BuildOrderCodec.crc32(new TextEncoder().encode(table)) & 0xffff;
+    }
+
+    static entityKey(name) {
+        return name.toLowerCase().split(/\s+/).filter(Boolean).join('_');
+    }
+
+    static crc32(bytes) {
+        if (!BuildOrderCodec.crcTable) {
+            BuildOrderCodec.crcTable = new Uint32Array(256);
+            for (let n = 0; n < 256; n++) {
+                let c = n;
+                for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+                BuildOrderCodec.crcTable[n] = c >>> 0;
+            }
+        }
+        let crc = 0xffffffff;
+        for (let i = 0; i < bytes.length; i++) crc = BuildOrderCodec.crcTable[(crc ^ bytes[i]) & 0xff] ^ (crc >>> 8);
+        return (crc ^ 0xffffffff) >>> 0;
+    }
+
+    static zigzag(value) {
+        return value >= 0 ? value * 2 : -value * 2 - 1;
+    }
+
+    static unzigzag(value) {
+        return value % 2 === 0 ? value / 2 : -(value + 1) / 2;
+    }
+
+    static toTicks(seconds) {
+        const ticks = Math.round(seconds * BuildOrderCodec.TICKS_PER_SECOND);
+        return ticks / BuildOrderCodec.TICKS_PER_SECOND === seconds ? ticks : null;
+    }
+
+    lookup(race, name) {
+        return this.entities.get(`${race}:${BuildOrderCodec.entityKey(name)}`) || null;
+    }
+
+    defaultBuildTime(data, chronoboostCount) {
+        return (data.build_time || data.research_time || 0) - BuildOrderCodec.CHRONOBOOST_SECONDS * chronoboostCount;
+    }
+
+    encode(buildOrder) {
+        const C = BuildOrderCodec;
+        const metadata = buildOrder.metadata || {};
+        const counts = {};
+        buildOrder.rows.forEach(row => (row.entities || []).forEach(e => {
+            if (e.race) counts[e.race.toLowerCase()] = (counts[e.race.toLowerCase()] || 0) + 1;
+        }));
+        const race = (metadata.race || Object.keys(counts).sort((a, b) => counts[b] - counts[a])[0] || '').toLowerCase();
+        if (!this.keys[race]) throw new Error(`Unknown race "${race}"`);
+
+        const rows = buildOrder.rows.map(row => (row.entities || []).map(entity => {
+            const entityRace = (entity.race || race).toLowerCase();
+            const data = this.lookup(entityRace, entity.name);
+            if (!data) throw new Error(`Unknown ${entityRace} entity "${entity.name}"`);
+            const count = entity.chronoboostCount || 0;
+            return {
+                data: data,
+                race: entityRace,
+                startTime: entity.startTime,
+                buildTime: entity.buildTime !== undefined ? entity.buildTime : this.defaultBuildTime(data, count),
+                minerals: entity.minerals !== undefined ? entity.minerals : (data.minerals || 0),
+                gas: entity.gas !== undefined ? entity.gas : (data.gas || 0),
+                chronoboosted: Boolean(entity.chronoboosted),
+                chronoboostCount: count
+            };
+        }).sort((a, b) => a.startTime - b.startTime));
+
+        const floatTimes = rows.some(row => row.some(e => C.toTicks(e.startTime) === null || C.toTicks(e.buildTime) === null));
+        const name = typeof metadata.name === 'string' ? new TextEncoder().encode(metadata.name) : null;
+        const flags = (floatTimes ? C.FLAG_FLOAT_TIMES : 0) | (name ? C.FLAG_NAME : 0);
+
+        const out = [C.VERSION];
+        const varint = value => {
+            while (value >= 0x80) {
+                out.push((value % 0x80) | 0x80);
+                value = Math.floor(value / 0x80);
+            }
+            out.push(value);
+        };
+        const float64 = value => {
+            const view = new DataView(new ArrayBuffer(8));
+            view.setFloat64(0, value);
+            for (let i = 0; i < 8; i++) out.push(view.getUint8(i));
+        };
+
+        varint(this.fingerprint);
+        varint(flags);
+        varint(this.races.indexOf(race));
+        if (name) {
+            varint(name.length);
+            name.forEach(byte => out.push(byte));
+        }
+        varint(rows.length);
+        rows.forEach(row => {
+            varint(row.length);
+            let previousEnd = 0;
+            row.forEach(e => {
+                let extras = 0;
+                if (e.chronoboosted) extras |= C.EXTRA_CHRONOBOOSTED;
+                if (e.chronoboostCount) extras |= C.EXTRA_CHRONOBOOST_COUNT;
+                if (e.buildTime !== this.defaultBuildTime(e.data, e.chronoboostCount)) extras |= C.EXTRA_BUILD_TIME;
+                if (e.minerals !== (e.data.minerals || 0) || e.gas !== (e.data.gas || 0)) extras |= C.EXTRA_COST;
+                if (e.race !== race) extras |= C.EXTRA_RACE;
+
+                varint(this.ids.get(`${e.race}:${C.entityKey(e.data.name)}`) * 2 + (extras ? 1 : 0));
+                if (floatTimes) {
+                    float64(e.startTime);
+                } else {
+                    const start = C.toTicks(e.startTime);
+                    varint(C.zigzag(start - previousEnd));
+                    previousEnd = start + C.toTicks(e.buildTime);
+                }
+                if (!extras) return;
+
+                varint(extras);
+                if (extras & C.EXTRA_CHRONOBOOST_COUNT) varint(C.zigzag(e.chronoboostCount));
+                if (extras & C.EXTRA_BUILD_TIME) {
+                    if (floatTimes) float64(e.buildTime);
+                    else varint(C.zigzag(C.toTicks(e.buildTime)));
+                }
+                if (extras & C.EXTRA_COST) {
+                    varint(C.zigzag(e.minerals));
+                    varint(C.zigzag(e.gas));
+                }
+                if (extras & C.EXTRA_RACE) varint(this.races.indexOf(e.race));
+            });
+        });
+
+        let binary = '';
+        out.forEach(byte => { binary += String.fromCharCode(byte); });
+        return btoa(binary).replace(/\+/g, '-').replace(/\//g, '_').replace(/=+$/, '');
+    }
+
+    decode(code) {
+        const C = BuildOrderCodec;
+        let binary;
+        try {
+            binary = atob(code.replace(/-/g, '+').replace(/_/g, '/'));
+        } catch (error) {
+            throw new Error('Build code is not valid base64url');
+        }
+        const bytes = Uint8Array.from(binary, char => char.charCodeAt(0));
+        const view = new DataView(bytes.buffer);
+        let pos = 0;
+        const need = length => {
+            if (pos + length > bytes.length) throw new Error('Build code is truncated');
+        };
+        const varint = () => {
+            let result = 0;
+            let scale = 1;
+            for (;;) {
+                need(1);
+                const byte = bytes[pos++];
+                result += (byte & 0x7f) * scale;
+                if (byte < 0x80) return result;
+                scale *= 0x80;
+            }
+        };
+        const float64 = () => {
+            need(8);
+            pos += 8;
+            return view.getFloat64(pos - 8);
+        };
+        const raceAt = index => {
+            if (index >= this.races.length) throw new Error(`Unknown race id ${index}`);
+            return this.races[index];
+        };
+        const fromTicks = ticks => ticks / C.TICKS_PER_SECOND;
+
+        need(1);
+        const version = bytes[pos++];
+        if (version !== C.VERSION) throw new Error(`Unsupported build code version ${version}`);
+        if (varint() !== this.fingerprint) throw new Error('Build code was made with different game data');
+        const flags = varint();
+        const race = raceAt(varint());
+        const metadata = { race: race };
+        if (flags & C.FLAG_NAME) {
+            const length = varint();
+            need(length);
+            metadata.name = new TextDecoder().decode(bytes.subarray(pos, pos + length));
+            pos += length;
+        }
+        const floatTimes = Boolean(flags & C.FLAG_FLOAT_TIMES);
+
+        const rows = [];
+        const rowCount = varint();
+        for (let rowIndex = 0; rowIndex < rowCount; rowIndex++) {
+            const entities = [];
+            let previousEnd = 0;
+            const entityCount = varint();
+            for (let i = 0; i < entityCount; i++) {
+                const header = varint();
+                const entityId = Math.floor(header / 2);
+                let start = floatTimes ? float64() : previousEnd + C.unzigzag(varint());
+                const extras = header % 2 ? varint() : 0;
+                const count = extras & C.EXTRA_CHRONOBOOST_COUNT ? C.unzigzag(varint()) : 0;
+                let buildTime = null;
+                if (extras & C.EXTRA_BUILD_TIME) buildTime = floatTimes ? float64() : C.unzigzag(varint());
+                const cost = extras & C.EXTRA_COST ? [C.unzigzag(varint()), C.unzigzag(varint())] : null;
+                const entityRace = extras & C.EXTRA_RACE ? raceAt(varint()) : race;
+
+                const key = this.keys[entityRace][entityId];
+                if (key === undefined) throw new Error(`Unknown ${entityRace} entity id ${entityId}`);
+                const data = this.entities.get(`${entityRace}:${key}`);
+                if (buildTime === null) {
+                    buildTime = this.defaultBuildTime(data, count);
+                    if (!floatTimes) buildTime = C.toTicks(buildTime);
+                }
+                if (!floatTimes) {
+                    previousEnd = start + buildTime;
+                    start = fromTicks(start);
+                    buildTime = fromTicks(buildTime);
+                }
+
+                entities.push({
+                    name: data.name,
+                    type: data.type,
+                    race: entityRace,
+                    startTime: start,
+                    buildTime: buildTime,
+                    minerals: cost ? cost[0] : (data.minerals || 0),
+                    gas: cost ? cost[1] : (data.gas || 0),
+                    chronoboosted: Boolean(extras & C.EXTRA_CHRONOBOOSTED),
+                    chronoboostCount: count
+                });
+            }
+            rows.push({ rowIndex: rowIndex, entities: entities });
+        }
+        if (pos !== bytes.length) throw new Error('Build code has trailing data');
+        return { metadata: metadata, rows: rows };
+    }
+}
+
+/**
+ * Live recalculation channel (mirrors sc2_gantt.backend.live). Edits are sent as
+ * operations against the last build the server saw; simulated timings come back
+ * over Server-Sent Events. Sending is coalesced to one request per animation frame
+ * with at most one in flight, and the server folds whatever arrives while it is
+ * simulating into a single update.
+ */
+class LiveRecalculation {
+    static FIELDS = ['startTime', 'buildTime', 'minerals', 'gas', 'chronoboosted', 'chronoboostCount'];
+
+    constructor(chart) {
+        this.chart = chart;
+        this.session = null;
+        this.source = null;
+        this.sent = null; // rows of entities as last acknowledged by the server
+        this.events = []; // simulation events by step
+        this.frame = null;
+        this.inFlight = false;
+        this.dirty = false;
+        this.status = document.getElementById('liveStatus');
+    }
+
+    async start() {
+        const basePath = window.APP_BASE_PATH || '';
+        try {
+            const response = await fetch(`${basePath}/api/live/sessions`, { method: 'POST' });
+            if (!response.ok) return;
+            this.session = await response.json();
+        } catch (error) {
+            console.warn('Live recalculation unavailable:', error);
+            return;
+        }
+        this.sent = null;
+        this.source = new EventSource(this.session.events);
+        this.source.addEventListener('update', e => this.onUpdate(JSON.parse(e.data)));
+        this.source.addEventListener('error', e => {
+            if (e.data) console.warn('Live recalculation:', JSON.parse(e.data).error);
+        });
+        this.schedule();
+    }
+
+    schedule() {
+        if (!this.session || this.frame !== null) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.flush();
+        });
+    }
+
+    async flush() {
+        if (this.inFlight) {
+            this.dirty = true;
+            return;
+        }
+        const rows = this.chart.collectBuildOrder().rows.map(row => row.entities);
+        const ops = this.diff(rows);
+        if (!ops.length) return;
+
+        this.inFlight = true;
+        try {
+            const response = await fetch(this.session.ops, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ ops: ops })
+            });
+            if (response.ok) {
+                this.sent = rows;
+            } else if (response.status === 404) {
+                // The session expired: open a new one, which resends the whole build
+                this.source.close();
+                this.session = null;
+                this.start();
+            } else {
+                console.warn('Live recalculation rejected an edit:', (await response.json()).error);
+                this.sent = null;
+            }
+        } catch (error) {
+            console.warn('Live recalculation request failed:', error);
+        } finally {
+            this.inFlight = false;
+            if (this.dirty) {
+                this.dirty = false;
+                this.schedule();
+            }
+        }
+    }
+
+    diff(rows) {
+        if (!this.sent || this.sent.length !== rows.length) {
+            return [{ op: 'set', build: { rows: rows.map(entities => ({ entities: entities })) } }];
+        }
+        const ops = [];
+        rows.forEach((entities, row) => {
+            const previous = this.sent[row];
+            const sameEntities = previous.length === entities.length &&
+                entities.every((entity, i) => entity.name === previous[i].name && entity.race === previous[i].race);
+            if (!sameEntities) {
+                ops.push({ op: 'row', row: row, entities: entities });
+                return;
+            }
+            entities.forEach((entity, index) => {
+                const fields = {};
+                LiveRecalculation.FIELDS.forEach(field => {
+                    if (entity[field] !== previous[index][field]) fields[field] = entity[field];
+                });
+                if (Object.keys(fields).length) ops.push({ op: 'update', row: row, index: index, fields: fields });
+            });
+        });
+        return ops;
+    }
+
+    onUpdate(update) {
+        if (update.full) this.events = [];
+        update.changed.forEach(event => {
+            this.events[event.step] = event;
+        });
+        this.events.length = update.total_steps;
+        this.render(update.summary);
+    }
+
+    render(summary) {
+        // Events are matched to rectangles by row and requested start time
+        const events = new Map(this.events.map(event => [`${event.row}:${event.requested}`, event]));
+        this.chart.rectangles.forEach(rect => {
+            const event = events.get(`${rect.row}:${rect.x / this.chart.timeScale}`);
+            const delayed = !!event && (event.delay >= 1 || event.warnings.length > 0);
+            rect.element.classList.toggle('sim-delayed', delayed);
+            if (!event) return;
+            const notes = [`Simulated start ${this.chart.formatTime(Math.round(event.start))}`];
+            if (event.delay >= 1) notes[0] += ` (+${Math.round(event.delay)}s)`;
+            notes.push(`Bank ${event.minerals}/${event.gas}, supply ${event.supply}`);
+            rect.element.title = notes.concat(event.warnings).join('\n');
+        });
+        if (this.status) {
+            const warnings = summary.warnings === 1 ? '1 warning' : `${summary.warnings} warnings`;
+            this.status.textContent = summary.supply
+                ? `Sim: ${summary.completion} · ${summary.supply} supply · ${warnings}`
+                : '';
+        }
+    }
+}
+
+/**
+ * Live recalculation for the static site, which has no server: the same
+ * frame-coalesced scheduling and rendering, with the simulation running in
+ * js/simulation-worker.js. Builds are posted as typed arrays whose buffers are
+ * transferred rather than copied, and at most one is being simulated at a time.
+ */
+class WorkerRecalculation extends LiveRecalculation {
+    static STEP_FIELDS = 4;
+    static TIMING_FIELDS = 6;
+
+    constructor(chart, url) {
+        super(chart);
+        this.url = url;
+        this.seq = 0;
+        this.posted = null; // entities of the build being simulated
+        this.lastSteps = null;
+        this.lastIds = null;
+    }
+
+    start() {
+        try {
+            this.worker = new Worker(this.url);
+        } catch (error) {
+            console.warn('Simulation worker unavailable:', error);
+            return;
+        }
+        this.worker.addEventListener('message', e => this.onResult(e.data));
+        this.worker.addEventListener('error', e => {
+            console.warn('Simulation worker:', e.message);
+            this.inFlight = false;
+        });
+        this.worker.postMessage({ type: 'catalog', races: this.catalog() });
+        this.session = this.worker;
+        this.schedule();
+    }
+
+    catalog() {
+        // Every entity of each race, indexed like the codec's keys
+        const codec = this.chart.codec;
+        const races = {};
+        codec.races.forEach(race => {
+            const keys = codec.keys[race];
+            const entities = keys.map(key => codec.entities.get(`${race}:${key}`));
+            races[race] = {
+                keys: keys,
+                names: entities.map(data => data.name),
+                buildings: entities.map(data => (data.type === 'building' ? 1 : 0)),
+                requirements: entities.map(data => (data.requirements || [])
+                    .map(name => codec.ids.get(`${race}:${BuildOrderCodec.entityKey(name)}`))
+                    .filter(id => id !== undefined))
+            };
+        });
+        return races;
+    }
+
+    flush() {
+        if (this.inFlight) {
+            this.dirty = true;
+            return;
+        }
+        const chart = this.chart;
+        const entities = [];
+        const raceCounts = new Map();
+        for (let rowIndex = 0; rowIndex < chart.rows; rowIndex++) {
+            chart.timeline(rowIndex).sorted().forEach(rect => {
+                entities.push({ rect: rect, row: rowIndex });
+                const race = rect.entityData.race;
+                raceCounts.set(race, (raceCounts.get(race) || 0) + 1);
+            });
+        }
+        // The most common race, as the backend picks it
+        const race = [...raceCounts].reduce((best, entry) => (entry[1] > best[1] ? entry : best), ['unknown', 0])[0];
+
+        const steps = new Float64Array(entities.length * WorkerRecalculation.STEP_FIELDS);
+        const ids = new Int32Array(entities.length * 2);
+        entities.forEach(({ rect, row }, i) => {
+            const offset = i * WorkerRecalculation.STEP_FIELDS;
+            steps[offset] = entities[i].requested = rect.x / chart.timeScale;
+            steps[offset + 1] = chart.getBuildTime(rect.entityData);
+            steps[offset + 2] = rect.entityData.minerals || 0;
+            steps[offset + 3] = rect.entityData.gas || 0;
+            const id = chart.codec.ids.get(`${race}:${BuildOrderCodec.entityKey(rect.entityData.name)}`);
+            ids[i * 2] = row;
+            ids[i * 2 + 1] = id === undefined ? -1 : id;
+        });
+        if (race === this.lastRace && this.sameArrays(steps, this.lastSteps) && this.sameArrays(ids, this.lastIds)) return;
+        this.lastRace = race;
+        this.lastSteps = steps.slice();
+        this.lastIds = ids.slice();
+
+        this.inFlight = true;
+        this.posted = entities;
+        this.worker.postMessage(
+            { type: 'simulate', seq: ++this.seq, race: race, steps: steps, ids: ids },
+            [steps.buffer, ids.buffer]
+        );
+    }
+
+    sameArrays(a, b) {
+        return !!b && a.length === b.length && a.every((value, i) => value === b[i]);
+    }
+
+    onResult(result) {
+        const fields = WorkerRecalculation.TIMING_FIELDS;
+        const timings = result.timings;
+        this.events = Array.from(result.order, (entityIndex, step) => {
+            const { rect, row, requested } = this.posted[entityIndex];
+            const start = timings[step * fields];
+            return {
+                step: step,
+                name: rect.entityData.name,
+                row: row,
+                requested: requested,
+                start: start,
+                end: timings[step * fields + 1],
+                delay: start - requested,
+                minerals: timings[step * fields + 2],
+                gas: timings[step * fields + 3],
+                supply: `${timings[step * fields + 4]}/${timings[step * fields + 5]}`,
+                warnings: result.warnings[step]
+            };
+        });
+        this.render(result.summary);
+
+        this.inFlight = false;
+        if (this.dirty) {
+            this.dirty = false;
+            this.schedule();
+        }
+    }
+}
+
+/**
+ * The rectangles of one chart row in start order, with cached extents and cost
+ * totals, so row queries never scan the whole chart. Geometry edits only mark
+ * the row dirty (`touch`); order and extents are rebuilt on the next read, by an
+ * insertion sort that is linear for the nearly sorted rows drags leave behind.
+ */
+class RowTimeline {
+    constructor() {
+        this.rects = [];
+        this.minerals = 0;
+        this.gas = 0;
+        this.endX = 0;
+        this.maxWidth = 0;
+        this.edgeCache = null;
+        this.dirty = false;
+    }
+
+    add(rect) {
+        this.rects.push(rect);
+        this.addCost(rect, 1);
+        this.touch();
+    }
+
+    remove(rect) {
+        const index = this.rects.indexOf(rect);
+        if (index === -1) return;
+        this.rects.splice(index, 1);
+        this.addCost(rect, -1);
+        this.touch();
+    }
+
+    addCost(rect, sign) {
+        const entityData = rect.entityData || {};
+        this.minerals += sign * (entityData.minerals || 0);
+        this.gas += sign * (entityData.gas || 0);
+    }
+
+    touch() {
+        this.dirty = true;
+        this.edgeCache = null;
+    }
+
+    refresh() {
+        if (!this.dirty) return;
+        const rects = this.rects;
+        for (let i = 1; i < rects.length; i++) {
+            const rect = rects[i];
+            let j = i - 1;
+            while (j >= 0 && rects[j].x > rect.x) {
+                rects[j + 1] = rects[j];
+                j--;
+            }
+            rects[j + 1] = rect;
+        }
+        let endX = 0;
+        let maxWidth = 0;
+        for (const rect of rects) {
+            endX = Math.max(endX, rect.x + rect.width);
+            maxWidth = Math.max(maxWidth, rect.width);
+        }
+        this.endX = endX;
+        this.maxWidth = maxWidth;
+        this.dirty = false;
+    }
+
+    get length() {
+        return this.rects.length;
+    }
+
+    sorted() {
+        this.refresh();
+        return this.rects;
+    }
+
+    start() {
+        this.refresh();
+        return this.rects.length ? this.rects[0].x : 0;
+    }
+
+    end() {
+        this.refresh();
+        return this.endX;
+    }
+
+    // Index of the first rectangle starting at or after x
+    lowerBound(x) {
+        const rects = this.sorted();
+        let lo = 0;
+        let hi = rects.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (rects[mid].x < x) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+
+    overlaps(x, width, excludeId = -1) {
+        // Only rectangles starting within maxWidth before x can reach into [x, x + width)
+        const rects = this.sorted();
+        for (let i = this.lowerBound(x - this.maxWidth); i < rects.length && rects[i].x < x + width; i++) {
+            const rect = rects[i];
+            if (rect.id !== excludeId && x < rect.x + rect.width) return true;
+        }
+        return false;
+    }
+
+    // Sorted, distinct start and end positions of the row's rectangles
+    edges() {
+        if (!this.edgeCache) {
+            const points = [];
+            this.sorted().forEach(rect => points.push(rect.x, rect.x + rect.width));
+            this.edgeCache = [...new Set(points)].sort((a, b) => a - b);
+        }
+        return this.edgeCache;
+    }
+
+    edgesBetween(lo, hi) {
+        const edges = this.edges();
+        let first = 0;
+        let last = edges.length;
+        while (first < last) {
+            const mid = (first + last) >> 1;
+            if (edges[mid] < lo) first = mid + 1;
+            else last = mid;
+        }
+        const result = [];
+        for (let i = first; i < edges.length && edges[i] <= hi; i++) result.push(edges[i]);
+        return result;
+    }
+}
+
 class GanttChart {
     constructor() {
         this.chart = document.getElementById('chart');
         this.rectangles = [];
+        this.rowTimelines = [new RowTimeline()]; // per-row index over this.rectangles
+        this.nextRectId = 0;
         this.rows = 1;
         this.selectedRectangle = null;
         this.dragData = null;
         this.gridSize = 20;
         this.sc2Data = null;
+        this.codec = null;
+        this.live = null;
+        this.earliestTable = null;
+        this.earliestTimings = new Map();
         this.timeScale = 3; // pixels per second
+        this.overscan = 400; // pixels rendered beyond each edge of the visible chart
         this.rightAlignedRows = new Set(); // Track which rows are right-aligned
         
+        // Pending DOM work, flushed once per animation frame by render()
+        this.frame = null;
+        this.dirtyRects = new Set();
+        this.dirtyRows = new Set();
+        this.axisDirty = false;
+        this.dropZoneRequest = null;
+        this.mounted = new Set(); // rectangles whose elements are in the DOM
+        this.viewport = null;
+        
+        // Palette icons load when scrolled into view; other races' icons in idle time
+        this.iconObserver = null;
+        this.iconPlaceholders = {}; // href -> tiny data URI shown until the icon loads
+        this.prefetchedIcons = new Set();
+        this.iconPrefetchQueue = [];
+        this.iconPrefetchesInFlight = 0;
+        this.iconPrefetchConcurrency = 4;
+        this.iconPrefetchScheduled = false;
+        
         this.init();
         this.createGridLines();
         this.createTimeIndex();
@@ -112,6 +818,10 @@ class GanttChart {
         document.addEventListener('mouseup', (e) => this.handleMouseUp(e));
         document.addEventListener('keydown', (e) => this.handleKeyDown(e));
         
+        // Scrolling changes which rectangles and axis marks are materialized
+        this.chart.parentElement.addEventListener('scroll', () => this.invalidateAxis());
+        window.addEventListener('scroll', () => this.invalidateAxis(), { passive: true });
+        
         // Row control handlers
         this.chart.addEventListener('click', (e) => {
             if (e.target.classList.contains('clear-row')) {
@@ -149,6 +859,8 @@ class GanttChart {
         this.addClickListener('#closeInfoPanel', () => this.hideInfoPanel());
         this.addClickListener('#downloadData', () => this.showDownloadMenu());
         this.addClickListener('#exportBuildOrder', () => this.exportBuildOrder());
+        this.addClickListener('#shareBuildOrder', () => this.shareBuildOrder());
+        window.addEventListener('hashchange', () => this.loadSharedBuildOrder());
     }
     
     async loadSC2Data() {
@@ -157,7 +869,19 @@ class GanttChart {
             const apiUrl = window.APP_API_URL || `${basePath}/api/sc2-data`;
             const response = await fetch(apiUrl);
             this.sc2Data = await response.json();
+            this.codec = new BuildOrderCodec(this.sc2Data);
             console.log('SC2 data loaded:', this.sc2Data);
+            this.loadIconPlaceholders();
+            this.prefetchIcons();
+            this.loadSharedBuildOrder();
+            if (!window.APP_STATIC_MODE && window.EventSource) {
+                this.live = new LiveRecalculation(this);
+                this.live.start();
+            } else if (window.APP_STATIC_MODE && window.Worker && WORKER_URL) {
+                // No server to simulate on: keep the simulation off the main thread
+                this.live = new WorkerRecalculation(this, WORKER_URL);
+                this.live.start();
+            }
         } catch (error) {
             console.error('Failed to load SC2 data:', error);
         }
@@ -174,6 +898,7 @@ class GanttChart {
         const searchInput = document.getElementById('entitySearch');
         if (searchInput) searchInput.value = '';
         this.updateEntityPalette();
+        this.prefetchIcons();
     }
     
     onTypeSelect(type) {
@@ -226,6 +951,7 @@ class GanttChart {
             );
         }
         
+        if (this.iconObserver) this.iconObserver.disconnect();
         content.innerHTML = '';
         
         entities.forEach(entity => {
@@ -233,13 +959,14 @@ class GanttChart {
             iconButton.dataset.entityData = JSON.stringify(entity);
             iconButton.dataset.entityType = this.selectedType;
             
-            // Create image
+            // Create image, loaded once it scrolls into view
             const img = document.createElement('img');
-            img.src = this.getIconPath(entity, this.selectedType.slice(0, -1)); // Remove 's' from 'units'/'buildings'/'upgrades'
             img.alt = entity.name;
+            img.decoding = 'async';
             img.onerror = () => {
                 img.style.display = 'none';
             };
+            this.lazyLoadIcon(img, entity, this.getIconPath(entity, this.selectedType.slice(0, -1))); // Remove 's' from 'units'/'buildings'/'upgrades'
             iconButton.appendChild(img);
             
             // Add tooltip with entity name and stats
@@ -265,14 +992,104 @@ class GanttChart {
         }
     }
     
-    addEntityFromIcon(entityData, entityType) {
+    lazyLoadIcon(img, entity, src) {
+        img.classList.add('icon-pending');
+        img.onload = () => {
+            // The placeholder loads first; the icon replaces it once decoded
+            if (!img.dataset.src) img.classList.remove('icon-pending');
+        };
+        const placeholder = this.iconPlaceholders[entity.href];
+        if (placeholder) img.src = placeholder;
+        img.dataset.src = src;
+        
+        if (!window.IntersectionObserver) {
+            this.showIcon(img);
+            return;
+        }
+        if (!this.iconObserver) {
+            this.iconObserver = new IntersectionObserver(entries => {
+                entries.forEach(entry => {
+                    if (!entry.isIntersecting) return;
+                    this.iconObserver.unobserve(entry.target);
+                    this.showIcon(entry.target);
+                });
+            }, { root: document.getElementById('paletteContent'), rootMargin: '120px 0px' });
+        }
+        this.iconObserver.observe(img);
+    }
+    
+    showIcon(img) {
+        const src = img.dataset.src;
+        delete img.dataset.src;
+        this.prefetchedIcons.add(src);
+        img.src = src;
+    }
+    
+    async loadIconPlaceholders() {
+        const basePath = window.APP_BASE_PATH || '';
+        const url = window.APP_STATIC_MODE ? `${basePath}/api/icon-placeholders.json` : `${basePath}/api/icon-placeholders`;
+        try {
+            const response = await fetch(url);
+            if (!response.ok) return;
+            this.iconPlaceholders = await response.json();
+        } catch (error) {
+            // Without placeholders the palette just shows empty tiles until icons load
+            return;
+        }
+        // Icons rendered before the placeholders arrived and still waiting to be scrolled into view
+        document.querySelectorAll('#paletteContent img.icon-pending').forEach(img => {
+            const entity = JSON.parse(img.parentElement.dataset.entityData);
+            const placeholder = this.iconPlaceholders[entity.href];
+            if (img.dataset.src && !img.getAttribute('src') && placeholder) img.src = placeholder;
+        });
+    }
+    
+    prefetchIcons() {
+        // Queue the other races' icons so switching race finds them in the browser cache
+        const queue = [];
+        Object.entries(this.sc2Data.races).forEach(([race, raceData]) => {
+            if (race === this.selectedRace) return;
+            const entities = Object.values(raceData.detailed_data || {}).concat(Object.values(raceData.upgrades || {}));
+            entities.forEach(entity => {
+                const src = this.getIconPath({ race: race, ...entity }, entity.type || 'upgrade');
+                if (!this.prefetchedIcons.has(src)) queue.push(src);
+            });
+        });
+        this.iconPrefetchQueue = queue;
+        this.scheduleIconPrefetch();
+    }
+    
+    scheduleIconPrefetch() {
+        if (this.iconPrefetchScheduled || !this.iconPrefetchQueue.length) return;
+        this.iconPrefetchScheduled = true;
+        const idle = window.requestIdleCallback || (callback => setTimeout(() => callback({ timeRemaining: () => 10 }), 200));
+        idle(deadline => {
+            this.iconPrefetchScheduled = false;
+            while (this.iconPrefetchQueue.length && this.iconPrefetchesInFlight < this.iconPrefetchConcurrency &&
+                   deadline.timeRemaining() > 1) {
+                const src = this.iconPrefetchQueue.shift();
+                if (this.prefetchedIcons.has(src)) continue;
+                this.prefetchedIcons.add(src);
+                this.iconPrefetchesInFlight++;
+                const img = new Image();
+                img.decoding = 'async';
+                img.onload = img.onerror = () => {
+                    this.iconPrefetchesInFlight--;
+                    this.scheduleIconPrefetch();
+                };
+                img.src = src;
+            }
+            // Out of idle time; a full pipeline reschedules as prefetches finish
+            if (this.iconPrefetchesInFlight < this.iconPrefetchConcurrency) this.scheduleIconPrefetch();
+        });
+    }
+    
+    addEntityFromIcon(entityData, entityType, rowIndex = this.rows - 1) {
         // Use the existing addEntity logic but with provided data
         const buildTime = this.getBuildTime(entityData);
         const width = buildTime * this.timeScale;
         
         const rectangle = this.createElement('div', `rectangle entity-rectangle ${entityData.race} ${entityType.slice(0, -1)}`);
-        rectangle.style.width = width + 'px';
-        rectangle.style.left = '0px';
         rectangle.dataset.entityName = entityData.name;
         rectangle.dataset.entityType = entityType;
         
@@ -295,31 +1112,16 @@ class GanttChart {
         rectangle.appendChild(timeDisplay);
         
         
-        // Calculate position to place at end of existing entities in last row BEFORE adding to DOM
-        const lastRowIndex = this.rows - 1;
-        const rowRects = this.rectangles.filter(r => r.row === lastRowIndex);
-        let initialX = 0;
-        
-        if (rowRects.length > 0) {
-            // Place at the end of the last entity in this row
-            const maxX = Math.max(...rowRects.map(r => r.x + r.width));
-            initialX = maxX;
-        }
-        
-        // Set position BEFORE adding to DOM
-        rectangle.style.left = initialX + 'px';
-        rectangle.style.top = '5px';
-        
-        // Now add to the last row
-        const lastRow = this.getRowElement(lastRowIndex);
-        lastRow.appendChild(rectangle);
+        // Place at the end of the last entity in this row; the element is added
+        // to the row on the next frame if it falls inside the visible window
+        const initialX = this.timeline(rowIndex).end();
         
         const rectData = {
             element: rectangle,
-            row: lastRowIndex,
+            row: rowIndex,
             x: initialX,
             width: width,
-            id: this.rectangles.length,
+            id: this.nextRectId++,
             entityData: entityData,
             entityType: entityType
         };
@@ -343,10 +1145,11 @@ class GanttChart {
         });
         
         this.rectangles.push(rectData);
+        this.timeline(rowIndex).add(rectData);
         this.positionRectangle(rectData);
-        this.updateRowStats(lastRowIndex);
-        this.createGridLines(); // Update grid lines when entities are added
-        this.createTimeIndex(); // Update time index when entities are added
+        this.invalidateRow(rowIndex);
+        this.invalidateAxis(); // Update grid lines and time index when entities are added
+        return rectData;
     }
     
     handleWheel(e) {
@@ -364,19 +1167,16 @@ class GanttChart {
     }
     
     updateTimeScale() {
-        // Update all existing rectangles
+        // Only the model is updated here, so a burst of wheel events costs one DOM update
         this.rectangles.forEach(rect => {
             if (rect.entityData) {
-                const buildTime = this.getBuildTime(rect.entityData);
-                const newWidth = buildTime * this.timeScale;
-                rect.width = newWidth;
-                rect.element.style.width = newWidth + 'px';
+                rect.width = this.getBuildTime(rect.entityData) * this.timeScale;
             }
         });
+        this.rowTimelines.forEach(timeline => timeline.touch());
         this.repositionAllRectangles();
         this.updateAllRowStats();
-        this.createGridLines(); // Update grid lines when scale changes
-        this.createTimeIndex(); // Update time index when scale changes
+        this.invalidateAxis(); // Update grid lines and time index when scale changes
         
         // Update the display in the toolbar
         const timeScaleDisplay = document.getElementById('timeScaleDisplay');
@@ -403,10 +1203,11 @@ class GanttChart {
         }
         
         // Remove from rectangles array
-        const index = this.rectangles.findIndex(r => r.id === rectData.id);
+        const index = this.rectangles.indexOf(rectData);
         if (index !== -1) {
             this.rectangles.splice(index, 1);
         }
+        this.timeline(rectData.row).remove(rectData);
         
         // Clear selection
         if (this.selectedRectangle === rectData) {
@@ -415,93 +1216,162 @@ class GanttChart {
         
         // Reposition remaining rectangles in the row to close gaps
         this.collapseGap(rectData.row, rectData.x, rectData.width, -1);
-        this.updateRowStats(rectData.row);
-        this.createGridLines(); // Update grid lines when entities are removed
-        this.createTimeIndex(); // Update time index when entities are removed
+        this.invalidateRow(rectData.row);
+        this.invalidateAxis(); // Update grid lines and time index when entities are removed
     }
     
     createGridLines() {
         const gridLines = document.getElementById('gridLines');
         if (!gridLines) return;
         
-        gridLines.innerHTML = '';
-        
         // Calculate the maximum time span needed
         const maxTime = this.getMaxTimeSpan();
-        const chartWidth = this.chart.clientWidth - 140; // Account for padding (120 + 20)
         const entityStartOffset = 120; // Same offset as chart padding-left where entities start
+        const { left, right } = this.visibleRange();
         
-        // Create vertical lines every 10 seconds starting at 0:00
+        // Create vertical lines every 10 seconds, only within the visible window
         const interval = 10; // 10 second intervals
+        const positions = [];
         
-        for (let time = 0; time <= maxTime; time += interval) {
-            const x = entityStartOffset + (time * this.timeScale);
-            if (x > this.chart.clientWidth) break;
-            
-            const line = document.createElement('div');
-            line.className = 'grid-line';
-            line.style.left = x + 'px';
-            gridLines.appendChild(line);
+        for (let time = this.firstTick(left, interval); time <= maxTime; time += interval) {
+            const x = time * this.timeScale;
+            if (x > right) break;
+            positions.push(entityStartOffset + x);
         }
+        this.syncAxisNodes(gridLines, 'grid-line', positions);
     }
     
     createTimeIndex() {
         const timeIndex = document.getElementById('timeIndex');
         if (!timeIndex) return;
         
-        timeIndex.innerHTML = '';
-        
         // Calculate the maximum time span needed
         const maxTime = this.getMaxTimeSpan();
-        const chartWidth = this.chart.clientWidth - 140; // Account for padding (120 + 20)
+        const { left, right } = this.visibleRange();
         
         // Create time markers every 30 seconds (or every minute for very long spans)
         const interval = maxTime > 600 ? 60 : 30; // 60s intervals for >10min, 30s otherwise
+        const positions = [];
+        const labels = [];
         
-        for (let time = 0; time <= maxTime + interval; time += interval) {
+        for (let time = this.firstTick(left, interval); time <= maxTime + interval; time += interval) {
             const x = time * this.timeScale;
-            if (x > chartWidth) break;
-            
-            const marker = document.createElement('div');
-            marker.className = 'time-marker';
-            marker.style.left = x + 'px';
-            
-            marker.textContent = this.formatTime(time);
-            
-            timeIndex.appendChild(marker);
+            if (x > right) break;
+            positions.push(x);
+            labels.push(this.formatTime(time));
         }
+        this.syncAxisNodes(timeIndex, 'time-marker', positions, labels);
+    }
+    
+    firstTick(left, interval) {
+        return Math.max(0, Math.floor(left / this.timeScale / interval) * interval);
+    }
+    
+    syncAxisNodes(container, className, positions, labels = null) {
+        // Existing nodes are reused; only the difference in count is created or removed
+        const nodes = container.children;
+        while (nodes.length > positions.length) {
+            container.lastElementChild.remove();
+        }
+        while (nodes.length < positions.length) {
+            container.appendChild(this.createElement('div', className));
+        }
+        positions.forEach((x, i) => {
+            const node = nodes[i];
+            const transform = `translateX(${x}px)`;
+            if (node.style.transform !== transform) node.style.transform = transform;
+            if (labels && node.textContent !== labels[i]) node.textContent = labels[i];
+        });
     }
     
     getMaxTimeSpan() {
         if (this.rectangles.length === 0) return 300; // Default 5 minutes if no entities
         
         // Find the furthest right edge of any entity
-        const maxEnd = Math.max(...this.rectangles.map(r => (r.x + r.width) / this.timeScale));
+        const maxEnd = this.rowTimelines.reduce((end, timeline) => Math.max(end, timeline.end()), 0) / this.timeScale;
         return Math.max(300, Math.ceil(maxEnd / 30) * 30); // Minimum 5 minutes, rounded up to 30s
     }
     
-    updateRowStats(rowIndex) {
-        const rowRects = this.rectangles.filter(r => r.row === rowIndex);
-        
-        let endTime = 0;
-        let startTime = 0;
-        let totalMinerals = 0;
-        let totalGas = 0;
-        
-        if (rowRects.length > 0) {
-            // Calculate end time (furthest right edge of any entity)
-            endTime = Math.max(...rowRects.map(r => (r.x + r.width) / this.timeScale));
-            // Calculate start time (leftmost position of any entity)
-            startTime = Math.min(...rowRects.map(r => r.x / this.timeScale));
-            
-            // Calculate total costs
-            rowRects.forEach(rect => {
-                if (rect.entityData) {
-                    totalMinerals += rect.entityData.minerals || 0;
-                    totalGas += rect.entityData.gas || 0;
-                }
-            });
+    timeline(rowIndex) {
+        while (this.rowTimelines.length <= rowIndex) {
+            this.rowTimelines.push(new RowTimeline());
+        }
+        return this.rowTimelines[rowIndex];
+    }
+    
+    paintRect(rect) {
+        // Rectangles are placed with transforms, which skip layout; width only changes on zoom and chronoboost
+        if (rect.renderedX !== rect.x) {
+            rect.element.style.transform = `translateX(${rect.x}px)`;
+            rect.renderedX = rect.x;
+        }
+        if (rect.renderedWidth !== rect.width) {
+            rect.element.style.width = rect.width + 'px';
+            rect.renderedWidth = rect.width;
         }
+    }
+    
+    measureViewport() {
+        // The visible part of the chart, in rectangle coordinates (x from where entities start, y from the first row)
+        const chartBox = this.chart.getBoundingClientRect();
+        const containerBox = this.chart.parentElement.getBoundingClientRect();
+        const originX = chartBox.left + 120; // chart padding-left
+        const originY = chartBox.top + 20; // chart padding-top
+        return {
+            left: Math.max(containerBox.left, 0) - originX,
+            right: Math.min(containerBox.right, window.innerWidth) - originX,
+            top: Math.max(containerBox.top, 0) - originY,
+            bottom: Math.min(containerBox.bottom, window.innerHeight) - originY
+        };
+    }
+    
+    visibleRange() {
+        const viewport = this.viewport || this.measureViewport();
+        return { left: viewport.left - this.overscan, right: viewport.right + this.overscan };
+    }
+    
+    mountVisible() {
+        // Only rectangles inside the visible rows and time range (plus overscan) are kept in the DOM
+        const { left, right } = this.visibleRange();
+        const rowHeight = 105; // row height plus margin, as in handleMouseMove
+        const firstRow = Math.max(0, Math.floor((this.viewport.top - this.overscan) / rowHeight));
+        const lastRow = Math.min(this.rows - 1, Math.floor((this.viewport.bottom + this.overscan) / rowHeight));
+        
+        const visible = new Set();
+        for (let rowIndex = firstRow; rowIndex <= lastRow; rowIndex++) {
+            const timeline = this.timeline(rowIndex);
+            const rowRects = timeline.sorted();
+            for (let i = timeline.lowerBound(left - timeline.maxWidth); i < rowRects.length && rowRects[i].x < right; i++) {
+                if (rowRects[i].x + rowRects[i].width > left) visible.add(rowRects[i]);
+            }
+        }
+        // Whatever is being dragged or is selected stays in the DOM wherever it is
+        if (this.dragData) {
+            visible.add(this.dragData.rectangle);
+            this.dragData.rightwardRects.forEach(rect => visible.add(rect));
+        }
+        if (this.selectedRectangle) visible.add(this.selectedRectangle);
+        
+        this.mounted.forEach(rect => {
+            if (!visible.has(rect)) rect.element.remove();
+        });
+        visible.forEach(rect => {
+            const rowElement = this.getRowElement(rect.row);
+            if (rect.element.parentNode !== rowElement) {
+                this.paintRect(rect);
+                rowElement.appendChild(rect.element);
+            }
+        });
+        this.mounted = visible;
+    }
+    
+    updateRowStats(rowIndex) {
+        // Extents and cost totals are maintained by the row's timeline
+        const timeline = this.timeline(rowIndex);
+        const endTime = timeline.end() / this.timeScale;
+        const startTime = timeline.start() / this.timeScale;
+        const totalMinerals = timeline.minerals;
+        const totalGas = timeline.gas;
         
         const rowElement = this.getRowElement(rowIndex);
         if (rowElement) {
@@ -519,11 +1389,73 @@ class GanttChart {
                 costElement.textContent = `Cost: ${totalMinerals}/${totalGas}`;
             }
         }
+        this.scheduleLiveSync();
+    }
+    
+    scheduleLiveSync() {
+        // Coalesced to one request per frame by the live channel
+        if (this.live) this.live.schedule();
     }
     
     updateAllRowStats() {
         for (let i = 0; i < this.rows; i++) {
-            this.updateRowStats(i);
+            this.invalidateRow(i);
+        }
+    }
+    
+    // Model edits mark what they touched; render() writes it to the DOM once per frame
+    invalidateRect(rect) {
+        this.dirtyRects.add(rect);
+        this.requestRender();
+    }
+    
+    invalidateRow(rowIndex) {
+        this.dirtyRows.add(rowIndex);
+        this.requestRender();
+    }
+    
+    invalidateAxis() {
+        this.axisDirty = true;
+        this.requestRender();
+    }
+    
+    requestRender() {
+        if (this.frame !== null) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    }
+    
+    render() {
+        // Layout is read once, before any of this frame's writes
+        this.viewport = this.measureViewport();
+        this.mountVisible();
+        this.dirtyRects.forEach(rect => {
+            if (this.mounted.has(rect)) this.paintRect(rect);
+        });
+        this.dirtyRects.clear();
+        
+        this.dirtyRows.forEach(rowIndex => {
+            if (rowIndex < this.rows) this.updateRowStats(rowIndex);
+        });
+        this.dirtyRows.clear();
+        
+        if (this.axisDirty) {
+            this.axisDirty = false;
+            // Wide enough to scroll to the last rectangle
+            const contentEnd = this.rowTimelines.reduce((end, timeline) => Math.max(end, timeline.end()), 0);
+            const minWidth = contentEnd > 0 ? Math.ceil(contentEnd) + 'px' : '';
+            if (this.chart.style.minWidth !== minWidth) this.chart.style.minWidth = minWidth;
+            this.createGridLines();
+            this.createTimeIndex();
+        }
+        
+        // Drop zones follow the latest pointer position of a drag that is still in progress
+        if (this.dropZoneRequest) {
+            const [dragX, dragRow] = this.dropZoneRequest;
+            this.dropZoneRequest = null;
+            if (this.dragData) this.showDropZones(dragX, dragRow);
         }
     }
     
@@ -540,6 +1472,66 @@ class GanttChart {
         
         // Add chronoboost event listeners if applicable
         this.addChronoboostHandlers(entityData, rectangleData);
+        this.showEarliestTiming(entityData);
+    }
+    
+    loadEarliestTiming(race, key) {
+        const basePath = window.APP_BASE_PATH || '';
+        if (window.APP_STATIC_MODE) {
+            // The static build ships the whole precomputed table
+            if (!this.earliestTable) {
+                this.earliestTable = fetch(`${basePath}/assets/earliest_timings.json`)
+                    .then(response => response.ok ? response.json() : null);
+            }
+            return this.earliestTable.then(table => {
+                const entry = table && table.races[race] && table.races[race][key];
+                if (!entry) return null;
+                const [start, completion, path] = entry;
+                return {
+                    start: start,
+                    completion: completion,
+                    path: path.map(([name, stepStart, stepEnd]) => ({ name: name, start: stepStart, completion: stepEnd }))
+                };
+            });
+        }
+        const id = `${race}:${key}`;
+        if (!this.earliestTimings.has(id)) {
+            this.earliestTimings.set(id, fetch(`${basePath}/api/earliest/${race}/${key}`)
+                .then(response => response.ok ? response.json() : null));
+        }
+        return this.earliestTimings.get(id);
+    }
+    
+    async showEarliestTiming(entityData) {
+        if (!entityData.race) return;
+        let timing = null;
+        try {
+            timing = await this.loadEarliestTiming(entityData.race, BuildOrderCodec.entityKey(entityData.name));
+        } catch (error) {
+            console.warn('Failed to load earliest timing:', error);
+        }
+        const infoTitle = document.getElementById('infoTitle');
+        const infoContent = document.getElementById('infoContent');
+        // The panel may show another entity by now
+        if (!timing || !infoContent || !infoTitle || infoTitle.textContent !== entityData.name) return;
+        
+        const path = timing.path.map(step =>
+            `<li>${step.name} (${this.formatTime(Math.round(step.start))})</li>`).join('');
+        infoContent.insertAdjacentHTML('beforeend', `
+            <div class="info-section">
+                <h5>Earliest Timing</h5>
+                <div class="timing-info">
+                    <div class="timing-item">
+                        <span>Start:</span>
+                        <span>${this.formatTime(Math.round(timing.start))}</span>
+                    </div>
+                    <div class="timing-item">
+                        <span>Completion:</span>
+                        <span>${this.formatTime(Math.round(timing.completion))}</span>
+                    </div>
+                </div>
+                ${path ? `<ul class="info-list">${path}</ul>` : ''}
+            </div>`);
     }
     
     hideInfoPanel() {
@@ -704,7 +1696,7 @@ class GanttChart {
         });
     }
     
-    applyChronoboost(rectangleData, change = 1) {
+    applyChronoboost(rectangleData, change = 1, showInfo = true) {
         if (!rectangleData || !rectangleData.entityData) return;
         
         // Initialize chronoboost data
@@ -739,7 +1731,7 @@ class GanttChart {
         
         // Update rectangle width
         rectangleData.width = newWidth;
-        rectangleData.element.style.width = newWidth + 'px';
+        this.timeline(rectangleData.row).touch();
         
         // Update time display on the rectangle
         const timeDisplay = rectangleData.element.querySelector('.entity-time');
@@ -758,12 +1750,13 @@ class GanttChart {
         
         // Reposition rectangles and update stats
         this.repositionAllRectangles();
-        this.updateRowStats(rectangleData.row);
-        this.createGridLines(); // Update grid lines when chronoboost changes timing
-        this.createTimeIndex(); // Update time index when chronoboost changes timing
+        this.invalidateRow(rectangleData.row);
+        this.invalidateAxis(); // Update grid lines and time index when chronoboost changes timing
         
         // Update info panel with new data
-        this.showInfoPanel(rectangleData.entityData, rectangleData);
+        if (showInfo) {
+            this.showInfoPanel(rectangleData.entityData, rectangleData);
+        }
         
         console.log(`Chronoboost updated for ${rectangleData.entityData.name}: ${rectangleData.chronoboostCount} boosts, ${rectangleData.originalBuildTime}s → ${newBuildTime}s`);
     }
@@ -791,6 +1784,7 @@ class GanttChart {
         row.appendChild(controls);
         
         this.chart.appendChild(row);
+        this.timeline(this.rows);
         this.rows++;
     }
     
@@ -798,16 +1792,14 @@ class GanttChart {
     repositionAllRectangles() {
         // Reposition all rectangles to avoid overlaps after scaling
         for (let rowIndex = 0; rowIndex < this.rows; rowIndex++) {
-            const rowRects = this.rectangles
-                .filter(r => r.row === rowIndex)
-                .sort((a, b) => a.x - b.x);
-            
+            const timeline = this.timeline(rowIndex);
             let currentX = 0;
-            rowRects.forEach(rect => {
+            timeline.sorted().forEach(rect => {
                 rect.x = currentX;
-                rect.element.style.left = currentX + 'px';
+                this.invalidateRect(rect);
                 currentX += rect.width;
             });
+            timeline.touch();
         }
     }
     
@@ -815,8 +1807,8 @@ class GanttChart {
         // Always use sequential positioning - place at the end if no collision
         const validX = this.findValidPosition(rectData.row, rectData.x, rectData.width, rectData.id);
         rectData.x = validX;
-        rectData.element.style.left = validX + 'px';
-        rectData.element.style.top = '5px';
+        this.invalidateRect(rectData);
+        this.timeline(rectData.row).touch();
     }
     
     findValidPosition(row, desiredX, width, excludeId = -1) {
@@ -847,42 +1839,37 @@ class GanttChart {
     }
     
     getRowEndPosition(row, excludeId = -1) {
-        const rowRects = this.rectangles.filter(r => r.row === row && r.id !== excludeId);
-        if (rowRects.length === 0) return 0;
-        return Math.max(...rowRects.map(r => r.x + r.width));
+        const timeline = this.timeline(row);
+        const rowRects = timeline.sorted();
+        if (!rowRects.some(r => r.id === excludeId)) return timeline.end();
+        return rowRects.reduce((end, r) => r.id === excludeId ? end : Math.max(end, r.x + r.width), 0);
     }
     
     pushRectanglesRight(row, insertX, insertWidth, excludeId = -1) {
-        const rowRects = this.rectangles
-            .filter(r => r.row === row && r.id !== excludeId)
-            .sort((a, b) => a.x - b.x);
+        const timeline = this.timeline(row);
+        const rowRects = timeline.sorted();
         
         // Push all rectangles that start at or after the insertion point
-        for (const rect of rowRects) {
-            if (rect.x >= insertX) {
-                rect.x += insertWidth;
-                rect.element.style.left = rect.x + 'px';
-                rect.element.style.top = '5px';
-            }
+        for (let i = timeline.lowerBound(insertX); i < rowRects.length; i++) {
+            const rect = rowRects[i];
+            if (rect.id === excludeId) continue;
+            rect.x += insertWidth;
+            this.invalidateRect(rect);
         }
+        timeline.touch();
     }
     
     getValidPositions(row, excludeId = -1) {
         const positions = [0];
         
-        const currentRowRects = this.rectangles.filter(r => r.row === row && r.id !== excludeId);
-        for (const rect of currentRowRects) {
-            positions.push(rect.x + rect.width);
+        for (const rect of this.timeline(row).sorted()) {
+            if (rect.id !== excludeId) positions.push(rect.x + rect.width);
         }
         
         // Add alignment positions from all other rows (not just adjacent)
         for (let otherRow = 0; otherRow < this.rows; otherRow++) {
             if (otherRow !== row) {
-                const otherRowRects = this.rectangles.filter(r => r.row === otherRow);
-                for (const rect of otherRowRects) {
-                    positions.push(rect.x);
-                    positions.push(rect.x + rect.width);
-                }
+                positions.push(...this.timeline(otherRow).edges());
             }
         }
         
@@ -890,14 +1877,7 @@ class GanttChart {
     }
     
     hasCollision(row, x, width, excludeId = -1) {
-        const rowRects = this.rectangles.filter(r => r.row === row && r.id !== excludeId);
-        
-        for (const rect of rowRects) {
-            if (x < rect.x + rect.width && x + width > rect.x) {
-                return true;
-            }
-        }
-        return false;
+        return this.timeline(row).overlaps(x, width, excludeId);
     }
     
     findInsertionPosition(row, desiredX, width, excludeId = -1) {
@@ -940,8 +1920,7 @@ class GanttChart {
             
             // Find all rectangles to the right that should move with this one
             // Only include rectangles that are strictly to the right (not at the same position)
-            const rightwardRects = this.rectangles.filter(rect => 
-                rect.row === rectData.row && 
+            const rightwardRects = this.timeline(rectData.row).sorted().filter(rect => 
                 rect.id !== rectData.id && 
                 rect.x > rectData.x
             );
@@ -971,28 +1950,10 @@ class GanttChart {
             const newRow = Math.max(0, Math.min(this.rows - 1, Math.floor((y + 47) / 105)));
             
             if (newRow !== this.dragData.rectangle.row) {
-                const oldRow = this.chart.querySelector(`.row[data-row="${this.dragData.rectangle.row}"]`);
-                const newRowElement = this.chart.querySelector(`.row[data-row="${newRow}"]`);
-                
-                if (newRowElement && oldRow) {
-                    try {
-                        // Move the main rectangle
-                        oldRow.removeChild(this.dragData.rectangle.element);
-                        newRowElement.appendChild(this.dragData.rectangle.element);
-                        this.dragData.rectangle.row = newRow;
-                        
-                        // Move all rightward rectangles to the new row
-                        this.dragData.rightwardRects.forEach(rect => {
-                            if (rect.element && rect.element.parentNode) {
-                                oldRow.removeChild(rect.element);
-                                newRowElement.appendChild(rect.element);
-                                rect.row = newRow;
-                            }
-                        });
-                    } catch (error) {
-                        console.error('Error moving between rows:', error);
-                    }
-                }
+                // Move the main rectangle and all rightward rectangles to the new row;
+                // their elements follow into the new row element on the next frame
+                this.moveToRow(this.dragData.rectangle, newRow);
+                this.dragData.rightwardRects.forEach(rect => this.moveToRow(rect, newRow));
             }
             
             // Group dragging logic - move selected box and all boxes to the right
@@ -1003,23 +1964,30 @@ class GanttChart {
             this.dragData.rectangle.x = newX;
             
             // Move the selected rectangle
-            this.dragData.rectangle.element.style.left = this.dragData.rectangle.x + 'px';
-            this.dragData.rectangle.element.style.top = '5px';
+            this.invalidateRect(this.dragData.rectangle);
             
             // Move all pre-calculated rightward rectangles by the same delta
             // But ensure they don't move to the left of the main rectangle
             let currentX = this.dragData.rectangle.x + this.dragData.rectangle.width;
             this.dragData.rightwardRects.forEach(rect => {
                 rect.x = Math.max(currentX, rect.x + deltaX);
-                rect.element.style.left = rect.x + 'px';
-                rect.element.style.top = '5px';
+                this.invalidateRect(rect);
                 currentX = rect.x + rect.width;
             });
+            this.timeline(newRow).touch();
             
-            this.showDropZones(this.dragData.rectangle.x, newRow);
+            this.dropZoneRequest = [this.dragData.rectangle.x, newRow];
+            this.requestRender();
+            this.scheduleLiveSync();
         }
     }
     
+    moveToRow(rect, row) {
+        this.timeline(rect.row).remove(rect);
+        rect.row = row;
+        this.timeline(row).add(rect);
+    }
+    
     handleMouseUp(e) {
         if (this.dragData) {
             this.hideDropZones();
@@ -1031,9 +1999,9 @@ class GanttChart {
             this.positionAtInsertionPoint(this.dragData.rectangle);
             
             // Update stats for both old and new rows
-            this.updateRowStats(originalRow);
+            this.invalidateRow(originalRow);
             if (this.dragData.rectangle.row !== originalRow) {
-                this.updateRowStats(this.dragData.rectangle.row);
+                this.invalidateRow(this.dragData.rectangle.row);
             }
             
             this.dragData = null;
@@ -1052,19 +2020,17 @@ class GanttChart {
         const proximityThreshold = 30; // pixels
         
         for (let rowIndex = 0; rowIndex < this.rows; rowIndex++) {
+            // While dragging, only the drop zones close to the pointer in its row are shown
+            const nearPointer = dragX !== null && dragRow !== null;
+            if (nearPointer && dragRow !== rowIndex) continue;
             const rowElement = this.getRowElement(rowIndex);
             
             // Use the standard insertion logic for sequential placement
-            const insertionPoints = this.getInsertionPoints(rowIndex, this.dragData.rectangle.id);
+            const insertionPoints = nearPointer
+                ? this.getInsertionPoints(rowIndex, this.dragData.rectangle.id, dragX - proximityThreshold, dragX + proximityThreshold)
+                : this.getInsertionPoints(rowIndex, this.dragData.rectangle.id);
             
-            insertionPoints.forEach((point, index) => {
-                // Only show drop zone if no drag position is provided (initial call) 
-                // or if the drag position is close to this drop zone
-                if (dragX !== null && dragRow !== null) {
-                    if (dragRow !== rowIndex || Math.abs(dragX - point) > proximityThreshold) {
-                        return; // Skip this drop zone
-                    }
-                }
+            insertionPoints.forEach(point => {
                 
                 const dropZone = document.createElement('div');
                 dropZone.className = 'drop-zone';
@@ -1083,30 +2049,23 @@ class GanttChart {
         dropZones.forEach(zone => zone.remove());
     }
     
-    getInsertionPoints(row, excludeId = -1) {
-        const rowRects = this.rectangles.filter(r => r.row === row && r.id !== excludeId)
-            .sort((a, b) => a.x - b.x);
-        
-        const points = [0];
-        
-        // Add start positions of entities in current row (for insertion before them)
-        for (const rect of rowRects) {
-            points.push(rect.x);
-        }
-        
-        // Add end positions of entities in current row (for insertion after them)
-        for (const rect of rowRects) {
-            points.push(rect.x + rect.width);
+    getInsertionPoints(row, excludeId = -1, from = -Infinity, to = Infinity) {
+        const points = from <= 0 && to >= 0 ? [0] : [];
+        
+        // Add start and end positions of entities in current row (for insertion before/after them)
+        const timeline = this.timeline(row);
+        const rowRects = timeline.sorted();
+        for (let i = timeline.lowerBound(from - timeline.maxWidth); i < rowRects.length && rowRects[i].x <= to; i++) {
+            const rect = rowRects[i];
+            if (rect.id === excludeId) continue;
+            if (rect.x >= from) points.push(rect.x);
+            if (rect.x + rect.width >= from && rect.x + rect.width <= to) points.push(rect.x + rect.width);
         }
         
         // Add alignment points from all other rows
         for (let otherRow = 0; otherRow < this.rows; otherRow++) {
             if (otherRow !== row) {
-                const otherRowRects = this.rectangles.filter(r => r.row === otherRow);
-                for (const rect of otherRowRects) {
-                    points.push(rect.x);
-                    points.push(rect.x + rect.width);
-                }
+                points.push(...this.timeline(otherRow).edgesBetween(from, to));
             }
         }
         
@@ -1117,11 +2076,8 @@ class GanttChart {
         const targetRow = draggedRect.row;
         
         // Get all rectangles in this row (excluding the dragged group)
-        const otherRects = this.rectangles.filter(r => 
-            r.row === targetRow && 
-            r.id !== draggedRect.id && 
-            !this.dragData.rightwardRects.includes(r)
-        );
+        const draggedIds = new Set([draggedRect.id, ...this.dragData.rightwardRects.map(r => r.id)]);
+        const otherRects = this.timeline(targetRow).sorted().filter(r => !draggedIds.has(r.id));
         
         // Create the new order: determine where the dragged group should be inserted
         const allRects = [...otherRects];
@@ -1144,39 +2100,40 @@ class GanttChart {
         let currentPosition = 0;
         allRects.forEach(rect => {
             rect.x = currentPosition;
-            rect.element.style.left = currentPosition + 'px';
-            rect.element.style.top = '5px';
+            this.invalidateRect(rect);
             currentPosition += rect.width;
         });
+        this.timeline(targetRow).touch();
     }
     
     collapseGap(row, gapStartX, gapWidth, excludeId) {
-        const rowRects = this.rectangles.filter(r => r.row === row && r.id !== excludeId)
-            .sort((a, b) => a.x - b.x);
+        const timeline = this.timeline(row);
+        const rowRects = timeline.sorted();
         
         // Only shift rectangles that are to the right of the gap
-        for (const rect of rowRects) {
-            if (rect.x > gapStartX) {
+        for (let i = timeline.lowerBound(gapStartX); i < rowRects.length; i++) {
+            const rect = rowRects[i];
+            if (rect.x > gapStartX && rect.id !== excludeId) {
                 rect.x = Math.max(0, rect.x - gapWidth);
-                rect.element.style.left = rect.x + 'px';
-                rect.element.style.top = '5px';
+                this.invalidateRect(rect);
             }
         }
+        timeline.touch();
     }
     
     clearRow(rowIndex) {
-        const rowRects = this.rectangles.filter(r => r.row === rowIndex);
+        const timeline = this.timeline(rowIndex);
         
         // Remove each rectangle from DOM and array
-        rowRects.forEach(rectData => {
+        timeline.sorted().forEach(rectData => {
             if (rectData.element && rectData.element.parentNode) {
                 rectData.element.parentNode.removeChild(rectData.element);
             }
-            const index = this.rectangles.findIndex(r => r.id === rectData.id);
-            if (index !== -1) {
-                this.rectangles.splice(index, 1);
-            }
         });
+        if (timeline.length > 0) {
+            this.rectangles = this.rectangles.filter(r => r.row !== rowIndex);
+        }
+        this.rowTimelines[rowIndex] = new RowTimeline();
         
         // Clear selection if it was in this row
         if (this.selectedRectangle && this.selectedRectangle.row === rowIndex) {
@@ -1184,15 +2141,13 @@ class GanttChart {
         }
         
         // Update row stats
-        this.updateRowStats(rowIndex);
+        this.invalidateRow(rowIndex);
         
         console.log(`Cleared row ${rowIndex + 1}`);
     }
     
     alignRowLeft(rowIndex) {
-        const rowRects = this.rectangles
-            .filter(r => r.row === rowIndex)
-            .sort((a, b) => a.x - b.x);
+        const rowRects = this.timeline(rowIndex).sorted();
         
         if (rowRects.length === 0) return;
         
@@ -1200,19 +2155,18 @@ class GanttChart {
         let currentX = 0;
         rowRects.forEach(rect => {
             rect.x = currentX;
-            rect.element.style.left = currentX + 'px';
+            this.invalidateRect(rect);
             currentX += rect.width;
         });
+        this.timeline(rowIndex).touch();
         
         this.rightAlignedRows.delete(rowIndex);
-        this.updateRowStats(rowIndex);
+        this.invalidateRow(rowIndex);
         console.log(`Aligned row ${rowIndex + 1} to left`);
     }
     
     alignRowRight(rowIndex) {
-        const rowRects = this.rectangles
-            .filter(r => r.row === rowIndex)
-            .sort((a, b) => a.x - b.x);
+        const rowRects = this.timeline(rowIndex).sorted();
         
         if (rowRects.length === 0) return;
         
@@ -1220,14 +2174,8 @@ class GanttChart {
         const totalWidth = rowRects.reduce((sum, rect) => sum + rect.width, 0);
         
         // Find the end position of the row above (previous row)
-        let alignmentX = 0;
-        if (rowIndex > 0) {
-            const prevRowRects = this.rectangles.filter(r => r.row === rowIndex - 1);
-            if (prevRowRects.length > 0) {
-                // Get the rightmost position of the previous row
-                alignmentX = Math.max(...prevRowRects.map(r => r.x + r.width));
-            }
-        }
+        // (the rightmost position of the previous row)
+        const alignmentX = rowIndex > 0 ? this.timeline(rowIndex - 1).end() : 0;
         
         // Calculate starting position to align with the end of the row above
         const startX = Math.max(0, alignmentX - totalWidth);
@@ -1236,12 +2184,13 @@ class GanttChart {
         let currentX = startX;
         rowRects.forEach(rect => {
             rect.x = currentX;
-            rect.element.style.left = currentX + 'px';
+            this.invalidateRect(rect);
             currentX += rect.width;
         });
+        this.timeline(rowIndex).touch();
         
         this.rightAlignedRows.add(rowIndex);
-        this.updateRowStats(rowIndex);
+        this.invalidateRow(rowIndex);
         console.log(`Aligned row ${rowIndex + 1} to align with end of row above`);
     }
     
@@ -1279,6 +2228,7 @@ class GanttChart {
                 rect.row -= 1;
             }
         });
+        this.rowTimelines.splice(rowIndex, 1);
         
         // Decrease total row count
         this.rows--;
@@ -1328,55 +2278,56 @@ class GanttChart {
         console.log(`Downloading file from: ${url}`);
     }
     
-    async exportBuildOrder() {
-        try {
-            // Collect all rectangles data for export
-            const buildOrder = {
-                metadata: {
-                    exportDate: new Date().toISOString(),
-                    timeScale: this.timeScale,
-                    totalRows: this.rows
-                },
-                rows: []
+    collectBuildOrder() {
+        // Collect all rectangles data for export
+        const buildOrder = {
+            metadata: {
+                exportDate: new Date().toISOString(),
+                timeScale: this.timeScale,
+                totalRows: this.rows
+            },
+            rows: []
+        };
+        
+        // Group rectangles by row
+        for (let rowIndex = 0; rowIndex < this.rows; rowIndex++) {
+            const timeline = this.timeline(rowIndex);
+            const rowRects = timeline.sorted();
+            
+            const rowData = {
+                rowIndex: rowIndex,
+                entities: rowRects.map(rect => ({
+                    name: rect.entityData.name,
+                    type: rect.entityType,
+                    race: rect.entityData.race,
+                    startTime: rect.x / this.timeScale,
+                    buildTime: this.getBuildTime(rect.entityData),
+                    minerals: rect.entityData.minerals || 0,
+                    gas: rect.entityData.gas || 0,
+                    chronoboosted: rect.chronoboosted || false,
+                    chronoboostCount: rect.chronoboostCount || 0
+                }))
             };
             
-            // Group rectangles by row
-            for (let rowIndex = 0; rowIndex < this.rows; rowIndex++) {
-                const rowRects = this.rectangles
-                    .filter(r => r.row === rowIndex)
-                    .sort((a, b) => a.x - b.x);
-                
-                const rowData = {
-                    rowIndex: rowIndex,
-                    entities: rowRects.map(rect => ({
-                        name: rect.entityData.name,
-                        type: rect.entityType,
-                        race: rect.entityData.race,
-                        startTime: rect.x / this.timeScale,
-                        buildTime: this.getBuildTime(rect.entityData),
-                        minerals: rect.entityData.minerals || 0,
-                        gas: rect.entityData.gas || 0,
-                        chronoboosted: rect.chronoboosted || false,
-                        chronoboostCount: rect.chronoboostCount || 0
-                    }))
+            // Calculate row statistics
+            if (rowRects.length > 0) {
+                rowData.stats = {
+                    endTime: timeline.end() / this.timeScale,
+                    totalMinerals: timeline.minerals,
+                    totalGas: timeline.gas
                 };
-                
-                // Calculate row statistics
-                if (rowRects.length > 0) {
-                    const endTime = Math.max(...rowRects.map(r => (r.x + r.width) / this.timeScale));
-                    const totalMinerals = rowRects.reduce((sum, r) => sum + (r.entityData.minerals || 0), 0);
-                    const totalGas = rowRects.reduce((sum, r) => sum + (r.entityData.gas || 0), 0);
-                    
-                    rowData.stats = {
-                        endTime: endTime,
-                        totalMinerals: totalMinerals,
-                        totalGas: totalGas
-                    };
-                }
-                
-                buildOrder.rows.push(rowData);
             }
             
+            buildOrder.rows.push(rowData);
+        }
+        
+        return buildOrder;
+    }
+    
+    async exportBuildOrder() {
+        try {
+            const buildOrder = this.collectBuildOrder();
+            
             // Check if we're in static hosting mode
             if (window.APP_STATIC_MODE) {
                 // Static hosting - direct client-side download
@@ -1426,15 +2377,75 @@ class GanttChart {
             alert('Failed to export build order. Please check the console for details.');
         }
     }
+    
+    async shareBuildOrder() {
+        if (!this.codec) return;
+        try {
+            const code = this.codec.encode(this.collectBuildOrder());
+            history.replaceState(null, '', `#build=${code}`);
+            const url = window.location.href;
+            if (navigator.clipboard) {
+                await navigator.clipboard.writeText(url);
+            }
+            console.log(`Share link copied (${code.length} characters): ${url}`);
+        } catch (error) {
+            console.error('Error creating share link:', error);
+            alert('Failed to create a share link. Please check the console for details.');
+        }
+    }
+    
+    loadSharedBuildOrder() {
+        const match = window.location.hash.match(/^#build=([A-Za-z0-9_-]+)$/);
+        if (!match || !this.codec) return;
+        
+        let buildOrder;
+        try {
+            buildOrder = this.codec.decode(match[1]);
+        } catch (error) {
+            console.error('Invalid share link:', error);
+            alert(`Could not load the shared build order: ${error.message}`);
+            return;
+        }
+        
+        for (let rowIndex = 0; rowIndex < this.rows; rowIndex++) {
+            this.clearRow(rowIndex);
+        }
+        while (this.rows < buildOrder.rows.length) {
+            this.addRow();
+        }
+        
+        // Rows are packed left to right, so entities are added in start order
+        buildOrder.rows.forEach((row, rowIndex) => {
+            row.entities.forEach(entity => {
+                // Copied because chronoboost rewrites the entity's build time in place
+                const entityData = { ...this.codec.lookup(entity.race, entity.name) };
+                const rectData = this.addEntityFromIcon(entityData, `${entity.type}s`, rowIndex);
+                if (entity.chronoboostCount > 0) {
+                    this.applyChronoboost(rectData, entity.chronoboostCount, false);
+                }
+            });
+        });
+        console.log(`Loaded shared build order (${buildOrder.metadata.race})`);
+    }
 }
 
+// Worker scripts are served next to this one
+const WORKER_URL = document.currentScript ? new URL('simulation-worker.js', document.currentScript.src).href : null;
+
 window.addEventListener('load', () => {
     window.ganttChart = new GanttChart();
 });
 
+// The static build ships a service worker at the site root caching data and icons
+if (window.APP_STATIC_MODE && 'serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(`${window.APP_BASE_PATH || '.'}/sw.js`)
+            .catch(error => console.warn('Service worker registration failed:', error));
+    });
+}
+
 window.addEventListener('resize', () => {
     if (window.ganttChart) {
-        window.ganttChart.createGridLines();
-        window.ganttChart.createTimeIndex();
+        window.ganttChart.invalidateAxis();
     }
 });
\ No newline at end of file
@@ -0,0 +1,150 @@
+/**
+ * Offline cache for the static site.
+ *
+ * The build writes precache-manifest.json, listing every file to keep with a
+ * content revision, and prepends PRECACHE_VERSION (a hash of the manifest) to
+ * this script, so any change to the site changes the worker and installs it
+ * again. The app shell lives in a cache named after the shell's hash; data and
+ * icons in one named after the game data's hash. Both are served cache-first.
+ * Installing copies files whose revision is unchanged from the old caches
+ * instead of downloading them again, and activating deletes the old caches.
+ *
+ * Browsers stop idle workers, and a restarted one has to find its files
+ * without the network, so the manifest itself is cached at install under this
+ * worker's version and read back from there.
+ */
+
+const CACHE_PREFIX = 'sc2-gantt-';
+const MANIFEST_CACHE = `${CACHE_PREFIX}manifest`;
+const MANIFEST_URL = 'precache-manifest.json';
+
+let manifestIndex = null; // Promise of absolute URL -> {cache, key}
+
+function cacheNames(manifest) {
+    return {
+        shell: `${CACHE_PREFIX}shell-${manifest.shell_version}`,
+        data: `${CACHE_PREFIX}data-${manifest.data_version}`
+    };
+}
+
+// Cached under the revision, so an unchanged file can be found in any version's cache
+function revisionKey(entry) {
+    const url = new URL(entry.url, self.registration.scope);
+    url.searchParams.set('__rev', entry.revision);
+    return url.href;
+}
+
+function manifestKey() {
+    return new URL(`${MANIFEST_URL}?v=${PRECACHE_VERSION}`, self.registration.scope).href;
+}
+
+async function fetchManifest() {
+    const response = await fetch(manifestKey(), { cache: 'no-store' });
+    if (!response.ok) throw new Error(`Precache manifest: HTTP ${response.status}`);
+    return response;
+}
+
+async function storedManifest() {
+    const cache = await caches.open(MANIFEST_CACHE);
+    const stored = await cache.match(manifestKey());
+    if (stored) return stored.json();
+    // Installed by an older worker that did not keep its manifest
+    const response = await fetchManifest();
+    await cache.put(manifestKey(), response.clone());
+    return response.json();
+}
+
+// A failed load is not kept, so the index is retried on the next request
+function loadIndex() {
+    if (!manifestIndex) {
+        manifestIndex = storedManifest().then(indexManifest);
+        manifestIndex.catch(() => { manifestIndex = null; });
+    }
+    return manifestIndex;
+}
+
+function indexManifest(manifest) {
+    const names = cacheNames(manifest);
+    const entries = new Map();
+    const add = (entry, cache) => {
+        const target = { cache: cache, key: revisionKey(entry) };
+        entries.set(new URL(entry.url, self.registration.scope).href, target);
+        // The site root serves index.html
+        if (entry.url === 'index.html') entries.set(self.registration.scope, target);
+    };
+    manifest.shell.forEach(entry => add(entry, names.shell));
+    manifest.data.concat(manifest.icons).forEach(entry => add(entry, names.data));
+    return entries;
+}
+
+async function precache(cacheName, entries, required) {
+    const cache = await caches.open(cacheName);
+    const results = await Promise.allSettled(entries.map(async entry => {
+        const key = revisionKey(entry);
+        if (await cache.match(key)) return;
+        const previous = await caches.match(key);
+        if (previous) {
+            await cache.put(key, previous);
+            return;
+        }
+        const response = await fetch(entry.url, { cache: 'no-cache' });
+        if (!response.ok) throw new Error(`${entry.url}: HTTP ${response.status}`);
+        await cache.put(key, response);
+    }));
+    const failed = results.filter(result => result.status === 'rejected');
+    // The shell and data must all be cached to work offline; an icon can be fetched later
+    if (required && failed.length) throw failed[0].reason;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const response = await fetchManifest();
+        const manifest = await response.clone().json();
+        const names = cacheNames(manifest);
+        await precache(names.shell, manifest.shell, true);
+        await precache(names.data, manifest.data, true);
+        await precache(names.data, manifest.icons, false);
+        // Kept only once everything it lists is cached
+        await (await caches.open(MANIFEST_CACHE)).put(manifestKey(), response);
+        manifestIndex = Promise.resolve(indexManifest(manifest));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const manifest = await storedManifest().catch(() => null);
+        if (manifest) {
+            manifestIndex = Promise.resolve(indexManifest(manifest));
+            const current = Object.values(cacheNames(manifest)).concat(MANIFEST_CACHE);
+            const stale = (await caches.keys()).filter(name => name.startsWith(CACHE_PREFIX) && !current.includes(name));
+            await Promise.all(stale.map(name => caches.delete(name)));
+            const manifests = await caches.open(MANIFEST_CACHE);
+            const old = (await manifests.keys()).filter(request => request.url !== manifestKey());
+            await Promise.all(old.map(request => manifests.delete(request)));
+        }
+        await self.clients.claim();
+    })());
+});
+
+async function respond(request, target) {
+    const cache = await caches.open(target.cache);
+    const cached = await cache.match(target.key);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok) await cache.put(target.key, response.clone());
+    return response;
+}
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') return;
+    const url = new URL(event.request.url);
+    url.search = '';
+    url.hash = '';
+    event.respondWith((async () => {
+        // A restarted worker rebuilds its index from the cached manifest
+        const entries = await loadIndex().catch(() => null);
+        const target = entries && entries.get(url.href);
+        return target ? respond(event.request, target) : fetch(event.request);
+    })());
+});
@@ -0,0 +1,364 @@
+/**
+ * Economy and supply simulation of the chart's build order, run in a Web Worker.
+ *
+ * The static site has no backend to re-simulate edits, so the page posts its
+ * build here and the worker answers with the simulated timings. This is a port
+ * of backend/simulation.py: the same income model, supply values and rules for
+ * when a step may start, including the per-step checkpoints, so an edit late in
+ * the build only re-simulates the steps after it.
+ *
+ * Messages in:
+ *   {type: 'catalog', races: {race: {keys, names, buildings, requirements}}}
+ *       once, with every entity of each race; buildings[i] is 1 for
+ *       structures and requirements[i] lists the indexes of the entities that
+ *       entity i requires
+ *   {type: 'simulate', seq, race, steps: Float64Array, ids: Int32Array}
+ *       steps holds [requested, buildTime, minerals, gas] and ids [row, key
+ *       index] per entity, rows in order; both buffers are transferred
+ * Message out:
+ *   {type: 'result', seq, fromStep, order: Int32Array, timings: Float64Array, warnings, summary}
+ *       order maps each simulation step to its entity in the posted arrays and
+ *       timings holds [start, end, minerals, gas, supplyUsed, supplyCap] per step
+ */
+
+const MINERAL_RATE = 0.94;
+const OVERSATURATED_MINERAL_RATE = 0.33;
+const WORKERS_PER_BASE = 16;
+const OVERSATURATION_PER_BASE = 8;
+const GAS_RATE = 0.9;
+const WORKERS_PER_GEYSER = 3;
+const STARTING_WORKERS = 12;
+const STARTING_MINERALS = 50;
+const EPSILON = 1e-6;
+const STEP_FIELDS = 4;
+const TIMING_FIELDS = 6;
+
+const TOWN_HALLS = ['nexus', 'command_center', 'hatchery'];
+const WORKERS = ['probe', 'scv', 'drone'];
+const GEYSERS = ['assimilator', 'refinery', 'extractor'];
+// Zerg structures morphed from an existing structure rather than a drone
+const ZERG_MORPHS = ['lair', 'hive', 'greater_spire'];
+
+const SUPPLY_PROVIDED = {
+    'nexus': 15, 'command_center': 15, 'hatchery': 6,
+    'pylon': 8, 'supply_depot': 8, 'overlord': 8
+};
+
+// Supply cost per unit; morphs count only the difference from the unit they morph from
+const SUPPLY_COST = {
+    'probe': 1, 'zealot': 2, 'adept': 2, 'stalker': 2, 'sentry': 2, 'high_templar': 2,
+    'dark_templar': 2, 'immortal': 4, 'colossus': 6, 'disruptor': 4, 'observer': 1,
+    'warp_prism': 2, 'phoenix': 2, 'oracle': 3, 'void_ray': 4, 'tempest': 5, 'carrier': 6,
+    'mothership': 8,
+    'scv': 1, 'marine': 1, 'marauder': 2, 'reaper': 1, 'ghost': 2, 'hellion': 2, 'hellbat': 2,
+    'widow_mine': 2, 'cyclone': 3, 'siege_tank': 3, 'thor': 6, 'viking': 2, 'medivac': 2,
+    'liberator': 3, 'raven': 2, 'banshee': 3, 'battlecruiser': 6,
+    'drone': 1, 'zergling': 1, 'queen': 2, 'roach': 2, 'ravager': 1, 'hydralisk': 2, 'lurker': 1,
+    'mutalisk': 2, 'corruptor': 2, 'brood_lord': 2, 'infestor': 2, 'swarm_host': 3,
+    'ultralisk': 6, 'viper': 3
+};
+
+const STARTING_SUPPLY_CAP = { 'protoss': 15, 'terran': 15, 'zerg': 14 };
+
+const STARTING_ENTITIES = {
+    'protoss': ['nexus', 'probe'],
+    'terran': ['command_center', 'scv'],
+    'zerg': ['hatchery', 'drone', 'larva', 'overlord']
+};
+
+function formatGameTime(seconds) {
+    const whole = Math.floor(seconds);
+    return `${Math.floor(whole / 60)}:${String(whole % 60).padStart(2, '0')}`;
+}
+
+/** Per-race entity tables, indexed like the catalog's keys. */
+class RaceTables {
+    constructor(race, entry) {
+        this.race = race;
+        this.keys = entry.keys;
+        this.names = entry.names;
+        this.requirements = entry.requirements;
+        // Drones become the structures they build
+        this.consumesWorker = Uint8Array.from(this.keys, (key, i) =>
+            race === 'zerg' && entry.buildings[i] && !ZERG_MORPHS.includes(key) ? 1 : 0);
+        const index = new Map(this.keys.map((key, i) => [key, i]));
+        const flags = names => {
+            const set = new Uint8Array(this.keys.length);
+            names.forEach(name => { if (index.has(name)) set[index.get(name)] = 1; });
+            return set;
+        };
+        this.isWorker = flags(WORKERS);
+        this.isTownHall = flags(TOWN_HALLS);
+        this.isGeyser = flags(GEYSERS);
+        this.supplyCost = Int8Array.from(this.keys, key => SUPPLY_COST[key] || 0);
+        this.supplyProvided = Int8Array.from(this.keys, key => SUPPLY_PROVIDED[key] || 0);
+        this.starting = (STARTING_ENTITIES[race] || []).filter(key => index.has(key)).map(key => index.get(key));
+    }
+
+    requirementName(id) {
+        return this.keys[id].replace(/_/g, ' ');
+    }
+}
+
+/** Everything the simulation carries from one step to the next. */
+class EconomyState {
+    constructor(tables) {
+        this.time = 0;
+        this.minerals = STARTING_MINERALS;
+        this.gas = 0;
+        this.workers = STARTING_WORKERS;
+        this.bases = 1;
+        this.gasSlots = 0;
+        this.supplyUsed = STARTING_WORKERS;
+        this.supplyCap = STARTING_SUPPLY_CAP[tables.race] || 15;
+        this.completed = new Uint16Array(tables.keys.length);
+        tables.starting.forEach(id => { this.completed[id] = 1; });
+        // Min-heap of [end time, step index, key index] for started but unfinished steps
+        this.pending = [];
+        this.rowFree = new Map();
+        this.lastStart = 0;
+    }
+
+    copy() {
+        const clone = Object.assign(Object.create(EconomyState.prototype), this);
+        clone.completed = this.completed.slice();
+        clone.pending = this.pending.slice();
+        clone.rowFree = new Map(this.rowFree);
+        return clone;
+    }
+
+    income() {
+        const gasWorkers = Math.min(this.gasSlots, this.workers);
+        const mineralWorkers = this.workers - gasWorkers;
+        const saturated = Math.min(mineralWorkers, WORKERS_PER_BASE * this.bases);
+        const extra = Math.min(mineralWorkers - saturated, OVERSATURATION_PER_BASE * this.bases);
+        return [saturated * MINERAL_RATE + extra * OVERSATURATED_MINERAL_RATE, gasWorkers * GAS_RATE];
+    }
+
+    accrue(until) {
+        if (until > this.time) {
+            const [mineralRate, gasRate] = this.income();
+            this.minerals += mineralRate * (until - this.time);
+            this.gas += gasRate * (until - this.time);
+            this.time = until;
+        }
+    }
+
+    advance(until, tables) {
+        // Move time forward, applying every completion on the way
+        while (this.pending.length && this.pending[0][0] <= until + EPSILON) {
+            const [end, , id] = heapPop(this.pending);
+            this.accrue(Math.max(end, this.time));
+            if (id < 0) continue;
+            this.completed[id] += 1;
+            this.supplyCap += tables.supplyProvided[id];
+            if (tables.isWorker[id]) {
+                this.workers += 1;
+            } else if (tables.isTownHall[id]) {
+                this.bases += 1;
+            } else if (tables.isGeyser[id]) {
+                this.gasSlots += WORKERS_PER_GEYSER;
+            }
+        }
+        this.accrue(until);
+    }
+
+    hasPending(id) {
+        return this.pending.some(entry => entry[2] === id);
+    }
+}
+
+function heapLess(a, b) {
+    return a[0] < b[0] || (a[0] === b[0] && a[1] < b[1]);
+}
+
+function heapPush(heap, entry) {
+    heap.push(entry);
+    let i = heap.length - 1;
+    while (i > 0) {
+        const parent = (i - 1) >> 1;
+        if (!heapLess(heap[i], heap[parent])) break;
+        [heap[i], heap[parent]] = [heap[parent], heap[i]];
+        i = parent;
+    }
+}
+
+function heapPop(heap) {
+    const top = heap[0];
+    const last = heap.pop();
+    if (heap.length) {
+        heap[0] = last;
+        let i = 0;
+        for (;;) {
+            const left = 2 * i + 1;
+            const right = left + 1;
+            let smallest = i;
+            if (left < heap.length && heapLess(heap[left], heap[smallest])) smallest = left;
+            if (right < heap.length && heapLess(heap[right], heap[smallest])) smallest = right;
+            if (smallest === i) break;
+            [heap[i], heap[smallest]] = [heap[smallest], heap[i]];
+            i = smallest;
+        }
+    }
+    return top;
+}
+
+/** Start one step as early as allowed, mutating state; writes its timings and returns its warnings. */
+function simulateStep(state, tables, stepIndex, step, timings) {
+    const warnings = [];
+    const { id, row, requested, buildTime, minerals, gas } = step;
+    const name = id >= 0 ? tables.names[id] : 'Unknown entity';
+    state.advance(Math.max(requested, state.lastStart, state.rowFree.get(row) || 0), tables);
+
+    const requirements = id >= 0 ? tables.requirements[id] : [];
+    const missing = requirements.filter(r => !state.completed[r] && !state.hasPending(r));
+    missing.forEach(r => warnings.push(`${name} requires ${tables.requirementName(r)}, which is never built`));
+    const supply = id >= 0 ? tables.supplyCost[id] : 0;
+
+    for (;;) {
+        const waitingForRequirement = requirements.some(r => !missing.includes(r) && !state.completed[r]);
+        let supplyBlocked = supply > 0 && state.supplyUsed + supply > state.supplyCap;
+        if (supplyBlocked && !state.pending.length) {
+            warnings.push(`${name} is supply blocked at ${state.supplyUsed}/${state.supplyCap}`);
+            supplyBlocked = false;
+        }
+        const [mineralRate, gasRate] = state.income();
+        const shortMinerals = minerals - state.minerals;
+        const shortGas = gas - state.gas;
+        const affordable = shortMinerals <= EPSILON && shortGas <= EPSILON;
+        if (affordable && !waitingForRequirement && !supplyBlocked) break;
+
+        const nextEvent = state.pending.length ? state.pending[0][0] : Infinity;
+        let target = nextEvent;
+        if (!waitingForRequirement && !supplyBlocked) {
+            // Only resources are missing: jump to when the income covers them
+            let need = 0;
+            [[shortMinerals, mineralRate], [shortGas, gasRate]].forEach(([short, rate]) => {
+                if (short > EPSILON) need = Math.max(need, rate > 0 ? short / rate : Infinity);
+            });
+            target = Math.min(nextEvent, state.time + need);
+        }
+        if (target === Infinity) {
+            warnings.push(`${name} can never be afforded`);
+            break;
+        }
+        state.advance(target, tables);
+    }
+
+    const start = state.time;
+    state.minerals -= minerals;
+    state.gas -= gas;
+    state.supplyUsed += supply;
+    if (id >= 0 && tables.consumesWorker[id]) {
+        state.workers -= 1;
+        state.supplyUsed -= 1;
+    }
+    heapPush(state.pending, [start + buildTime, stepIndex, id]);
+    state.rowFree.set(row, start + buildTime);
+    state.lastStart = start;
+
+    const offset = stepIndex * TIMING_FIELDS;
+    timings[offset] = start;
+    timings[offset + 1] = start + buildTime;
+    timings[offset + 2] = Math.trunc(state.minerals);
+    timings[offset + 3] = Math.trunc(state.gas);
+    timings[offset + 4] = state.supplyUsed;
+    timings[offset + 5] = state.supplyCap;
+    return warnings;
+}
+
+function sameStep(a, b) {
+    return a.id === b.id && a.row === b.row && a.requested === b.requested &&
+        a.buildTime === b.buildTime && a.minerals === b.minerals && a.gas === b.gas;
+}
+
+/** Simulates builds, re-simulating each one from the first step that differs from the last. */
+class IncrementalSimulation {
+    constructor() {
+        this.tables = {};
+        this.race = null;
+        this.steps = [];
+        this.timings = new Float64Array(0);
+        this.warnings = [];
+        this.checkpoints = [];
+    }
+
+    setCatalog(races) {
+        Object.entries(races).forEach(([race, entry]) => {
+            this.tables[race] = new RaceTables(race, entry);
+        });
+        this.race = null;
+    }
+
+    update(race, stepData, ids) {
+        const tables = this.tables[race] || new RaceTables(race, { keys: [], names: [], buildings: [], requirements: [] });
+        const count = ids.length / 2;
+        const order = Int32Array.from({ length: count }, (_, i) => i);
+        // Steps run in order of requested time; rows and positions break ties as in the backend
+        order.sort((a, b) => stepData[a * STEP_FIELDS] - stepData[b * STEP_FIELDS] || a - b);
+        const steps = Array.from(order, i => ({
+            id: ids[i * 2 + 1],
+            row: ids[i * 2],
+            requested: stepData[i * STEP_FIELDS],
+            buildTime: stepData[i * STEP_FIELDS + 1],
+            minerals: stepData[i * STEP_FIELDS + 2],
+            gas: stepData[i * STEP_FIELDS + 3]
+        }));
+
+        let first = 0;
+        if (race === this.race) {
+            const limit = Math.min(steps.length, this.steps.length);
+            while (first < limit && sameStep(steps[first], this.steps[first])) first++;
+        } else {
+            this.race = race;
+            this.initial = new EconomyState(tables);
+            this.checkpoints = [];
+            this.warnings = [];
+        }
+
+        const timings = new Float64Array(count * TIMING_FIELDS);
+        timings.set(this.timings.subarray(0, first * TIMING_FIELDS));
+        const state = (first ? this.checkpoints[first - 1] : this.initial).copy();
+        this.checkpoints.length = first;
+        this.warnings.length = first;
+        for (let i = first; i < count; i++) {
+            this.warnings.push(simulateStep(state, tables, i, steps[i], timings));
+            this.checkpoints.push(state.copy());
+        }
+
+        this.steps = steps;
+        this.timings = timings;
+        return { fromStep: first, order: order, timings: timings.slice(), warnings: this.warnings.slice(), summary: this.summary() };
+    }
+
+    summary() {
+        const count = this.steps.length;
+        if (!count) return { completion_time: 0, completion: formatGameTime(0), supply: null, workers: STARTING_WORKERS, warnings: 0 };
+        const final = this.checkpoints[count - 1];
+        let completion = 0;
+        for (let i = 0; i < count; i++) completion = Math.max(completion, this.timings[i * TIMING_FIELDS + 1]);
+        const tables = this.tables[this.race];
+        const last = (count - 1) * TIMING_FIELDS;
+        return {
+            completion_time: completion,
+            completion: formatGameTime(completion),
+            supply: `${this.timings[last + 4]}/${this.timings[last + 5]}`,
+            workers: final.workers + final.pending.filter(entry => entry[2] >= 0 && tables && tables.isWorker[entry[2]]).length,
+            warnings: this.warnings.reduce((total, warnings) => total + warnings.length, 0)
+        };
+    }
+}
+
+// Only wired up when loaded as a worker, so the file can also be loaded directly for tests
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    const simulation = new IncrementalSimulation();
+    self.onmessage = event => {
+        const message = event.data;
+        if (message.type === 'catalog') {
+            simulation.setCatalog(message.races);
+        } else if (message.type === 'simulate') {
+            const result = simulation.update(message.race, message.steps, message.ids);
+            self.postMessage({ type: 'result', seq: message.seq, ...result }, [result.order.buffer, result.timings.buffer]);
+        }
+    };
+}
@@ -0,0 +1,47 @@
+"""Shared fixtures and builders for the test suite."""
+
+import json
+
+import pytest
+
+from sc2_gantt.backend.build_order import GameDataIndex
+from sc2_gantt.backend.render import DATA_PATH
+from sc2_gantt.backend.web_app import create_app
+
+
+def make_entity(race, name, start, build_time):
+    """Build an export-format entity with just the fields validation and simulation read."""
+    return {'name': name, 'race': race, 'startTime': start, 'buildTime': build_time}
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Return a factory for test applications whose build store lives in ``tmp_path``."""
+    def factory(**config):
+        return create_app({'TESTING': True, 'BUILD_STORE_PATH': str(tmp_path / 'builds.sqlite3'), **config})
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    """Create test Flask application."""
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def sc2_data():
+    """The bundled game data."""
+    with open(DATA_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def index(sc2_data):
+    """Game data index built from the bundled data file."""
+    return GameDataIndex(sc2_data)
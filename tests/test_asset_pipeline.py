@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""Tests for the frontend asset pipeline."""
+
+import json
+
+from sc2_gantt.backend.asset_pipeline import (
+    AssetPipeline, FRONTEND_DIR, minify_css, minify_js, tokenize_js, _BASE64
+)
+from sc2_gantt.backend.web_app import create_app
+
+
+def _decode_first_segment(mappings):
+    """Decode the first segment of a source map into absolute values."""
+    values, shift, value = [], 0, 0
+    for char in mappings.split(',')[0].split(';')[0]:
+        digit = _BASE64.index(char)
+        value += (digit & 31) << shift
+        shift += 5
+        if not digit & 32:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            shift = value = 0
+    return values
+
+
+def test_minify_js_preserves_token_stream():
+    """Minified gantt.js tokenizes to exactly the same tokens as the source."""
+    source = (FRONTEND_DIR / 'js' / 'gantt.js').read_text(encoding='utf-8')
+    minified, _ = minify_js(source, 'gantt.js', 'gantt.src.js')
+
+    assert len(minified) < len(source) * 0.7
+    assert [t.text for t in tokenize_js(minified)] == [t.text for t in tokenize_js(source)]
+
+
+def test_minify_js_keeps_semantics_sensitive_constructs():
+    """Strings, templates, regexes and ASI-relevant line breaks survive."""
+    source = """
+    // comment
+    const name = entity.name.toLowerCase().replace(/\\s+/g, '_'); /* block */
+    const html = `
+        <div>${ items.map(i => `<li>${i}</li>`).join('') }</div>`;
+    function f() {
+        return
+        a + +b - -c;
+    }
+    let x = a
+    ++b
+    """
+    minified, _ = minify_js(source, 'out.js', 'in.js')
+
+    assert 'comment' not in minified and 'block' not in minified
+    assert "/\\s+/g" in minified
+    assert "`\n        <div>${ items.map(i => `<li>${i}</li>`).join('') }</div>`" in minified
+    assert 'return\n' in minified
+    assert 'a+ +b- -c' in minified
+    assert 'a\n++b' in minified
+
+
+def test_minify_css_and_source_map():
+    """CSS is compacted and the source map points back at the original text."""
+    source = "/* header */\n.row .label :hover {\n    color : red;\n    width: calc(100% - 20px);\n}\n"
+    minified, source_map = minify_css(source, 'out.css', 'in.css')
+
+    assert minified == '.row .label :hover{color :red;width:calc(100% - 20px)}'
+    assert source_map['version'] == 3
+    assert source_map['sourcesContent'] == [source]
+    # First generated token '.row' comes from line 1 (0-based), column 0
+    assert _decode_first_segment(source_map['mappings']) == [0, 0, 1, 0]
+
+
+def test_pipeline_injects_config_prelude(tmp_path):
+    """Configuration is injected as a prelude without touching the source."""
+    pipeline = AssetPipeline(config={'APP_API_URL': 'api/sc2-data.json', 'APP_STATIC_MODE': True})
+    written = pipeline.write(tmp_path)
+
+    names = sorted(p.relative_to(tmp_path).as_posix() for p in written)
+    assert names == ['css/gantt.css', 'css/gantt.css.map', 'js/gantt.js', 'js/gantt.js.map',
+                     'js/simulation-worker.js', 'js/simulation-worker.js.map']
+
+    js = (tmp_path / 'js' / 'gantt.js').read_text()
+    assert js.startswith('window.APP_API_URL="api/sc2-data.json";\nwindow.APP_STATIC_MODE=true;\n')
+    assert js.rstrip().endswith('//# sourceMappingURL=gantt.js.map')
+
+    source_map = json.loads((tmp_path / 'js' / 'gantt.js.map').read_text())
+    # Prelude lines carry no mappings
+    assert source_map['mappings'].startswith(';;')
+
+    # Workers have no window to configure
+    assert (tmp_path / 'js' / 'simulation-worker.js').read_text().startswith('const MINERAL_RATE=')
+
+
+def test_bundle_route(client):
+    """The Flask app serves bundles and references them from the index page."""
+    index = client.get('/')
+    assert b'/bundle/js/gantt.js' in index.data
+    assert b'/bundle/css/gantt.css' in index.data
+
+    response = client.get('/bundle/js/gantt.js')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/javascript'
+    assert response.headers['ETag']
+
+    cached = client.get('/bundle/js/gantt.js', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+    assert client.get('/bundle/js/gantt.js.map').status_code == 200
+    assert client.get('/bundle/js/missing.js').status_code == 404
+
+
+def test_bundle_can_be_disabled():
+    """With the pipeline disabled the index references raw static files."""
+    app = create_app()
+    app.config['ASSET_PIPELINE'] = False
+    response = app.test_client().get('/')
+    assert b'/bundle/' not in response.data
+    assert b'js/gantt.js' in response.data
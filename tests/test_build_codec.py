@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""Tests for the compact build-order codec and its share-link endpoints."""
+
+import copy
+import timeit
+
+import pytest
+
+from sc2_gantt.backend.build_codec import BuildCodec
+from sc2_gantt.backend.build_order import BuildOrderError
+
+
+@pytest.fixture
+def codec(sc2_data):
+    return BuildCodec(sc2_data)
+
+
+def frontend_build(sc2_data, steps=40, rows=4):
+    """A build shaped like the frontend export: packed rows, plural types, some chronoboosts."""
+    race_data = sc2_data['races']['protoss']
+    catalog = sorted(race_data['detailed_data'].values(), key=lambda e: e['name'])
+    catalog += sorted(race_data['upgrades'].values(), key=lambda e: e['name'])
+    build = {'metadata': {'name': 'Two base Colossus'}, 'rows': [{'rowIndex': i, 'entities': []} for i in range(rows)]}
+    ends = [0] * rows
+    for step in range(steps):
+        data = catalog[(step * 7) % len(catalog)]
+        row = step % rows
+        duration = data.get('build_time') or data.get('research_time')
+        boosts = 1 if step % 5 == 0 and duration >= 30 else 0
+        build_time = duration - 10 * boosts
+        build['rows'][row]['entities'].append({
+            'name': data['name'], 'type': data['type'] + 's', 'race': 'protoss',
+            'startTime': ends[row], 'buildTime': build_time,
+            'minerals': data.get('minerals', 0), 'gas': data.get('gas', 0),
+            'chronoboosted': bool(boosts), 'chronoboostCount': boosts
+        })
+        ends[row] += build_time
+    return build
+
+
+def strip_types(build):
+    """Types are restored from the game data (the frontend exports them plural)."""
+    build = copy.deepcopy(build)
+    for row in build['rows']:
+        for entity in row['entities']:
+            entity.pop('type')
+    return build
+
+
+def test_round_trip_is_exact(codec, sc2_data):
+    build = frontend_build(sc2_data)
+    decoded = codec.decode(codec.encode(build))
+    assert decoded['metadata'] == {'race': 'protoss', 'name': 'Two base Colossus'}
+    assert strip_types(decoded)['rows'] == strip_types(build)['rows']
+    assert decoded['rows'][0]['entities'][0]['type'] in ('unit', 'building', 'upgrade')
+    # Canonical builds are fixed points
+    assert codec.encode(decoded) == codec.encode(build)
+
+
+def test_forty_step_build_fits_in_short_url(codec, sc2_data):
+    code = codec.encode(frontend_build(sc2_data))
+    assert len(code) < 200
+    assert set(code) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_')
+    seconds = min(timeit.repeat(lambda: codec.decode(code), number=100, repeat=3)) / 100
+    assert seconds < 0.005
+
+
+def test_off_grid_times_and_overrides_round_trip(codec):
+    """Zoomed exports have fractional times; gaps, custom costs and other races survive too."""
+    build = {'rows': [{'entities': [
+        {'name': 'Probe', 'race': 'protoss', 'startTime': 1 / 3, 'buildTime': 12},
+        {'name': 'Gateway', 'race': 'protoss', 'startTime': 40.25, 'buildTime': 33.3, 'minerals': 125, 'gas': 5},
+        {'name': 'Marine', 'race': 'terran', 'startTime': 90, 'buildTime': 18}
+    ]}]}
+    decoded = codec.decode(codec.encode(build))
+    entities = decoded['rows'][0]['entities']
+    assert [e['startTime'] for e in entities] == [1 / 3, 40.25, 90]
+    assert entities[1]['buildTime'] == 33.3 and (entities[1]['minerals'], entities[1]['gas']) == (125, 5)
+    assert entities[2]['race'] == 'terran' and decoded['metadata']['race'] == 'protoss'
+
+
+def test_rejects_bad_codes(codec, sc2_data):
+    code = codec.encode(frontend_build(sc2_data, steps=5))
+    with pytest.raises(BuildOrderError, match='truncated'):
+        codec.decode(code[:-3])
+    with pytest.raises(BuildOrderError, match='not valid base64url'):
+        codec.decode('a')
+    with pytest.raises(BuildOrderError, match='Unknown protoss entity'):
+        codec.encode({'rows': [{'entities': [{'name': 'Marine', 'race': 'protoss', 'startTime': 0}]}]})
+
+    changed = copy.deepcopy(sc2_data)
+    changed['races']['protoss']['detailed_data']['mothership_core'] = {'name': 'Mothership Core', 'type': 'unit'}
+    with pytest.raises(BuildOrderError, match='different game data'):
+        BuildCodec(changed).decode(code)
+
+
+def test_share_endpoints(client, sc2_data):
+    build = frontend_build(sc2_data, steps=12)
+    response = client.post('/api/builds/encode', json=build)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['url'].endswith('/#build=' + body['code'])
+
+    decoded = client.get(f"/api/builds/decode/{body['code']}").get_json()
+    assert strip_types(decoded)['rows'] == strip_types(build)['rows']
+    assert client.get('/api/builds/decode/AAAA').status_code == 400
+    assert client.post('/api/builds/encode', json={'rows': 1}).status_code == 400
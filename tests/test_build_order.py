@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+"""Tests for build-order evaluation and the NDJSON streaming endpoint."""
+
+import io
+import json
+
+import pytest
+
+from sc2_gantt.backend.build_order import (
+    BuildOrderError, evaluate_build_order, iter_ndjson, normalize_build_order, summarize_build_order
+)
+
+
+TERRAN_OPENER = {'rows': [
+    {'rowIndex': 0, 'entities': [
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 18, 'buildTime': 21},
+        {'name': 'Barracks', 'race': 'terran', 'startTime': 40, 'buildTime': 46, 'minerals': 150, 'gas': 0}
+    ]},
+    {'rowIndex': 1, 'entities': [
+        {'name': 'Marine', 'race': 'terran', 'startTime': 86, 'buildTime': 18}
+    ]}
+]}
+
+
+def test_evaluate_valid_build(index):
+    result = evaluate_build_order(TERRAN_OPENER, index)
+    assert result['ok'] and result['errors'] == [] and result['warnings'] == []
+    assert result['summary']['race'] == 'terran'
+    assert result['summary']['completion_time'] == 104
+
+
+def test_evaluate_reports_problems(index):
+    """Unknown entities are errors; requirement and cost problems are warnings."""
+    build = {'rows': [{'entities': [
+        {'name': 'Barracks', 'race': 'terran', 'startTime': 10, 'buildTime': 46, 'minerals': 100},
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 20, 'buildTime': 21},
+        {'name': 'Zergling', 'race': 'terran', 'startTime': 90, 'buildTime': 17}
+    ]}]}
+    result = evaluate_build_order(build, index)
+    assert not result['ok']
+    assert result['errors'] == ['Unknown terran entity "Zergling"']
+    assert any('before Supply Depot completes' in w for w in result['warnings'])
+    assert any('minerals 100 differs from 150' in w for w in result['warnings'])
+    assert any('overlaps' in w for w in result['warnings'])
+
+
+def test_normalize_fills_from_game_data(index):
+    build = normalize_build_order(TERRAN_OPENER, index)
+    depot = build['rows'][0]['entities'][0]
+    assert depot['minerals'] == 100 and depot['type'] == 'building'
+    assert build['metadata']['race'] == 'terran'
+
+
+@pytest.mark.parametrize('build', [
+    {'rows': [{'entities': [{'name': 'SCV', 'startTime': 0, 'minerals': 'x'}]}]},
+    {'rows': [{'entities': [{'name': 'SCV', 'startTime': 0, 'gas': [1]}]}]},
+    {'rows': [{'entities': [{'name': 'SCV', 'startTime': 0, 'chronoboostCount': 'x'}]}]},
+    {'rows': [{'entities': [{'name': 'SCV', 'startTime': 0, 'race': 5}]}]},
+    {'metadata': 'terran', 'rows': []},
+    {'metadata': {'race': 3}, 'rows': []}
+])
+def test_mistyped_fields_are_build_order_errors(build, index):
+    with pytest.raises(BuildOrderError):
+        summarize_build_order(build)
+    assert not evaluate_build_order(build, index)['ok']
+
+
+def test_iter_ndjson_bounds_line_length():
+    stream = io.BytesIO(b'{"a": 1}\n' + b'x' * 100 + b'\n\n{"b": 2}\nnot json\n')
+    results = list(iter_ndjson(stream, max_line_bytes=50))
+    assert results[0] == ({'a': 1}, None)
+    assert results[1][1] == 'Line exceeds 50 bytes'
+    assert results[2] == ({'b': 2}, None)
+    assert results[3][1].startswith('Invalid JSON')
+
+
+def test_streaming_evaluate_endpoint(client):
+    """Each NDJSON input line produces one NDJSON result line, in order."""
+    mistyped = {'rows': [{'entities': [{'name': 'SCV', 'startTime': 0, 'minerals': 'x'}]}]}
+    lines = [json.dumps(TERRAN_OPENER)] * 250 + [json.dumps(mistyped)] + [json.dumps(TERRAN_OPENER)] * 249 + [
+        '{broken', json.dumps({'rows': 3})]
+    response = client.post('/api/builds/evaluate', data='\n'.join(lines) + '\n',
+                           content_type='application/x-ndjson', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(results) == 502
+    assert [r['index'] for r in results] == list(range(502))
+    assert [i for i, r in enumerate(results) if not r['ok']] == [250, 500, 501]
+    assert 'minerals' in results[250]['errors'][0]
+    assert not results[500]['ok'] and not results[501]['ok']
+
+
+def test_streaming_export_mode(client):
+    response = client.post('/api/builds/evaluate?mode=export', data=json.dumps(TERRAN_OPENER) + '\n')
+    result = json.loads(response.get_data(as_text=True))
+    assert result['build']['rows'][1]['entities'][0]['minerals'] == 50
+    assert client.post('/api/builds/evaluate?mode=bogus', data='').status_code == 400
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""Tests for the SQLite build-order store and its REST endpoints."""
+
+import pytest
+
+from sc2_gantt.backend.build_order import BuildOrderError, parse_game_time
+from sc2_gantt.backend.build_store import BuildStore, get_build_store
+
+
+def make_build(race='terran', stim_start=None, marines=3, name=None):
+    """Build an export-format build order."""
+    entities = [
+        {'name': 'Barracks', 'type': 'building', 'race': race, 'startTime': 40, 'buildTime': 46,
+         'minerals': 150, 'gas': 0}
+    ]
+    entities += [
+        {'name': 'Marine', 'type': 'unit', 'race': race, 'startTime': 86 + i * 18, 'buildTime': 18,
+         'minerals': 50, 'gas': 0}
+        for i in range(marines)
+    ]
+    if stim_start is not None:
+        entities.append({'name': 'Stimpack', 'type': 'upgrade', 'race': race, 'startTime': stim_start,
+                         'buildTime': 100, 'minerals': 100, 'gas': 100})
+    build = {'metadata': {'timeScale': 10, 'totalRows': 1}, 'rows': [{'rowIndex': 0, 'entities': entities}]}
+    if name:
+        build['metadata']['name'] = name
+    return build
+
+
+def test_parse_game_time():
+    assert parse_game_time('4:30') == 270
+    assert parse_game_time('95') == 95
+    for invalid in ('nan', '-30', '4:99', '1e9', 'inf', ''):
+        with pytest.raises(BuildOrderError):
+            parse_game_time(invalid)
+
+
+def test_save_and_fetch_build(client):
+    """Saved builds are summarised and returned with their document."""
+    response = client.post('/api/builds', json=make_build(stim_start=150, name='Stim timing'))
+    assert response.status_code == 201
+    summary = response.get_json()
+    assert summary['race'] == 'terran'
+    assert summary['name'] == 'Stim timing'
+    assert summary['total_cost'] == 150 + 3 * 50 + 200
+    assert summary['completion_time'] == 250
+
+    fetched = client.get(f"/api/builds/{summary['id']}").get_json()
+    assert fetched['document']['rows'][0]['entities'][0]['name'] == 'Barracks'
+    assert client.get('/api/builds/999').status_code == 404
+
+
+def test_invalid_build_rejected(client):
+    assert client.post('/api/builds', json={'rows': 'nope'}).status_code == 400
+    response = client.post('/api/builds', json={'rows': [{'entities': [{'name': 'Marine'}]}]})
+    assert response.status_code == 400
+    assert 'startTime' in response.get_json()['error']
+
+
+def test_bulk_import_is_atomic(app, client):
+    """A bulk import stores every build or none of them."""
+    response = client.post('/api/builds/import', json=[make_build(), make_build(race='zerg')])
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 2
+
+    response = client.post('/api/builds/import', json={'builds': [make_build(), {'rows': None}]})
+    assert response.status_code == 400
+    assert 'Build 1' in response.get_json()['error']
+    assert len(get_build_store(app).list()[0]) == 2
+
+
+def test_target_query_uses_index(app, client):
+    """"Terran builds reaching Stimpack before 4:30" is answered from the targets index."""
+    client.post('/api/builds/import', json=[
+        make_build(stim_start=150),             # Stimpack done at 4:10
+        make_build(stim_start=200),             # done at 5:00
+        make_build(race='protoss', stim_start=100),
+        make_build()
+    ])
+
+    builds = client.get('/api/builds?race=terran&entity=Stimpack&before=4:30').get_json()['builds']
+    assert [b['id'] for b in builds] == [1]
+    response = client.get('/api/builds?race=terran&before=4:30')
+    assert response.status_code == 400
+    assert 'entity' in response.get_json()['error']
+
+    plan = ' '.join(get_build_store(app).explain(race='terran', entity='Stimpack', before=270))
+    assert 'SEARCH t USING PRIMARY KEY (race=? AND entity=? AND first_complete<?)' in plan
+    assert 'SCAN' not in plan
+
+    builds = client.get('/api/builds?entity=Stimpack&before=4:30').get_json()['builds']
+    assert [b['id'] for b in builds] == [3, 1]
+    plan = ' '.join(get_build_store(app).explain(entity='Stimpack', before=270))
+    assert 'USING COVERING INDEX idx_build_targets_entity (entity=? AND first_complete<?)' in plan
+    assert 'SCAN' not in plan
+
+
+def test_cursor_pagination(client):
+    """Listings page through every build exactly once."""
+    client.post('/api/builds/import', json=[make_build(marines=n) for n in range(1, 8)])
+
+    for sort in ('id', 'total_cost'):
+        seen, cursor = [], None
+        while True:
+            url = f'/api/builds?limit=3&sort={sort}' + (f'&cursor={cursor}' if cursor else '')
+            page = client.get(url).get_json()
+            seen.extend(b['id'] for b in page['builds'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert sorted(seen) == list(range(1, 8))
+        assert len(seen) == 7
+
+    assert client.get('/api/builds?sort=bogus').status_code == 400
+    assert client.get('/api/builds?cursor=%%%').status_code == 400
+    assert client.get('/api/builds?max_completion=nan').status_code == 400
+
+
+def test_store_is_created_lazily(tmp_path):
+    """No database file is created until the store is used."""
+    store = BuildStore(str(tmp_path / 'sub' / 'builds.sqlite3'))
+    assert not (tmp_path / 'sub').exists()
+    store.save(make_build())
+    assert (tmp_path / 'sub' / 'builds.sqlite3').exists()
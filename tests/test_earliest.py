@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""Tests for the precomputed earliest-timing table and its endpoint."""
+
+import copy
+import json
+
+import pytest
+
+from sc2_gantt.backend.build_order import GameDataIndex
+from sc2_gantt.backend.earliest import TABLE_PATH, EarliestTable, EarliestTimings, build_table
+
+
+def test_shipped_table_matches_data(sc2_data):
+    """Regenerate with ``python -m sc2_gantt earliest`` after changing the data or the model."""
+    with open(TABLE_PATH) as f:
+        assert json.load(f) == build_table(sc2_data)
+
+
+def test_paths_follow_prerequisites(sc2_data):
+    timings = EarliestTimings(GameDataIndex(sc2_data))
+
+    stalker = timings.compute('protoss', 'stalker')
+    assert [step[0] for step in stalker['path']] == ['Gateway', 'Cybernetics Core']
+    assert stalker['start'] >= stalker['path'][-1][2]
+    # Gateway needs a finished Pylon ("Pylon Power"), which the opening provides
+    assert 60 < stalker['start'] < 180
+
+    brood_lord = timings.compute('zerg', 'brood_lord')
+    names = [step[0] for step in brood_lord['path']]
+    assert {'Spawning Pool', 'Lair', 'Infestation Pit', 'Hive', 'Spire', 'Greater Spire'} == set(names)
+    ends = {name: end for name, _, end in brood_lord['path']}
+    starts = {name: start for name, start, _ in brood_lord['path']}
+    assert starts['Hive'] >= max(ends['Lair'], ends['Infestation Pit'])
+    assert brood_lord['start'] >= ends['Greater Spire']
+
+    # Starting structures need no path; producer alternatives pick the fastest
+    assert timings.compute('terran', 'scv')['path'] == []
+    zealot = timings.compute('protoss', 'zealot')
+    assert [step[0] for step in zealot['path']] == ['Gateway']
+
+
+def test_upgrade_levels_follow_each_other(sc2_data):
+    index = GameDataIndex(sc2_data)
+    table = EarliestTable(sc2_data)
+    checked = 0
+    for (race, key), data in index.entities.items():
+        previous = index.previous_level(race, key)
+        if previous is None:
+            continue
+        # The path's opening can differ (a second gas), so compare within the path
+        timing = table.lookup(race, key)
+        completions = {step['name']: step['completion'] for step in timing['path']}
+        assert timing['start'] >= completions[index.entities[(race, previous)]['name']] - 1e-6
+        checked += 1
+    assert checked >= 20
+
+
+def test_stale_table_is_recomputed(sc2_data, tmp_path):
+    changed = copy.deepcopy(sc2_data)
+    changed['races']['protoss']['detailed_data']['cybernetics_core']['build_time'] = 100
+    path = tmp_path / 'earliest.json'
+    path.write_text(TABLE_PATH.read_text())
+
+    current = EarliestTable(sc2_data, path).lookup('protoss', 'Stalker')
+    recomputed = EarliestTable(changed, path).lookup('protoss', 'Stalker')
+    assert recomputed['start'] == pytest.approx(current['start'] + 64, abs=1)
+
+
+def test_earliest_endpoint(client):
+    response = client.get('/api/earliest/terran/siege tank')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['name'] == 'Siege Tank' and body['race'] == 'terran'
+    assert [step['name'] for step in body['path']] == ['Barracks', 'Factory']
+    assert body['start_time'] == f"{int(body['start']) // 60}:{int(body['start']) % 60:02d}"
+
+    assert client.get('/api/earliest/Protoss/stalker').get_json()['name'] == 'Stalker'
+    assert client.get('/api/earliest/protoss/marine').status_code == 404
+    assert client.get('/api/earliest/orks/stalker').status_code == 404
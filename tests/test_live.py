@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+"""Tests for live recalculation sessions and their Server-Sent Events stream."""
+
+import json
+
+import pytest
+
+from sc2_gantt.backend.build_order import BuildOrderError
+from sc2_gantt.backend.live import get_live_sessions
+
+
+@pytest.fixture
+def app(make_app):
+    """Create test Flask application with a short heartbeat."""
+    return make_app(LIVE_HEARTBEAT=0.05)
+
+
+def probe_build(steps=20):
+    """A Protoss build of back-to-back Probes with a Pylon and Gateway in a second row."""
+    return {'metadata': {'race': 'protoss', 'name': 'Probes'}, 'rows': [
+        {'entities': [{'name': 'Probe', 'race': 'protoss', 'startTime': 12 * i, 'buildTime': 12}
+                      for i in range(steps)]},
+        {'entities': [{'name': 'Pylon', 'race': 'protoss', 'startTime': 18, 'buildTime': 18},
+                      {'name': 'Gateway', 'race': 'protoss', 'startTime': 60, 'buildTime': 46}]}
+    ]}
+
+
+def read_event(stream):
+    """Return the next non-heartbeat (event, id, data) from an SSE stream."""
+    while True:
+        message = next(stream)
+        message = message.decode() if isinstance(message, bytes) else message
+        if message.startswith(':'):
+            continue
+        fields = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+        return fields['event'], int(fields['id']), json.loads(fields['data'])
+
+
+def open_session(client, build=None):
+    response = client.post('/api/live/sessions', json=build)
+    assert response.status_code == 201
+    body = response.get_json()
+    stream = client.get(body['events'], buffered=False)
+    assert stream.mimetype == 'text/event-stream'
+    return body, iter(stream.response)
+
+
+def test_stream_starts_with_full_update_then_diffs(client):
+    body, stream = open_session(client, probe_build())
+    event, event_id, first = read_event(stream)
+    assert (event, event_id, first['seq']) == ('update', 1, 1)
+    assert first['full'] and len(first['changed']) == first['total_steps'] == 22
+    assert first['summary']['completion_time'] > 0
+
+    # Moving the Gateway later only re-simulates from where it now sorts
+    response = client.post(body['ops'], json={'ops': [
+        {'op': 'update', 'row': 1, 'index': 1, 'fields': {'startTime': 200}}
+    ]})
+    assert response.status_code == 202 and response.get_json() == {'seq': 2}
+    event, event_id, update = read_event(stream)
+    assert event == 'update' and update['seq'] == 2 and not update['full']
+    assert update['from_step'] == 7 and update['recomputed'] == 15
+    gateway = [e for e in update['changed'] if e['name'] == 'Gateway']
+    assert gateway and gateway[0]['start'] >= 200
+
+
+def test_rapid_edits_are_coalesced(client, app):
+    body, stream = open_session(client, probe_build())
+    read_event(stream)
+    for step in range(30):
+        client.post(body['ops'], json=[{'op': 'update', 'row': 1, 'index': 0, 'fields': {'startTime': 18 + step}}])
+    event, event_id, update = read_event(stream)
+    # One simulation covers all 30 edits
+    assert update['seq'] == 31
+    session = get_live_sessions(app).get(body['id'])
+    assert session.updates == 2
+    assert [e['start'] for e in update['changed'] if e['name'] == 'Pylon'][0] >= 47
+
+
+def test_operations(app):
+    session = get_live_sessions(app).create()
+    session.apply([{'op': 'set', 'build': probe_build(steps=2)}])
+    session.apply([
+        {'op': 'insert', 'row': 1, 'index': 0, 'entity': {'name': 'Nexus', 'startTime': 0, 'buildTime': 71}},
+        {'op': 'delete', 'row': 0, 'index': 0},
+        {'op': 'row', 'row': 2, 'entities': [{'name': 'Zealot', 'startTime': 120, 'buildTime': 27}]}
+    ])
+    build = session.build_order()
+    assert [[e['name'] for e in row['entities']] for row in build['rows']] == [
+        ['Probe'], ['Nexus', 'Pylon', 'Gateway'], ['Zealot']
+    ]
+
+    # Batches are atomic: the valid first operation is not applied either
+    with pytest.raises(BuildOrderError, match='Operation 1: Unknown protoss entity "Marine"'):
+        session.apply([{'op': 'delete', 'row': 2, 'index': 0},
+                       {'op': 'insert', 'row': 0, 'entity': {'name': 'Marine', 'startTime': 0}}])
+    with pytest.raises(BuildOrderError, match='No entity 5 in row 0'):
+        session.apply([{'op': 'update', 'row': 0, 'index': 5, 'fields': {'startTime': 1}}])
+    with pytest.raises(BuildOrderError, match='"update" fields'):
+        session.apply([{'op': 'update', 'row': 0, 'index': 0, 'fields': {'name': 'Zealot'}}])
+    for fields in ({'minerals': 'x'}, {'gas': -50}, {'chronoboostCount': [1]}, {'buildTime': float('nan')}):
+        with pytest.raises(BuildOrderError):
+            session.apply([{'op': 'update', 'row': 0, 'index': 0, 'fields': fields}])
+    with pytest.raises(BuildOrderError):
+        session.apply([{'op': 'insert', 'row': 0, 'entity': {'name': 'Probe', 'startTime': 0, 'race': 5}}])
+    with pytest.raises(BuildOrderError):
+        session.apply([{'op': 'set', 'build': {'metadata': 'protoss', 'rows': []}}])
+    assert session.build_order() == build and session.seq == 2
+
+
+def test_stream_survives_simulation_failure(app, monkeypatch):
+    session = get_live_sessions(app).create()
+    session.apply([{'op': 'set', 'build': probe_build(steps=2)}])
+    recalculate = session.recalculate
+    monkeypatch.setattr(session, 'recalculate', lambda *args, **kwargs: 1 / 0)
+    stream = session.stream(heartbeat=0.05)
+    assert next(stream).startswith('event: error')
+
+    monkeypatch.setattr(session, 'recalculate', recalculate)
+    session.apply([{'op': 'delete', 'row': 0, 'index': 0}])
+    assert next(stream).startswith('event: update')
+    session.close()
+
+
+def test_session_errors_and_close(client):
+    assert client.post('/api/live/sessions/nope/ops', json=[{'op': 'delete'}]).status_code == 404
+    assert client.get('/api/live/sessions/nope/events').status_code == 404
+    assert client.post('/api/live/sessions', json={'rows': 1}).status_code == 400
+
+    body, stream = open_session(client, probe_build(steps=3))
+    read_event(stream)
+    assert client.post(body['ops'], json={'ops': [{'op': 'explode'}]}).status_code == 400
+    assert client.delete(f"/api/live/sessions/{body['id']}").status_code == 204
+    with pytest.raises(StopIteration):
+        read_event(stream)
+    assert client.post(body['ops'], json=[{'op': 'delete', 'row': 0, 'index': 0}]).status_code == 404
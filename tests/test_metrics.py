@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""Tests for request metrics and response compression."""
+
+import gzip
+
+from sc2_gantt.backend.metrics import MetricsRegistry, get_metrics
+from sc2_gantt.backend.web_app import create_app
+
+
+def test_histogram_rendering():
+    """Histograms render cumulative buckets, sum and count."""
+    registry = MetricsRegistry()
+    registry.histogram('latency', 'Latency.', (0.1, 1.0))
+    labels = (('route', '/x'),)
+    for value in (0.05, 0.5, 5.0):
+        registry.observe('latency', value, labels)
+
+    text = registry.render()
+    assert '# TYPE latency histogram' in text
+    assert 'latency_bucket{route="/x",le="0.1"} 1' in text
+    assert 'latency_bucket{route="/x",le="1.0"} 2' in text
+    assert 'latency_bucket{route="/x",le="+Inf"} 3' in text
+    assert 'latency_sum{route="/x"} 5.55' in text
+    assert 'latency_count{route="/x"} 3' in text
+
+
+def test_request_metrics_endpoint(client):
+    """Per-route latency, size and status metrics appear on /metrics."""
+    client.get('/api/sc2-data')
+    client.get('/download/sc2-data/nope')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+    text = response.get_data(as_text=True)
+    assert 'sc2_gantt_request_duration_seconds_count{route="/api/sc2-data",method="GET"} 1' in text
+    assert 'sc2_gantt_requests_total{route="/download/sc2-data/<race>",method="GET",status="404"} 1' in text
+    assert 'sc2_gantt_response_size_bytes_bucket{route="/api/sc2-data",method="GET",le="+Inf"} 1' in text
+
+
+def test_data_cache_hits(app, client):
+    """The parsed data file is reused until it changes on disk."""
+    client.get('/api/sc2-data')
+    client.get('/api/sc2-data')
+    client.get('/download/sc2-data/terran')
+
+    metrics = get_metrics(app)
+    assert metrics.get_counter('sc2_gantt_data_cache_requests_total', (('result', 'miss'),)) == 1
+    assert metrics.get_counter('sc2_gantt_data_cache_requests_total', (('result', 'hit'),)) == 2
+
+
+def test_gzip_compression_ratio(app, client):
+    """Large JSON responses are gzipped when accepted and the ratio is recorded."""
+    plain = client.get('/api/sc2-data')
+    assert 'Content-Encoding' not in plain.headers
+
+    response = client.get('/api/sc2-data', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain.data
+
+    histogram = get_metrics(app).get_histogram(
+        'sc2_gantt_response_compression_ratio', (('route', '/api/sc2-data'),)
+    )
+    assert histogram.count == 1
+    assert 0 < histogram.sum < 0.5
+
+
+def test_etagged_responses_are_compressed_once(client, monkeypatch):
+    calls = []
+    compress = gzip.compress
+    monkeypatch.setattr(gzip, 'compress', lambda data, **kwargs: calls.append(len(data)) or compress(data, **kwargs))
+
+    plain = client.get('/bundle/js/gantt.js')
+    first = client.get('/bundle/js/gantt.js', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/bundle/js/gantt.js', headers={'Accept-Encoding': 'gzip'})
+    assert len(calls) == 1
+    assert first.data == second.data and gzip.decompress(second.data) == plain.data
+    assert second.headers['ETag'].startswith('W/')
+
+
+def test_metrics_can_be_disabled():
+    """With metrics disabled no hooks or endpoint are registered."""
+    app = create_app({'METRICS_ENABLED': False})
+    assert get_metrics(app) is None
+    assert app.test_client().get('/metrics').status_code == 404
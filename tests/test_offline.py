@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+"""Tests for the static site's service worker and precache manifest."""
+
+import json
+
+from sc2_gantt.backend.asset_pipeline import AssetPipeline, tokenize_js
+from sc2_gantt.backend.offline import PRECACHE_MANIFEST, SERVICE_WORKER, write_service_worker
+
+
+def _site(tmp_path):
+    AssetPipeline(config={'APP_STATIC_MODE': True}).write(tmp_path)
+    (tmp_path / 'index.html').write_text('<html></html>', encoding='utf-8')
+    (tmp_path / 'api').mkdir()
+    (tmp_path / 'api' / 'sc2-data.json').write_text('{"races": {}}', encoding='utf-8')
+    icons = tmp_path / 'assets' / 'icons' / 'terran' / 'units'
+    icons.mkdir(parents=True)
+    (icons / 'marine.jpg').write_bytes(b'marine')
+    (icons / 'scv.jpg').write_bytes(b'scv')
+    return tmp_path
+
+
+def test_precache_manifest_lists_the_build(tmp_path):
+    """Shell, data and icons are listed with content revisions; source maps are not."""
+    manifest = write_service_worker(_site(tmp_path))
+
+    assert json.loads((tmp_path / PRECACHE_MANIFEST).read_text(encoding='utf-8')) == manifest
+    assert [entry['url'] for entry in manifest['shell']] == [
+        'index.html', 'js/gantt.js', 'js/simulation-worker.js', 'css/gantt.css']
+    assert [entry['url'] for entry in manifest['data']] == ['api/sc2-data.json']
+    assert [entry['url'] for entry in manifest['icons']] == [
+        'assets/icons/terran/units/marine.jpg', 'assets/icons/terran/units/scv.jpg']
+    assert len({entry['revision'] for entry in manifest['icons']}) == 2
+
+    worker = (tmp_path / SERVICE_WORKER).read_text(encoding='utf-8')
+    assert worker.startswith('const PRECACHE_VERSION="')
+    assert 'window.' not in worker
+    assert tokenize_js(worker)
+
+
+def test_versions_follow_content(tmp_path):
+    """Only the group whose files changed gets a new version, and sw.js always changes."""
+    site = _site(tmp_path)
+    before = write_service_worker(site)
+    worker_before = (site / SERVICE_WORKER).read_text(encoding='utf-8')
+
+    (site / 'api' / 'sc2-data.json').write_text('{"races": {"terran": {}}}', encoding='utf-8')
+    after = write_service_worker(site)
+    assert after['data_version'] != before['data_version']
+    assert after['shell_version'] == before['shell_version']
+    assert after['icons'] == before['icons']
+    assert (site / SERVICE_WORKER).read_text(encoding='utf-8') != worker_before
+
+    (site / 'index.html').write_text('<html lang="en"></html>', encoding='utf-8')
+    again = write_service_worker(site)
+    assert again['shell_version'] != after['shell_version']
+    assert again['data_version'] == after['data_version']
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+"""Tests for the patch-versioned game data store."""
+
+import copy
+import json
+
+import pytest
+
+from sc2_gantt.backend.patches import PatchError, PatchStore, apply_delta, diff_game_data
+from sc2_gantt.backend.render import DATA_PATH
+
+
+@pytest.fixture(scope='module')
+def sc2_data():
+    with open(DATA_PATH) as f:
+        return json.load(f)
+
+
+def _next_patch(data, minerals):
+    data = copy.deepcopy(data)
+    data['races']['terran']['detailed_data']['banshee']['minerals'] = minerals
+    return data
+
+
+def _patched(data, patch):
+    return dict(data, metadata=dict(data['metadata'], patch=patch))
+
+
+def test_diff_and_apply_round_trip(sc2_data):
+    changed = _next_patch(sc2_data, 175)
+    zerg = changed['races']['zerg']
+    removed = next(iter(zerg['upgrades']))
+    del zerg['upgrades'][removed]
+    zerg['entities'].reverse()
+    zerg['entities'].append({'name': 'Mutant Larva', 'type': 'unit', 'race': 'zerg'})
+
+    delta = diff_game_data(sc2_data, changed)
+    assert set(delta['races']) == {'terran', 'zerg'}
+    assert list(delta['races']['terran']) == ['detailed_data']
+    assert list(delta['races']['terran']['detailed_data']['set']) == ['banshee']
+    assert delta['races']['zerg']['upgrades']['removed'] == [removed]
+    assert 'order' in delta['races']['zerg']['entities']
+
+    rebuilt = apply_delta(sc2_data, json.loads(json.dumps(delta)))
+    assert rebuilt == changed
+    assert [e['name'] for e in rebuilt['races']['zerg']['entities']] == [e['name'] for e in zerg['entities']]
+
+
+def test_unchanged_records_are_shared(sc2_data, tmp_path):
+    store = PatchStore(tmp_path)
+    current = sc2_data
+    for i in range(10):
+        current = _next_patch(current, 150 + i)
+        store.add(f'5.0.{i}', current)
+    assert (tmp_path / '5.0.9.json').stat().st_size < 2048
+
+    store = PatchStore(tmp_path)
+    patches = [store.get(f'5.0.{i}') for i in range(10)]
+    assert patches[-1] == _patched(current, '5.0.9')
+    assert patches[0]['races']['protoss'] is patches[-1]['races']['protoss']
+    first, last = patches[0]['races']['terran'], patches[-1]['races']['terran']
+    assert first['entities'] is last['entities']
+    assert first['detailed_data']['marine'] is last['detailed_data']['marine']
+    assert first['detailed_data']['banshee']['minerals'] == 150
+    assert last['detailed_data']['banshee']['minerals'] == 159
+
+
+def test_store_errors(sc2_data, tmp_path):
+    store = PatchStore(tmp_path)
+    assert store.patches() == [] and store.latest() is None
+    store.add('5.0.14', sc2_data)
+    with pytest.raises(PatchError):
+        store.add('5.0.14', sc2_data)
+    with pytest.raises(PatchError):
+        store.add('../escape', sc2_data)
+    with pytest.raises(PatchError):
+        store.get('4.0')
+
+
+def test_patch_selector(sc2_data, tmp_path, make_app):
+    store = PatchStore(tmp_path)
+    store.add('5.0.13', sc2_data)
+    store.add('5.0.14', _next_patch(sc2_data, 175))
+    client = make_app(COMPRESS_RESPONSES=False, PATCHES_DIR=tmp_path).test_client()
+
+    listing = client.get('/api/patches').get_json()
+    assert [p['patch'] for p in listing['patches']] == ['5.0.13', '5.0.14']
+    assert listing['latest'] == '5.0.14'
+
+    def banshee_minerals(patch):
+        data = client.get(f'/api/sc2-data?patch={patch}').get_json()
+        assert data['metadata']['patch'] == patch
+        return data['races']['terran']['detailed_data']['banshee']['minerals']
+
+    assert (banshee_minerals('5.0.13'), banshee_minerals('5.0.14')) == (150, 175)
+    assert client.get('/api/sc2-data').get_json() == sc2_data
+    assert client.get('/api/sc2-data?patch=4.0').status_code == 404
+
+    build = {'metadata': {'race': 'terran'}, 'rows': [{'entities': [
+        {'name': 'Banshee', 'race': 'terran', 'startTime': 0, 'buildTime': 43, 'minerals': 150, 'gas': 100}]}]}
+    body = json.dumps(build) + '\n'
+    older = client.post('/api/builds/evaluate?patch=5.0.13', data=body).get_data(as_text=True)
+    newer = client.post('/api/builds/evaluate?patch=5.0.14', data=body).get_data(as_text=True)
+    assert 'minerals' not in ' '.join(json.loads(older)['warnings'])
+    assert 'minerals' in ' '.join(json.loads(newer)['warnings']).lower()
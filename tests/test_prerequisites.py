@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""Tests for bitmask prerequisite validation."""
+
+import argparse
+import json
+from functools import partial
+
+import pytest
+
+from sc2_gantt.__main__ import validate_command
+from sc2_gantt.backend.build_order import BuildOrderError
+from sc2_gantt.backend.prerequisites import PrerequisiteValidator
+from sc2_gantt.backend.render import DATA_PATH
+
+from tests.conftest import make_entity
+
+
+_entity = partial(make_entity, 'protoss')
+
+
+VALID = {'metadata': {'race': 'protoss'}, 'rows': [
+    {'entities': [_entity('Pylon', 18, 18), _entity('Gateway', 40, 46), _entity('Cybernetics Core', 90, 36)]},
+    {'entities': [_entity('Stalker', 130, 30), _entity('Warp Gate', 130, 100)]}
+]}
+
+EARLY_STALKER = {'metadata': {'race': 'protoss'}, 'rows': [
+    {'entities': [_entity('Pylon', 18, 18), _entity('Gateway', 40, 46)]},
+    {'entities': [_entity('Stalker', 60, 30)]}
+]}
+
+
+@pytest.fixture(scope='module')
+def validator():
+    with open(DATA_PATH) as f:
+        return PrerequisiteValidator(json.load(f))
+
+
+def test_valid_build(validator):
+    assert validator.validate(VALID) == {'ok': True, 'race': 'protoss', 'errors': []}
+
+
+def test_missing_prerequisite_names_row_and_position(validator):
+    result = validator.validate(EARLY_STALKER)
+    assert not result['ok']
+    [error] = result['errors']
+    assert (error['row'], error['position'], error['name']) == (1, 0, 'Stalker')
+    assert error['missing'] == ['Cybernetics Core']
+    assert error['message'] == 'Stalker at 1:00 (row 1, position 0) needs Cybernetics Core'
+
+
+def test_prerequisite_must_be_finished(validator):
+    # The Cybernetics Core is started but not finished when the Stalker starts
+    build = {'metadata': {'race': 'protoss'}, 'rows': [
+        {'entities': [_entity('Pylon', 18, 18), _entity('Gateway', 40, 46), _entity('Cybernetics Core', 90, 36)]},
+        {'entities': [_entity('Stalker', 100, 30)]}
+    ]}
+    assert validator.validate(build)['errors'][0]['missing'] == ['Cybernetics Core']
+
+
+def test_upgrade_needs_previous_level(validator):
+    build = {'metadata': {'race': 'protoss'}, 'rows': [
+        {'entities': [_entity('Pylon', 18, 18), _entity('Gateway', 40, 46), _entity('Cybernetics Core', 90, 36)]},
+        {'entities': [_entity('Air Armor Level 2', 130, 190)]}
+    ]}
+    [error] = validator.validate(build)['errors']
+    assert error['missing'] == ['Air Armor Level 1']
+    build['rows'][1]['entities'].insert(0, _entity('Air Armor Level 1', 130, 129))
+    build['rows'][1]['entities'][1]['startTime'] = 259
+    assert validator.validate(build)['ok']
+
+
+def test_unknown_and_malformed(validator):
+    build = {'metadata': {'race': 'protoss'}, 'rows': [{'entities': [_entity('Mothership Core', 20, 30)]}]}
+    assert validator.validate(build)['errors'][0]['message'] == 'Unknown protoss entity "Mothership Core"'
+    with pytest.raises(BuildOrderError):
+        validator.validate({'rows': [{'entities': [{'name': 'Pylon'}]}]})
+    with pytest.raises(BuildOrderError):
+        validator.validate({'rows': [{'entities': [dict(_entity('Pylon', 0, 18), race=5)]}]})
+    with pytest.raises(BuildOrderError):
+        validator.validate({'metadata': {'race': ['protoss']}, 'rows': []})
+    results = validator.validate_many([VALID, 'nope', {'metadata': 'protoss', 'rows': []}, VALID])
+    assert [result['ok'] for result in results] == [True, False, False, True]
+
+
+def test_validate_route(make_app):
+    client = make_app(COMPRESS_RESPONSES=False).test_client()
+    mistyped = {'rows': [{'entities': [dict(_entity('Pylon', 0, 18), race=5)]}]}
+    body = '\n'.join([json.dumps(VALID), 'not json', json.dumps(EARLY_STALKER), json.dumps(mistyped)]) + '\n'
+    response = client.post('/api/builds/validate', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(r['index'], r['ok']) for r in results] == [(0, True), (1, False), (2, False), (3, False)]
+    assert results[2]['errors'][0]['missing'] == ['Cybernetics Core']
+
+
+def test_validate_command(tmp_path, capsys):
+    (tmp_path / 'valid.json').write_text(json.dumps(VALID))
+    assert validate_command(argparse.Namespace(sources=[str(tmp_path)], data=None)) == 0
+    (tmp_path / 'stored.json').write_text(json.dumps({'id': 'abc', 'document': EARLY_STALKER}))
+    assert validate_command(argparse.Namespace(sources=[str(tmp_path)], data=None)) == 1
+    assert 'needs Cybernetics Core' in capsys.readouterr().out
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""Tests for the opt-in request profiling hook."""
+
+import json
+import pstats
+
+from sc2_gantt.backend.web_app import create_app
+
+
+def _profiling_app(tmp_path, **config):
+    return create_app({
+        'TESTING': True,
+        'PROFILING_ENABLED': True,
+        'PROFILING_DIR': str(tmp_path),
+        **config
+    })
+
+
+def test_profiling_disabled_by_default():
+    """Without config, requests are never profiled and no routes exist."""
+    app = create_app({'TESTING': True})
+    client = app.test_client()
+    response = client.get('/api/sc2-data', headers={'X-Profile': '1'})
+    assert 'X-Profile-Id' not in response.headers
+    assert client.get('/profiles').status_code == 404
+
+
+def test_unflagged_requests_are_not_profiled(tmp_path):
+    """Only requests carrying the header or query flag are profiled."""
+    client = _profiling_app(tmp_path).test_client()
+    response = client.get('/api/sc2-data')
+    assert 'X-Profile-Id' not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pstats_profile_via_header(tmp_path):
+    """The header flag stores a loadable pstats profile that can be downloaded."""
+    client = _profiling_app(tmp_path).test_client()
+    response = client.get('/download/sc2-data/terran', headers={'X-Profile': '1'})
+    assert response.status_code == 200
+
+    profile_id = response.headers['X-Profile-Id']
+    assert profile_id.endswith('.pstats')
+    stats = pstats.Stats(str(tmp_path / profile_id))
+    assert stats.total_calls > 0
+
+    listing = client.get('/profiles').get_json()
+    assert [p['id'] for p in listing] == [profile_id]
+    download = client.get(f'/profiles/{profile_id}')
+    assert download.status_code == 200
+    assert 'attachment' in download.headers['Content-Disposition']
+
+
+def test_speedscope_profile_via_query(tmp_path):
+    """The query flag can request a balanced speedscope evented profile."""
+    client = _profiling_app(tmp_path).test_client()
+    response = client.get('/api/sc2-data?profile=speedscope')
+
+    profile_id = response.headers['X-Profile-Id']
+    document = json.loads((tmp_path / profile_id).read_text())
+    events = document['profiles'][0]['events']
+    assert document['profiles'][0]['type'] == 'evented'
+    assert sum(1 for e in events if e['type'] == 'O') == sum(1 for e in events if e['type'] == 'C')
+    assert any('get_sc2_data' in frame['name'] for frame in document['shared']['frames'])
+
+
+def test_profile_retention(tmp_path):
+    """Only the newest PROFILING_MAX_FILES profiles are kept."""
+    client = _profiling_app(tmp_path, PROFILING_MAX_FILES=2).test_client()
+    for _ in range(4):
+        client.get('/?profile=1')
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_streamed_responses_are_profiled_until_first_chunk(tmp_path):
+    """Endless SSE streams still return, and the profile is written after the first event."""
+    client = _profiling_app(tmp_path, COMPRESS_RESPONSES=False).test_client()
+    session = client.post('/api/live/sessions').get_json()
+    stream = client.get(session['events'] + '?profile=1', buffered=False)
+    assert stream.mimetype == 'text/event-stream'
+
+    profile_id = stream.headers['X-Profile-Id']
+    assert pstats.Stats(str(tmp_path / profile_id)).total_calls > 0
+    assert next(iter(stream.response))
+    stream.close()
+
+    response = client.post('/api/builds/evaluate?profile=speedscope', data='{"rows": []}\n' * 3)
+    assert response.is_streamed
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+    assert (tmp_path / response.headers['X-Profile-Id']).exists()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+"""Tests for server-side chart rendering and the /render endpoints."""
+
+import base64
+import io
+import json
+import xml.dom.minidom
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+import sc2_gantt
+
+from sc2_gantt.backend.metrics import get_metrics
+from sc2_gantt.backend.render import (
+    PLACEHOLDER_SIZE, ChartRenderer, RenderCache, icon_placeholders, layout_chart, render_batch
+)
+
+
+BUILD = {'metadata': {'name': 'Reaper expand'}, 'rows': [
+    {'entities': [
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 18, 'buildTime': 21},
+        {'name': 'Barracks', 'race': 'terran', 'startTime': 40, 'buildTime': 46},
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 86, 'buildTime': 21}
+    ]},
+    {'entities': [{'name': 'Stimpack', 'race': 'terran', 'startTime': 90, 'buildTime': 100}]}
+]}
+
+
+@pytest.fixture
+def app(make_app):
+    """Create test Flask application."""
+    return make_app(COMPRESS_RESPONSES=False)
+
+
+@pytest.fixture
+def renderer():
+    with open(Path(sc2_gantt.__file__).parent / 'assets' / 'sc2_comprehensive_data.json') as f:
+        return ChartRenderer(json.load(f))
+
+
+def test_layout_positions_bars(renderer):
+    layout = layout_chart(BUILD, renderer.index, renderer.icons)
+    assert len(layout.lanes) == 2 and len(layout.bars) == 4
+    depot, barracks = layout.bars[:2]
+    assert barracks.x - depot.x == 22 * 3 and barracks.width == 46 * 3
+    assert depot.icon is not None and depot.icon.is_file()
+    assert layout.bars[3].dashed and layout.title == 'Reaper expand'
+
+
+def test_svg_embeds_each_icon_once(renderer):
+    svg = renderer.render(BUILD, 'svg').decode()
+    document = xml.dom.minidom.parseString(svg)
+    assert len(document.getElementsByTagName('symbol')) == 3
+    assert len(document.getElementsByTagName('use')) == 4
+    assert 'Reaper expand' in svg
+
+
+def test_png_matches_layout_size(renderer):
+    layout = layout_chart(BUILD, renderer.index, renderer.icons)
+    image = Image.open(io.BytesIO(renderer.render(BUILD, 'png')))
+    assert image.format == 'PNG' and image.size == (layout.width, layout.height)
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(max_entries=2)
+    cache.put_build('a', {})
+    cache.put_build('b', {})
+    cache.get_build('a')
+    cache.put_build('c', {})
+    assert cache.get_build('b') is None and cache.get_build('a') == {} and len(cache) == 2
+
+
+def test_render_endpoints(app, client):
+    registered = client.post('/render', json=BUILD)
+    assert registered.status_code == 201
+    body = registered.get_json()
+    assert body['svg'].endswith(f"/render/{body['code']}.svg")
+
+    svg = client.get(f"/render/{body['hash']}.svg")
+    assert svg.status_code == 200 and svg.mimetype == 'image/svg+xml'
+    png = client.get(f"/render/{body['hash']}.png")
+    assert png.mimetype == 'image/png' and png.data.startswith(b'\x89PNG')
+
+    again = client.get(f"/render/{body['hash']}.svg", headers={'If-None-Match': svg.headers['ETag']})
+    assert again.status_code == 304
+    metrics = get_metrics(app)
+    labels = (('format', 'svg'), ('result', 'hit'))
+    assert metrics.get_counter('sc2_gantt_render_cache_requests_total', labels) == 1
+
+    # Share codes render without registering first, from the same cache entry
+    assert client.get(f"/render/{body['code']}.svg").data == svg.data
+    assert client.get('/render/0123456789abcdef0123.svg').status_code == 404
+    assert client.get(f"/render/{body['hash']}.gif").status_code == 404
+    assert client.post('/render', json={'rows': []}).status_code == 400
+
+
+def test_oversized_charts_are_rejected(client):
+    entities = [{'name': 'SCV', 'race': 'terran', 'startTime': 200000, 'buildTime': 12}]
+    long_build = {'metadata': {'race': 'terran'}, 'rows': [{'entities': entities}] * 10}
+    code = client.post('/api/builds/encode', json=long_build).get_json()['code']
+    assert client.get(f'/render/{code}.png').status_code == 400
+    assert client.post('/render', json=long_build).status_code == 400
+
+    entities = [{'name': 'SCV', 'race': 'terran', 'startTime': 0, 'buildTime': 12}]
+    tall_build = {'metadata': {'race': 'terran'}, 'rows': [{'entities': entities}] * 65}
+    assert client.post('/render', json=tall_build).status_code == 400
+
+
+def test_icon_placeholders(client):
+    """Every icon gets a tiny PNG preview, served by href with an ETag."""
+    response = client.get('/api/icon-placeholders')
+    assert response.status_code == 200
+    placeholders = response.get_json()
+    assert placeholders
+    href, uri = next(iter(placeholders.items()))
+    assert href.startswith('/assets/icons/')
+    assert uri.startswith('data:image/png;base64,')
+    preview = Image.open(io.BytesIO(base64.b64decode(uri.split(',', 1)[1])))
+    assert preview.size == (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE)
+
+    assert client.get('/api/icon-placeholders', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert icon_placeholders({'races': {'terran': {'detailed_data': {
+        'ghost': {'name': 'Ghost', 'href': '/assets/icons/terran/units/missing.jpg'}}}}}) == {}
+
+
+def test_render_batch(tmp_path):
+    """Directories are mirrored into the output, bad files are reported and fresh outputs skipped."""
+    library = tmp_path / 'library'
+    (library / 'zvt').mkdir(parents=True)
+    (library / 'opener.json').write_text(json.dumps(BUILD))
+    (library / 'zvt' / 'stored.json').write_text(json.dumps({'id': 3, 'document': BUILD}))
+    (library / 'broken.json').write_text('{"rows": 3}')
+    output = tmp_path / 'charts'
+
+    result = render_batch([str(library)], output, formats=('png', 'svg'), workers=2)
+    assert result['rendered'] == 2 and result['images'] == 4
+    assert [Path(source).name for source, _ in result['failed']] == ['broken.json']
+    assert sorted(p.relative_to(output).as_posix() for p in output.rglob('*')) == [
+        'opener.png', 'opener.svg', 'zvt', 'zvt/stored.png', 'zvt/stored.svg'
+    ]
+
+    again = render_batch([str(library / '*.json')], output, formats=('png', 'svg'), workers=1)
+    assert again['skipped'] == 1 and again['rendered'] == 0
+
+
+def test_render_batch_reports_unexpected_errors(tmp_path, monkeypatch):
+    library = tmp_path / 'library'
+    library.mkdir()
+    (library / 'opener.json').write_text(json.dumps(BUILD))
+    (library / 'cursed.json').write_text(json.dumps(dict(BUILD, metadata={'name': 'cursed'})))
+    render = ChartRenderer.render
+
+    def flaky_render(self, build_order, fmt):
+        if build_order['metadata'].get('name') == 'cursed':
+            raise RuntimeError('font cache exploded')
+        return render(self, build_order, fmt)
+
+    monkeypatch.setattr(ChartRenderer, 'render', flaky_render)
+    result = render_batch([str(library)], tmp_path / 'charts', formats=('svg',), workers=1)
+    assert result['rendered'] == 1
+    assert [(Path(source).name, error) for source, error in result['failed']] == [
+        ('cursed.json', 'font cache exploded')]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""Tests for build-order extraction from replay tracker events."""
+
+import json
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+from sc2_gantt.backend import replays
+from sc2_gantt.backend.build_order import evaluate_build_order
+from sc2_gantt.backend.render import DATA_PATH
+from sc2_gantt.backend.replays import GAME_LOOPS_PER_SECOND, ReplayError, ReplayExtractor, ingest_replays
+
+
+METADATA = {'map': 'Alcyone LE', 'players': [{'id': 1, 'name': 'Maru', 'race': 'Terran'},
+                                             {'id': 2, 'name': 'Serral', 'race': 'Zerg'}]}
+
+
+def _loop(seconds):
+    return round(seconds * GAME_LOOPS_PER_SECOND)
+
+
+def _event(kind, seconds, **fields):
+    return dict(fields, _event=f'NNet.Replay.Tracker.{kind}', _gameloop=_loop(seconds))
+
+
+def _unit(kind, seconds, tag, type_name, player):
+    return _event(kind, seconds, m_unitTagIndex=tag, m_unitTagRecycle=1,
+                  m_unitTypeName=type_name.encode(), m_controlPlayerId=player)
+
+
+EVENTS = [
+    _unit('SUnitBornEvent', 0, 1, 'CommandCenter', 1),
+    _unit('SUnitBornEvent', 0, 2, 'SCV', 1),
+    _unit('SUnitBornEvent', 0, 3, 'Larva', 2),
+    _unit('SUnitBornEvent', 12, 4, 'SCV', 1),
+    _unit('SUnitInitEvent', 18, 5, 'SupplyDepot', 1),
+    _unit('SUnitInitEvent', 20, 6, 'SpawningPool', 2),
+    _unit('SUnitInitEvent', 25, 7, 'Barracks', 1),  # cancelled
+    _event('SUnitDiedEvent', 30, m_unitTagIndex=7, m_unitTagRecycle=1),
+    _event('SUnitDoneEvent', 39, m_unitTagIndex=5, m_unitTagRecycle=1),
+    _event('SUnitDoneEvent', 66, m_unitTagIndex=6, m_unitTagRecycle=1),
+    _unit('SUnitBornEvent', 90, 8, 'Zergling', 2),
+    _unit('SUnitBornEvent', 90, 9, 'Zergling', 2),
+    # Orbital Command, lifting off and landing again counts once
+    _event('SUnitTypeChangeEvent', 100, m_unitTagIndex=1, m_unitTagRecycle=1, m_unitTypeName=b'OrbitalCommand'),
+    _event('SUnitTypeChangeEvent', 110, m_unitTagIndex=1, m_unitTagRecycle=1, m_unitTypeName=b'OrbitalCommandFlying'),
+    _event('SUnitTypeChangeEvent', 120, m_unitTagIndex=1, m_unitTagRecycle=1, m_unitTypeName=b'OrbitalCommand'),
+    _event('SUpgradeEvent', 0, m_playerId=1, m_upgradeTypeName=b'SprayTerran', m_count=1),
+    _event('SUpgradeEvent', 200, m_playerId=1, m_upgradeTypeName=b'ShieldWall', m_count=1),
+    _event('SUpgradeEvent', 300, m_playerId=1, m_upgradeTypeName=b'TerranInfantryWeaponsLevel1', m_count=1),
+    _event('SUpgradeEvent', 150, m_playerId=2, m_upgradeTypeName=b'zerglingmovementspeed', m_count=1),
+]
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    with open(DATA_PATH) as f:
+        return ReplayExtractor(json.load(f))
+
+
+def test_extract_build_orders(extractor):
+    """Tracker events become one export-format build per player, with start times."""
+    terran, zerg = extractor.extract(METADATA, iter(EVENTS))
+
+    assert terran['metadata']['race'] == 'terran' and terran['metadata']['player'] == 'Maru'
+    steps = sorted((e['startTime'], e['name']) for row in terran['rows'] for e in row['entities'])
+    assert steps == [(0.0, 'SCV'), (18.0, 'Supply Depot'), (65.0, 'Orbital Command'),
+                     (121.0, 'Combat Shield'), (186.0, 'Infantry Weapons Level 1')]
+    assert evaluate_build_order(terran, extractor.index)['ok']
+
+    assert zerg['metadata']['race'] == 'zerg'
+    zerg_steps = sorted((e['startTime'], e['name']) for row in zerg['rows'] for e in row['entities'])
+    assert zerg_steps == [(20.0, 'Spawning Pool'), (71.0, 'Metabolic Boost'), (73.0, 'Zergling'), (73.0, 'Zergling')]
+    # Rows never overlap
+    for row in zerg['rows']:
+        entities = row['entities']
+        assert all(a['startTime'] + a['buildTime'] <= b['startTime'] + 1e-6 for a, b in zip(entities, entities[1:]))
+
+
+def test_missing_dependencies_are_reported(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, 'mpyq', None)
+    with pytest.raises(ReplayError, match='pip install'):
+        ingest_replays([str(tmp_path)], tmp_path / 'out')
+
+
+def test_ingest_replays(monkeypatch, tmp_path):
+    """Every replay below a directory gives a build file per player, mirroring its path."""
+    (tmp_path / 'scrims' / 'week1').mkdir(parents=True)
+    (tmp_path / 'scrims' / 'week1' / 'game1.SC2Replay').write_bytes(b'')
+    (tmp_path / 'scrims' / 'broken.SC2Replay').write_bytes(b'')
+    (tmp_path / 'scrims' / 'truncated.SC2Replay').write_bytes(b'')
+
+    class TruncatedError(Exception):
+        """Like s2protocol's decoder errors, not a ValueError."""
+
+    def truncated_events():
+        yield from EVENTS[:3]
+        raise TruncatedError('Truncated tracker events')
+
+    def read_replay(path):
+        if path.name == 'broken.SC2Replay':
+            raise ReplayError('Not a readable replay')
+        if path.name == 'truncated.SC2Replay':
+            return dict(METADATA), truncated_events()
+        return dict(METADATA), iter(EVENTS)
+
+    monkeypatch.setattr(replays, '_protocol', lambda: None)
+    monkeypatch.setattr(replays, 'read_replay', read_replay)
+    result = ingest_replays([str(tmp_path / 'scrims')], tmp_path / 'builds', workers=1)
+
+    assert result['replays'] == 1 and result['builds'] == 2
+    assert sorted(error for _, error in result['failed']) == ['Not a readable replay', 'Truncated tracker events']
+    written = sorted(p.relative_to(tmp_path / 'builds').as_posix() for p in (tmp_path / 'builds').rglob('*.json'))
+    assert written == ['week1/game1.1-Maru.json', 'week1/game1.2-Serral.json']
+    build = json.loads((tmp_path / 'builds' / 'week1' / 'game1.1-Maru.json').read_text())
+    assert build['metadata']['replay'] == 'game1.SC2Replay'
+
+    only = ingest_replays([str(tmp_path / 'scrims' / 'week1')], tmp_path / 'serral', workers=1, player='serral')
+    assert only['builds'] == 1
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='workers must inherit the patched reader')
+def test_ingest_survives_crashed_worker(monkeypatch, tmp_path):
+    """A worker process dying fails the replays in flight; the rest still go through."""
+    for i in range(20):
+        (tmp_path / f'game{i:02d}.SC2Replay').write_bytes(b'')
+    (tmp_path / 'a-crash.SC2Replay').write_bytes(b'')
+
+    def read_replay(path):
+        if path.name == 'a-crash.SC2Replay':
+            os._exit(1)
+        return dict(METADATA), iter(EVENTS)
+
+    monkeypatch.setattr(replays, '_protocol', lambda: None)
+    monkeypatch.setattr(replays, 'read_replay', read_replay)
+    result = ingest_replays([str(tmp_path)], tmp_path / 'builds', workers=2)
+
+    failed = [source for source, _ in result['failed']]
+    assert str(tmp_path / 'a-crash.SC2Replay') in failed
+    assert result['replays'] + len(failed) == 21
+    # Only the first batch (2 workers x TASKS_PER_WORKER) can fail with the crashed pool
+    assert result['replays'] >= 21 - 2 * replays.TASKS_PER_WORKER
@@ -9,20 +9,6 @@ from pathlib import Path
 from sc2_gantt.backend.web_app import create_app
 
 
-@pytest.fixture
-def app():
-    """Create test Flask application."""
-    app = create_app()
-    app.config['TESTING'] = True
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
-
-
 @pytest.fixture
 def sample_sc2_data():
     """Sample SC2 data for testing."""
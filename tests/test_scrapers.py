@@ -146,4 +146,135 @@ def test_cost_parsing():
     
     for cost_str, expected in test_costs:
         result = parse_cost(cost_str)
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+def _mock_response(content, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.text = content.decode('latin-1')
+    response.raise_for_status = Mock()
+    return response
+
+
+def test_telemetry_records_fetch_and_parse(tmp_path):
+    """Fetching and parsing a statistics page records timed phase events."""
+    html = (
+        '<table class="wikitable"><tr><th>Unit</th></tr>'
+        '<tr><td><a href="/starcraft2/Marine">Marine</a></td></tr></table>'
+    )
+    log_path = tmp_path / 'telemetry.jsonl'
+    scraper = SC2ComprehensiveScraper(output_dir=str(tmp_path), telemetry_log=str(log_path))
+
+    with patch('requests.get', return_value=_mock_response(html.encode())):
+        entities = scraper.extract_entities_from_statistics('Unit_Statistics', 'Units')
+    scraper.telemetry.close()
+
+    assert entities['protoss'][0]['name'] == 'Marine'
+    events = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [e['phase'] for e in events] == ['fetch_page', 'parse']
+    assert events[0]['bytes'] == len(html)
+    assert events[0]['url'].endswith('Unit_Statistics')
+
+
+def test_telemetry_records_icon_phases(tmp_path):
+    """Icon downloads are split into fetch, decode and encode phases."""
+    from PIL import Image
+    import io
+
+    buffer = io.BytesIO()
+    Image.new('RGBA', (8, 8), (255, 0, 0, 128)).save(buffer, 'PNG')
+    scraper = SC2ComprehensiveScraper(output_dir=str(tmp_path))
+
+    with patch('requests.get', return_value=_mock_response(buffer.getvalue())):
+        assert scraper.download_icon('https://example.invalid/marine.png', 'Marine', 'terran', 'unit')
+
+    summary = scraper.telemetry.summary()
+    assert list(summary) == ['fetch_icon', 'icon_decode', 'icon_encode']
+    assert summary['icon_encode']['bytes'] == (tmp_path / 'icons/terran/units/marine.jpg').stat().st_size
+
+
+def test_telemetry_summary_percentiles():
+    """The end-of-run summary reports p50/p95 per phase."""
+    from sc2_gantt.backend.sc2_data.telemetry import ScrapeTelemetry
+
+    telemetry = ScrapeTelemetry()
+    for ms in range(1, 101):
+        telemetry.record('fetch_page', ms / 1000, bytes=10)
+
+    stats = telemetry.summary()['fetch_page']
+    assert stats['count'] == 100
+    assert stats['p50'] == 0.05
+    assert stats['p95'] == 0.095
+    assert stats['bytes'] == 1000
+    assert 'fetch_page' in telemetry.format_summary()
+
+
+def test_fetch_retries_throttled_requests(tmp_path):
+    """429 responses are retried after the Retry-After delay."""
+    throttled = _mock_response(b'')
+    throttled.status_code = 429
+    throttled.headers = {'Retry-After': '0'}
+    ok = _mock_response(b'ok')
+
+    scraper = SC2ComprehensiveScraper(output_dir=str(tmp_path))
+    with patch('requests.get', side_effect=[throttled, ok]) as get:
+        assert scraper._fetch('https://example.invalid/page') is ok
+
+    assert get.call_count == 2
+    summary = scraper.telemetry.summary()
+    assert summary['fetch_page']['count'] == 2
+    assert summary['retry_backoff']['count'] == 1
+
+
+def test_fetch_caps_retry_after_and_retries_timeouts(tmp_path):
+    """Long Retry-After values are capped and hung connections are retried."""
+    import requests
+
+    throttled = _mock_response(b'')
+    throttled.status_code = 429
+    throttled.headers = {'Retry-After': '3600'}
+    ok = _mock_response(b'ok')
+
+    scraper = SC2ComprehensiveScraper(output_dir=str(tmp_path), max_backoff=0.5, timeout=5)
+    with patch('requests.get', side_effect=[throttled, requests.Timeout('read timed out'), ok]) as get, \
+            patch('time.sleep') as sleep:
+        assert scraper._fetch('https://example.invalid/page') is ok
+
+    assert [call.args[0] for call in sleep.call_args_list] == [0.5, 0.5]
+    assert all(call.kwargs['timeout'] == 5 for call in get.call_args_list)
+
+    with patch('requests.get', side_effect=requests.ConnectionError('refused')), patch('time.sleep'):
+        with pytest.raises(requests.ConnectionError):
+            scraper._fetch('https://example.invalid/page')
+
+
+def test_corpus_record_and_replay(tmp_path):
+    """Recorded responses are replayed by the local corpus server."""
+    from sc2_gantt.backend.sc2_data.corpus import Corpus, CorpusServer, RecordingScraper
+
+    html = (
+        '<table class="wikitable"><tr><th>Unit</th></tr>'
+        '<tr><td><a href="/starcraft2/Marine">Marine</a></td></tr></table>'
+    )
+    response = _mock_response(html.encode())
+    response.headers = {'Content-Type': 'text/html; charset=UTF-8'}
+
+    corpus = Corpus(str(tmp_path / 'corpus' / 'v1'))
+    recorder = RecordingScraper(corpus, output_dir=str(tmp_path))
+    with patch('requests.get', return_value=response):
+        recorded = recorder.extract_entities_from_statistics('Unit_Statistics', 'Units')
+    corpus.save()
+
+    replay_corpus = Corpus(str(tmp_path / 'corpus' / 'v1'))
+    assert replay_corpus.manifest['version'] == 'v1'
+    assert '/starcraft2/Unit_Statistics' in replay_corpus.entries
+
+    with CorpusServer(replay_corpus, seed=1) as server:
+        scraper = SC2ComprehensiveScraper(output_dir=str(tmp_path), base_page_url=server.page_url,
+                                          base_image_url=server.base_url)
+        assert scraper.extract_entities_from_statistics('Unit_Statistics', 'Units') == recorded
+        assert scraper.extract_entities_from_statistics('Missing_Page', 'Units') == {}
+
+    assert server.stats['served'] == 1
+    assert server.stats['not_found'] == 1
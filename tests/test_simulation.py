@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+
+"""Tests for the economy simulation and incremental re-simulation."""
+
+import copy
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from sc2_gantt.backend.asset_pipeline import FRONTEND_DIR
+from sc2_gantt.backend.build_order import BuildOrderError, entity_key
+from sc2_gantt.backend.simulation import IncrementalSimulation, build_steps, simulate_build_order
+
+
+def terran_build(marines=15):
+    workers = [{'name': 'SCV', 'race': 'terran', 'startTime': 12 * i, 'buildTime': 12} for i in range(20)]
+    structures = [
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 18},
+        {'name': 'Barracks', 'race': 'terran', 'startTime': 40},
+        {'name': 'Refinery', 'race': 'terran', 'startTime': 86},
+        {'name': 'Command Center', 'race': 'terran', 'startTime': 110},
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 180}
+    ]
+    army = [{'name': 'Marine', 'race': 'terran', 'startTime': 86 + 18 * i} for i in range(marines)]
+    return {'rows': [{'entities': workers}, {'entities': structures}, {'entities': army}]}
+
+
+def test_steps_wait_for_resources_supply_and_requirements(index):
+    result = simulate_build_order(terran_build(), index)
+    events = {(e['name'], e['requested']): e for e in result['events']}
+    assert events[('SCV', 0.0)]['start'] == 0 and events[('SCV', 0.0)]['supply'] == '13/15'
+    # 15/15 after the third SCV: the fourth waits for the depot to finish at 0:39
+    assert events[('SCV', 36.0)]['start'] == 39.0
+    # The Barracks needs the finished depot
+    assert events[('Barracks', 40.0)]['start'] >= events[('Supply Depot', 18.0)]['end']
+    assert all(e['start'] >= e['requested'] for e in result['events'])
+    assert result['summary']['workers'] == 32
+
+
+def test_never_built_requirement_is_a_warning(index):
+    build = {'rows': [{'entities': [{'name': 'Ghost', 'race': 'terran', 'startTime': 0}]}]}
+    event = simulate_build_order(build, index)['events'][0]
+    assert any('requires ghost academy' in w for w in event['warnings'])
+
+
+def test_waits_for_requirement_in_progress(index):
+    build = {'rows': [{'entities': [
+        {'name': 'Supply Depot', 'race': 'terran', 'startTime': 0}
+    ]}, {'entities': [{'name': 'Barracks', 'race': 'terran', 'startTime': 5}]}]}
+    events = simulate_build_order(build, index)['events']
+    depot = events[0]
+    barracks = next(e for e in events if e['name'] == 'Barracks')
+    assert barracks['start'] >= depot['end'] and barracks['warnings'] == []
+
+
+def test_late_edit_only_recomputes_the_tail(index):
+    build = terran_build()
+    simulation = IncrementalSimulation(index)
+    assert simulation.update(build)['recomputed'] == 40
+
+    build['rows'][2]['entities'][13]['startTime'] += 30
+    diff = simulation.update(build)
+    assert diff['from_step'] >= 35 and diff['recomputed'] <= 5
+    assert diff['changed'] and all(e['step'] >= diff['from_step'] for e in diff['changed'])
+
+    del build['rows'][2]['entities'][-2:]
+    diff = simulation.update(build)
+    assert diff['removed'] == [38, 39] and diff['total_steps'] == 38
+
+
+def test_incremental_matches_full_simulation(index):
+    """Random edits re-simulated from checkpoints give exactly the full result."""
+    rng = random.Random(7)
+    build = terran_build()
+    simulation = IncrementalSimulation(index)
+    for _ in range(30):
+        row = build['rows'][rng.randrange(3)]['entities']
+        if row and rng.random() < 0.2:
+            row.pop(rng.randrange(len(row)))
+        elif row:
+            row[rng.randrange(len(row))]['startTime'] = rng.randrange(0, 400)
+        simulation.update(copy.deepcopy(build))
+        full = simulate_build_order(build, index)
+        assert [e.to_dict() for e in simulation.events] == full['events']
+        assert simulation.summary() == full['summary']
+
+
+def test_empty_build_summary_has_the_same_shape(index):
+    empty = simulate_build_order({'rows': []}, index)['summary']
+    assert set(empty) == set(simulate_build_order(terran_build(), index)['summary'])
+    assert empty['completion'] == '0:00'
+
+
+def test_invalid_builds(index, client):
+    with pytest.raises(BuildOrderError):
+        IncrementalSimulation(index).update({'rows': [{'entities': [{'name': 'SCV'}]}]})
+    assert client.post('/api/simulate', json={'rows': 3}).status_code == 400
+    response = client.post('/api/simulate', json=terran_build(3))
+    assert response.status_code == 200 and len(response.get_json()['events']) == 28
+
+
+def worker_catalog(index, race):
+    """The catalog message the frontend posts to the simulation worker."""
+    keys = sorted(key for r, key in index.entities if r == race)
+    ids = {key: i for i, key in enumerate(keys)}
+    entities = [index.entities[(race, key)] for key in keys]
+    return {race: {
+        'keys': keys,
+        'names': [data['name'] for data in entities],
+        'buildings': [1 if data.get('type') == 'building' else 0 for data in entities],
+        'requirements': [[ids[entity_key(r)] for r in data.get('requirements') or [] if entity_key(r) in ids]
+                         for data in entities]
+    }}
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_worker_port_matches_backend(index):
+    """The static site's simulation worker gives the backend's results, incrementally too."""
+    zerg = {'rows': [
+        {'entities': [{'name': 'Drone', 'race': 'zerg', 'startTime': 12 * i, 'buildTime': 12} for i in range(8)]},
+        {'entities': [{'name': 'Spawning Pool', 'race': 'zerg', 'startTime': 20},
+                      {'name': 'Extractor', 'race': 'zerg', 'startTime': 40},
+                      {'name': 'Lair', 'race': 'zerg', 'startTime': 90}]},
+        {'entities': [{'name': 'Zergling', 'race': 'zerg', 'startTime': 70 + 5 * i} for i in range(6)] +
+                     [{'name': 'Hydralisk', 'race': 'zerg', 'startTime': 150}]}
+    ]}
+    edited = terran_build()
+    edited['rows'][2]['entities'][13]['startTime'] += 30
+    builds = [terran_build(), edited, zerg]
+
+    messages, expected = [], []
+    catalog = {}
+    for build in builds:
+        race, steps = build_steps(build, index)
+        catalog.update(worker_catalog(index, race))
+        ids = {key: i for i, key in enumerate(catalog[race]['keys'])}
+        messages.append({'race': race,
+                         'steps': [v for s in steps for v in (s.requested, s.build_time, s.minerals, s.gas)],
+                         'ids': [v for s in steps for v in (s.row, ids.get(s.key, -1))]})
+    simulation = IncrementalSimulation(index)
+    for build in builds:
+        expected.append((simulation.update(build)['from_step'], simulate_build_order(build, index)))
+
+    script = (FRONTEND_DIR / 'js' / 'simulation-worker.js').read_text(encoding='utf-8') + """
+        const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+        const simulation = new IncrementalSimulation();
+        simulation.setCatalog(input.catalog);
+        console.log(JSON.stringify(input.messages.map(m => {
+            const result = simulation.update(m.race, Float64Array.from(m.steps), Int32Array.from(m.ids));
+            return { ...result, order: Array.from(result.order), timings: Array.from(result.timings) };
+        })));
+    """
+    output = subprocess.run(['node', '-e', script], input=json.dumps({'catalog': catalog, 'messages': messages}),
+                            capture_output=True, text=True, check=True).stdout
+    for result, (from_step, full) in zip(json.loads(output), expected):
+        assert result['fromStep'] == from_step
+        assert result['order'] == list(range(len(full['events'])))
+        for step, event in enumerate(full['events']):
+            start, end, minerals, gas, used, cap = result['timings'][step * 6:step * 6 + 6]
+            assert (round(start, 3), round(end, 3)) == (event['start'], event['end'])
+            assert (minerals, gas, f'{used:g}/{cap:g}') == (event['minerals'], event['gas'], event['supply'])
+            assert result['warnings'][step] == event['warnings']
+        summary = result['summary']
+        assert summary['completion'] == full['summary']['completion']
+        assert (summary['supply'], summary['workers'], summary['warnings']) == (
+            full['summary']['supply'], full['summary']['workers'], full['summary']['warnings'])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""Tests for timeline queries over simulated builds."""
+
+import json
+import random
+
+import pytest
+
+from sc2_gantt.backend.build_order import BuildOrderError, GameDataIndex, parse_game_time
+from sc2_gantt.backend.render import DATA_PATH
+from sc2_gantt.backend.timeline import BuildTimeline, IntervalTree
+
+from tests.conftest import make_entity
+
+
+BUILD_TIMES = {'SCV': 12, 'Supply Depot': 21, 'Barracks': 46, 'Refinery': 21, 'Factory': 43,
+               'Starport': 36, 'Marine': 18, 'Medivac': 30}
+
+
+def _entity(name, start):
+    return make_entity('terran', name, start, BUILD_TIMES[name])
+
+
+BUILD = {'metadata': {'race': 'terran'}, 'rows': [
+    {'entities': [_entity('SCV', 12 * i) for i in range(20)]},
+    {'entities': [_entity('Supply Depot', 18), _entity('Barracks', 40), _entity('Refinery', 45),
+                  _entity('Factory', 110), _entity('Starport', 160)]},
+    {'entities': [_entity('Marine', 90), _entity('Marine', 110)]},
+    {'entities': [_entity('Medivac', 210), _entity('Medivac', 240)]}
+]}
+
+
+@pytest.fixture(scope='module')
+def timeline():
+    with open(DATA_PATH) as f:
+        return BuildTimeline(BUILD, GameDataIndex(json.load(f)))
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        intervals = []
+        for item in range(rng.randint(0, 50)):
+            start = rng.uniform(0, 100)
+            intervals.append((start, start + rng.choice([0, rng.uniform(0, 30)]), item))
+        tree = IntervalTree(intervals)
+        start = rng.uniform(-5, 110)
+        end = start + rng.choice([0, rng.uniform(0, 20)])
+        expected = [item for s, e, item in sorted(intervals, key=lambda i: (i[0], i[1]))
+                    if s < max(end, start + 1e-6) and e > start + 1e-6]
+        assert tree.overlapping(start, end) == expected
+
+
+def test_point_and_range_queries(timeline):
+    assert [e['name'] for e in timeline.active(parse_game_time('3:15'))] == ['Marine']
+    # Half-open: the Refinery ends at 1:47 and is no longer in production then
+    assert 'Refinery' not in [e['name'] for e in timeline.active(107)]
+    # Supply blocks push the last SCVs past 4:00
+    assert {e['name'] for e in timeline.overlapping(240, 300)} == {'SCV', 'Starport'}
+
+    idle = {p['name']: p for p in timeline.idle_producers(parse_game_time('4:00'), parse_game_time('5:00'))}
+    assert idle['Factory']['fully_idle'] and idle['Factory']['idle_seconds'] == 60
+    assert idle['Starport']['idle_seconds'] == 21
+    assert 'Marine' not in idle
+
+
+def test_aggregate_queries(timeline):
+    assert timeline.completion('Medivac', 2) == 411
+    assert timeline.completion('medivac', 3) is None
+    at_start = timeline.resources(0)
+    assert at_start['supply_cap'] == 15 and at_start['minerals_spent'] == 50
+    late = timeline.resources(parse_game_time('5:00'))
+    assert late['supply_cap'] == 23 and late['gas_spent'] == 200
+    # Steps started at 0:00 are before the range
+    total = timeline.resources(1e9)
+    assert timeline.spent_between(0, 1e9) == {'minerals': total['minerals_spent'] - 50, 'gas': total['gas_spent']}
+
+
+def test_parse_game_time():
+    assert parse_game_time('3:15') == 195 and parse_game_time(42) == 42 and parse_game_time('195') == 195
+    for invalid in ('3:75', '-1', -1, None, True, float('inf')):
+        with pytest.raises(BuildOrderError):
+            parse_game_time(invalid)
+
+
+def test_timeline_route(make_app):
+    client = make_app(COMPRESS_RESPONSES=False).test_client()
+    response = client.post('/api/timeline/query', json={'build': BUILD, 'queries': [
+        {'type': 'active', 'at': '3:15'},
+        {'type': 'completion', 'entity': 'Medivac', 'n': 2},
+        {'type': 'idle', 'from': '4:00', 'to': '5:00'},
+        {'type': 'spent', 'from': '1:00', 'to': '2:00'}
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['race'] == 'terran'
+    assert body['results'][1] == {'time': 411.0, 'game_time': '6:51'}
+    assert len(body['results']) == 4
+
+    bad = client.post('/api/timeline/query',
+                      json={'build': BUILD, 'queries': [{'type': 'idle', 'from': '5:00', 'to': '4:00'}]})
+    assert bad.status_code == 400
+    assert client.post('/api/timeline/query', json={'queries': []}).status_code == 400